@@ -0,0 +1,326 @@
+"""Throughput benchmarks for the simulation engine and the balance_ai pipeline.
+
+Engine suites report games/sec and ticks/sec per strategy group at fixed
+seeds (from main.gd's per-strategy elapsed_ms and avg_ticks); the Python
+suite times engine launch, result JSON parsing and result-cache hits. Each
+run is appended to a JSON-lines history and checked against recent runs.
+Engine suites pass --every-seed, so seed-invariant batches that main.gd would
+otherwise play once are timed game by game.
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from result_cache import ResultCache, cache_key
+from simulation_runner import GODOT_PATH, PROJECT_PATH, UPGRADE_STRATEGY_IDS, SimulationRunner
+
+HISTORY_FILE = Path(__file__).parent / "results" / "benchmarks.jsonl"
+FAKE_GODOT = Path(__file__).parent / "tests" / "fake_godot.py"
+
+# Suite -> (--strategy, --ai); rush_aoe and smash_maze are timed apart from the matrix
+SUITES = {
+    "baselines": ("a,b,c,d", ""),
+    "upgrades": (
+        ",".join(s for s in UPGRADE_STRATEGY_IDS if s not in ("rush_aoe", "smash_maze")),
+        "",
+    ),
+    "rush_aoe": ("rush_aoe", ""),
+    "smash_maze": ("smash_maze", ""),
+    "ai_balanced": ("all", "balanced"),
+}
+DEFAULT_COUNT = 20
+DEFAULT_SEED = 12345
+LAUNCH_REPEATS = 5
+PARSE_REPEATS = 200
+CACHE_REPEATS = 200
+TOLERANCE = 0.15  # Allowed slowdown against the recent median before it counts as a regression
+WINDOW = 5  # Recent comparable runs the median is taken over
+
+# Metric -> True when higher is better
+METRICS = {
+    "games_per_s": True,
+    "ticks_per_s": True,
+    "launch_ms": False,
+    "json_parse_us": False,
+    "cache_hit_us": False,
+}
+
+
+def resolve_engine(godot_path: str, work_dir: Path) -> Tuple[str, str]:
+    """(engine command, backend name); the fake Godot stub stands in for a missing binary."""
+    if shutil.which(godot_path):
+        return godot_path, "godot"
+    script = Path(work_dir) / "godot"
+    script.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_GODOT}" "$@"\n')
+    script.chmod(0o755)
+    return str(script), "fake"
+
+
+def run_engine(
+    runner: SimulationRunner, strategy: str, ai: str, count: int, seed: int
+) -> Dict[str, Any]:
+    """One engine process over a suite; returns its --json output."""
+    cmd = [
+        runner.godot_path,
+        "--headless",
+        "--path",
+        str(runner.project_path),
+        "--",
+        "--strategy",
+        strategy,
+        "--count",
+        str(count),
+        "--seed",
+        str(seed),
+        "--json",
+        "--every-seed",
+    ]
+    if ai:
+        cmd += ["--ai", ai]
+    for record in runner.iter_records(cmd):
+        return record
+    raise RuntimeError(f"No JSON output from: {' '.join(cmd)}")
+
+
+def throughput(records: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Games/sec and ticks/sec per strategy and over the whole suite (engine time only)."""
+    per_strategy = {}
+    games = ticks = elapsed_ms = 0.0
+    for strat_id, record in records.items():
+        runs = record.get("runs", 0)
+        ms = record.get("elapsed_ms") or record.get("avg_duration_ms", 0) * runs
+        seconds = max(ms, 1e-3) / 1000
+        per_strategy[strat_id] = {
+            "games": runs,
+            "games_per_s": runs / seconds,
+            "ticks_per_s": runs * record.get("avg_ticks", 0) / seconds,
+        }
+        games += runs
+        ticks += runs * record.get("avg_ticks", 0)
+        elapsed_ms += ms
+    seconds = max(elapsed_ms, 1e-3) / 1000
+    return {
+        "games": int(games),
+        "elapsed_ms": elapsed_ms,
+        "games_per_s": games / seconds,
+        "ticks_per_s": ticks / seconds,
+        "strategies": per_strategy,
+    }
+
+
+def bench_engine(
+    runner: SimulationRunner, suites: List[str], count: int, seed: int
+) -> Dict[str, Any]:
+    results = {}
+    for name in suites:
+        strategy, ai = SUITES[name]
+        start = time.perf_counter()
+        output = run_engine(runner, strategy, ai, count, seed)
+        results[name] = throughput(output.get("strategies", {}))
+        results[name]["wall_ms"] = (time.perf_counter() - start) * 1000
+    return results
+
+
+def bench_python(runner: SimulationRunner, seed: int, work_dir: Path) -> Dict[str, Any]:
+    """Launch, parse and cache-hit timings of the Python side of a sweep."""
+    launches = []
+    for _ in range(LAUNCH_REPEATS):
+        start = time.perf_counter()
+        output = run_engine(runner, "a", "", 1, seed)
+        launches.append((time.perf_counter() - start) * 1000)
+
+    text = json.dumps(output)
+    start = time.perf_counter()
+    for _ in range(PARSE_REPEATS):
+        json.loads(text)
+    parse_us = (time.perf_counter() - start) * 1e6 / PARSE_REPEATS
+
+    cache = ResultCache(Path(work_dir) / "cache")
+    key = cache_key(output.get("config", {}), "a", seed, 1, "benchmark")
+    cache.put(key, output)
+    start = time.perf_counter()
+    for _ in range(CACHE_REPEATS):
+        cache.get(key)
+    hit_us = (time.perf_counter() - start) * 1e6 / CACHE_REPEATS
+
+    return {
+        "launch_ms": statistics.median(launches),
+        "json_parse_us": parse_us,
+        "json_bytes": len(text),
+        "cache_hit_us": hit_us,
+    }
+
+
+def run_benchmarks(
+    godot_path: str = GODOT_PATH,
+    project_path: Path = PROJECT_PATH,
+    suites: Optional[List[str]] = None,
+    count: int = DEFAULT_COUNT,
+    seed: int = DEFAULT_SEED,
+    python: bool = True,
+) -> Dict[str, Any]:
+    """One history entry: engine suites plus (optionally) the Python-side timings."""
+    suites = list(SUITES) if suites is None else suites
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine, backend = resolve_engine(godot_path, Path(work_dir))
+        runner = SimulationRunner(godot_path=engine, project_path=project_path)
+        entry = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(project_path),
+            "backend": backend,
+            "count": count,
+            "seed": seed,
+            "suites": bench_engine(runner, suites, count, seed),
+        }
+        if python:
+            entry["python"] = bench_python(runner, seed, Path(work_dir))
+    return entry
+
+
+def git_commit(project_path: Path) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=project_path,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return result.stdout.strip()
+
+
+def load_history(path: Path = HISTORY_FILE) -> List[Dict[str, Any]]:
+    if not Path(path).exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(entry: Dict[str, Any], path: Path = HISTORY_FILE) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+
+def flat_metrics(entry: Dict[str, Any]) -> Dict[str, float]:
+    """Every tracked metric in an entry, keyed "suite.metric" or "python.metric"."""
+    flat = {}
+    for name, suite in entry.get("suites", {}).items():
+        for metric in ("games_per_s", "ticks_per_s"):
+            if metric in suite:
+                flat[f"{name}.{metric}"] = suite[metric]
+    for metric, value in entry.get("python", {}).items():
+        if metric in METRICS:
+            flat[f"python.{metric}"] = value
+    return flat
+
+
+def check_regression(
+    entry: Dict[str, Any],
+    history: List[Dict[str, Any]],
+    tolerance: float = TOLERANCE,
+    window: int = WINDOW,
+) -> List[Dict[str, Any]]:
+    """Metrics worse than the median of the last window comparable runs by more than tolerance.
+
+    Runs are comparable when backend, count and seed match.
+    """
+    same = [
+        h
+        for h in history
+        if (h.get("backend"), h.get("count"), h.get("seed"))
+        == (entry["backend"], entry["count"], entry["seed"])
+    ][-window:]
+    if not same:
+        return []
+
+    current = flat_metrics(entry)
+    past = [flat_metrics(h) for h in same]
+    regressions = []
+    for key, value in current.items():
+        values = [p[key] for p in past if key in p]
+        if not values:
+            continue
+        baseline = statistics.median(values)
+        higher_is_better = METRICS[key.split(".", 1)[1]]
+        change = (value - baseline) / baseline if baseline else 0.0
+        slowdown = -change if higher_is_better else change
+        if slowdown > tolerance:
+            regressions.append(
+                {"metric": key, "value": value, "baseline": baseline, "slowdown": slowdown}
+            )
+    return regressions
+
+
+def format_entry(entry: Dict[str, Any]) -> str:
+    lines = [
+        f"Benchmark ({entry['backend']}, {entry['count']} games/strategy, seed {entry['seed']})"
+    ]
+    for name, suite in entry["suites"].items():
+        lines.append(
+            f"  {name:<12} {suite['games_per_s']:>9.1f} games/s {suite['ticks_per_s']:>12.0f} "
+            f"ticks/s  ({suite['games']} games, {suite['wall_ms']:.0f}ms wall)"
+        )
+        for strat_id, stats in suite["strategies"].items():
+            lines.append(
+                f"    {strat_id:<20} {stats['games_per_s']:>9.1f} games/s "
+                f"{stats['ticks_per_s']:>12.0f} ticks/s"
+            )
+    python = entry.get("python")
+    if python:
+        lines.append(
+            f"  python       launch {python['launch_ms']:.1f}ms, "
+            f"parse {python['json_parse_us']:.1f}us ({python['json_bytes']} bytes), "
+            f"cache hit {python['cache_hit_us']:.1f}us"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the simulation engine and pipeline")
+    parser.add_argument("--godot", default=GODOT_PATH, help="Godot binary (stub if absent)")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="Games per strategy")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Base seed")
+    parser.add_argument(
+        "--suite", action="append", choices=list(SUITES), help="Suites to run (default: all)"
+    )
+    parser.add_argument("--no-python", action="store_true", help="Skip the Python-side timings")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE, help="History file")
+    parser.add_argument("--no-save", action="store_true", help="Do not append to the history")
+    parser.add_argument(
+        "--check", action="store_true", help="Exit 1 if a metric regressed against the history"
+    )
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed slowdown")
+    args = parser.parse_args()
+
+    entry = run_benchmarks(
+        args.godot, PROJECT_PATH, args.suite, args.count, args.seed, not args.no_python
+    )
+    print(format_entry(entry))
+
+    regressions = check_regression(entry, load_history(args.history), args.tolerance)
+    for r in regressions:
+        print(
+            f"REGRESSION {r['metric']}: {r['value']:.1f} vs median {r['baseline']:.1f} "
+            f"({r['slowdown']:.0%} slower)"
+        )
+    if not args.no_save:
+        append_history(entry, args.history)
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
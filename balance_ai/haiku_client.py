@@ -1,28 +1,206 @@
 """Claude Haiku API client for balance analysis."""
 
+import asyncio
+import hashlib
 import json
 import os
 import time
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from anthropic import Anthropic
 from dotenv import load_dotenv
 
-from prompts import build_analysis_prompt
+from prompts import build_analysis_prompt, build_compact_prompt
 
 load_dotenv()
 
+MODEL = "claude-haiku-4-5-20251001"
+MAX_TOKENS = 2048
+CACHE_DIR = Path(__file__).parent / "results" / "haiku_cache"
+REQUESTS_PER_MINUTE = 50
+BURST = 4  # Requests allowed back to back before the rate limit kicks in
+MAX_CONCURRENCY = 4
+CHARS_PER_TOKEN = 4  # Token estimate when the backend reports no usage (cache hits, stub)
 
-class HaikuClient:
-    def __init__(self):
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
+# Backends return the response text and its token usage
+Completion = Tuple[str, Dict[str, int]]
+
+
+def parse_response(content: str) -> Dict[str, Any]:
+    """Recommendations from a response text (handles markdown code blocks)."""
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0]
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0]
+
+    try:
+        return json.loads(content.strip())
+    except json.JSONDecodeError as e:
+        # Return error info if JSON parsing fails
+        return {
+            "error": f"Failed to parse JSON: {e}",
+            "raw_response": content,
+            "analysis": "Failed to parse AI response",
+            "changes": {},
+            "converged": False,
+            "confidence": 0,
+        }
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: rate tokens per second, up to capacity banked.
+
+    reserve() takes a token immediately (the balance may go negative) and
+    returns how long the caller must wait, so concurrent callers queue up
+    without a lock and the limiter works from any event loop.
+    """
+
+    def __init__(
+        self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def reserve(self) -> float:
+        """Take one token; seconds to wait before using it."""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class ResponseCache:
+    """Response texts on disk, keyed by a hash of the model and prompt."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        path = self.cache_dir / f"{self.key(model, prompt)}.json"
+        try:
+            with open(path) as f:
+                return json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, model: str, prompt: str, response: str) -> None:
+        path = self.cache_dir / f"{self.key(model, prompt)}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"model": model, "response": response}, f)
+        os.replace(tmp, path)  # Atomic, so a reader never sees half a file
+
+
+class AnthropicBackend:
+    """Sends prompts to the Anthropic Messages API."""
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not set in environment or .env file")
+        self._client = None
+        self._loop = None
+
+    async def complete(self, prompt: str, model: str, max_tokens: int) -> Completion:
+        # The async HTTP client is bound to the event loop it was created in
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            from anthropic import AsyncAnthropic
+
+            self._client = AsyncAnthropic(api_key=self.api_key)
+            self._loop = loop
+
+        response = await self._client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        usage = {
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+        }
+        return response.content[0].text, usage
 
-        self.client = Anthropic(api_key=api_key)
-        self.model = "claude-haiku-4-5-20251001"
-        self.request_delay = 1.0  # Delay between requests to avoid rate limits
-        self.last_request_time = 0
+
+class StubBackend:
+    """Deterministic offline backend: never recommends changes, never touches the network.
+
+    latency (seconds) simulates a round trip, for benchmarking the loop.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(self, prompt: str, model: str, max_tokens: int) -> Completion:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+        text = json.dumps(
+            {
+                "analysis": f"Offline stub response (prompt {digest})",
+                "best_strategy": "",
+                "off_target_metrics": [],
+                "changes": {},
+                "reasoning": "Stub backend does not analyze results",
+                "expected_impact": "None",
+                "confidence": 0,
+                "converged": False,
+            }
+        )
+        return text, {}
+
+
+class HaikuClient:
+    """Rate-limited, cached analysis client; sync and asyncio entry points.
+
+    analyze_many() sends several prompts concurrently (at most max_concurrency
+    in flight) while the token bucket spaces them to requests_per_minute.
+    Identical prompts to the same model are answered from the disk cache.
+
+    With compact=True prompts come from build_compact_prompt (off-target
+    metrics, the diff from `previous` and a sparse changes schema). Every
+    call's prompt size, token usage and latency is kept in `calls` and,
+    with metrics_path, appended there as one JSON line.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        model: str = MODEL,
+        requests_per_minute: float = REQUESTS_PER_MINUTE,
+        burst: int = BURST,
+        max_concurrency: int = MAX_CONCURRENCY,
+        cache: Optional[ResponseCache] = None,
+        compact: bool = False,
+        metrics_path: Optional[Path] = None,
+    ):
+        self.backend = backend if backend is not None else AnthropicBackend()
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(requests_per_minute / 60, burst)
+        self.cache = cache
+        self.compact = compact
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.calls: List[Dict[str, Any]] = []
+        self.requests = 0
+        self.cache_hits = 0
+        self.latency_s = 0.0
 
     def analyze(
         self,
@@ -30,43 +208,105 @@ class HaikuClient:
         results: Dict[str, Any],
         targets: Dict[str, Any],
         goal: str,
+        previous: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
-        """Send results to Haiku, get recommendations."""
+        """Send results to Haiku, get recommendations.
 
-        # Rate limit delay
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.request_delay:
-            time.sleep(self.request_delay - elapsed)
+        previous is the prior (config, results), used by compact prompts.
+        """
+        return asyncio.run(self.analyze_async(config, results, targets, goal, previous))
 
+    def analyze_batch(
+        self,
+        requests: List[Tuple],
+        targets: Dict[str, Any],
+        goal: str,
+    ) -> List[Dict[str, Any]]:
+        """Recommendations for several (config, results[, previous]) requests, concurrently."""
+        return asyncio.run(self.analyze_many(requests, targets, goal))
+
+    async def analyze_async(
+        self,
+        config: Dict[str, Any],
+        results: Dict[str, Any],
+        targets: Dict[str, Any],
+        goal: str,
+        previous: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
         parameter_bounds = results.get("parameter_bounds", {})
-        prompt = build_analysis_prompt(config, results, targets, goal, parameter_bounds)
+        if self.compact:
+            prompt = build_compact_prompt(
+                config, results, targets, goal, parameter_bounds, previous
+            )
+        else:
+            prompt = build_analysis_prompt(config, results, targets, goal, parameter_bounds)
+        return parse_response(await self.complete(prompt))
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=2048,
-            messages=[{"role": "user", "content": prompt}],
-        )
+    async def analyze_many(
+        self,
+        requests: List[Tuple],
+        targets: Dict[str, Any],
+        goal: str,
+    ) -> List[Dict[str, Any]]:
+        """Recommendations in request order."""
+        slots = asyncio.Semaphore(self.max_concurrency)
 
-        self.last_request_time = time.time()
+        async def one(config, results, previous=None):
+            async with slots:
+                return await self.analyze_async(config, results, targets, goal, previous)
 
-        # Parse JSON response
-        content = response.content[0].text
+        return list(await asyncio.gather(*(one(*request) for request in requests)))
 
-        # Extract JSON from response (handle markdown code blocks)
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0]
+    async def complete(self, prompt: str) -> str:
+        """Response text for a prompt, from the cache or the rate-limited backend.
 
-        try:
-            return json.loads(content.strip())
-        except json.JSONDecodeError as e:
-            # Return error info if JSON parsing fails
-            return {
-                "error": f"Failed to parse JSON: {e}",
-                "raw_response": content,
-                "analysis": "Failed to parse AI response",
-                "changes": {},
-                "converged": False,
-                "confidence": 0,
-            }
+        Only replies that parse are cached: a rejected reply changes nothing,
+        so the next iteration sends the same prompt and must reach the backend
+        again rather than replay the bad reply.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self.model, prompt)
+            if cached is not None and "error" not in parse_response(cached):
+                self.cache_hits += 1
+                self._record(prompt, cached, {}, 0.0, cached=True)
+                return cached
+
+        await self.bucket.acquire()
+        start = time.monotonic()
+        content, usage = await self.backend.complete(prompt, self.model, MAX_TOKENS)
+        latency = time.monotonic() - start
+        self.latency_s += latency
+        self.requests += 1
+        self._record(prompt, content, usage, latency, cached=False)
+
+        if self.cache is not None and "error" not in parse_response(content):
+            self.cache.put(self.model, prompt, content)
+        return content
+
+    def _record(
+        self, prompt: str, content: str, usage: Dict[str, int], latency: float, cached: bool
+    ) -> None:
+        call = {
+            "mode": "compact" if self.compact else "full",
+            "cached": cached,
+            "prompt_chars": len(prompt),
+            "input_tokens": usage.get("input_tokens", len(prompt) // CHARS_PER_TOKEN),
+            "output_tokens": usage.get("output_tokens", len(content) // CHARS_PER_TOKEN),
+            "latency_s": round(latency, 4),
+        }
+        self.calls.append(call)
+        if self.metrics_path:
+            self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.metrics_path, "a") as f:
+                f.write(json.dumps(call) + "\n")
+
+    def stats(self) -> Dict[str, Any]:
+        """Request/cache counters and average prompt size since this client was created."""
+        calls = len(self.calls)
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "avg_latency_s": self.latency_s / self.requests if self.requests else 0.0,
+            "avg_prompt_chars": sum(c["prompt_chars"] for c in self.calls) / calls if calls else 0,
+            "avg_input_tokens": sum(c["input_tokens"] for c in self.calls) / calls if calls else 0,
+        }
@@ -0,0 +1,108 @@
+"""Multi-fidelity successive halving of candidate configs (optimizer.py --halving).
+
+Candidates race up a schedule of rungs, cheapest first. The first rung screens
+every candidate on a few seeds, the baseline strategies and waves 1-10 only;
+each rung keeps the best 1/eta and re-runs them at higher fidelity. The last
+rung is the optimizer's normal --runs sweep over every strategy and the whole
+roster, so whatever wins there is confirmed at full fidelity before it is
+written. The parent (candidate 0) is always promoted, so a generation can
+still keep it.
+"""
+
+import math
+from typing import Callable, Dict, Any, List, Tuple
+
+from population import score_results
+
+HALVING_ETA = 3  # Each rung keeps 1/eta of its candidates
+DEFAULT_RUNGS = 3
+SCREEN_WAVES = 10  # Waves played by the first (cheapest) rung
+BASELINE_STRATEGY = "a,b,c,d"
+MIN_RUNS = 10  # Fewest games per strategy at any rung
+
+Evaluator = Callable[[List[Dict[str, Any]], Dict[str, Any]], List[Dict[str, Any]]]
+
+
+def fidelity_schedule(
+    runs: int, rungs: int = DEFAULT_RUNGS, eta: int = HALVING_ETA
+) -> List[Dict[str, Any]]:
+    """{runs, strategy, max_waves} per rung, cheapest first; the last is full fidelity."""
+    schedule = []
+    for r in range(rungs):
+        if r == rungs - 1:
+            schedule.append({"runs": runs, "strategy": "all", "max_waves": 0})
+            continue
+        schedule.append(
+            {
+                "runs": max(runs // eta ** (rungs - 1 - r), min(MIN_RUNS, runs)),
+                "strategy": BASELINE_STRATEGY,
+                "max_waves": SCREEN_WAVES if r == 0 else 0,
+            }
+        )
+    return schedule
+
+
+def promote(scores: List[float], keep: int) -> List[int]:
+    """Indices of the keep lowest scores plus index 0 (the parent), in input order."""
+    ranked = sorted(range(len(scores)), key=lambda i: (scores[i], i))
+    kept = {0} if scores else set()
+    for i in ranked:
+        if len(kept) >= keep:
+            break
+        kept.add(i)
+    return sorted(kept)
+
+
+def successive_halving(
+    configs: List[Dict[str, Any]],
+    evaluate: Evaluator,
+    schedule: List[Dict[str, Any]],
+    targets: Dict[str, Tuple[float, float]],
+    eta: int = HALVING_ETA,
+) -> Tuple[List[int], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Race configs up the schedule.
+
+    Returns the indices that reached the last rung, their full-fidelity
+    results and one log entry per rung played. Screening rungs are skipped
+    once only the parent is left.
+    """
+    if not configs:
+        return [], [], []
+    alive = list(range(len(configs)))
+    rungs: List[Dict[str, Any]] = []
+    for r, rung in enumerate(schedule):
+        last = r == len(schedule) - 1
+        if not last and len(alive) <= 1:
+            continue
+        results = evaluate([configs[i] for i in alive], rung)
+        scores = [
+            math.inf if result.get("partial") else score_results(result, targets)
+            for result in results
+        ]
+        rungs.append(dict(rung, rung=r, candidates=len(alive), best_score=min(scores)))
+        if last:
+            return alive, results, rungs
+        alive = [alive[i] for i in promote(scores, math.ceil(len(alive) / eta))]
+    return alive, [], rungs
+
+
+def run_rung(
+    sim_runner: Any, configs: List[Dict[str, Any]], rung: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Evaluator: one run_config_batch at the rung's fidelity."""
+    max_waves, sim_runner.max_waves = sim_runner.max_waves, rung["max_waves"]
+    try:
+        return sim_runner.run_config_batch(configs, count=rung["runs"], strategy=rung["strategy"])
+    finally:
+        sim_runner.max_waves = max_waves
+
+
+def format_rungs(rungs: List[Dict[str, Any]]) -> str:
+    lines = []
+    for rung in rungs:
+        waves = f"waves 1-{rung['max_waves']}" if rung["max_waves"] else "all waves"
+        lines.append(
+            f"Rung {rung['rung']}: {rung['candidates']} candidates x {rung['runs']} runs "
+            f"({rung['strategy']}, {waves}), best score {rung['best_score']:.3f}"
+        )
+    return "\n".join(lines)
@@ -1,9 +1,11 @@
 """Detailed logging for optimization runs."""
 
-import json
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from run_store import RunStore
 
 # Strategy layouts - hardcoded to match main.gd
 # Map: 10x10, spawns at (2,0) and (7,0), shrine at (4,4)-(5,5)
@@ -30,6 +32,9 @@ STRATEGIES = {
     },
 }
 
+FLUSH_LINES = 200  # Buffered log lines before a write
+FLUSH_SECONDS = 2.0  # Max age of buffered log lines
+
 MAP_WIDTH = 10
 MAP_HEIGHT = 10
 SPAWNS = [(2, 0), (7, 0)]
@@ -68,28 +73,74 @@ def render_board(strategy_id: str) -> str:
     return "\n".join(lines)
 
 
+class LogWriter:
+    """Appends lines to a file through one open handle, written in batches.
+
+    Lines are flushed once FLUSH_LINES are pending or the oldest is
+    FLUSH_SECONDS old, and on flush()/close().
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+        self._pending: List[str] = []
+        self._oldest = 0.0
+
+    def write(self, line: str) -> None:
+        if not self._pending:
+            self._oldest = time.monotonic()
+        self._pending.append(line)
+        if len(self._pending) >= FLUSH_LINES or time.monotonic() - self._oldest >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.write("\n".join(self._pending) + "\n")
+        self._file.flush()
+        self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 class Logger:
-    def __init__(self, results_dir: str = "results"):
+    def __init__(self, results_dir: str = "results", store: Optional[RunStore] = None):
         self.results_dir = Path(__file__).parent / results_dir
         self.results_dir.mkdir(exist_ok=True)
         self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = self.results_dir / f"run_{self.run_id}.log"
+        self.writer = LogWriter(self.log_file)
+        self.store = store if store is not None else RunStore(self.results_dir / "runs.sqlite3")
         self.iterations: List[Dict[str, Any]] = []
+        self._evaluated: set = set()  # Iterations whose candidates were recorded
+        self.status = "finished"
         self.goal = ""
         self.targets = {}
 
     def _log(self, msg: str) -> None:
-        """Write to console and log file."""
+        """Write to console and (buffered) log file."""
         timestamp = datetime.now().strftime("%H:%M:%S")
         line = f"[{timestamp}] {msg}"
         print(line)
-        with open(self.log_file, "a") as f:
-            f.write(line + "\n")
+        self.writer.write(line)
+
+    def close(self) -> None:
+        """Flush the log file and the run store."""
+        self.writer.close()
+        self.store.close()
 
     def log_start(self, goal: str, targets: Dict[str, Any]) -> None:
         """Log optimization start."""
         self.goal = goal
         self.targets = targets
+        self.store.start_run(self.run_id, goal, targets)
+        self.store.flush()
 
         self._log("=" * 60)
         self._log("AI BALANCE OPTIMIZER")
@@ -111,6 +162,7 @@ class Logger:
 
     def log_iteration_start(self, iteration: int) -> None:
         """Log iteration start."""
+        self.writer.flush()
         self._log("-" * 40)
         self._log(f"ITERATION {iteration + 1}")
         self._log("-" * 40)
@@ -137,11 +189,15 @@ class Logger:
         """Log simulation results."""
         self._log("Simulation Results:")
         strategies = results.get("strategies", {})
+        if results.get("partial"):
+            self._log(f"  PARTIAL (timed out) - {len(strategies)} strategies finished")
         for strat_id in ["a", "b", "c", "d"]:
             if strat_id not in strategies:
                 continue
             data = strategies[strat_id]
             self._log(f"  Strategy {strat_id.upper()} ({data.get('name', '')}):")
+            if "stop_reason" in data:
+                self._log(f"    Runs: {data['runs']} ({data['stop_reason']})")
             self._log(f"    Win rate: {data['win_rate'] * 100:.1f}%")
             self._log(f"    Shrine HP: {data['avg_shrine_hp']:.1f}")
             self._log(f"    Gold: {data['avg_gold']:.1f}")
@@ -149,6 +205,29 @@ class Logger:
                 f"    Killed/Leaked: {data['avg_killed']:.0f}/{data['avg_leaked']:.0f}"
             )
 
+    def log_cache_stats(self, stats: Dict[str, Any]) -> None:
+        """Log result cache hits/misses and simulation time saved."""
+        self._log(
+            f"Result cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate'] * 100:.0f}% hit rate), "
+            f"{stats['saved_ms'] / 1000:.1f}s simulation saved"
+        )
+
+    def log_haiku_stats(self, stats: Dict[str, Any]) -> None:
+        """Log Haiku requests, response cache hits, average latency and prompt size."""
+        self._log(
+            f"Haiku: {stats['requests']} requests, {stats['cache_hits']} cache hits, "
+            f"{stats['avg_latency_s']:.2f}s avg latency, "
+            f"{stats['avg_input_tokens']:.0f} avg input tokens"
+        )
+
+    def log_population(self, labels: List[str], scores: List[float], best: int) -> None:
+        """Log each candidate's target distance and the one kept."""
+        self._log("Population:")
+        for i, (label, score) in enumerate(zip(labels, scores)):
+            marker = " <- kept" if i == best else ""
+            self._log(f"  {label}: score {score:.3f}{marker}")
+
     def log_recommendations(self, rec: Dict[str, Any]) -> None:
         """Log Haiku recommendations."""
         self._log("Haiku Analysis:")
@@ -177,6 +256,7 @@ class Logger:
         """Log success."""
         self._log("")
         self._log("=" * 60)
+        self.status = "converged"
         self._log(f"SUCCESS! Targets met after {iteration + 1} iterations")
         self._log("=" * 60)
 
@@ -187,6 +267,7 @@ class Logger:
 
     def log_max_iterations(self) -> None:
         """Log max iterations reached."""
+        self.status = "max_iterations"
         self._log("")
         self._log("=" * 60)
         self._log("MAX ITERATIONS REACHED - targets not fully met")
@@ -200,20 +281,24 @@ class Logger:
         self._log("=" * 60)
         self._log(f"Total iterations: {len(self.iterations)}")
         self._log(f"Log saved to: {self.log_file}")
+        self.store.finish_run(self.run_id, self.status)
+        self._log(f"History saved to: {self.store.path} (run {self.run_id})")
+        self.writer.flush()
 
-        # Save iterations to JSON
-        json_file = self.results_dir / f"run_{self.run_id}.json"
-        with open(json_file, "w") as f:
-            json.dump(
-                {
-                    "goal": self.goal,
-                    "targets": {k: list(v) for k, v in self.targets.items()},
-                    "iterations": self.iterations,
-                },
-                f,
-                indent=2,
+    def save_evaluations(
+        self,
+        iteration: int,
+        labels: List[str],
+        configs: List[Dict[str, Any]],
+        population: List[Dict[str, Any]],
+        scores: List[float],
+    ) -> None:
+        """Record every simulated candidate of a population generation."""
+        for label, config, results, score in zip(labels, configs, population, scores):
+            self.store.add_evaluation(
+                self.run_id, iteration, config, results, label, _finite(score)
             )
-        self._log(f"Data saved to: {json_file}")
+        self._evaluated.add(iteration)
 
     def save_iteration(
         self,
@@ -222,7 +307,7 @@ class Logger:
         results: Dict[str, Any],
         recommendations: Dict[str, Any],
     ) -> None:
-        """Save iteration data."""
+        """Save iteration data to the run store (one transaction per iteration)."""
         self.iterations.append(
             {
                 "iteration": iteration,
@@ -232,8 +317,11 @@ class Logger:
                 "recommendations": recommendations,
             }
         )
+        if iteration not in self._evaluated:
+            self.store.add_evaluation(self.run_id, iteration, config, results, "iteration")
+        self.store.add_iteration(self.run_id, iteration, config, results, recommendations)
+        self.store.flush()
+
 
-        # Also save individual iteration file
-        iter_file = self.results_dir / f"iteration_{self.run_id}_{iteration}.json"
-        with open(iter_file, "w") as f:
-            json.dump(self.iterations[-1], f, indent=2)
+def _finite(score: float) -> Optional[float]:
+    return None if score == float("inf") else score
@@ -7,20 +7,60 @@ Usage:
   python optimizer.py --goal "Your optimization goal here"
   python optimizer.py --goal "..." --max-iterations 5 --runs 500
   python optimizer.py --goal "..." --dry-run
+  python optimizer.py --goal "..." --workers 8
+  python optimizer.py --goal "..." --workers 4 --persistent
+  python optimizer.py --goal "..." --no-cache
+  python optimizer.py --goal "..." --stream
+  python optimizer.py --goal "..." --adaptive
+  python optimizer.py --goal "..." --population 8 --workers 8
+  python optimizer.py --goal "..." --population 8 --surrogate
+  python optimizer.py --goal "..." --population 8 --halving --workers 8
+  python optimizer.py --goal "..." --sensitivity results/sensitivity.json --top-k 12
+  python optimizer.py --goal "..." --population 8 --haiku-stub
+  python optimizer.py --goal "..." --compact-prompt
 """
 
 import argparse
+import math
+import random
 import sys
-from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
-from haiku_client import HaikuClient
-from simulation_runner import SimulationRunner
+from haiku_client import (
+    MAX_CONCURRENCY,
+    REQUESTS_PER_MINUTE,
+    HaikuClient,
+    ResponseCache,
+    StubBackend,
+)
+from simulation_runner import SimulationRunner, adaptive_options
+from result_cache import ResultCache, source_fingerprint
+from population import (
+    DEFAULT_SIGMA,
+    adapt_sigma,
+    apply_changes,
+    config_diff,
+    generate_candidates,
+    score_results,
+    select_best,
+)
 from config_manager import ConfigManager
+from halving import (
+    DEFAULT_RUNGS,
+    HALVING_ETA,
+    fidelity_schedule,
+    format_rungs,
+    run_rung,
+    successive_halving,
+)
 from logger import Logger
+from sensitivity import DEFAULT_TOP_K, focus_bounds, load_report, top_parameters
+from surrogate import Surrogate
 
 MAX_ITERATIONS = 10
 RUNS_PER_STRATEGY = 1000
+SURROGATE_OVERSAMPLE = 4  # Candidates generated per simulated slot when prescreening
+HAIKU_CANDIDATES = 3  # Best candidates analyzed (concurrently) per population generation
 
 # Target metrics
 TARGETS: Dict[str, Tuple[float, float]] = {
@@ -55,49 +95,37 @@ def check_targets_met(
     )
 
 
-def filter_changes(changes: Dict[str, Any]) -> Dict[str, Any]:
-    """Filter out null changes."""
-    return {k: v for k, v in changes.items() if v is not None}
+def filter_changes(
+    changes: Dict[str, Any], focus: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Filter out null changes (and, with a focus list, changes to other keys)."""
+    return {
+        k: v for k, v in changes.items() if v is not None and (focus is None or k in focus)
+    }
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="AI Balance Optimizer for Bastion's Last Stand"
-    )
-    parser.add_argument(
-        "--goal", type=str, required=True, help="Optimization goal description"
-    )
-    parser.add_argument(
-        "--max-iterations",
-        type=int,
-        default=MAX_ITERATIONS,
-        help=f"Maximum iterations (default: {MAX_ITERATIONS})",
-    )
-    parser.add_argument(
-        "--runs",
-        type=int,
-        default=RUNS_PER_STRATEGY,
-        help=f"Simulations per strategy (default: {RUNS_PER_STRATEGY})",
-    )
-    parser.add_argument(
-        "--dry-run", action="store_true", help="Don't apply changes, just analyze"
-    )
-    args = parser.parse_args()
+def load_focus(args, logger) -> Optional[List[str]]:
+    """Top-k parameters from a --sensitivity report (None = tune everything)."""
+    if not args.sensitivity:
+        return None
+    focus = top_parameters(load_report(args.sensitivity), args.top_k)
+    logger._log(f"Tuning the {len(focus)} most influential parameters: {', '.join(focus)}")
+    return focus
 
-    # Initialize components
-    logger = Logger()
-    config_mgr = ConfigManager()
-    sim_runner = SimulationRunner()
 
-    try:
-        haiku = HaikuClient()
-    except ValueError as e:
-        print(f"ERROR: {e}")
-        print("Please create a .env file with your ANTHROPIC_API_KEY")
-        sys.exit(1)
+def focus_results(results: Dict[str, Any], focus: Optional[List[str]]) -> Dict[str, Any]:
+    """Results whose parameter_bounds (what Haiku is shown) only cover the focus keys."""
+    if focus is None:
+        return results
+    return dict(
+        results, parameter_bounds=focus_bounds(results.get("parameter_bounds", {}), focus)
+    )
 
-    logger.log_start(args.goal, TARGETS)
 
+def run_sequential(args, logger, config_mgr, sim_runner, haiku) -> None:
+    """One config -> one sweep -> one Haiku call -> apply, per iteration."""
+    focus = load_focus(args, logger)
+    previous = None  # (config, results) of the last iteration, for compact prompts
     for iteration in range(args.max_iterations):
         logger.log_iteration_start(iteration)
 
@@ -113,25 +141,31 @@ def main():
             break
 
         logger.log_results(results)
+        if sim_runner.cache is not None:
+            logger.log_cache_stats(sim_runner.cache.stats())
 
-        # 3. Check if targets met
-        if check_targets_met(results, TARGETS):
+        # 3. Check if targets met (a timed-out partial sweep can't prove that)
+        if not results.get("partial") and check_targets_met(results, TARGETS):
             logger.log_success(iteration)
             logger.save_iteration(iteration, config, results, {"converged": True})
             break
 
         # 4. Ask Haiku for recommendations
         try:
-            recommendations = haiku.analyze(config, results, TARGETS, args.goal)
+            recommendations = haiku.analyze(
+                config, focus_results(results, focus), TARGETS, args.goal, previous
+            )
         except Exception as e:
             logger._log(f"ERROR calling Haiku: {e}")
             break
 
         logger.log_recommendations(recommendations)
+        logger.log_haiku_stats(haiku.stats())
         logger.save_iteration(iteration, config, results, recommendations)
+        previous = (config, results)
 
         # 5. Apply changes (unless dry-run)
-        changes = filter_changes(recommendations.get("changes", {}))
+        changes = filter_changes(recommendations.get("changes", {}), focus)
         if not args.dry_run and changes:
             config_mgr.apply_changes(changes)
             logger.log_changes_applied(changes)
@@ -149,7 +183,327 @@ def main():
     else:
         logger.log_max_iterations()
 
-    logger.log_summary()
+
+def run_population_search(args, logger, config_mgr, sim_runner, haiku) -> None:
+    """Evaluate K candidate configs concurrently per iteration and keep the best.
+
+    Candidates are the current parent, Haiku's last suggestions and random
+    mutations within the engine's parameter bounds (a (1+lambda) evolution
+    strategy with 1/5th-rule step sizes). The first iteration only evaluates
+    the starting config, since bounds arrive with the first results. Haiku
+    analyzes the HAIKU_CANDIDATES best candidates concurrently.
+
+    With --surrogate, SURROGATE_OVERSAMPLE times as many candidates are
+    generated and a Gaussian-process surrogate fit on past results keeps the
+    most promising or least explored ones, plus its own proposal.
+
+    With --sensitivity, mutations and Haiku's changes only touch the report's
+    --top-k most influential parameters.
+
+    With --halving, HALVING_ETA ** (rungs - 1) times as many candidates are
+    screened at low fidelity (few seeds, baselines, waves 1-10) and only the
+    best are promoted; the K that reach the last rung are the generation,
+    evaluated at full fidelity as usual.
+    """
+    rng = random.Random(args.population_seed)
+    sigma = DEFAULT_SIGMA
+    parent = config_mgr.read_config()
+    parent_score = math.inf
+    parent_results = None
+    previous = None  # Last generation's (parent, results), for compact prompts
+    bounds: Dict[str, Any] = {}
+    suggestions: List[Dict[str, Any]] = []
+    focus = load_focus(args, logger)
+    schedule = fidelity_schedule(args.runs, args.halving_rungs) if args.halving else []
+    k = args.population * HALVING_ETA ** (len(schedule) - 1) if schedule else args.population
+    surrogate = None
+    if args.surrogate:
+        surrogate = Surrogate(fingerprint=source_fingerprint(sim_runner.project_path))
+
+    for iteration in range(args.max_iterations):
+        logger.log_iteration_start(iteration)
+
+        # 1. Build this generation's candidates
+        if surrogate is not None and surrogate.ready():
+            pool = generate_candidates(
+                parent, bounds, k * SURROGATE_OVERSAMPLE, rng, sigma, suggestions
+            )
+            proposal = surrogate.propose(parent, TARGETS, rng, sigma)
+            candidates = surrogate.screen(pool, TARGETS, max(k - 1, 1), parent_score)
+            if proposal not in [config for _, config in candidates]:
+                candidates.append(("surrogate", proposal))
+            logger._log(
+                f"Surrogate kept {len(candidates)} of {len(pool) + 1} candidates "
+                f"({len(surrogate.history)} configs of history)"
+            )
+        else:
+            candidates = generate_candidates(parent, bounds, k, rng, sigma, suggestions)
+
+        # 2. Simulate all candidates in one batch (one engine boot per worker), or race
+        # them up the fidelity rungs and keep the full-fidelity survivors
+        try:
+            if schedule:
+                survivors, population, rungs = successive_halving(
+                    [candidate for _, candidate in candidates],
+                    lambda configs, rung: run_rung(sim_runner, configs, rung),
+                    schedule,
+                    TARGETS,
+                )
+                logger._log(format_rungs(rungs))
+                candidates = [candidates[i] for i in survivors]
+            else:
+                population = sim_runner.run_config_batch(
+                    [candidate for _, candidate in candidates], count=args.runs, strategy="all"
+                )
+        except Exception as e:
+            logger._log(f"ERROR running simulations: {e}")
+            break
+
+        if surrogate is not None:
+            for (_, candidate), result in zip(candidates, population):
+                surrogate.add(candidate, result)
+
+        # 3. Keep the best (the parent wins ties, so a generation never regresses)
+        scores = [
+            math.inf if r.get("partial") else score_results(r, TARGETS) for r in population
+        ]
+        best = select_best(scores)
+        logger.log_population([label for label, _ in candidates], scores, best)
+        logger.save_evaluations(
+            iteration,
+            [label for label, _ in candidates],
+            [candidate for _, candidate in candidates],
+            population,
+            scores,
+        )
+
+        label, config = candidates[best]
+        results = population[best]
+        bounds = focus_bounds(results.get("parameter_bounds", bounds), focus)
+        if surrogate is not None:
+            surrogate.set_bounds(bounds)
+        sigma = adapt_sigma(sigma, scores[best] < parent_score)
+        changes = config_diff(parent, config)
+        if parent_results is not None:
+            previous = (parent, parent_results)
+        parent, parent_score, parent_results = config, scores[best], results
+
+        logger.log_config(parent)
+        logger.log_results(results)
+        if sim_runner.cache is not None:
+            logger.log_cache_stats(sim_runner.cache.stats())
+        if changes:
+            if args.dry_run:
+                logger._log("DRY RUN - changes not applied")
+            else:
+                config_mgr.write_config(parent)
+                logger.log_changes_applied(changes)
+
+        if not results.get("partial") and check_targets_met(results, TARGETS):
+            logger.log_success(iteration)
+            logger.save_iteration(iteration, parent, results, {"converged": True})
+            break
+
+        # 4. Haiku's advice on the best candidates seeds the next generation
+        ranked = sorted(range(len(candidates)), key=lambda i: scores[i])
+        analyzed = [best] + [
+            i for i in ranked if i != best and not math.isinf(scores[i])
+        ][: HAIKU_CANDIDATES - 1]
+        try:
+            analyses = haiku.analyze_batch(
+                [
+                    (candidates[i][1], focus_results(population[i], focus), previous)
+                    for i in analyzed
+                ],
+                TARGETS,
+                args.goal,
+            )
+        except Exception as e:
+            logger._log(f"ERROR calling Haiku: {e}")
+            analyses = [{}]
+
+        recommendations = analyses[0]
+        logger.log_recommendations(recommendations)
+        logger.log_haiku_stats(haiku.stats())
+        logger.save_iteration(iteration, parent, results, recommendations)
+
+        # Suggestions are whole configs (candidate + Haiku's changes) as diffs from the parent
+        suggestions = []
+        for i, analysis in zip(analyzed, analyses):
+            haiku_changes = filter_changes(analysis.get("changes", {}), focus)
+            if haiku_changes:
+                suggested = apply_changes(candidates[i][1], haiku_changes, bounds)
+                if config_diff(parent, suggested):
+                    suggestions.append(config_diff(parent, suggested))
+    else:
+        logger.log_max_iterations()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="AI Balance Optimizer for Bastion's Last Stand"
+    )
+    parser.add_argument(
+        "--goal", type=str, required=True, help="Optimization goal description"
+    )
+    parser.add_argument(
+        "--max-iterations",
+        type=int,
+        default=MAX_ITERATIONS,
+        help=f"Maximum iterations (default: {MAX_ITERATIONS})",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=RUNS_PER_STRATEGY,
+        help=f"Simulations per strategy (default: {RUNS_PER_STRATEGY})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Don't apply changes, just analyze"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent Godot processes; sweeps are sharded by strategy/seed (default: 1)",
+    )
+    parser.add_argument(
+        "--persistent",
+        action="store_true",
+        help="Keep Godot workers running (--serve) across iterations",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Treat --runs as a cap; stop each strategy once its confidence intervals "
+        "are tight or the targets are decided",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read --ndjson records incrementally; keep finished strategies on timeout",
+    )
+    parser.add_argument(
+        "--population",
+        type=int,
+        default=1,
+        help="Candidate configs simulated concurrently per iteration (default: 1 = "
+        "one Haiku change per iteration)",
+    )
+    parser.add_argument(
+        "--population-seed",
+        type=int,
+        default=0,
+        help="RNG seed for candidate mutations (default: 0)",
+    )
+    parser.add_argument(
+        "--surrogate",
+        action="store_true",
+        help="With --population, prescreen candidates with a surrogate fit on past results",
+    )
+    parser.add_argument(
+        "--halving",
+        action="store_true",
+        help="With --population, screen many more candidates at low fidelity and promote "
+        "the best through successive halving",
+    )
+    parser.add_argument(
+        "--halving-rungs",
+        type=int,
+        default=DEFAULT_RUNGS,
+        help=f"Fidelity rungs for --halving, the last at full fidelity (default: {DEFAULT_RUNGS})",
+    )
+    parser.add_argument(
+        "--sensitivity",
+        type=str,
+        default=None,
+        help="Sensitivity report (sensitivity.py); only tune its --top-k parameters",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=DEFAULT_TOP_K,
+        help=f"Parameters kept from --sensitivity (default: {DEFAULT_TOP_K})",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always re-run simulations"
+    )
+    parser.add_argument(
+        "--haiku-stub",
+        action="store_true",
+        help="Use the deterministic offline Haiku stub (no API key or network)",
+    )
+    parser.add_argument(
+        "--haiku-rpm",
+        type=float,
+        default=REQUESTS_PER_MINUTE,
+        help=f"Haiku requests per minute, token-bucket limited (default: {REQUESTS_PER_MINUTE})",
+    )
+    parser.add_argument(
+        "--haiku-concurrency",
+        type=int,
+        default=MAX_CONCURRENCY,
+        help=f"Haiku requests in flight at once (default: {MAX_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--compact-prompt",
+        action="store_true",
+        help="Send Haiku only off-target metrics, the last diff and relevant parameters",
+    )
+    parser.add_argument(
+        "--no-haiku-cache",
+        action="store_true",
+        help="Always call Haiku (skip the response cache)",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        default=64,
+        help="Result cache size bound in MB, least recently used evicted (default: 64)",
+    )
+    args = parser.parse_args()
+    if args.surrogate and args.population <= 1:
+        parser.error("--surrogate needs --population > 1")
+    if args.halving and args.population <= 1:
+        parser.error("--halving needs --population > 1")
+
+    # Initialize components
+    logger = Logger()
+    config_mgr = ConfigManager()
+    cache = None if args.no_cache else ResultCache(max_bytes=args.cache_mb * 1024 * 1024)
+    sim_runner = SimulationRunner(
+        workers=args.workers,
+        persistent=args.persistent,
+        cache=cache,
+        ndjson=args.stream,
+        adaptive=adaptive_options(TARGETS) if args.adaptive else None,
+    )
+
+    try:
+        haiku = HaikuClient(
+            backend=StubBackend() if args.haiku_stub else None,
+            requests_per_minute=args.haiku_rpm,
+            max_concurrency=args.haiku_concurrency,
+            cache=None if args.no_haiku_cache else ResponseCache(),
+            compact=args.compact_prompt,
+            metrics_path=logger.results_dir / f"haiku_calls_{logger.run_id}.jsonl",
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        print("Please create a .env file with your ANTHROPIC_API_KEY")
+        sys.exit(1)
+
+    logger.log_start(args.goal, TARGETS)
+
+    try:
+        if args.population > 1:
+            run_population_search(args, logger, config_mgr, sim_runner, haiku)
+        else:
+            run_sequential(args, logger, config_mgr, sim_runner, haiku)
+        logger.log_summary()
+    finally:
+        sim_runner.close()
+        logger.close()
 
 
 if __name__ == "__main__":
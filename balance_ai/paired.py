@@ -0,0 +1,157 @@
+"""Paired comparison of two balance configs on common random numbers.
+
+Both configs play the same seeds (base_seed + i). The engine draws crits, procs
+and scatter from a per-tower stream and splitter offsets from their own stream,
+all derived from the seed alone, so game i of both runs shares its randomness
+wherever the change leaves it alone. The per-seed differences then cancel most
+of the seed noise: a change is judged on the spread of the differences, not of
+the two result sets, and needs far fewer --runs to come out significant.
+
+Usage:
+  python paired.py --candidate new_config.json --runs 200
+  python paired.py --base old.json --candidate new.json --strategy a,b --json
+"""
+
+import argparse
+import json
+import math
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List
+
+from simulation_runner import SimulationRunner
+
+# Compared metric -> GameResult.to_dict() field of each --ndjson-games record
+METRICS = {
+    "win_rate": "won",
+    "shrine_hp": "final_shrine_hp",
+    "gold": "final_gold",
+    "leaked": "enemies_leaked",
+}
+Z = 1.96  # Two-sided 95% normal interval
+
+
+def paired_difference(base: List[float], candidate: List[float], z: float = Z) -> Dict[str, Any]:
+    """Mean candidate - base difference over paired games, with its CI.
+
+    variance_reduction is the share of games pairing saves against comparing two
+    independent runs at the same interval width (0 when pairing does not help).
+    """
+    n = len(base)
+    diffs = [c - b for b, c in zip(base, candidate)]
+    if n == 0:
+        return {
+            "n": 0,
+            "mean_diff": 0.0,
+            "std_diff": 0.0,
+            "ci": [0.0, 0.0],
+            "significant": False,
+            "variance_reduction": 0.0,
+        }
+    mean = statistics.fmean(diffs)
+    std = statistics.stdev(diffs) if n > 1 else 0.0
+    half = z * std / math.sqrt(n)
+    unpaired = statistics.variance(base) + statistics.variance(candidate) if n > 1 else 0.0
+    return {
+        "n": n,
+        "mean_diff": mean,
+        "std_diff": std,
+        "ci": [mean - half, mean + half],
+        "significant": mean - half > 0 or mean + half < 0,
+        "variance_reduction": max(1 - std**2 / unpaired, 0.0) if unpaired > 0 else 0.0,
+    }
+
+
+def game_values(records: List[Dict[str, Any]]) -> Dict[str, Dict[int, Dict[str, float]]]:
+    """{strategy: {seed: {metric: value}}} from --ndjson-games "game" records."""
+    values: Dict[str, Dict[int, Dict[str, float]]] = {}
+    for record in records:
+        if record.get("type") != "game":
+            continue
+        result = record["result"]
+        values.setdefault(record["strategy"], {})[record["seed"]] = {
+            metric: float(result[field]) for metric, field in METRICS.items() if field in result
+        }
+    return values
+
+
+def compare_games(
+    base: List[Dict[str, Any]], candidate: List[Dict[str, Any]], z: float = Z
+) -> Dict[str, Dict[str, Any]]:
+    """Paired differences per strategy and metric over the seeds both runs played."""
+    base_values, candidate_values = game_values(base), game_values(candidate)
+    comparison: Dict[str, Dict[str, Any]] = {}
+    for strat_id, base_games in base_values.items():
+        candidate_games = candidate_values.get(strat_id, {})
+        seeds = sorted(set(base_games) & set(candidate_games))
+        if not seeds:
+            continue
+        comparison[strat_id] = {
+            metric: paired_difference(
+                [base_games[s][metric] for s in seeds],
+                [candidate_games[s][metric] for s in seeds],
+                z,
+            )
+            for metric in METRICS
+            if metric in base_games[seeds[0]]
+        }
+    return comparison
+
+
+def run_paired(
+    runner: SimulationRunner,
+    base_config: Dict[str, Any],
+    candidate_config: Dict[str, Any],
+    count: int,
+    strategy: str = "all",
+    seed: int = 12345,
+    z: float = Z,
+) -> Dict[str, Dict[str, Any]]:
+    """Play both configs on the same seeds and compare them game by game."""
+    runs = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, config in (("base", base_config), ("candidate", candidate_config)):
+            path = Path(work_dir) / f"{name}.json"
+            path.write_text(json.dumps(config))
+            runs.append(
+                list(runner.stream_simulations(count, strategy, seed, str(path), per_game=True))
+            )
+    return compare_games(runs[0], runs[1], z)
+
+
+def format_comparison(comparison: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'strategy':<20} {'metric':<10} {'diff':>9} {'95% CI':>20} {'saved':>6}"]
+    for strat_id, metrics in comparison.items():
+        for metric, stats in metrics.items():
+            low, high = stats["ci"]
+            flag = " *" if stats["significant"] else ""
+            lines.append(
+                f"{strat_id:<20} {metric:<10} {stats['mean_diff']:>+9.3f} "
+                f"{f'[{low:+.3f}, {high:+.3f}]':>20} {stats['variance_reduction']:>6.0%}{flag}"
+            )
+    lines.append("* CI excludes 0; saved = share of games pairing saves over independent runs")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two configs on paired seeds")
+    parser.add_argument("--base", default="balance_config.json", help="Reference config")
+    parser.add_argument("--candidate", required=True, help="Config to compare against --base")
+    parser.add_argument("--runs", type=int, default=200, help="Games per strategy")
+    parser.add_argument("--strategy", default="all", help="Strategy argument for main.gd")
+    parser.add_argument("--seed", type=int, default=12345, help="Base seed")
+    parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    args = parser.parse_args()
+
+    runner = SimulationRunner()
+    configs = []
+    for path in (args.base, args.candidate):
+        full = Path(path) if Path(path).is_absolute() else runner.project_path / path
+        configs.append(json.loads(full.read_text()))
+    comparison = run_paired(runner, configs[0], configs[1], args.runs, args.strategy, args.seed)
+    print(json.dumps(comparison, indent=2) if args.json else format_comparison(comparison))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Candidate generation and ranking for population-based optimization."""
+
+import json
+import math
+import random
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_SIGMA = 0.1  # mutation scale as a fraction of each parameter's range
+MIN_SIGMA = 0.02
+MAX_SIGMA = 0.5
+PARAMS_PER_MUTATION = 3
+
+
+def best_strategy_record(results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Highest win-rate strategy, the same pick check_targets_met makes."""
+    strategies = results.get("strategies", {})
+    if not strategies:
+        return None
+    return max(strategies.values(), key=lambda s: s.get("win_rate", 0))
+
+
+def score_results(results: Dict[str, Any], targets: Dict[str, Tuple[float, float]]) -> float:
+    """Distance from the target bands (0.0 = every target met, lower is better).
+
+    Each metric contributes how far it falls outside its band, normalized by
+    the band width so win rate and shrine HP are comparable.
+    """
+    best = best_strategy_record(results)
+    if best is None:
+        return math.inf
+
+    values = {
+        "win_rate": best.get("win_rate", 0),
+        "shrine_hp": best.get("avg_shrine_hp", 0),
+        "gold_remaining": best.get("avg_gold", 0),
+        "enemies_leaked": best.get("avg_leaked", math.inf),
+    }
+    score = 0.0
+    for metric, (lo, hi) in targets.items():
+        if metric not in values:
+            continue
+        value = values[metric]
+        width = max(hi - lo, 1e-9)
+        score += max(lo - value, 0.0, value - hi) / width
+    return score
+
+
+def _snap(value: float, bounds: Dict[str, Any], as_int: bool) -> Any:
+    """Round to the parameter's step and clamp into [min, max]."""
+    lo, hi, step = bounds["min"], bounds["max"], bounds.get("step", 1) or 1
+    value = lo + round((value - lo) / step) * step
+    value = min(max(value, lo), hi)
+    return int(round(value)) if as_int else round(value, 6)
+
+
+def _is_int_param(value: Any, bounds: Dict[str, Any]) -> bool:
+    return isinstance(value, int) and all(
+        isinstance(bounds.get(k, 1), int) for k in ("min", "max", "step")
+    )
+
+
+def apply_changes(
+    config: Dict[str, Any], changes: Dict[str, Any], bounds: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Copy of config with (e.g. Haiku) changes applied and clamped to bounds."""
+    candidate = dict(config)
+    for key, value in changes.items():
+        if value is None or key not in config:
+            continue
+        if key in bounds and isinstance(value, (int, float)):
+            value = _snap(value, bounds[key], _is_int_param(config[key], bounds[key]))
+        candidate[key] = value
+    return candidate
+
+
+def mutate(
+    config: Dict[str, Any],
+    bounds: Dict[str, Any],
+    rng: random.Random,
+    sigma: float = DEFAULT_SIGMA,
+    n_params: int = PARAMS_PER_MUTATION,
+) -> Dict[str, Any]:
+    """Gaussian step on a few random parameters, snapped to their bounds and steps."""
+    keys = sorted(k for k in bounds if k in config and isinstance(config[k], (int, float)))
+    candidate = dict(config)
+    for key in rng.sample(keys, min(n_params, len(keys))):
+        b = bounds[key]
+        step = b.get("step", 1) or 1
+        delta = rng.gauss(0.0, sigma) * (b["max"] - b["min"])
+        if abs(delta) < step:
+            delta = step if delta >= 0 else -step  # always move at least one step
+        candidate[key] = _snap(config[key] + delta, b, _is_int_param(config[key], b))
+    return candidate
+
+
+def generate_candidates(
+    config: Dict[str, Any],
+    bounds: Dict[str, Any],
+    k: int,
+    rng: random.Random,
+    sigma: float = DEFAULT_SIGMA,
+    suggestions: Optional[List[Dict[str, Any]]] = None,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Build up to k distinct (label, config) candidates.
+
+    The parent config always comes first so a generation can never get worse,
+    then any suggested change sets (Haiku), then random mutations.
+    """
+    candidates: List[Tuple[str, Dict[str, Any]]] = [("parent", dict(config))]
+    seen = {_canonical(config)}
+
+    for i, changes in enumerate(suggestions or []):
+        if len(candidates) >= k:
+            break
+        candidate = apply_changes(config, changes, bounds)
+        if _canonical(candidate) not in seen:
+            seen.add(_canonical(candidate))
+            candidates.append((f"haiku_{i}", candidate))
+
+    attempts = 0
+    while len(candidates) < k and attempts < k * 20:
+        attempts += 1
+        candidate = mutate(config, bounds, rng, sigma)
+        if _canonical(candidate) not in seen:
+            seen.add(_canonical(candidate))
+            candidates.append((f"mutant_{len(candidates)}", candidate))
+    return candidates
+
+
+def adapt_sigma(sigma: float, improved: bool) -> float:
+    """1/5th success rule: widen the search after a success, narrow after a failure."""
+    sigma *= math.exp(1 / 3) if improved else math.exp(-1 / 12)
+    return min(max(sigma, MIN_SIGMA), MAX_SIGMA)
+
+
+def select_best(scores: List[float]) -> int:
+    """Index of the lowest score; earlier candidates (the parent) win ties."""
+    best = 0
+    for i, score in enumerate(scores):
+        if score < scores[best]:
+            best = i
+    return best
+
+
+def config_diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Keys whose values differ, with the new values."""
+    return {k: v for k, v in new.items() if old.get(k) != v}
+
+
+def _canonical(config: Dict[str, Any]) -> str:
+    return json.dumps(config, sort_keys=True)
@@ -0,0 +1,94 @@
+"""Parses and pretty-prints main.gd --profile tick timings.
+
+Each strategy record of a profiled run carries
+{"phases": {name: {us, calls}}, "specials": {...}, "waves": {"1": {name: {us, calls}}}}.
+"""
+
+import argparse
+from typing import Dict, Any, List
+
+Timings = Dict[str, Dict[str, int]]
+
+
+def merge_timings(timings: List[Timings]) -> Timings:
+    """Sum us and calls per key."""
+    merged: Timings = {}
+    for entry in timings:
+        for key, value in entry.items():
+            total = merged.setdefault(key, {"us": 0, "calls": 0})
+            total["us"] += value.get("us", 0)
+            total["calls"] += value.get("calls", 0)
+    return merged
+
+
+def merge_profiles(profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One profile summing several (shards, or every strategy of a run)."""
+    waves: Dict[str, List[Timings]] = {}
+    for profile in profiles:
+        for wave, timings in profile.get("waves", {}).items():
+            waves.setdefault(wave, []).append(timings)
+    return {
+        "phases": merge_timings([p.get("phases", {}) for p in profiles]),
+        "specials": merge_timings([p.get("specials", {}) for p in profiles]),
+        "waves": {wave: merge_timings(waves[wave]) for wave in sorted(waves, key=int)},
+    }
+
+
+def collect_profile(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Profile over every strategy of a --json result (empty if it was not profiled)."""
+    records = results.get("strategies", {}).values()
+    return merge_profiles([record["profile"] for record in records if "profile" in record])
+
+
+def _format_timings(title: str, timings: Timings) -> List[str]:
+    total = sum(t["us"] for t in timings.values()) or 1
+    lines = [f"{title:<16} {'ms':>10} {'share':>6} {'calls':>10} {'us/call':>8}"]
+    for key in sorted(timings, key=lambda k: timings[k]["us"], reverse=True):
+        us, calls = timings[key]["us"], timings[key]["calls"]
+        lines.append(
+            f"{key:<16} {us / 1000:>10.1f} {us / total:>6.1%} {calls:>10} "
+            f"{us / calls if calls else 0:>8.2f}"
+        )
+    return lines
+
+
+def format_profile(profile: Dict[str, Any], per_wave: bool = True) -> str:
+    """Phase table, tower-special table and (optionally) the hottest phases per wave."""
+    lines = _format_timings("phase", profile.get("phases", {}))
+    if profile.get("specials"):
+        lines += [""] + _format_timings("tower special", profile["specials"])
+    if per_wave and profile.get("waves"):
+        lines += ["", f"{'wave':<6} {'ms':>9}  hottest phases"]
+        for wave, timings in profile["waves"].items():
+            total = sum(t["us"] for t in timings.values())
+            hottest = sorted(timings, key=lambda p: timings[p]["us"], reverse=True)[:3]
+            shares = ", ".join(f"{p} {timings[p]['us'] / total:.0%}" for p in hottest if total)
+            lines.append(f"{wave:<6} {total / 1000:>9.1f}  {shares}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    from simulation_runner import SimulationRunner  # Imports this module for merge_profiles
+
+    parser = argparse.ArgumentParser(description="Profile the tick loop per phase")
+    parser.add_argument("--count", type=int, default=20, help="Games per strategy")
+    parser.add_argument("--strategy", default="all", help="Strategy argument for main.gd")
+    parser.add_argument("--seed", type=int, default=12345, help="Base seed")
+    parser.add_argument("--config", default="balance_config.json", help="Config file")
+    parser.add_argument("--by-strategy", action="store_true", help="One table per strategy")
+    parser.add_argument("--no-waves", action="store_true", help="Skip the per-wave breakdown")
+    args = parser.parse_args()
+
+    runner = SimulationRunner(profile=True)
+    results = runner.run_simulations(args.count, args.strategy, args.seed, args.config)
+    if args.by_strategy:
+        for strat_id, record in results.get("strategies", {}).items():
+            print(f"== {strat_id} ==")
+            print(format_profile(record.get("profile", {}), not args.no_waves))
+            print()
+    else:
+        print(format_profile(collect_profile(results), not args.no_waves))
+
+
+if __name__ == "__main__":
+    main()
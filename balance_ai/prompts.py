@@ -1,6 +1,186 @@
 """Prompt templates for Haiku analysis."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from population import best_strategy_record
+
+# Parameters Haiku is shown and may change, grouped by system
+KEY_PARAMS = [
+    # Economy
+    "starting_gold",
+    "wall_cost",
+    "sell_rate_percent",
+    # Archer
+    "archer_cost",
+    "archer_damage",
+    "archer_attack_speed_ms",
+    "archer_range",
+    # Cannon
+    "cannon_cost",
+    "cannon_damage",
+    "cannon_attack_speed_ms",
+    "cannon_range",
+    "cannon_aoe_radius",
+    # Frost
+    "frost_cost",
+    "frost_damage",
+    "frost_attack_speed_ms",
+    "frost_range",
+    "frost_slow",
+    "frost_slow_duration_ms",
+    # Lightning
+    "lightning_cost",
+    "lightning_damage",
+    "lightning_attack_speed_ms",
+    "lightning_range",
+    "lightning_chain_count",
+    "lightning_chain_range",
+    # Flame
+    "flame_cost",
+    "flame_damage",
+    "flame_attack_speed_ms",
+    "flame_range",
+    "flame_burn_dps",
+    "flame_burn_duration_ms",
+    # Grunt
+    "grunt_hp",
+    "grunt_speed",
+    "grunt_gold",
+    # Runner
+    "runner_hp",
+    "runner_speed",
+    "runner_gold",
+    # Tank
+    "tank_hp",
+    "tank_speed",
+    "tank_armor",
+    "tank_gold",
+    # Flyer
+    "flyer_hp",
+    "flyer_speed",
+    "flyer_gold",
+    # Swarm
+    "swarm_hp",
+    "swarm_speed",
+    "swarm_gold",
+    # Stealth
+    "stealth_hp",
+    "stealth_speed",
+    "stealth_gold",
+    # Breaker
+    "breaker_hp",
+    "breaker_speed",
+    "breaker_armor",
+    "breaker_gold",
+    "breaker_wall_damage",
+    # Boss
+    "boss_golem_hp",
+    "boss_golem_speed",
+    "boss_golem_armor",
+    "boss_golem_gold",
+    "boss_golem_regen",
+    # Shrine
+    "shrine_hp",
+    "enemy_shrine_damage",
+]
+
+# Compact mode: parameters worth showing per off-target metric, most influential first
+METRIC_PARAMS = {
+    "win_rate": [
+        "shrine_hp",
+        "enemy_shrine_damage",
+        "archer_damage",
+        "archer_attack_speed_ms",
+        "grunt_hp",
+        "runner_hp",
+        "starting_gold",
+        "archer_cost",
+        "archer_range",
+        "grunt_speed",
+        "runner_speed",
+        "tank_hp",
+        "flyer_hp",
+        "swarm_hp",
+        "boss_golem_hp",
+    ],
+    "shrine_hp": [
+        "shrine_hp",
+        "enemy_shrine_damage",
+        "archer_damage",
+        "archer_attack_speed_ms",
+        "grunt_hp",
+        "runner_hp",
+        "runner_speed",
+        "grunt_speed",
+        "archer_range",
+        "starting_gold",
+    ],
+    "gold_remaining": [
+        "starting_gold",
+        "grunt_gold",
+        "runner_gold",
+        "archer_cost",
+        "wall_cost",
+        "tank_gold",
+        "swarm_gold",
+        "flyer_gold",
+        "boss_golem_gold",
+        "sell_rate_percent",
+    ],
+    "enemies_leaked": [
+        "archer_damage",
+        "archer_attack_speed_ms",
+        "grunt_hp",
+        "runner_hp",
+        "runner_speed",
+        "grunt_speed",
+        "archer_range",
+        "starting_gold",
+        "archer_cost",
+        "swarm_hp",
+        "flyer_hp",
+    ],
+}
+COMPACT_MAX_PARAMS = 15
+
+# Target metric -> best-strategy record field
+METRIC_FIELDS = {
+    "win_rate": "win_rate",
+    "shrine_hp": "avg_shrine_hp",
+    "gold_remaining": "avg_gold",
+    "enemies_leaked": "avg_leaked",
+}
+
+
+def best_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    """Target metric values of the best (highest win rate) strategy."""
+    best = best_strategy_record(results) or {}
+    return {metric: best.get(field, 0) for metric, field in METRIC_FIELDS.items()}
+
+
+def off_target_metrics(results: Dict[str, Any], targets: Dict[str, Any]) -> List[str]:
+    """Metrics of the best strategy outside their target band, in targets order."""
+    values = best_metrics(results)
+    return [m for m, (lo, hi) in targets.items() if m in values and not lo <= values[m] <= hi]
+
+
+def relevant_params(
+    metrics: List[str],
+    parameter_bounds: Dict[str, Any],
+    changed: Optional[List[str]] = None,
+    limit: int = COMPACT_MAX_PARAMS,
+) -> List[str]:
+    """Last iteration's changed keys, then the off-target metrics' parameters interleaved."""
+    ranked = list(changed or [])
+    lists = [METRIC_PARAMS.get(m, []) for m in metrics]
+    for rank in range(max((len(lst) for lst in lists), default=0)):
+        ranked.extend(lst[rank] for lst in lists if rank < len(lst))
+
+    params: List[str] = []
+    for param in ranked:
+        if param in parameter_bounds and param not in params:
+            params.append(param)
+    return params[:limit]
 
 
 def build_analysis_prompt(
@@ -29,85 +209,7 @@ Strategy {strat_id.upper()} ({s["name"]}):
 
     # Format parameter bounds
     bounds_text = ""
-    key_params = [
-        # Economy
-        "starting_gold",
-        "wall_cost",
-        "sell_rate_percent",
-        # Archer
-        "archer_cost",
-        "archer_damage",
-        "archer_attack_speed_ms",
-        "archer_range",
-        # Cannon
-        "cannon_cost",
-        "cannon_damage",
-        "cannon_attack_speed_ms",
-        "cannon_range",
-        "cannon_aoe_radius",
-        # Frost
-        "frost_cost",
-        "frost_damage",
-        "frost_attack_speed_ms",
-        "frost_range",
-        "frost_slow",
-        "frost_slow_duration_ms",
-        # Lightning
-        "lightning_cost",
-        "lightning_damage",
-        "lightning_attack_speed_ms",
-        "lightning_range",
-        "lightning_chain_count",
-        "lightning_chain_range",
-        # Flame
-        "flame_cost",
-        "flame_damage",
-        "flame_attack_speed_ms",
-        "flame_range",
-        "flame_burn_dps",
-        "flame_burn_duration_ms",
-        # Grunt
-        "grunt_hp",
-        "grunt_speed",
-        "grunt_gold",
-        # Runner
-        "runner_hp",
-        "runner_speed",
-        "runner_gold",
-        # Tank
-        "tank_hp",
-        "tank_speed",
-        "tank_armor",
-        "tank_gold",
-        # Flyer
-        "flyer_hp",
-        "flyer_speed",
-        "flyer_gold",
-        # Swarm
-        "swarm_hp",
-        "swarm_speed",
-        "swarm_gold",
-        # Stealth
-        "stealth_hp",
-        "stealth_speed",
-        "stealth_gold",
-        # Breaker
-        "breaker_hp",
-        "breaker_speed",
-        "breaker_armor",
-        "breaker_gold",
-        "breaker_wall_damage",
-        # Boss
-        "boss_golem_hp",
-        "boss_golem_speed",
-        "boss_golem_armor",
-        "boss_golem_gold",
-        "boss_golem_regen",
-        # Shrine
-        "shrine_hp",
-        "enemy_shrine_damage",
-    ]
-    for param in key_params:
+    for param in KEY_PARAMS:
         if param in parameter_bounds:
             b = parameter_bounds[param]
             bounds_text += f"- {param}: {b['min']} to {b['max']} (step {b['step']})\n"
@@ -243,3 +345,68 @@ Output ONLY valid JSON (no markdown, no explanation outside JSON):
   "confidence": <0-100>,
   "converged": <true if all targets are met by best strategy, false otherwise>
 }}"""
+
+
+def build_compact_prompt(
+    config: Dict[str, Any],
+    results: Dict[str, Any],
+    targets: Dict[str, Any],
+    goal: str,
+    parameter_bounds: Dict[str, Any],
+    previous: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None,
+) -> str:
+    """Short prompt: off-target metrics, the last change and its effect, relevant parameters.
+
+    previous is the (config, results) of the iteration before; only keys that
+    changed since then are shown as a diff. Haiku answers with a sparse
+    `changes` object instead of the full null-filled schema.
+    """
+    values = best_metrics(results)
+    off_target = off_target_metrics(results, targets)
+    best = max(
+        results.get("strategies", {}).items(),
+        key=lambda item: item[1].get("win_rate", 0),
+        default=("?", {}),
+    )
+
+    lines = [
+        "Tune balance for the tower defense game Bastion's Last Stand.",
+        f"Goal: {goal}",
+        "",
+        f"Best strategy: {best[0]} ({best[1].get('name', '?')})",
+    ]
+    for metric, (lo, hi) in targets.items():
+        flag = " OFF" if metric in off_target else ""
+        lines.append(f"- {metric}: {values.get(metric, 0):.3g} (target {lo}-{hi}){flag}")
+
+    changed: List[str] = []
+    if previous is not None:
+        prev_config, prev_results = previous
+        changed = sorted(k for k in config if k in prev_config and config[k] != prev_config[k])
+        if changed:
+            diff = ", ".join(f"{k} {prev_config[k]}->{config[k]}" for k in changed)
+            prev_values = best_metrics(prev_results)
+            effect = ", ".join(
+                f"{m} {prev_values[m]:.3g}->{values[m]:.3g}" for m in targets if m in values
+            )
+            lines += ["", f"Last change: {diff}", f"Effect: {effect}"]
+
+    params = relevant_params(off_target, parameter_bounds, changed)
+    lines += ["", "Adjustable parameters (current; min-max, step):"]
+    for param in params:
+        b = parameter_bounds[param]
+        lines.append(
+            f"- {param}: {config.get(param, '?')}; {b['min']}-{b['max']}, step {b['step']}"
+        )
+
+    lines += [
+        "",
+        "Damage, burn and regen values are x1000 fixed point (15000 = 15 dmg); "
+        "speeds x1000 tiles/s. Keep changes incremental (10-25%).",
+        "",
+        "Output ONLY valid JSON. List only the parameters you change in \"changes\":",
+        '{"analysis": "...", "best_strategy": "a|b|c|d", "off_target_metrics": [...], '
+        '"changes": {"param": new_value}, "reasoning": "...", "expected_impact": "...", '
+        '"confidence": 0-100, "converged": true|false}',
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""Content-addressed on-disk cache for simulation results."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+CACHE_DIR = Path(__file__).parent / "results" / "cache"
+MAX_CACHE_BYTES = 64 * 1024 * 1024  # 64 MB
+
+# Sources that decide simulation outcomes (main.gd holds the strategy layouts)
+FINGERPRINT_DIRS = ["simulation", "resources"]
+FINGERPRINT_FILES = ["main.gd"]
+FINGERPRINT_SUFFIXES = {".gd", ".tres", ".json"}
+
+
+def source_fingerprint(project_path: Path) -> str:
+    """Hash every simulation/resource source file so engine edits invalidate the cache."""
+    project_path = Path(project_path)
+    files: List[Path] = []
+    for dirname in FINGERPRINT_DIRS:
+        root = project_path / dirname
+        if root.is_dir():
+            files.extend(
+                p for p in root.rglob("*") if p.is_file() and p.suffix in FINGERPRINT_SUFFIXES
+            )
+    files.extend(project_path / f for f in FINGERPRINT_FILES if (project_path / f).is_file())
+
+    digest = hashlib.sha256()
+    for path in sorted(files):
+        digest.update(path.relative_to(project_path).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cache_key(
+    config: Dict[str, Any],
+    strategy: str,
+    seed: int,
+    count: int,
+    fingerprint: str,
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Canonical hash of everything that determines one strategy's batch result.
+
+    options holds run-mode settings that change results (e.g. adaptive stopping).
+    """
+    payload = json.dumps(
+        {
+            "config": config,
+            "strategy": strategy,
+            "seed": seed,
+            "count": count,
+            "fingerprint": fingerprint,
+            "options": options or {},
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of JSON results, one file per key.
+
+    Recency is the file mtime, refreshed on every hit, so the LRU order
+    survives restarts of the optimizer.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def has(self, key: str) -> bool:
+        """Whether key is cached, without touching it or the hit/miss counters."""
+        return self._path(key).exists()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        os.utime(path)  # mark as most recently used
+        self.hits += 1
+        self.saved_ms += entry.get("sim_ms", 0.0)
+        return entry["value"]
+
+    def put(self, key: str, value: Dict[str, Any], sim_ms: float = 0.0) -> None:
+        """Store a value, then evict least recently used entries over the size bound.
+
+        sim_ms is the simulation time the value cost, credited to saved_ms on hits.
+        """
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"value": value, "sim_ms": sim_ms, "stored_at": time.time()}, f)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since this cache was created."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_ms": self.saved_ms,
+        }
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""SQLite store of optimizer runs, evaluated configs, per-strategy metrics and recommendations.
+
+Usage:
+  python run_store.py --runs
+  python run_store.py --best 5
+  python run_store.py --param archer_damage --min 15000 --max 25000
+  python run_store.py --export 20260101_120000
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+STORE_FILE = Path(__file__).parent / "results" / "runs.sqlite3"
+
+# Target metric -> strategy_metrics column
+METRIC_COLUMNS = {
+    "win_rate": "win_rate",
+    "shrine_hp": "avg_shrine_hp",
+    "gold_remaining": "avg_gold",
+    "enemies_leaked": "avg_leaked",
+}
+STRATEGY_COLUMNS = [
+    "win_rate",
+    "avg_shrine_hp",
+    "avg_gold",
+    "avg_leaked",
+    "avg_killed",
+    "avg_final_wave",
+    "total_simulations",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL,
+    finished_at REAL,
+    goal TEXT,
+    targets TEXT,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS configs (
+    config_hash TEXT PRIMARY KEY,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS config_params (
+    config_hash TEXT,
+    key TEXT,
+    value REAL,
+    PRIMARY KEY (config_hash, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS config_params_key_value ON config_params (key, value);
+CREATE TABLE IF NOT EXISTS evaluations (
+    evaluation_id INTEGER PRIMARY KEY,
+    run_id TEXT,
+    iteration INTEGER,
+    label TEXT,
+    config_hash TEXT,
+    score REAL,
+    best_strategy TEXT,
+    partial INTEGER,
+    created_at REAL
+);
+CREATE INDEX IF NOT EXISTS evaluations_run ON evaluations (run_id, iteration);
+CREATE INDEX IF NOT EXISTS evaluations_config ON evaluations (config_hash);
+CREATE TABLE IF NOT EXISTS strategy_metrics (
+    evaluation_id INTEGER,
+    strategy TEXT,
+    is_best INTEGER,
+    win_rate REAL,
+    avg_shrine_hp REAL,
+    avg_gold REAL,
+    avg_leaked REAL,
+    avg_killed REAL,
+    avg_final_wave REAL,
+    total_simulations INTEGER,
+    PRIMARY KEY (evaluation_id, strategy)
+);
+CREATE INDEX IF NOT EXISTS strategy_metrics_best ON strategy_metrics (is_best, evaluation_id);
+CREATE TABLE IF NOT EXISTS iterations (
+    run_id TEXT,
+    iteration INTEGER,
+    config_hash TEXT,
+    best_strategy TEXT,
+    recommendations TEXT,
+    PRIMARY KEY (run_id, iteration)
+);
+"""
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def _best_strategy(strategies: Dict[str, Any]) -> str:
+    """Highest win-rate strategy id, the same pick check_targets_met makes."""
+    if not strategies:
+        return ""
+    return max(strategies, key=lambda s: strategies[s].get("win_rate", 0))
+
+
+class RunStore:
+    """Indexed history of every run, written in batched transactions.
+
+    Writes are queued in memory and committed together by flush() (the
+    Logger flushes once per iteration), so a population of K candidates
+    costs one transaction rather than one per row.
+    """
+
+    def __init__(self, path: Path = STORE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._pending: List[Tuple[str, Any]] = []  # (sql, rows) in write order
+        self._next_evaluation = self._max_evaluation_id() + 1
+
+    def start_run(self, run_id: str, goal: str, targets: Dict[str, Any]) -> None:
+        targets_json = json.dumps({k: list(v) for k, v in targets.items()})
+        self._queue(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, NULL, ?, ?, 'running')",
+            [(run_id, time.time(), goal, targets_json)],
+        )
+
+    def finish_run(self, run_id: str, status: str) -> None:
+        self._queue(
+            "UPDATE runs SET finished_at = ?, status = ? WHERE run_id = ?",
+            [(time.time(), status, run_id)],
+        )
+        self.flush()
+
+    def add_evaluation(
+        self,
+        run_id: str,
+        iteration: int,
+        config: Dict[str, Any],
+        results: Dict[str, Any],
+        label: str = "",
+        score: Optional[float] = None,
+    ) -> int:
+        """Queue one simulated config with its per-strategy metrics; returns its id."""
+        evaluation_id = self._next_evaluation
+        self._next_evaluation += 1
+        key = self._add_config(config)
+        strategies = results.get("strategies", {})
+        best = _best_strategy(strategies)
+        self._queue(
+            "INSERT INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    evaluation_id,
+                    run_id,
+                    iteration,
+                    label,
+                    key,
+                    score,
+                    best,
+                    int(bool(results.get("partial"))),
+                    time.time(),
+                )
+            ],
+        )
+        self._queue(
+            "INSERT INTO strategy_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (evaluation_id, sid, int(sid == best))
+                + tuple(record.get(column) for column in STRATEGY_COLUMNS)
+                for sid, record in strategies.items()
+            ],
+        )
+        return evaluation_id
+
+    def add_iteration(
+        self,
+        run_id: str,
+        iteration: int,
+        config: Dict[str, Any],
+        results: Dict[str, Any],
+        recommendations: Dict[str, Any],
+    ) -> None:
+        self._queue(
+            "INSERT OR REPLACE INTO iterations VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    iteration,
+                    self._add_config(config),
+                    results.get("best_strategy") or _best_strategy(results.get("strategies", {})),
+                    json.dumps(recommendations),
+                )
+            ],
+        )
+
+    def flush(self) -> None:
+        """Commit every queued write in one transaction."""
+        if not self._pending:
+            return
+        with self.conn:
+            for sql, rows in self._pending:
+                self.conn.executemany(sql, rows)
+        self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    # Queries (pending writes are flushed first so they are visible)
+
+    def runs(self) -> List[Dict[str, Any]]:
+        self.flush()
+        rows = self.conn.execute(
+            "SELECT r.*, COUNT(e.evaluation_id) AS evaluations FROM runs r "
+            "LEFT JOIN evaluations e USING (run_id) GROUP BY r.run_id ORDER BY r.started_at"
+        )
+        return [dict(row) for row in rows]
+
+    def best_configs(
+        self, targets: Dict[str, Tuple[float, float]], limit: int = 1
+    ) -> List[Dict[str, Any]]:
+        """Evaluated configs closest to targets (score_results distance), best first.
+
+        Partial (timed-out) evaluations are skipped; a config evaluated more
+        than once is listed once, with its best evaluation.
+        """
+        self.flush()
+        terms, params = [], []
+        for metric, (lo, hi) in targets.items():
+            if metric not in METRIC_COLUMNS:
+                continue
+            column = METRIC_COLUMNS[metric]
+            terms.append(f"MAX(? - m.{column}, 0.0, m.{column} - ?) / ?")
+            params += [lo, hi, max(hi - lo, 1e-9)]
+        distance = " + ".join(terms) or "0.0"
+        rows = self.conn.execute(
+            f"SELECT e.*, c.config, m.strategy, {', '.join('m.' + c for c in STRATEGY_COLUMNS)}, "
+            f"MIN({distance}) AS distance "
+            "FROM evaluations e JOIN strategy_metrics m USING (evaluation_id) "
+            "JOIN configs c USING (config_hash) "
+            "WHERE m.is_best = 1 AND e.partial = 0 "
+            "GROUP BY e.config_hash ORDER BY distance, e.evaluation_id LIMIT ?",
+            params + [limit],
+        )
+        return [self._evaluation_row(row) for row in rows]
+
+    def evaluations_in_range(
+        self, key: str, lo: float, hi: float, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Every evaluation whose config has lo <= config[key] <= hi (best strategy's metrics)."""
+        self.flush()
+        rows = self.conn.execute(
+            f"SELECT e.*, c.config, m.strategy, {', '.join('m.' + c for c in STRATEGY_COLUMNS)} "
+            "FROM config_params p JOIN evaluations e USING (config_hash) "
+            "JOIN configs c USING (config_hash) "
+            "LEFT JOIN strategy_metrics m ON m.evaluation_id = e.evaluation_id AND m.is_best = 1 "
+            "WHERE p.key = ? AND p.value BETWEEN ? AND ? "
+            "ORDER BY p.value, e.evaluation_id LIMIT ?",
+            (key, lo, hi, -1 if limit is None else limit),
+        )
+        return [self._evaluation_row(row) for row in rows]
+
+    def export_run(self, run_id: str) -> Dict[str, Any]:
+        """A run in the shape the old run_<id>.json files had."""
+        self.flush()
+        run = self.conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if run is None:
+            raise KeyError(run_id)
+        iterations = []
+        for row in self.conn.execute(
+            "SELECT i.*, c.config FROM iterations i JOIN configs c USING (config_hash) "
+            "WHERE run_id = ? ORDER BY iteration",
+            (run_id,),
+        ):
+            evaluation = self.conn.execute(
+                "SELECT evaluation_id FROM evaluations WHERE run_id = ? AND iteration = ? "
+                "AND config_hash = ? ORDER BY evaluation_id DESC LIMIT 1",
+                (run_id, row["iteration"], row["config_hash"]),
+            ).fetchone()
+            strategies = {}
+            if evaluation is not None:
+                for m in self.conn.execute(
+                    "SELECT * FROM strategy_metrics WHERE evaluation_id = ?",
+                    (evaluation["evaluation_id"],),
+                ):
+                    strategies[m["strategy"]] = {c: m[c] for c in STRATEGY_COLUMNS}
+            iterations.append(
+                {
+                    "iteration": row["iteration"],
+                    "config": json.loads(row["config"]),
+                    "results": strategies,
+                    "best_strategy": row["best_strategy"],
+                    "recommendations": json.loads(row["recommendations"]),
+                }
+            )
+        return {
+            "goal": run["goal"],
+            "targets": json.loads(run["targets"]),
+            "iterations": iterations,
+        }
+
+    def _add_config(self, config: Dict[str, Any]) -> str:
+        key = config_hash(config)
+        self._queue("INSERT OR IGNORE INTO configs VALUES (?, ?)", [(key, json.dumps(config))])
+        self._queue(
+            "INSERT OR IGNORE INTO config_params VALUES (?, ?, ?)",
+            [
+                (key, k, v)
+                for k, v in config.items()
+                if isinstance(v, (int, float)) and not isinstance(v, bool)
+            ],
+        )
+        return key
+
+    def _queue(self, sql: str, rows: List[Tuple]) -> None:
+        if rows:
+            self._pending.append((sql, rows))
+
+    def _max_evaluation_id(self) -> int:
+        row = self.conn.execute("SELECT MAX(evaluation_id) FROM evaluations").fetchone()
+        return row[0] or 0
+
+    @staticmethod
+    def _evaluation_row(row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record["config"] = json.loads(record["config"])
+        return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the optimizer run history")
+    parser.add_argument("--store", default=str(STORE_FILE), help="SQLite file")
+    parser.add_argument("--runs", action="store_true", help="List runs")
+    parser.add_argument("--best", type=int, default=0, help="N configs closest to TARGETS")
+    parser.add_argument("--param", help="Parameter for a range query")
+    parser.add_argument("--min", type=float, default=float("-inf"))
+    parser.add_argument("--max", type=float, default=float("inf"))
+    parser.add_argument("--export", metavar="RUN_ID", help="Print a run as JSON")
+    args = parser.parse_args()
+
+    store = RunStore(args.store)
+    if args.runs:
+        for run in store.runs():
+            print(
+                f"{run['run_id']}  {run['status']:<10} {run['evaluations']:>5} evaluations  "
+                f"{run['goal']}"
+            )
+    if args.best:
+        from optimizer import TARGETS
+
+        for record in store.best_configs(TARGETS, args.best):
+            print(json.dumps(record))
+    if args.param:
+        for record in store.evaluations_in_range(args.param, args.min, args.max):
+            print(json.dumps(record))
+    if args.export:
+        print(json.dumps(store.export_run(args.export), indent=2))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""Global sensitivity analysis (Morris / Sobol) of the target metrics over BalanceConfig bounds.
+
+Usage:
+  python sensitivity.py --method morris --trajectories 10 --workers 8
+  python sensitivity.py --method sobol --samples 64 --backend reference
+  python optimizer.py --goal "..." --sensitivity results/sensitivity.json --top-k 12
+
+The report ranks parameters by influence; the optimizer's --sensitivity flag
+then restricts mutations and Haiku's changes to the top-k of them.
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from config_manager import PROJECT_PATH, ConfigManager
+from population import _is_int_param, _snap
+from surrogate import METRICS, observed_metrics
+
+REPORT_FILE = Path(__file__).parent / "results" / "sensitivity.json"
+MORRIS_LEVELS = 4
+DEFAULT_TRAJECTORIES = 10
+DEFAULT_SOBOL_SAMPLES = 64
+DEFAULT_BATCH_SIZE = 64  # Configs per run_config_batch call
+DEFAULT_TOP_K = 12
+
+Evaluator = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+def read_parameter_bounds(project_path: Path = PROJECT_PATH) -> Dict[str, Any]:
+    """BalanceConfig.get_parameter_bounds(), parsed from the GDScript source."""
+    source = (project_path / "simulation" / "core" / "balance_config.gd").read_text()
+    body = source.split("func get_parameter_bounds()", 1)[1]
+    body = body.split("\nfunc ", 1)[0].split("\nstatic func ", 1)[0]
+    return {
+        key: json.loads(entry)
+        for key, entry in re.findall(r'"(\w+)":\s*(\{[^{}]*\})', body)
+    }
+
+
+def design_keys(bounds: Dict[str, Any]) -> List[str]:
+    """Parameters with a non-empty range, in a stable order."""
+    return sorted(k for k, b in bounds.items() if b["max"] > b["min"])
+
+
+def to_configs(
+    base: Dict[str, Any], keys: List[str], bounds: Dict[str, Any], unit: np.ndarray
+) -> List[Dict[str, Any]]:
+    """Configs for rows of [0, 1]-scaled parameter values, snapped to each step."""
+    configs = []
+    for row in unit:
+        config = dict(base)
+        for key, u in zip(keys, row):
+            b = bounds[key]
+            as_int = _is_int_param(base.get(key, b["min"]), b)
+            config[key] = _snap(b["min"] + u * (b["max"] - b["min"]), b, as_int)
+        configs.append(config)
+    return configs
+
+
+def to_unit(configs: List[Dict[str, Any]], keys: List[str], bounds: Dict[str, Any]) -> np.ndarray:
+    """Inverse of to_configs after snapping (the values actually simulated)."""
+    unit = np.zeros((len(configs), len(keys)))
+    for j, key in enumerate(keys):
+        lo, hi = bounds[key]["min"], bounds[key]["max"]
+        unit[:, j] = [(config[key] - lo) / (hi - lo) for config in configs]
+    return unit
+
+
+def morris_design(
+    k: int, trajectories: int, rng: np.random.Generator, levels: int = MORRIS_LEVELS
+) -> Tuple[np.ndarray, List[Tuple[int, int, int]]]:
+    """One-at-a-time trajectories on a levels-point grid.
+
+    Returns the (trajectories * (k + 1), k) design and the (before, after,
+    parameter) row triples, one per elementary effect.
+    """
+    delta = levels / (2 * (levels - 1))
+    rows = []
+    steps = []
+    for _ in range(trajectories):
+        x = rng.integers(0, levels, size=k) / (levels - 1)
+        rows.append(x.copy())
+        for j in rng.permutation(k):
+            x[j] = x[j] + delta if x[j] + delta <= 1 else x[j] - delta
+            steps.append((len(rows) - 1, len(rows), int(j)))
+            rows.append(x.copy())
+    return np.array(rows), steps
+
+
+def morris_effects(
+    unit: np.ndarray, y: np.ndarray, steps: List[Tuple[int, int, int]], k: int
+) -> List[Dict[str, float]]:
+    """Per parameter: mu_star (mean |effect|), mu and sigma of the elementary effects."""
+    effects: List[List[float]] = [[] for _ in range(k)]
+    for before, after, j in steps:
+        moved = unit[after, j] - unit[before, j]
+        if moved != 0 and np.isfinite(y[before]) and np.isfinite(y[after]):
+            effects[j].append((y[after] - y[before]) / moved)
+    stats = []
+    for values in effects:
+        ee = np.array(values) if values else np.zeros(1)
+        stats.append(
+            {
+                "mu_star": float(np.abs(ee).mean()),
+                "mu": float(ee.mean()),
+                "sigma": float(ee.std()),
+            }
+        )
+    return stats
+
+
+def sobol_design(k: int, samples: int, rng: np.random.Generator) -> np.ndarray:
+    """Saltelli design: rows A, then B, then AB_j (A with column j from B) for each j."""
+    a = rng.random((samples, k))
+    b = rng.random((samples, k))
+    blocks = [a, b]
+    for j in range(k):
+        ab = a.copy()
+        ab[:, j] = b[:, j]
+        blocks.append(ab)
+    return np.vstack(blocks)
+
+
+def sobol_indices(y: np.ndarray, k: int, samples: int) -> List[Dict[str, float]]:
+    """Per parameter: first-order S1 (Saltelli 2010) and total ST (Jansen) indices."""
+    f_a, f_b = y[:samples], y[samples : 2 * samples]
+    stats = []
+    for j in range(k):
+        f_ab = y[(2 + j) * samples : (3 + j) * samples]
+        ok = np.isfinite(f_a) & np.isfinite(f_b) & np.isfinite(f_ab)
+        both = np.concatenate([f_a[ok], f_b[ok]])
+        variance = both.var() if ok.any() else 0.0
+        if variance == 0:
+            stats.append({"S1": 0.0, "ST": 0.0})
+            continue
+        center = both.mean()  # Centering cuts the S1 estimator's variance
+        s1 = ((f_b[ok] - center) * (f_ab[ok] - f_a[ok])).mean() / variance
+        st = 0.5 * ((f_a[ok] - f_ab[ok]) ** 2).mean() / variance
+        stats.append({"S1": float(s1), "ST": float(st)})
+    return stats
+
+
+def evaluate(
+    evaluator: Evaluator, configs: List[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, np.ndarray]:
+    """Metric -> value per config (NaN where a result was partial or empty)."""
+    values = {metric: np.full(len(configs), np.nan) for metric in METRICS}
+    for start in range(0, len(configs), batch_size):
+        batch = configs[start : start + batch_size]
+        for i, results in enumerate(evaluator(batch), start):
+            metrics = observed_metrics(results)
+            for metric, value in (metrics or {}).items():
+                values[metric][i] = value
+    return values
+
+
+def rank_parameters(
+    effects: Dict[str, Dict[str, Dict[str, float]]], measure: str
+) -> Dict[str, float]:
+    """Importance per parameter: measure scaled by its largest value per metric, averaged."""
+    params = sorted({p for per_param in effects.values() for p in per_param})
+    importance = dict.fromkeys(params, 0.0)
+    for per_param in effects.values():
+        peak = max((max(s[measure], 0.0) for s in per_param.values()), default=0.0)
+        if peak <= 0:
+            continue
+        for param, stats in per_param.items():
+            importance[param] += max(stats[measure], 0.0) / peak / len(effects)
+    return dict(sorted(importance.items(), key=lambda kv: (-kv[1], kv[0])))
+
+
+def analyze(
+    base: Dict[str, Any],
+    bounds: Dict[str, Any],
+    evaluator: Evaluator,
+    method: str = "morris",
+    trajectories: int = DEFAULT_TRAJECTORIES,
+    samples: int = DEFAULT_SOBOL_SAMPLES,
+    seed: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Run a Morris or Sobol design through evaluator and report per-parameter effects.
+
+    Morris reports mu_star (overall influence) and sigma (interactions and
+    nonlinearity) with trajectories * (k + 1) evaluations; Sobol reports
+    first-order S1 and total ST indices with samples * (k + 2).
+    """
+    keys = design_keys(bounds)
+    k = len(keys)
+    rng = np.random.default_rng(seed)
+    if method == "morris":
+        design, steps = morris_design(k, trajectories, rng)
+    elif method == "sobol":
+        design = sobol_design(k, samples, rng)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    configs = to_configs(base, keys, bounds, design)
+    values = evaluate(evaluator, configs, batch_size)
+    unit = to_unit(configs, keys, bounds)
+
+    effects = {}
+    for metric, y in values.items():
+        if method == "morris":
+            stats = morris_effects(unit, y, steps, k)
+        else:
+            stats = sobol_indices(y, k, samples)
+        effects[metric] = dict(zip(keys, stats))
+
+    importance = rank_parameters(effects, "mu_star" if method == "morris" else "ST")
+    return {
+        "method": method,
+        "evaluations": len(configs),
+        "seed": seed,
+        "effects": effects,
+        "importance": importance,
+        "ranking": list(importance),
+    }
+
+
+def load_report(path: Path = REPORT_FILE) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def top_parameters(report: Dict[str, Any], k: int = DEFAULT_TOP_K) -> List[str]:
+    """The k most influential parameters of a report, most influential first."""
+    return report["ranking"][:k]
+
+
+def focus_bounds(bounds: Dict[str, Any], params: Optional[List[str]]) -> Dict[str, Any]:
+    """Bounds restricted to params (all of them when params is None)."""
+    if params is None:
+        return bounds
+    return {k: v for k, v in bounds.items() if k in params}
+
+
+def format_report(report: Dict[str, Any], top: int = 20) -> str:
+    """Text table of the most influential parameters."""
+    measure = "mu_star" if report["method"] == "morris" else "ST"
+    metrics = list(report["effects"])
+    lines = [
+        f"{report['method'].title()} sensitivity ({report['evaluations']} evaluations, "
+        f"{measure} per metric)",
+        f"{'parameter':<28} {'importance':>10} " + " ".join(f"{m:>14}" for m in metrics),
+    ]
+    for param in report["ranking"][:top]:
+        cells = " ".join(f"{report['effects'][m][param][measure]:>14.4g}" for m in metrics)
+        lines.append(f"{param:<28} {report['importance'][param]:>10.3f} {cells}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Morris / Sobol sensitivity of BalanceConfig")
+    parser.add_argument("--method", choices=["morris", "sobol"], default="morris")
+    parser.add_argument(
+        "--trajectories",
+        type=int,
+        default=DEFAULT_TRAJECTORIES,
+        help=f"Morris trajectories, (k + 1) configs each (default: {DEFAULT_TRAJECTORIES})",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=DEFAULT_SOBOL_SAMPLES,
+        help=f"Sobol base samples, (k + 2) configs each (default: {DEFAULT_SOBOL_SAMPLES})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["godot", "reference"],
+        default="godot",
+        help="Evaluate with Godot or the NumPy reference simulator (waves 1-9 only)",
+    )
+    parser.add_argument("--runs", type=int, default=100, help="Godot games per strategy")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent Godot processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=0, help="Design RNG seed")
+    parser.add_argument("--output", default=str(REPORT_FILE), help="Report JSON path")
+    args = parser.parse_args()
+
+    base = ConfigManager().read_config()
+    bounds = read_parameter_bounds()
+    options = dict(
+        method=args.method,
+        trajectories=args.trajectories,
+        samples=args.samples,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+
+    if args.backend == "reference":
+        from reference_sim import evaluate_configs
+
+        report = analyze(base, bounds, evaluate_configs, **options)
+    else:
+        from simulation_runner import SimulationRunner
+
+        with SimulationRunner(workers=args.workers) as runner:
+
+            def evaluator(configs):
+                return runner.run_config_batch(configs, count=args.runs, strategy="all")
+
+            report = analyze(base, bounds, evaluator, **options)
+
+    report["backend"] = args.backend
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(format_report(report))
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,386 @@
 
 import subprocess
 import json
+import math
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from profiling import merge_profiles
+from result_cache import ResultCache, cache_key, source_fingerprint
 
 GODOT_PATH = "godot"
 PROJECT_PATH = Path(__file__).parent.parent
+TIMEOUT_S = 300  # 5 minute timeout per Godot process
+
+# Target metrics main.gd --adaptive can decide early, and their CLI flags
+ADAPTIVE_TARGET_FLAGS = {
+    "win_rate": "--target-win-rate",
+    "shrine_hp": "--target-shrine-hp",
+    "gold_remaining": "--target-gold",
+    "enemies_leaked": "--target-leaked",
+}
+
+# Per-game metrics with avg_/std_<metric> (and p<q>_<metric> for the histogrammed ones) in
+# each strategy record - must match ResultAccumulator.METRICS
+SPREAD_METRICS = ["final_wave", "shrine_hp", "gold", "killed", "leaked", "ticks", "duration_ms"]
+QUANTILES = [5, 50, 95]
+
+# Strategy ids - must match main.gd _get_all_strategies()
+BASELINE_STRATEGY_IDS = ["a", "b", "c", "d"]
+UPGRADE_STRATEGY_IDS = [
+    "archer_sniper",
+    "archer_machine",
+    "cannon_siege",
+    "cannon_railgun",
+    "frost_permafrost",
+    "frost_cryo",
+    "lightning_storm",
+    "lightning_disruptor",
+    "flame_hellfire",
+    "flame_plasma",
+    "wall_fortress",
+    "wall_tar",
+    "rush_aoe",
+    "smash_maze",
+]
+
+
+def expand_strategy(strategy: str) -> List[str]:
+    """Expand a --strategy argument (all, upgrades, id or id list) into ids."""
+    strategy = strategy.lower()
+    if strategy == "all":
+        return BASELINE_STRATEGY_IDS + UPGRADE_STRATEGY_IDS
+    if strategy == "upgrades":
+        return list(UPGRADE_STRATEGY_IDS)
+    return [s.strip() for s in strategy.split(",") if s.strip()]
+
+
+def plan_shards(
+    strategy_ids: List[str], count: int, seed: int, workers: int
+) -> List[Dict[str, Any]]:
+    """Split strategies (and seed ranges when workers outnumber them) into shards.
+
+    Each shard is {"strategies": [...], "seed": base_seed, "count": n}. Games use
+    seeds base_seed + i, so a seed slice reproduces exactly the same games.
+    """
+    workers = max(1, workers)
+    if workers <= len(strategy_ids):
+        groups: List[List[str]] = [[] for _ in range(workers)]
+        for i, strat_id in enumerate(strategy_ids):
+            groups[i % workers].append(strat_id)
+        return [{"strategies": g, "seed": seed, "count": count} for g in groups if g]
+
+    # More workers than strategies: also slice each strategy's seed range
+    slices = min(count, -(-workers // len(strategy_ids)))
+    shards = []
+    for strat_id in strategy_ids:
+        start = 0
+        for i in range(slices):
+            size = count // slices + (1 if i < count % slices else 0)
+            if size <= 0:
+                continue
+            shards.append({"strategies": [strat_id], "seed": seed + start, "count": size})
+            start += size
+    return shards
+
+
+def adaptive_options(
+    targets: Dict[str, Any], min_games: int = 50
+) -> Dict[str, Any]:
+    """Early-stopping options for main.gd --adaptive from optimizer TARGETS.
+
+    Every target needs an engine-side confidence interval: a target_met stop
+    judged without one would decide that metric on a small sample.
+    """
+    unsupported = sorted(set(targets) - set(ADAPTIVE_TARGET_FLAGS))
+    if unsupported:
+        raise ValueError(f"No adaptive stopping interval for targets: {', '.join(unsupported)}")
+    bands = {metric: [float(band[0]), float(band[1])] for metric, band in targets.items()}
+    return {"min_games": min_games, "targets": bands}
+
+
+def histogram_quantile(histogram: Dict[str, int], percent: int) -> int:
+    """Nearest-rank percentile of a {value: count} histogram (record "distributions")."""
+    rank = max(math.ceil(sum(histogram.values()) * percent / 100), 1)
+    seen = 0
+    for value in sorted(histogram, key=int):
+        seen += histogram[value]
+        if seen >= rank:
+            return int(value)
+    return 0
+
+
+def merge_distributions(histograms: List[Dict[str, int]]) -> Dict[str, int]:
+    merged: Dict[str, int] = {}
+    for histogram in histograms:
+        for value, n in histogram.items():
+            merged[value] = merged.get(value, 0) + n
+    return merged
+
+
+def pooled_std(records: List[Dict[str, Any]], metric: str) -> float:
+    """Sample std of metric over every game of several records (from their runs/avg/std)."""
+    played = [r for r in records if r.get("runs", 0) > 0]
+    runs = sum(r["runs"] for r in played)
+    if runs < 2:
+        return 0.0
+    mean = sum(r[f"avg_{metric}"] * r["runs"] for r in played) / runs
+    squares = sum(
+        (r["runs"] - 1) * r.get(f"std_{metric}", 0.0) ** 2 + r["runs"] * r[f"avg_{metric}"] ** 2
+        for r in played
+    )
+    return math.sqrt(max(squares - runs * mean**2, 0.0) / (runs - 1))
+
+
+def merge_strategy_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-shard results for one strategy, weighting averages by runs."""
+    merged = dict(records[0])
+    if len(records) == 1:
+        return merged
+    runs = sum(r.get("runs", 0) for r in records)
+    if runs <= 0:
+        return merged
+
+    merged["runs"] = runs
+    merged["wins"] = sum(r.get("wins", 0) for r in records)
+    merged["win_rate"] = merged["wins"] / runs
+    for key in records[0]:
+        if key.startswith("avg_"):
+            merged[key] = sum(r.get(key, 0) * r.get("runs", 0) for r in records) / runs
+    for key in ("elapsed_ms", "simulated"):
+        if key in records[0]:
+            merged[key] = sum(r.get(key, 0) for r in records)
+    for metric in SPREAD_METRICS:
+        if f"std_{metric}" in records[0] and f"avg_{metric}" in records[0]:
+            merged[f"std_{metric}"] = pooled_std(records, metric)
+    if "distributions" in records[0]:
+        distributions = {
+            metric: merge_distributions(
+                [r.get("distributions", {}).get(metric, {}) for r in records]
+            )
+            for metric in records[0]["distributions"]
+        }
+        merged["distributions"] = distributions
+        for metric, histogram in distributions.items():
+            for percent in QUANTILES:
+                merged[f"p{percent}_{metric}"] = histogram_quantile(histogram, percent)
+    if "profile" in records[0]:
+        merged["profile"] = merge_profiles([r.get("profile", {}) for r in records])
+
+    path_counts: Dict[str, int] = {}
+    for r in records:
+        for path_key, n in r.get("upgrade_path_counts", {}).items():
+            path_counts[path_key] = path_counts.get(path_key, 0) + n
+    merged["upgrade_path_counts"] = path_counts
+    return merged
+
+
+def merge_shard_results(
+    shard_results: List[Dict[str, Any]], strategy_ids: List[str]
+) -> Dict[str, Any]:
+    """Merge shard outputs into the single-process JSON shape."""
+    per_strategy: Dict[str, List[Dict[str, Any]]] = {}
+    for result in shard_results:
+        for strat_id, record in result.get("strategies", {}).items():
+            per_strategy.setdefault(strat_id, []).append(record)
+
+    strategies = {}
+    for strat_id in strategy_ids:
+        if strat_id in per_strategy:
+            strategies[strat_id] = merge_strategy_records(per_strategy[strat_id])
+
+    # Same rule as main.gd: first strategy with the highest win rate
+    best_strategy = ""
+    best_win_rate = -1.0
+    for strat_id, record in strategies.items():
+        if record["win_rate"] > best_win_rate:
+            best_win_rate = record["win_rate"]
+            best_strategy = strat_id
+
+    merged = dict(shard_results[0]) if shard_results else {}
+    merged["strategies"] = strategies
+    merged["best_strategy"] = best_strategy
+    if any(result.get("partial") for result in shard_results):
+        merged["partial"] = True
+    return merged
+
+
+def assemble_ndjson(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the --json result shape from streamed --ndjson records.
+
+    Without the closing "done" record the run was cut short; the strategies
+    that finished are kept and the result is flagged "partial".
+    """
+    strategies: Dict[str, Any] = {}
+    summary: Optional[Dict[str, Any]] = None
+    for record in records:
+        if record.get("type") == "strategy":
+            strategies[record["id"]] = record["record"]
+        elif record.get("type") == "done":
+            summary = {k: v for k, v in record.items() if k != "type"}
+
+    result = dict(summary or {}, strategies=strategies)
+    if summary is None:
+        result["partial"] = True
+    return merge_shard_results([result], list(strategies))
+
+
+class SimulationTimeout(RuntimeError):
+    """A Godot process did not finish within the runner timeout."""
+
+
+def _start_line_reader(stream) -> "queue.Queue[Optional[str]]":
+    """Pump a text stream into a queue from a daemon thread (None marks EOF)."""
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    def read() -> None:
+        for line in stream:
+            lines.put(line)
+        lines.put(None)
+
+    threading.Thread(target=read, daemon=True).start()
+    return lines
+
+
+def _next_json_line(
+    lines: "queue.Queue[Optional[str]]", deadline: float
+) -> Optional[Dict[str, Any]]:
+    """Return the next JSON object line, or None at EOF.
+
+    Engine banners and other non-JSON output are skipped. Raises
+    SimulationTimeout once the monotonic deadline passes.
+    """
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise SimulationTimeout("Godot timed out")
+        try:
+            line = lines.get(timeout=remaining)
+        except queue.Empty:
+            continue
+        if line is None:
+            return None
+        if line.strip().startswith("{"):
+            return json.loads(line)
+
+
+class _GodotServer:
+    """One long-lived `godot --serve` process speaking line-delimited JSON."""
+
+    def __init__(self, cmd: List[str], cwd: Path):
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            cwd=cwd,
+        )
+        self._lines = _start_line_reader(self.process.stdout)
+        self._next_id = 0
+
+    def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one request and wait for its JSON response line."""
+        self._next_id += 1
+        payload = dict(payload, id=self._next_id)
+        try:
+            self.process.stdin.write(json.dumps(payload) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise RuntimeError(f"Godot server exited: {e}") from e
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                response = _next_json_line(self._lines, deadline)
+            except SimulationTimeout:
+                self.kill()
+                raise SimulationTimeout(f"Godot server timed out after {timeout}s") from None
+            if response is None:
+                raise RuntimeError("Godot server exited unexpectedly")
+            if "error" in response:
+                raise RuntimeError(f"Godot server error: {response['error']}")
+            if response.get("id") == self._next_id:
+                response.pop("id", None)
+                return response
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self) -> None:
+        """Ask the server to quit, killing it if it does not exit promptly."""
+        if self.alive():
+            try:
+                self.process.stdin.write(json.dumps({"cmd": "quit"}) + "\n")
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.kill()
+
+    def kill(self) -> None:
+        if self.alive():
+            self.process.kill()
+            self.process.wait()
 
 
 class SimulationRunner:
-    def __init__(self, godot_path: str = GODOT_PATH, project_path: Path = PROJECT_PATH):
+    def __init__(
+        self,
+        godot_path: str = GODOT_PATH,
+        project_path: Path = PROJECT_PATH,
+        workers: int = 1,
+        timeout: float = TIMEOUT_S,
+        persistent: bool = False,
+        cache: Optional[ResultCache] = None,
+        ndjson: bool = False,
+        adaptive: Optional[Dict[str, Any]] = None,
+        profile: bool = False,
+        fast_forward: bool = False,
+        reuse_prefix: bool = False,
+        every_seed: bool = False,
+        max_waves: int = 0,
+    ):
         self.godot_path = godot_path
         self.project_path = project_path
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.persistent = persistent
+        # A profile times this run, so profiled sweeps never read or fill the cache
+        self.cache = None if profile else cache
+        self.ndjson = ndjson
+        self.adaptive = adaptive
+        self.profile = profile
+        # Results are identical with or without it, so cached results stay valid
+        self.fast_forward = fast_forward
+        # Engine-side wave snapshots; pays off across configs of one --configs batch or worker
+        self.reuse_prefix = reuse_prefix
+        # Play every seed even when a batch is seed-invariant (timing runs)
+        self.every_seed = every_seed
+        # Play only waves 1..max_waves (0 = all); a low-fidelity screen, cached separately
+        self.max_waves = max_waves
+        self._fingerprint: Optional[str] = None
+        self._servers: "Optional[queue.Queue[_GodotServer]]" = None
+        self._all_servers: List[_GodotServer] = []
+        self._server_lock = threading.Lock()
+
+    def __enter__(self) -> "SimulationRunner":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down any persistent Godot servers."""
+        for server in self._all_servers:
+            server.close()
+        self._all_servers = []
+        self._servers = None
 
     def run_simulations(
         self,
@@ -22,30 +391,418 @@ class SimulationRunner:
         config_path: str = "balance_config.json",
     ) -> Dict[str, Any]:
         """Run simulations and return parsed JSON results."""
+        if self.cache is not None:
+            return self._run_cached(
+                expand_strategy(strategy), count, seed, config_path, self.workers
+            )
+        return self._run_uncached(strategy, count, seed, config_path, self.workers)
+
+    def run_with_telemetry(
+        self,
+        directory: Path,
+        count: int = 1000,
+        strategy: str = "all",
+        seed: int = 12345,
+        config_path: str = "balance_config.json",
+    ) -> Dict[str, Any]:
+        """Run one uncached engine process that also writes --telemetry CSVs to directory.
+
+        Load them with telemetry.load_telemetry(directory).
+        """
+        cmd = self._build_command(strategy, count, seed, config_path)
+        return self._run_godot(cmd + ["--telemetry", str(Path(directory).resolve())])
+
+    def run_config_batch(
+        self,
+        configs: List[Dict[str, Any]],
+        count: int = 1000,
+        strategy: str = "all",
+        seed: int = 12345,
+    ) -> List[Dict[str, Any]]:
+        """Evaluate many config dicts with as few engine boots as possible.
+
+        Configs are dealt into one chunk per worker and each chunk runs in a
+        single `godot --configs` process (or, when persistent, as requests to
+        the warm servers). With fewer configs than workers the
+        spare workers shard each config's strategies. With a cache, each
+        config simulates only its uncached strategies; configs missing the
+        same strategies share chunks. Results come back in input order, in
+        the same shape as run_simulations.
+        """
+        strategy_ids = expand_strategy(strategy)
+        keys: Dict[int, Dict[str, str]] = {}
+        cached: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        missing: Dict[int, List[str]] = {}
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i, config in enumerate(configs):
+            missing[i] = strategy_ids
+            if self.cache is not None:
+                keys[i] = self._cache_keys(config, strategy_ids, seed, count)
+                cached[i], missing[i] = self._lookup_cached(keys[i], strategy_ids)
+            if missing[i]:
+                groups.setdefault(tuple(missing[i]), []).append(i)
+
+        jobs = []
+        for group, todo in groups.items():
+            n_chunks = min(len(todo), self.workers)
+            chunks = [todo[c::n_chunks] for c in range(n_chunks)]
+            shards = plan_shards(list(group), count, seed, max(1, self.workers // n_chunks))
+            jobs.extend((chunk, shard) for chunk in chunks for shard in shards)
+
+        parts: Dict[int, List[Dict[str, Any]]] = {}
+        if jobs:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                outputs = list(pool.map(lambda job: self._run_config_job(configs, *job), jobs))
+            for output in outputs:
+                for i, result in output.items():
+                    parts.setdefault(i, []).append(result)
+
+        results = []
+        for i in range(len(configs)):
+            fresh = []
+            if missing[i]:
+                if i not in parts:
+                    raise RuntimeError(f"No result for config {i}")
+                fresh.append(merge_shard_results(parts[i], strategy_ids))
+            if self.cache is None:
+                results.append(fresh[0])
+                continue
+            if fresh:
+                self._put_cached(keys[i], fresh[0])
+            results.append(self._merge_cached(fresh, cached[i], strategy_ids))
+        return results
+
+    def _run_config_job(
+        self, configs: List[Dict[str, Any]], indices: List[int], shard: Dict[str, Any]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Run one shard of strategies for a chunk of configs; returns index -> result."""
+        strategy = ",".join(shard["strategies"])
+        if self.persistent:
+            return {
+                i: self._request_server(configs[i], strategy, shard["count"], shard["seed"])
+                for i in indices
+            }
+
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as f:
+            for i in indices:
+                f.write(json.dumps(configs[i]) + "\n")
+            configs_path = f.name
+        try:
+            cmd = self._build_command(
+                strategy, shard["count"], shard["seed"], "", configs_path=configs_path
+            )
+            results = {}
+            for record in self.iter_records(cmd):
+                if "index" in record:
+                    results[indices[record.pop("index")]] = record
+            return results
+        finally:
+            Path(configs_path).unlink(missing_ok=True)
+
+    def _run_cached(
+        self,
+        strategy_ids: List[str],
+        count: int,
+        seed: int,
+        config_path: str,
+        workers: int,
+    ) -> Dict[str, Any]:
+        """Serve strategies from the result cache and simulate only the misses."""
+        keys = self._cache_keys(self._load_config(config_path), strategy_ids, seed, count)
+
+        cached, missing = self._lookup_cached(keys, strategy_ids)
+
+        parts: List[Dict[str, Any]] = []
+        if missing:
+            fresh = self._run_uncached(",".join(missing), count, seed, config_path, workers)
+            self._put_cached(keys, fresh)
+            parts.append(fresh)
+        return self._merge_cached(parts, cached, strategy_ids)
+
+    def _cache_keys(
+        self, config: Dict[str, Any], strategy_ids: List[str], seed: int, count: int
+    ) -> Dict[str, str]:
+        """Per-strategy cache keys for one config."""
+        if self._fingerprint is None:
+            self._fingerprint = source_fingerprint(self.project_path)
+        options = {"adaptive": self.adaptive} if self.adaptive else {}
+        if self.max_waves:
+            options["max_waves"] = self.max_waves
+        return {
+            s: cache_key(config, s, seed, count, self._fingerprint, options or None)
+            for s in strategy_ids
+        }
+
+    def _put_cached(self, keys: Dict[str, str], result: Dict[str, Any]) -> None:
+        """Store each strategy record of a fresh result under its key."""
+        envelope = {k: v for k, v in result.items() if k not in ("strategies", "cache")}
+        for strat_id, record in result.get("strategies", {}).items():
+            if strat_id in keys:
+                sim_ms = record.get("avg_duration_ms", 0) * record.get("runs", 0)
+                value = {"record": record, "envelope": envelope}
+                self.cache.put(keys[strat_id], value, sim_ms=sim_ms)
+
+    def _lookup_cached(
+        self, keys: Dict[str, str], strategy_ids: List[str]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Cache entries by strategy, and the strategies that missed, in order."""
+        cached: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for strat_id in strategy_ids:
+            entry = self.cache.get(keys[strat_id])
+            if entry is None:
+                missing.append(strat_id)
+            else:
+                cached[strat_id] = entry
+        return cached, missing
+
+    def _merge_cached(
+        self,
+        fresh: List[Dict[str, Any]],
+        cached: Dict[str, Dict[str, Any]],
+        strategy_ids: List[str],
+    ) -> Dict[str, Any]:
+        """Merge freshly simulated results with cached strategy records."""
+        parts = list(fresh)
+        for strat_id, entry in cached.items():
+            parts.append(dict(entry["envelope"], strategies={strat_id: entry["record"]}))
+
+        merged = merge_shard_results(parts, strategy_ids)
+        merged["cache"] = {"hits": len(cached), "misses": len(strategy_ids) - len(cached)}
+        if not fresh:
+            merged["total_duration_ms"] = 0
+        return merged
+
+    def _run_uncached(
+        self, strategy: str, count: int, seed: int, config_path: str, workers: int
+    ) -> Dict[str, Any]:
+        if workers <= 1:
+            return self._run_shard(strategy, count, seed, config_path)
 
-        cmd = [
+        return self._run_sharded(expand_strategy(strategy), count, seed, config_path, workers)
+
+    def _run_sharded(
+        self,
+        strategy_ids: List[str],
+        count: int,
+        seed: int,
+        config_path: str,
+        workers: int,
+    ) -> Dict[str, Any]:
+        """Run shards across a pool of concurrent Godot processes and merge."""
+        shards = plan_shards(strategy_ids, count, seed, workers)
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            shard_results = list(
+                pool.map(
+                    lambda shard: self._run_shard(
+                        ",".join(shard["strategies"]),
+                        shard["count"],
+                        shard["seed"],
+                        config_path,
+                    ),
+                    shards,
+                )
+            )
+
+        merged = merge_shard_results(shard_results, strategy_ids)
+        merged["total_duration_ms"] = int((time.monotonic() - start) * 1000)
+        merged["shards"] = len(shards)
+        return merged
+
+    def _run_shard(
+        self, strategy: str, count: int, seed: int, config_path: str
+    ) -> Dict[str, Any]:
+        """Run one shard on a warm server, or a fresh process if not persistent."""
+        if not self.persistent:
+            if self.ndjson:
+                cmd = self._build_command(strategy, count, seed, config_path, "--ndjson")
+                return self._collect_ndjson(cmd)
+            return self._run_godot(self._build_command(strategy, count, seed, config_path))
+
+        return self._request_server(self._load_config(config_path), strategy, count, seed)
+
+    def _request_server(
+        self, config: Dict[str, Any], strategy: str, count: int, seed: int
+    ) -> Dict[str, Any]:
+        """Send one sweep to a pooled --serve worker."""
+        request = {"config": config, "strategy": strategy, "count": count, "seed": seed}
+        if self.adaptive:
+            request["adaptive"] = self.adaptive
+        if self.profile:
+            request["profile"] = True
+        if self.fast_forward:
+            request["fast_forward"] = True
+        if self.reuse_prefix:
+            request["reuse_prefix"] = True
+        if self.every_seed:
+            request["every_seed"] = True
+        if self.max_waves:
+            request["max_waves"] = self.max_waves
+        server = self._acquire_server()
+        try:
+            return server.request(request, self.timeout)
+        finally:
+            self._release_server(server)
+
+    def _load_config(self, config_path: str) -> Dict[str, Any]:
+        """Read the config file the one-shot CLI would have loaded."""
+        path = Path(config_path)
+        if not path.is_absolute():
+            path = self.project_path / path
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _acquire_server(self) -> _GodotServer:
+        with self._server_lock:
+            if self._servers is None:
+                self._servers = queue.Queue()
+                for _ in range(self.workers):
+                    self._servers.put(self._start_server())
+        server = self._servers.get()
+        if not server.alive():
+            # Replace servers that crashed or were killed on timeout
+            with self._server_lock:
+                self._all_servers.remove(server)
+            server.kill()
+            server = self._start_server()
+        return server
+
+    def _release_server(self, server: _GodotServer) -> None:
+        if self._servers is not None:
+            self._servers.put(server)
+
+    def _start_server(self) -> _GodotServer:
+        cmd = [self.godot_path, "--headless", "--path", str(self.project_path), "--", "--serve"]
+        server = _GodotServer(cmd, self.project_path)
+        self._all_servers.append(server)
+        return server
+
+    def stream_simulations(
+        self,
+        count: int = 1000,
+        strategy: str = "all",
+        seed: int = 12345,
+        config_path: str = "balance_config.json",
+        per_game: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield --ndjson records ("game", "strategy", then "done") as Godot emits them."""
+        flag = "--ndjson-games" if per_game else "--ndjson"
+        return self.iter_records(self._build_command(strategy, count, seed, config_path, flag))
+
+    def iter_records(self, cmd: List[str]) -> Iterator[Dict[str, Any]]:
+        """Run one Godot process and yield each JSON line as soon as it is printed.
+
+        The process is killed if the timeout passes (SimulationTimeout) or the
+        consumer stops iterating early.
+        """
+        with tempfile.TemporaryFile("w+") as stderr:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=True,
+                bufsize=1,
+                cwd=self.project_path,
+            )
+            lines = _start_line_reader(process.stdout)
+            deadline = time.monotonic() + self.timeout
+            try:
+                while True:
+                    try:
+                        record = _next_json_line(lines, deadline)
+                    except SimulationTimeout:
+                        raise SimulationTimeout(f"Godot timed out after {self.timeout}s") from None
+                    if record is None:
+                        break
+                    yield record
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                raise SimulationTimeout(f"Godot timed out after {self.timeout}s") from None
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+
+            if process.returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"Godot failed: {stderr.read()}")
+
+    def _collect_ndjson(self, cmd: List[str]) -> Dict[str, Any]:
+        """Gather streamed records, keeping finished strategies if a later one times out."""
+        records: List[Dict[str, Any]] = []
+        try:
+            for record in self.iter_records(cmd):
+                records.append(record)
+        except SimulationTimeout:
+            if not any(r.get("type") == "strategy" for r in records):
+                raise
+        return assemble_ndjson(records)
+
+    def _build_command(
+        self,
+        strategy: str,
+        count: int,
+        seed: int,
+        config_path: str,
+        output_flag: str = "--json",
+        configs_path: Optional[str] = None,
+    ) -> List[str]:
+        """Engine command line; configs_path selects --configs batch mode over --config."""
+        config_args = ["--configs", configs_path] if configs_path else ["--config", config_path]
+        return [
             self.godot_path,
             "--headless",
             "--path",
             str(self.project_path),
             "--",
-            "--config",
-            config_path,
+            *config_args,
             "--strategy",
             strategy,
             "--count",
             str(count),
             "--seed",
             str(seed),
-            "--json",
+            output_flag,
+        ] + self._adaptive_args() + self._flag_args() + self._max_waves_args()
+
+    def _flag_args(self) -> List[str]:
+        """Boolean main.gd flags enabled on this runner."""
+        flags = [
+            ("--profile", self.profile),
+            ("--fast-forward", self.fast_forward),
+            ("--reuse-prefix", self.reuse_prefix),
+            ("--every-seed", self.every_seed),
         ]
+        return [flag for flag, enabled in flags if enabled]
+
+    def _max_waves_args(self) -> List[str]:
+        return ["--max-waves", str(self.max_waves)] if self.max_waves else []
+
+    def _adaptive_args(self) -> List[str]:
+        """CLI flags for main.gd --adaptive (empty when disabled)."""
+        if not self.adaptive:
+            return []
+        args = ["--adaptive"]
+        if "min_games" in self.adaptive:
+            args += ["--min-games", str(self.adaptive["min_games"])]
+        for metric, flag in ADAPTIVE_TARGET_FLAGS.items():
+            band = self.adaptive.get("targets", {}).get(metric)
+            if band:
+                args += [flag, f"{band[0]},{band[1]}"]
+        return args
 
+    def _run_godot(self, cmd: List[str]) -> Dict[str, Any]:
+        """Run one Godot process and parse its JSON output."""
         result = subprocess.run(
             cmd,
             capture_output=True,
             text=True,
             cwd=self.project_path,
-            timeout=300,  # 5 minute timeout
+            timeout=self.timeout,
         )
 
         if result.returncode != 0:
@@ -0,0 +1,208 @@
+"""Gaussian-process surrogate for prescreening candidate configs before simulation."""
+
+import json
+import math
+import random
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from population import best_strategy_record, mutate
+
+HISTORY_FILE = Path(__file__).parent / "results" / "surrogate_history.jsonl"
+
+# Surrogate metric -> best-strategy record field (same pick as score_results)
+METRICS = {
+    "win_rate": "win_rate",
+    "shrine_hp": "avg_shrine_hp",
+    "gold_remaining": "avg_gold",
+    "enemies_leaked": "avg_leaked",
+}
+MIN_HISTORY = 5  # Observations before predictions are trusted
+KAPPA = 1.0  # Std devs of optimism in the lower confidence bound
+LENGTH_SCALES = [0.1, 0.2, 0.4, 0.8, 1.6]  # In [0, 1]-normalized parameter units
+NOISE_LEVELS = [1e-4, 1e-3, 1e-2, 1e-1]  # Fraction of the metric's variance
+PROPOSAL_SAMPLES = 256
+
+
+def observed_metrics(results: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """Surrogate targets from a simulation result (None if nothing usable)."""
+    if results.get("partial"):
+        return None
+    best = best_strategy_record(results)
+    if best is None:
+        return None
+    return {metric: float(best.get(field, 0)) for metric, field in METRICS.items()}
+
+
+class _GaussianProcess:
+    """Zero-mean GP with an RBF kernel on standardized targets (one per metric)."""
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        self.x = x
+        self.mean = y.mean()
+        self.scale = y.std() or 1.0
+        z = (y - self.mean) / self.scale
+
+        best = None
+        for length in LENGTH_SCALES:
+            k = _rbf(x, x, length)
+            for noise in NOISE_LEVELS:
+                chol = np.linalg.cholesky(k + noise * np.eye(len(x)))
+                alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, z))
+                # Log marginal likelihood (up to a constant)
+                fit = -0.5 * z @ alpha - np.log(np.diag(chol)).sum()
+                if best is None or fit > best[0]:
+                    best = (fit, length, chol, alpha)
+        _, self.length, self.chol, self.alpha = best
+
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        k_star = _rbf(x, self.x, self.length)
+        mean = k_star @ self.alpha
+        v = np.linalg.solve(self.chol, k_star.T)
+        var = np.maximum(1.0 - (v * v).sum(axis=0), 0.0)
+        return self.mean + mean * self.scale, np.sqrt(var) * self.scale
+
+
+def _rbf(a: np.ndarray, b: np.ndarray, length: float) -> np.ndarray:
+    d2 = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1)
+    return np.exp(-0.5 * d2 / (length * length))
+
+
+class Surrogate:
+    """Predicts best-strategy metrics (with uncertainty) from numeric config values.
+
+    Features are the numeric keys of get_parameter_bounds(), scaled to [0, 1].
+    Candidates are ranked by an optimistic (lower confidence bound) target
+    distance, so configs that are either promising or poorly explored come
+    first; those that cannot beat the parent even optimistically are dropped.
+    """
+
+    def __init__(self, history_path: Optional[Path] = HISTORY_FILE, fingerprint: str = ""):
+        self.history_path = Path(history_path) if history_path else None
+        self.fingerprint = fingerprint
+        self.history: List[Tuple[Dict[str, Any], Dict[str, float]]] = []
+        self.bounds: Dict[str, Any] = {}
+        self._models: Dict[str, _GaussianProcess] = {}
+        self._keys: List[str] = []
+        self._load()
+
+    def set_bounds(self, bounds: Dict[str, Any]) -> None:
+        """Parameter bounds from the engine (numeric keys become features)."""
+        if bounds != self.bounds:
+            self.bounds = bounds
+            self._models = {}
+
+    def add(self, config: Dict[str, Any], results: Dict[str, Any]) -> None:
+        """Record one simulated config (partial or empty results are skipped)."""
+        metrics = observed_metrics(results)
+        if metrics is None:
+            return
+        self.history.append((dict(config), metrics))
+        self._models = {}
+        if self.history_path:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.history_path, "a") as f:
+                entry = {"fingerprint": self.fingerprint, "config": config, "metrics": metrics}
+                f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    def ready(self) -> bool:
+        return bool(self.bounds) and len(self.history) >= MIN_HISTORY
+
+    def predict(self, configs: List[Dict[str, Any]]) -> List[Dict[str, Tuple[float, float]]]:
+        """Per config: metric -> (mean, std). Raises if the surrogate is not ready."""
+        if not self.ready():
+            raise RuntimeError("Surrogate needs parameter bounds and more history")
+        self._fit()
+        x = self._features(configs)
+        columns = {metric: model.predict(x) for metric, model in self._models.items()}
+        return [
+            {metric: (float(mean[i]), float(std[i])) for metric, (mean, std) in columns.items()}
+            for i in range(len(configs))
+        ]
+
+    def optimistic_scores(
+        self, configs: List[Dict[str, Any]], targets: Dict[str, Tuple[float, float]]
+    ) -> List[float]:
+        """Lower confidence bound on score_results' target distance (lower is better)."""
+        scores = []
+        for prediction in self.predict(configs):
+            score = 0.0
+            for metric, (lo, hi) in targets.items():
+                if metric not in prediction:
+                    continue
+                mean, std = prediction[metric]
+                width = max(hi - lo, 1e-9)
+                score += max(lo - (mean + KAPPA * std), 0.0, (mean - KAPPA * std) - hi) / width
+            scores.append(score)
+        return scores
+
+    def screen(
+        self,
+        candidates: List[Tuple[str, Dict[str, Any]]],
+        targets: Dict[str, Tuple[float, float]],
+        keep: int,
+        parent_score: float = math.inf,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Parent plus the best-ranked candidates, at most keep in total.
+
+        Candidates whose optimistic score cannot beat parent_score are rejected.
+        Before the surrogate is ready the first keep candidates pass unchanged.
+        """
+        if not self.ready() or len(candidates) <= 1:
+            return candidates[:keep]
+        parent, rest = candidates[0], candidates[1:]
+        scores = self.optimistic_scores([config for _, config in rest], targets)
+        ranked = sorted(zip(scores, range(len(rest))))
+        kept = [rest[i] for score, i in ranked if score < parent_score]
+        return [parent] + kept[: keep - 1]
+
+    def propose(
+        self,
+        config: Dict[str, Any],
+        targets: Dict[str, Tuple[float, float]],
+        rng: random.Random,
+        sigma: float,
+    ) -> Optional[Dict[str, Any]]:
+        """Most informative nearby config: lowest LCB among sampled mutations."""
+        if not self.ready():
+            return None
+        samples = [mutate(config, self.bounds, rng, sigma) for _ in range(PROPOSAL_SAMPLES)]
+        scores = self.optimistic_scores(samples, targets)
+        return samples[int(np.argmin(scores))]
+
+    def _fit(self) -> None:
+        if self._models:
+            return
+        self._keys = sorted(
+            k
+            for k, b in self.bounds.items()
+            if isinstance(b, dict) and b.get("max", 0) > b.get("min", 0)
+        )
+        x = self._features([config for config, _ in self.history])
+        for metric in METRICS:
+            y = np.array([metrics[metric] for _, metrics in self.history], dtype=np.float64)
+            model = _GaussianProcess()
+            model.fit(x, y)
+            self._models[metric] = model
+
+    def _features(self, configs: List[Dict[str, Any]]) -> np.ndarray:
+        x = np.zeros((len(configs), len(self._keys)))
+        for j, key in enumerate(self._keys):
+            lo, hi = self.bounds[key]["min"], self.bounds[key]["max"]
+            for i, config in enumerate(configs):
+                value = config.get(key, lo)
+                x[i, j] = (float(value) - lo) / (hi - lo) if isinstance(value, (int, float)) else 0
+        return x
+
+    def _load(self) -> None:
+        if not self.history_path or not self.history_path.exists():
+            return
+        with open(self.history_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry.get("fingerprint", "") == self.fingerprint:
+                    self.history.append((entry["config"], entry["metrics"]))
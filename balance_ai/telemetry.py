@@ -0,0 +1,74 @@
+"""Loads main.gd --telemetry CSVs (per-wave and per-tower game stats) as NumPy columns."""
+
+import argparse
+import csv
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+WAVES_FILE = "waves.csv"
+TOWERS_FILE = "towers.csv"
+TEXT_COLUMNS = {"strategy", "tower", "branch"}  # Everything else is an integer
+
+Table = Dict[str, np.ndarray]
+
+
+def load_table(path: Path) -> Table:
+    """Column name -> array (int64, or str for TEXT_COLUMNS) for one telemetry CSV."""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows: List[List[str]] = [row for row in reader if row]
+
+    columns = list(zip(*rows)) if rows else [() for _ in header]
+    return {
+        name: np.array(values, dtype=str if name in TEXT_COLUMNS else np.int64)
+        for name, values in zip(header, columns)
+    }
+
+
+def load_telemetry(directory: Path) -> Dict[str, Table]:
+    """{"waves": table, "towers": table} from a --telemetry directory."""
+    directory = Path(directory)
+    return {
+        "waves": load_table(directory / WAVES_FILE),
+        "towers": load_table(directory / TOWERS_FILE),
+    }
+
+
+def wave_means(waves: Table, field: str, strategy: str = "") -> np.ndarray:
+    """Mean of field per wave number (index 0 is wave 1), over games that reached it."""
+    mask = waves["strategy"] == strategy if strategy else np.ones(len(waves["wave"]), bool)
+    numbers = waves["wave"][mask]
+    if not len(numbers):
+        return np.zeros(0)
+    totals = np.bincount(numbers - 1, weights=waves[field][mask])
+    counts = np.bincount(numbers - 1)
+    return totals / np.maximum(counts, 1)
+
+
+def tower_totals(towers: Table, field: str) -> Dict[str, int]:
+    """Sum of field per tower type over every game."""
+    ids, inverse = np.unique(towers["tower"], return_inverse=True)
+    totals = np.bincount(inverse, weights=towers[field], minlength=len(ids))
+    return {str(tower): int(total) for tower, total in zip(ids, totals)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize main.gd --telemetry output")
+    parser.add_argument("directory", type=Path, help="Directory passed to --telemetry")
+    args = parser.parse_args()
+
+    telemetry = load_telemetry(args.directory)
+    waves, towers = telemetry["waves"], telemetry["towers"]
+    print(f"{len(np.unique(waves['strategy']))} strategies, {len(waves['wave'])} wave rows")
+    print("wave  spawned  killed  leaked")
+    spawned, killed, leaked = (wave_means(waves, f) for f in ("spawned", "killed", "leaked"))
+    for i in range(len(spawned)):
+        print(f"{i + 1:>4}  {spawned[i]:7.1f}  {killed[i]:6.1f}  {leaked[i]:6.1f}")
+    print("tower damage (x1000):", tower_totals(towers, "damage"))
+
+
+if __name__ == "__main__":
+    main()
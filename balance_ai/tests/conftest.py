@@ -0,0 +1,17 @@
+"""Shared fixtures for balance_ai tests."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+FAKE_GODOT = Path(__file__).parent / "fake_godot.py"
+
+
+@pytest.fixture
+def fake_godot(tmp_path):
+    """Executable wrapper that runs the fake Godot stub."""
+    script = tmp_path / "godot"
+    script.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_GODOT}" "$@"\n')
+    script.chmod(0o755)
+    return str(script)
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""Stand-in for `godot --headless` that mimics main.gd's CLI output.
+
+Per-game outcomes are a pure function of (strategy, seed), so sharded or
+cached runs can be checked against a single-process run without Godot.
+"""
+
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import zlib
+
+# Seconds to sleep before each strategy finishes (exercises runner timeouts)
+DELAY_S = float(os.environ.get("FAKE_GODOT_DELAY_S", "0"))
+BOOT_LOG = os.environ.get("FAKE_GODOT_BOOT_LOG", "")  # one line appended per process
+
+STRATEGY_NAMES = {"a": "DualTower", "b": "TripleTower", "c": "Flanking", "d": "CentralDefense"}
+ALL_IDS = ["a", "b", "c", "d"] + [
+    "archer_sniper",
+    "archer_machine",
+    "cannon_siege",
+    "cannon_railgun",
+    "frost_permafrost",
+    "frost_cryo",
+    "lightning_storm",
+    "lightning_disruptor",
+    "flame_hellfire",
+    "flame_plasma",
+    "wall_fortress",
+    "wall_tar",
+    "rush_aoe",
+    "smash_maze",
+]
+UPGRADE_IDS = ALL_IDS[4:]
+STRING_FLAGS = ("--strategy", "--config", "--configs", "--telemetry", "--ai")
+
+
+DEFAULT_CONFIG = {"starting_gold": 120}
+MAX_WAVES = 0  # --max-waves / "max_waves" of the current run (0 = every wave)
+
+
+def play_game(strat_id: str, seed: int, config: dict = DEFAULT_CONFIG) -> dict:
+    """Deterministic fake game result; starting_gold stands in for the whole config."""
+    gold = config.get("starting_gold", 120)
+    limit = f":{MAX_WAVES}" if MAX_WAVES else ""  # A shorter roster plays a different game
+    h = zlib.crc32(f"{strat_id}:{seed}:{gold}{limit}".encode())
+    waves = MAX_WAVES or 30
+    return {
+        "won": h % 4 != 0,
+        "final_wave": waves if h % 4 != 0 else 1 + h % waves,
+        "shrine_hp": h % 60 + 40,
+        "gold": h % 37,
+        "killed": 100 + h % 11,
+        "leaked": h % 7,
+        "duration_ms": 3 + h % 5,
+        "ticks": 800 + h % 200,
+        "path": f"archer:T{1 + h % 3}",
+    }
+
+
+def game_result(game: dict) -> dict:
+    """play_game() under GameResult.to_dict() field names, as --ndjson-games prints it."""
+    return {
+        "won": game["won"],
+        "final_wave": game["final_wave"],
+        "final_shrine_hp": game["shrine_hp"],
+        "final_gold": game["gold"],
+        "enemies_killed": game["killed"],
+        "enemies_leaked": game["leaked"],
+        "duration_ms": game["duration_ms"],
+        "ticks": game["ticks"],
+    }
+
+
+# Adaptive target band -> record field (main.gd --target-* flags)
+TARGET_FIELDS = {
+    "win_rate": "win_rate",
+    "shrine_hp": "avg_shrine_hp",
+    "gold_remaining": "avg_gold",
+    "enemies_leaked": "avg_leaked",
+}
+TARGET_FLAGS = {
+    "--target-win-rate": "win_rate",
+    "--target-shrine-hp": "shrine_hp",
+    "--target-gold": "gold_remaining",
+    "--target-leaked": "enemies_leaked",
+}
+
+# ResultAccumulator.METRICS / QUANTILE_METRICS (play_game fields of the same names)
+METRICS = ["final_wave", "shrine_hp", "gold", "killed", "leaked", "ticks", "duration_ms"]
+QUANTILE_METRICS = ["shrine_hp", "gold", "leaked"]
+
+
+def fake_spread(games: list) -> dict:
+    """std_*, p5/p50/p95_* and "distributions", as ResultAccumulator.to_dict() adds them."""
+    spread: dict = {"distributions": {}}
+    for metric in METRICS:
+        values = [g[metric] for g in games]
+        spread[f"std_{metric}"] = statistics.stdev(values) if len(values) > 1 else 0.0
+    for metric in QUANTILE_METRICS:
+        values = sorted(g[metric] for g in games)
+        for percent in (5, 50, 95):
+            rank = max(math.ceil(len(values) * percent / 100), 1)
+            spread[f"p{percent}_{metric}"] = values[rank - 1]
+        histogram: dict = {}
+        for value in values:
+            histogram[str(value)] = histogram.get(str(value), 0) + 1
+        spread["distributions"][metric] = histogram
+    return spread
+
+
+def fake_profile(games: list) -> dict:
+    """Mimic TickProfiler.to_dict(): every tick runs each phase once."""
+    ticks = sum(g["ticks"] for g in games)
+    phases = {"spawns": (1, ticks), "move": (3, ticks), "tower_attacks": (5, ticks)}
+    return {
+        "phases": {p: {"us": us * calls, "calls": calls} for p, (us, calls) in phases.items()},
+        "specials": {"beam": {"us": 2 * len(games), "calls": len(games)}},
+        "waves": {"1": {"move": {"us": 3 * ticks, "calls": ticks}}},
+    }
+
+
+def fake_stop_reason(record: dict, targets: dict, stopped: bool) -> str:
+    """Deterministic games decide every target band at the first check."""
+    if not stopped:
+        return "max_games"
+    if not targets:
+        return "converged"
+    inside = all(lo <= record[TARGET_FIELDS[m]] <= hi for m, (lo, hi) in targets.items())
+    return "target_met" if inside else "target_missed"
+
+
+def run_strategy(
+    strat_id: str,
+    count: int,
+    seed: int,
+    on_game=None,
+    adaptive=None,
+    config=DEFAULT_CONFIG,
+    profile=False,
+) -> dict:
+    # Adaptive stand-in: stop at the first check (min_games), as deterministic games would
+    played = min(count, adaptive.get("min_games", 50)) if adaptive is not None else count
+    games = [play_game(strat_id, seed + i, config) for i in range(played)]
+    if on_game is not None:
+        for i, game in enumerate(games):
+            on_game(i, game)
+    time.sleep(DELAY_S)
+    wins = sum(1 for g in games if g["won"])
+    paths: dict = {}
+    for g in games:
+        paths[g["path"]] = paths.get(g["path"], 0) + 1
+    record = {
+        "name": STRATEGY_NAMES.get(strat_id, strat_id),
+        "description": "fake",
+        "runs": played,
+        "simulated": played,
+        "wins": wins,
+        "win_rate": wins / played,
+        "elapsed_ms": float(sum(g["duration_ms"] for g in games)),
+        "upgrade_path_counts": paths,
+    }
+    for metric in METRICS:
+        record[f"avg_{metric}"] = sum(g[metric] for g in games) / played
+    record.update(fake_spread(games))
+    if profile:
+        record["profile"] = fake_profile(games)
+    if adaptive is not None:
+        record["adaptive_targets"] = adaptive.get("targets", {})
+        record["stop_reason"] = fake_stop_reason(record, record["adaptive_targets"], played < count)
+    return record
+
+
+def parse_args(argv: list) -> dict:
+    user_args = argv[argv.index("--") + 1 :] if "--" in argv else []
+    opts = {
+        "count": 100,
+        "seed": 12345,
+        "strategy": "all",
+        "config": "",
+        "configs": "",
+        "output": "text",
+        "adaptive": None,
+        "telemetry": "",
+        "ai": "",
+        "profile": False,
+        "max_waves": 0,
+    }
+    for i, arg in enumerate(user_args):
+        if arg in ("--json", "--ndjson", "--ndjson-games"):
+            opts["output"] = arg[2:]
+        elif arg == "--profile":
+            opts["profile"] = True
+        elif arg in ("--fast-forward", "--reuse-prefix", "--every-seed"):
+            pass  # Same results either way (fake games always depend on the seed)
+        elif arg == "--adaptive":
+            opts["adaptive"] = opts["adaptive"] or {"targets": {}}
+        elif arg == "--min-games" and i + 1 < len(user_args):
+            opts["adaptive"] = opts["adaptive"] or {"targets": {}}
+            opts["adaptive"]["min_games"] = int(user_args[i + 1])
+        elif arg in TARGET_FLAGS and i + 1 < len(user_args):
+            opts["adaptive"] = opts["adaptive"] or {"targets": {}}
+            metric = TARGET_FLAGS[arg]
+            opts["adaptive"]["targets"][metric] = [float(v) for v in user_args[i + 1].split(",")]
+        elif arg in ("--count", "--seed", "--max-waves") and i + 1 < len(user_args):
+            opts[arg[2:].replace("-", "_")] = int(user_args[i + 1])
+        elif arg in STRING_FLAGS and i + 1 < len(user_args):
+            opts[arg[2:]] = user_args[i + 1]
+    return opts
+
+
+def expand(strategy: str) -> list:
+    if strategy == "all":
+        return list(ALL_IDS)
+    if strategy == "upgrades":
+        return list(UPGRADE_IDS)
+    return [s for s in strategy.split(",") if s]
+
+
+def load_config(path: str) -> dict:
+    """Mimic BalanceConfig.load_from_file (relative to the project/cwd)."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return dict(DEFAULT_CONFIG)
+
+
+def load_config_list(path: str) -> list:
+    """Mimic main.gd _load_config_list: a JSON array or one config per line."""
+    with open(path) as f:
+        text = f.read()
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return parsed if isinstance(parsed, list) else [parsed]
+
+
+def build_output(
+    strategy: str, count: int, seed: int, config: dict, adaptive=None, profile=False
+) -> dict:
+    strategies = {
+        s: run_strategy(s, count, seed, adaptive=adaptive, config=config, profile=profile)
+        for s in expand(strategy)
+    }
+    return summarize(strategies, config)
+
+
+def summarize(strategies: dict, config: dict) -> dict:
+    best, best_rate = "", -1.0
+    for strat_id, record in strategies.items():
+        if record["win_rate"] > best_rate:
+            best, best_rate = strat_id, record["win_rate"]
+    return {
+        "config": config,
+        "strategies": strategies,
+        "best_strategy": best,
+        "ai_mode": "",
+        "total_duration_ms": 1,
+        "timestamp": "2026-01-01T00:00:00",
+        "parameter_bounds": {"starting_gold": {"min": 50, "max": 300, "step": 10}},
+    }
+
+
+def write_telemetry(directory: str, strategy: str, count: int, seed: int, config: dict) -> None:
+    """Mimic main.gd --telemetry: one wave row and one tower row per fake game."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "waves.csv"), "w") as waves, open(
+        os.path.join(directory, "towers.csv"), "w"
+    ) as towers:
+        waves.write("strategy,game,seed,wave,success,ticks,spawned,killed,leaked,damage,")
+        waves.write("gold_earned,shrine_hp,gold\n")
+        towers.write("strategy,game,seed,tower,x,y,tier,branch,damage,kills,shots\n")
+        for strat_id in expand(strategy):
+            for i in range(count):
+                g = play_game(strat_id, seed + i, config)
+                spawned = g["killed"] + g["leaked"]
+                waves.write(
+                    f"{strat_id},{i},{seed + i},1,{int(g['won'])},{g['duration_ms']},{spawned},"
+                    f"{g['killed']},{g['leaked']},{g['killed'] * 1000},{g['gold']},"
+                    f"{g['shrine_hp']},{g['gold']}\n"
+                )
+                towers.write(f"{strat_id},{i},{seed + i},archer,3,2,1,,{g['killed'] * 1000},")
+                towers.write(f"{g['killed']},{g['killed'] * 2}\n")
+
+
+def serve() -> None:
+    """Mimic main.gd --serve: one JSON request per stdin line."""
+    global MAX_WAVES
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            break
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            print(json.dumps({"error": "Invalid request: " + line}), flush=True)
+            continue
+        if request.get("cmd") == "quit":
+            break
+        MAX_WAVES = int(request.get("max_waves", 0))
+        output = build_output(
+            request.get("strategy", "all"),
+            int(request.get("count", 100)),
+            int(request.get("seed", 12345)),
+            request.get("config") or dict(DEFAULT_CONFIG),
+            request.get("adaptive"),
+            bool(request.get("profile")),
+        )
+        output["id"] = request.get("id")
+        print(json.dumps(output), flush=True)
+
+
+def emit(record: dict) -> None:
+    print(json.dumps(record), flush=True)
+
+
+def stream(opts: dict, per_game: bool) -> None:
+    """Mimic main.gd --ndjson / --ndjson-games."""
+    strategies = {}
+    for strat_id in expand(opts["strategy"]):
+
+        def on_game(index: int, game: dict, strat_id=strat_id) -> None:
+            emit(
+                {
+                    "type": "game",
+                    "strategy": strat_id,
+                    "index": index,
+                    "seed": opts["seed"] + index,
+                    "result": game_result(game),
+                }
+            )
+
+        record = run_strategy(
+            strat_id,
+            opts["count"],
+            opts["seed"],
+            on_game if per_game else None,
+            opts["adaptive"],
+            load_config(opts["config"]),
+            opts["profile"],
+        )
+        strategies[strat_id] = record
+        emit({"type": "strategy", "id": strat_id, "record": record})
+
+    summary = summarize(strategies, load_config(opts["config"]))
+    del summary["strategies"]
+    emit(dict(summary, type="done"))
+
+
+def main() -> None:
+    global MAX_WAVES
+    print("Godot Engine v4.3.stable.official - https://godotengine.org", flush=True)
+    if BOOT_LOG:
+        with open(BOOT_LOG, "a") as f:
+            f.write(" ".join(sys.argv[1:]) + "\n")
+    if "--serve" in sys.argv:
+        serve()
+        return
+    opts = parse_args(sys.argv)
+    MAX_WAVES = opts["max_waves"]
+    if opts["ai"]:
+        opts["strategy"] = f"ai_{opts['ai']}"  # main.gd reports the AI as one strategy
+    if opts["configs"]:
+        for i, config in enumerate(load_config_list(opts["configs"])):
+            output = build_output(
+                opts["strategy"],
+                opts["count"],
+                opts["seed"],
+                config,
+                opts["adaptive"],
+                opts["profile"],
+            )
+            print(json.dumps(dict(output, index=i)), flush=True)
+        return
+    if opts["output"] in ("ndjson", "ndjson-games"):
+        stream(opts, per_game=opts["output"] == "ndjson-games")
+        return
+    config = load_config(opts["config"])
+    if opts["telemetry"]:
+        write_telemetry(opts["telemetry"], opts["strategy"], opts["count"], opts["seed"], config)
+    output = build_output(
+        opts["strategy"], opts["count"], opts["seed"], config, opts["adaptive"], opts["profile"]
+    )
+    print(json.dumps(output))
+
+
+if __name__ == "__main__":
+    main()
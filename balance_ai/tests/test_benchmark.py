@@ -0,0 +1,78 @@
+"""Tests for benchmark.py"""
+
+import pytest
+from benchmark import (
+    SUITES,
+    append_history,
+    check_regression,
+    load_history,
+    run_benchmarks,
+    throughput,
+)
+
+
+def entry(games_per_s, launch_ms=100.0, backend="fake", count=10):
+    return {
+        "backend": backend,
+        "count": count,
+        "seed": 1,
+        "suites": {"baselines": {"games_per_s": games_per_s, "ticks_per_s": games_per_s * 900}},
+        "python": {"launch_ms": launch_ms, "json_parse_us": 50.0, "cache_hit_us": 30.0},
+    }
+
+
+def test_throughput_uses_engine_time():
+    records = {
+        "a": {"runs": 10, "avg_ticks": 1000, "elapsed_ms": 500},
+        "b": {"runs": 10, "avg_ticks": 500, "avg_duration_ms": 50},  # No elapsed_ms
+    }
+
+    stats = throughput(records)
+
+    assert stats["strategies"]["a"]["games_per_s"] == pytest.approx(20)
+    assert stats["strategies"]["a"]["ticks_per_s"] == pytest.approx(20000)
+    assert stats["strategies"]["b"]["games_per_s"] == pytest.approx(20)
+    assert stats["games"] == 20
+    assert stats["games_per_s"] == pytest.approx(20 / 1.0)
+    assert stats["ticks_per_s"] == pytest.approx(15000 / 1.0)
+
+
+def test_check_regression_against_recent_median():
+    history = [entry(100), entry(110), entry(90), entry(10, backend="godot")]
+
+    assert check_regression(entry(95), history) == []
+    assert check_regression(entry(50), []) == []
+    assert check_regression(entry(50, count=20), history) == []  # Not comparable
+
+    regressions = check_regression(entry(80, launch_ms=150), history)
+    assert {r["metric"] for r in regressions} == {
+        "baselines.games_per_s",
+        "baselines.ticks_per_s",
+        "python.launch_ms",
+    }
+    slow = next(r for r in regressions if r["metric"] == "baselines.games_per_s")
+    assert (slow["baseline"], slow["slowdown"]) == (100, pytest.approx(0.2))
+
+
+def test_history_round_trip(tmp_path):
+    path = tmp_path / "results" / "benchmarks.jsonl"
+    assert load_history(path) == []
+
+    append_history(entry(100), path)
+    append_history(entry(90), path)
+
+    assert [h["suites"]["baselines"]["games_per_s"] for h in load_history(path)] == [100, 90]
+
+
+def test_run_benchmarks_falls_back_to_stub(tmp_path):
+    result = run_benchmarks(godot_path=str(tmp_path / "no-godot"), count=3, seed=7)
+
+    assert result["backend"] == "fake"
+    assert set(result["suites"]) == set(SUITES)
+    assert set(result["suites"]["baselines"]["strategies"]) == {"a", "b", "c", "d"}
+    assert list(result["suites"]["ai_balanced"]["strategies"]) == ["ai_balanced"]
+    assert "rush_aoe" not in result["suites"]["upgrades"]["strategies"]
+    for suite in result["suites"].values():
+        assert suite["games_per_s"] > 0 and suite["ticks_per_s"] > 0
+    assert result["python"]["launch_ms"] > 0
+    assert result["python"]["cache_hit_us"] > 0
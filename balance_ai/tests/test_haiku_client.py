@@ -0,0 +1,175 @@
+"""Tests for haiku_client.py"""
+
+import asyncio
+import json
+
+import pytest
+from haiku_client import (
+    AnthropicBackend,
+    HaikuClient,
+    ResponseCache,
+    StubBackend,
+    TokenBucket,
+    parse_response,
+)
+
+TARGETS = {
+    "win_rate": (0.95, 1.0),
+    "shrine_hp": (85, 100),
+    "gold_remaining": (0, 20),
+    "enemies_leaked": (0, 5),
+}
+CONFIG = {"starting_gold": 120}
+RESULTS = {
+    "strategies": {
+        "a": {
+            "name": "Archers",
+            "win_rate": 0.5,
+            "avg_shrine_hp": 50.0,
+            "avg_gold": 10.0,
+            "avg_killed": 40,
+            "avg_leaked": 5,
+        }
+    }
+}
+
+
+class SlowBackend:
+    """Echoes a changes dict after a delay and tracks requests in flight."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts = []
+
+    async def complete(self, prompt, model, max_tokens):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        gold = 0
+        if "Starting gold: " in prompt:
+            gold = int(prompt.split("Starting gold: ")[1].split("\n")[0])
+        text = "```json\n" + json.dumps({"changes": {"starting_gold": gold + 10}}) + "\n```"
+        return text, {"input_tokens": 1000, "output_tokens": 20}
+
+
+def client(backend, **kwargs):
+    kwargs.setdefault("requests_per_minute", 60000)
+    return HaikuClient(backend=backend, **kwargs)
+
+
+def test_parse_response_strips_code_fences_and_reports_bad_json():
+    assert parse_response('```json\n{"changes": {}}\n```') == {"changes": {}}
+    assert parse_response('```\n{"a": 1}\n```') == {"a": 1}
+    failed = parse_response("not json")
+    assert failed["changes"] == {} and "error" in failed
+
+
+def test_token_bucket_allows_a_burst_then_spaces_requests():
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0])
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+    now[0] = 3.0  # Debt repaid and the bucket refilled to capacity
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_analyze_many_runs_concurrently_in_request_order():
+    backend = SlowBackend()
+    haiku = client(backend, max_concurrency=3)
+    requests = [(dict(CONFIG, starting_gold=100 + i), RESULTS) for i in range(6)]
+
+    analyses = haiku.analyze_batch(requests, TARGETS, "goal")
+    assert [a["changes"]["starting_gold"] for a in analyses] == [110 + i for i in range(6)]
+    assert backend.max_in_flight == 3
+    assert haiku.stats()["requests"] == 6
+
+
+def test_rate_limit_delays_requests_beyond_the_burst():
+    haiku = client(SlowBackend(delay=0), requests_per_minute=600, burst=1)  # 0.1s apart
+    requests = [(dict(CONFIG, starting_gold=100 + i), RESULTS) for i in range(3)]
+
+    loop = asyncio.new_event_loop()
+    start = loop.time()
+    loop.run_until_complete(haiku.analyze_many(requests, TARGETS, "goal"))
+    assert loop.time() - start >= 0.19
+    loop.close()
+
+
+def test_identical_prompts_are_answered_from_disk(tmp_path):
+    backend = SlowBackend(delay=0)
+    haiku = client(backend, cache=ResponseCache(tmp_path))
+    first = haiku.analyze(CONFIG, RESULTS, TARGETS, "goal")
+    assert haiku.analyze(CONFIG, RESULTS, TARGETS, "goal") == first
+    assert haiku.stats()["cache_hits"] == 1
+
+    # A fresh client shares the disk cache; another model does not
+    assert client(backend, cache=ResponseCache(tmp_path)).analyze(
+        CONFIG, RESULTS, TARGETS, "goal"
+    ) == first
+    client(backend, model="other", cache=ResponseCache(tmp_path)).analyze(
+        CONFIG, RESULTS, TARGETS, "goal"
+    )
+    assert len(backend.prompts) == 2
+
+
+def test_unparseable_replies_are_not_cached(tmp_path):
+    """A bad reply is retried on the next identical prompt; the good one is cached."""
+
+    class FlakyBackend:
+        def __init__(self):
+            self.replies = ["not json", json.dumps({"changes": {"starting_gold": 130}})]
+            self.calls = 0
+
+        async def complete(self, prompt, model, max_tokens):
+            self.calls += 1
+            return self.replies.pop(0), {}
+
+    backend = FlakyBackend()
+    haiku = client(backend, cache=ResponseCache(tmp_path))
+
+    assert "error" in haiku.analyze(CONFIG, RESULTS, TARGETS, "goal")
+    assert haiku.analyze(CONFIG, RESULTS, TARGETS, "goal")["changes"] == {"starting_gold": 130}
+    assert haiku.analyze(CONFIG, RESULTS, TARGETS, "goal")["changes"] == {"starting_gold": 130}
+    assert backend.calls == 2
+    assert haiku.stats()["cache_hits"] == 1
+
+
+def test_stub_backend_is_deterministic_and_offline(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    with pytest.raises(ValueError):
+        AnthropicBackend()
+
+    haiku = HaikuClient(backend=StubBackend())
+    first = haiku.analyze(CONFIG, RESULTS, TARGETS, "goal")
+    assert first == haiku.analyze(CONFIG, RESULTS, TARGETS, "goal")
+    assert first["changes"] == {} and first["converged"] is False
+    assert haiku.analyze(dict(CONFIG, starting_gold=130), RESULTS, TARGETS, "goal") != first
+
+
+def test_calls_record_prompt_size_tokens_and_latency(tmp_path):
+    metrics = tmp_path / "calls.jsonl"
+    haiku = client(SlowBackend(delay=0), cache=ResponseCache(tmp_path), metrics_path=metrics)
+    haiku.analyze(CONFIG, RESULTS, TARGETS, "goal")
+    haiku.analyze(CONFIG, RESULTS, TARGETS, "goal")
+
+    first, cached = [json.loads(line) for line in metrics.read_text().splitlines()]
+    assert first["mode"] == "full" and not first["cached"]
+    assert (first["input_tokens"], first["output_tokens"]) == (1000, 20)
+    assert first["prompt_chars"] > 1000
+    assert cached["cached"] and cached["latency_s"] == 0
+    assert cached["input_tokens"] == cached["prompt_chars"] // 4  # Estimated
+    assert haiku.stats()["avg_prompt_chars"] == first["prompt_chars"]
+
+
+def test_compact_mode_sends_shorter_prompts():
+    full, compact = SlowBackend(delay=0), SlowBackend(delay=0)
+    previous = (dict(CONFIG, starting_gold=110), RESULTS)
+    client(full).analyze(CONFIG, RESULTS, TARGETS, "goal", previous)
+    client(compact, compact=True).analyze(CONFIG, RESULTS, TARGETS, "goal", previous)
+
+    assert "Last change: starting_gold 110->120" in compact.prompts[0]
+    assert len(compact.prompts[0]) * 3 < len(full.prompts[0])
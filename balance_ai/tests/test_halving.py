@@ -0,0 +1,102 @@
+"""Tests for halving.py"""
+
+from halving import (
+    BASELINE_STRATEGY,
+    SCREEN_WAVES,
+    fidelity_schedule,
+    format_rungs,
+    promote,
+    run_rung,
+    successive_halving,
+)
+from simulation_runner import SimulationRunner
+
+TARGETS = {"win_rate": (0.95, 1.0)}
+
+
+def result(win_rate):
+    return {"strategies": {"a": {"win_rate": win_rate}}}
+
+
+def test_fidelity_schedule_ends_at_full_fidelity():
+    schedule = fidelity_schedule(900)
+
+    assert schedule == [
+        {"runs": 100, "strategy": BASELINE_STRATEGY, "max_waves": SCREEN_WAVES},
+        {"runs": 300, "strategy": BASELINE_STRATEGY, "max_waves": 0},
+        {"runs": 900, "strategy": "all", "max_waves": 0},
+    ]
+    assert fidelity_schedule(20)[0]["runs"] == 10  # MIN_RUNS floor
+    assert fidelity_schedule(5)[0]["runs"] == 5
+    assert fidelity_schedule(900, rungs=1) == [{"runs": 900, "strategy": "all", "max_waves": 0}]
+
+
+def test_promote_keeps_best_and_parent():
+    assert promote([0.5, 0.1, 0.9, 0.1], 2) == [0, 1]
+    assert promote([0.0, 0.1, 0.9, 0.1], 3) == [0, 1, 3]
+    assert promote([], 2) == []
+
+
+def test_successive_halving_narrows_by_eta_each_rung():
+    win_rates = [0.5, 0.99, 0.7, 0.96, 0.2, 0.6, 0.97, 0.1, 0.3]
+    calls = []
+
+    def evaluate(configs, rung):
+        calls.append((len(configs), rung["runs"]))
+        return [result(win_rates[c["id"]]) for c in configs]
+
+    configs = [{"id": i} for i in range(len(win_rates))]
+    survivors, results, rungs = successive_halving(
+        configs, evaluate, fidelity_schedule(90), TARGETS
+    )
+
+    assert calls == [(9, 10), (3, 30), (1, 90)]
+    assert survivors == [0]  # Parent always promoted; 9 -> 3 -> 1 keeps only it
+    assert results == [result(0.5)]
+    assert [r["candidates"] for r in rungs] == [9, 3, 1]
+    assert "Rung 0: 9 candidates x 10 runs" in format_rungs(rungs)
+
+
+def test_successive_halving_keeps_parent_and_top_candidates():
+    win_rates = [0.5, 0.99, 0.7, 0.96, 0.2, 0.6, 0.97, 0.1, 0.3, 0.95, 0.4, 0.8]
+    configs = [{"id": i} for i in range(len(win_rates))]
+
+    survivors, results, _ = successive_halving(
+        configs,
+        lambda batch, rung: [result(win_rates[c["id"]]) for c in batch],
+        fidelity_schedule(90, rungs=2),
+        TARGETS,
+    )
+
+    assert survivors == [0, 1, 3, 6]
+    assert len(results) == 4
+
+
+def test_successive_halving_skips_screening_for_a_lone_parent():
+    calls = []
+
+    def evaluate(configs, rung):
+        calls.append(rung["strategy"])
+        return [result(1.0)]
+
+    survivors, _, rungs = successive_halving([{}], evaluate, fidelity_schedule(90), TARGETS)
+
+    assert calls == ["all"]
+    assert survivors == [0]
+    assert rungs[0]["rung"] == 2
+
+
+def test_run_rung_passes_wave_limit_to_engine(fake_godot):
+    runner = SimulationRunner(godot_path=fake_godot, persistent=True)
+    configs = [{"starting_gold": 100}, {"starting_gold": 200}]
+    screen = {"runs": 8, "strategy": "a,b", "max_waves": 10}
+    full = dict(screen, max_waves=0)
+
+    with runner:
+        short = run_rung(runner, configs, screen)
+        whole = run_rung(runner, configs, full)
+
+    assert runner.max_waves == 0
+    assert [list(r["strategies"]) for r in short] == [["a", "b"], ["a", "b"]]
+    assert short[0]["strategies"]["a"]["runs"] == 8
+    assert short[0]["strategies"] != whole[0]["strategies"]
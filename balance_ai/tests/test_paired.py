@@ -0,0 +1,78 @@
+"""Tests for paired.py"""
+
+import statistics
+
+import pytest
+from paired import compare_games, format_comparison, paired_difference, run_paired
+from simulation_runner import SimulationRunner
+
+
+def game(strategy, seed, hp, won=True):
+    return {
+        "type": "game",
+        "strategy": strategy,
+        "index": seed,
+        "seed": seed,
+        "result": {"won": won, "final_shrine_hp": hp, "final_gold": 10, "enemies_leaked": 0},
+    }
+
+
+def test_paired_difference_cancels_shared_noise():
+    """A constant shift under large per-seed noise is significant when paired."""
+    base = [10.0, 90.0, 40.0, 70.0, 20.0, 60.0]
+    candidate = [b + 2 for b in base]
+
+    stats = paired_difference(base, candidate)
+
+    assert stats["n"] == 6
+    assert stats["mean_diff"] == pytest.approx(2.0)
+    assert stats["std_diff"] == 0.0
+    assert stats["ci"] == [pytest.approx(2.0), pytest.approx(2.0)]
+    assert stats["significant"]
+    assert stats["variance_reduction"] == 1.0
+
+
+def test_paired_difference_interval():
+    base = [50.0, 60.0, 70.0, 80.0]
+    candidate = [51.0, 59.0, 73.0, 81.0]
+
+    stats = paired_difference(base, candidate, z=2.0)
+
+    diffs = [1.0, -1.0, 3.0, 1.0]
+    half = 2.0 * statistics.stdev(diffs) / 2
+    assert stats["ci"] == [pytest.approx(1.0 - half), pytest.approx(1.0 + half)]
+    assert not stats["significant"]
+    assert 0.0 < stats["variance_reduction"] < 1.0
+
+
+def test_paired_difference_without_games():
+    assert paired_difference([], [])["n"] == 0
+    assert not paired_difference([], [])["significant"]
+
+
+def test_compare_games_pairs_by_seed():
+    base = [game("a", 1, 50), game("a", 2, 80), game("b", 1, 10), {"type": "done"}]
+    candidate = [game("a", 2, 90), game("a", 1, 55), game("a", 3, 0, won=False)]
+
+    comparison = compare_games(base, candidate)
+
+    assert list(comparison) == ["a"]  # No candidate games for b
+    assert comparison["a"]["shrine_hp"]["n"] == 2  # Seed 3 has no base game
+    assert comparison["a"]["shrine_hp"]["mean_diff"] == pytest.approx(7.5)
+    assert comparison["a"]["win_rate"]["mean_diff"] == 0.0
+    assert "shrine_hp" in format_comparison(comparison)
+
+
+def test_run_paired_plays_both_configs_on_the_same_seeds(fake_godot):
+    runner = SimulationRunner(godot_path=fake_godot)
+
+    same = run_paired(runner, {"starting_gold": 150}, {"starting_gold": 150}, 12, "a,b", 3)
+    changed = run_paired(runner, {"starting_gold": 150}, {"starting_gold": 200}, 12, "a,b", 3)
+
+    assert list(same) == ["a", "b"]
+    for metrics in same.values():
+        assert metrics["shrine_hp"]["n"] == 12
+        assert metrics["shrine_hp"]["mean_diff"] == 0.0
+        assert not metrics["shrine_hp"]["significant"]
+    assert changed["a"]["shrine_hp"]["n"] == 12
+    assert changed["a"]["shrine_hp"]["std_diff"] > 0
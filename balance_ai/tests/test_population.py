@@ -0,0 +1,121 @@
+"""Tests for population.py"""
+
+import json
+import math
+import random
+
+import pytest
+from population import (
+    adapt_sigma,
+    apply_changes,
+    config_diff,
+    generate_candidates,
+    mutate,
+    score_results,
+    select_best,
+)
+
+TARGETS = {
+    "win_rate": (0.95, 1.0),
+    "shrine_hp": (85, 100),
+    "gold_remaining": (0, 20),
+    "enemies_leaked": (0, 5),
+}
+
+BOUNDS = {
+    "starting_gold": {"min": 50, "max": 300, "step": 10},
+    "archer_damage": {"min": 5000, "max": 50000, "step": 1000},
+    "lightning_chain_range": {"min": 1.5, "max": 4.0, "step": 0.5},
+}
+
+
+@pytest.fixture
+def config():
+    """Small config with int and float parameters."""
+    return {
+        "starting_gold": 120,
+        "archer_damage": 15000,
+        "lightning_chain_range": 2.5,
+        "shrine_hp": 100,
+    }
+
+
+def _results(win_rate, shrine_hp, gold, leaked):
+    return {
+        "strategies": {
+            "a": {
+                "win_rate": win_rate,
+                "avg_shrine_hp": shrine_hp,
+                "avg_gold": gold,
+                "avg_leaked": leaked,
+            }
+        }
+    }
+
+
+def test_score_is_zero_when_targets_met():
+    """All metrics in band scores 0, the same case check_targets_met accepts."""
+    assert score_results(_results(1.0, 90, 10, 1), TARGETS) == 0.0
+
+
+def test_score_grows_with_distance_from_band():
+    """Further from the bands scores worse; no strategies scores infinity."""
+    near = score_results(_results(0.9, 90, 10, 1), TARGETS)
+    far = score_results(_results(0.5, 60, 10, 1), TARGETS)
+
+    assert 0.0 < near < far
+    assert score_results({"strategies": {}}, TARGETS) == math.inf
+
+
+def test_mutate_respects_bounds_and_steps(config):
+    """Mutants stay inside bounds, on step multiples and keep value types."""
+    rng = random.Random(1)
+    for _ in range(200):
+        mutant = mutate(config, BOUNDS, rng, sigma=0.5)
+        assert mutant != config
+        assert mutant["shrine_hp"] == 100  # not in bounds, never touched
+        for key, b in BOUNDS.items():
+            assert b["min"] <= mutant[key] <= b["max"]
+            assert ((mutant[key] - b["min"]) / b["step"]).is_integer()
+        assert isinstance(mutant["starting_gold"], int)
+        assert isinstance(mutant["lightning_chain_range"], float)
+
+
+def test_apply_changes_clamps_and_ignores_unknown(config):
+    """Haiku suggestions are snapped into bounds; unknown keys are dropped."""
+    candidate = apply_changes(
+        config, {"starting_gold": 999, "archer_damage": 24, "bogus": 1}, BOUNDS
+    )
+
+    assert candidate["starting_gold"] == 300
+    assert candidate["archer_damage"] == 5000
+    assert "bogus" not in candidate
+    assert config["starting_gold"] == 120  # input untouched
+
+
+def test_generate_candidates_parent_first_and_distinct(config):
+    """Parent, then suggestions, then distinct mutants up to k."""
+    candidates = generate_candidates(
+        config, BOUNDS, 6, random.Random(3), suggestions=[{"starting_gold": 150}]
+    )
+
+    labels = [label for label, _ in candidates]
+    assert labels[:2] == ["parent", "haiku_0"]
+    assert len(candidates) == 6
+    assert candidates[0][1] == config
+    assert candidates[1][1]["starting_gold"] == 150
+    assert len({json.dumps(c, sort_keys=True) for _, c in candidates}) == 6
+
+
+def test_generate_candidates_without_bounds_is_parent_only(config):
+    """Before the first sweep reports bounds only the parent can be evaluated."""
+    assert generate_candidates(config, {}, 4, random.Random(0)) == [("parent", config)]
+
+
+def test_adapt_sigma_and_select_best():
+    """Step size widens on success and stays clamped; ties keep the parent."""
+    assert adapt_sigma(0.1, True) > 0.1 > adapt_sigma(0.1, False)
+    assert adapt_sigma(10.0, True) == 0.5
+    assert select_best([1.0, 0.5, 0.5]) == 1
+    assert select_best([0.0, 0.0]) == 0
+    assert config_diff({"a": 1, "b": 2}, {"a": 1, "b": 3}) == {"b": 3}
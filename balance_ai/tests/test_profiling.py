@@ -0,0 +1,70 @@
+"""Tests for profiling.py"""
+
+import pytest
+from profiling import collect_profile, format_profile, merge_profiles
+from result_cache import ResultCache
+from simulation_runner import SimulationRunner
+
+
+def profile(spawns_us, move_us, calls=10, wave="1"):
+    return {
+        "phases": {
+            "spawns": {"us": spawns_us, "calls": calls},
+            "move": {"us": move_us, "calls": calls},
+        },
+        "specials": {"beam": {"us": 5, "calls": 1}},
+        "waves": {wave: {"move": {"us": move_us, "calls": calls}}},
+    }
+
+
+def test_merge_profiles_sums_phases_specials_and_waves():
+    merged = merge_profiles([profile(10, 90), profile(30, 70, wave="10"), profile(0, 40)])
+
+    assert merged["phases"]["spawns"] == {"us": 40, "calls": 30}
+    assert merged["phases"]["move"] == {"us": 200, "calls": 30}
+    assert merged["specials"]["beam"] == {"us": 15, "calls": 3}
+    assert list(merged["waves"]) == ["1", "10"]  # Numeric wave order
+    assert merged["waves"]["1"]["move"] == {"us": 130, "calls": 20}
+
+
+def test_format_profile_ranks_hot_phases():
+    text = format_profile(profile(100, 300))
+    lines = text.splitlines()
+
+    assert lines[1].startswith("move") and "75.0%" in lines[1]
+    assert lines[2].startswith("spawns")
+    assert "tower special" in text and "beam" in text
+    assert "move 100%" in text.splitlines()[-1]
+    assert "wave" not in format_profile(profile(1, 1), per_wave=False)
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_profiled_run_returns_profiles(fake_godot, persistent):
+    with SimulationRunner(godot_path=fake_godot, persistent=persistent, profile=True) as runner:
+        results = runner.run_simulations(count=4, strategy="a,b", seed=3)
+
+    for record in results["strategies"].values():
+        assert record["profile"]["phases"]["move"]["calls"] == record["avg_ticks"] * 4
+    total = collect_profile(results)["phases"]["move"]["calls"]
+    assert total == sum(r["avg_ticks"] * 4 for r in results["strategies"].values())
+
+
+def test_sharded_profiles_merge(fake_godot):
+    single = SimulationRunner(godot_path=fake_godot, profile=True)
+    sharded = SimulationRunner(godot_path=fake_godot, workers=2, profile=True)
+
+    expected = single.run_simulations(count=6, strategy="a", seed=1)
+    merged = sharded.run_simulations(count=6, strategy="a", seed=1)
+
+    assert merged["strategies"]["a"]["profile"] == expected["strategies"]["a"]["profile"]
+
+
+def test_profiled_runs_skip_the_cache(fake_godot, tmp_path):
+    runner = SimulationRunner(
+        godot_path=fake_godot, cache=ResultCache(tmp_path / "cache"), profile=True
+    )
+
+    runner.run_simulations(count=2, strategy="a", seed=1)
+
+    assert runner.cache is None
+    assert not list((tmp_path / "cache").glob("*.json"))
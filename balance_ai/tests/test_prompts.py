@@ -1,6 +1,41 @@
 """Tests for prompts.py"""
 
-from prompts import build_analysis_prompt
+from prompts import (
+    build_analysis_prompt,
+    build_compact_prompt,
+    off_target_metrics,
+    relevant_params,
+)
+
+TARGETS = {
+    "win_rate": (0.95, 1.0),
+    "shrine_hp": (85, 100),
+    "gold_remaining": (0, 20),
+    "enemies_leaked": (0, 5),
+}
+BOUNDS = {
+    "starting_gold": {"min": 50, "max": 300, "step": 10},
+    "archer_damage": {"min": 5000, "max": 50000, "step": 1000},
+    "grunt_gold": {"min": 2, "max": 15, "step": 1},
+    "shrine_hp": {"min": 50, "max": 200, "step": 10},
+    "boss_golem_hp": {"min": 500, "max": 5000, "step": 100},
+}
+
+
+def results_with(win_rate, shrine_hp, gold, leaked):
+    return {
+        "strategies": {
+            "a": {
+                "name": "DualTower",
+                "win_rate": win_rate,
+                "avg_shrine_hp": shrine_hp,
+                "avg_gold": gold,
+                "avg_killed": 100,
+                "avg_leaked": leaked,
+            },
+            "b": {"name": "TripleTower", "win_rate": 0.1, "avg_shrine_hp": 0.0},
+        }
+    }
 
 
 def test_build_analysis_prompt():
@@ -52,3 +87,41 @@ def test_build_analysis_prompt():
     assert "75.0%" in prompt
     assert "starting_gold: 50 to 200" in prompt
     assert "Output ONLY valid JSON" in prompt
+
+
+def test_off_target_metrics_use_best_strategy():
+    assert off_target_metrics(results_with(0.97, 90, 10, 2), TARGETS) == []
+    assert off_target_metrics(results_with(0.5, 90, 40, 2), TARGETS) == [
+        "win_rate",
+        "gold_remaining",
+    ]
+
+
+def test_relevant_params_put_last_changes_first():
+    assert relevant_params(["gold_remaining"], BOUNDS) == ["starting_gold", "grunt_gold"]
+    assert relevant_params(["win_rate"], BOUNDS, changed=["boss_golem_hp"], limit=3) == [
+        "boss_golem_hp",
+        "shrine_hp",
+        "archer_damage",
+    ]
+    assert relevant_params([], BOUNDS) == []
+
+
+def test_compact_prompt_shows_diff_effect_and_sparse_schema():
+    config = {"starting_gold": 130, "archer_damage": 15000, "grunt_gold": 5, "shrine_hp": 100}
+    previous = (dict(config, starting_gold=120), results_with(0.6, 70, 35, 8))
+    prompt = build_compact_prompt(
+        config, results_with(0.97, 90, 40, 2), TARGETS, "Tighten gold", BOUNDS, previous
+    )
+
+    assert "Goal: Tighten gold" in prompt
+    assert "Best strategy: a (DualTower)" in prompt
+    assert "- gold_remaining: 40 (target 0-20) OFF" in prompt
+    assert "Last change: starting_gold 120->130" in prompt
+    assert "win_rate 0.6->0.97" in prompt
+    assert "- starting_gold: 130; 50-300, step 10" in prompt
+    assert "archer_damage" not in prompt  # Only gold is off target
+    assert "<new_value or null>" not in prompt
+
+    fresh = build_compact_prompt(config, results_with(0.8, 80, 40, 6), TARGETS, "g", BOUNDS)
+    assert "Last change" not in fresh
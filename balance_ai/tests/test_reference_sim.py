@@ -0,0 +1,119 @@
+"""Tests for reference_sim.py"""
+
+import json
+
+import numpy as np
+import pytest
+from config_manager import PROJECT_PATH
+from reference_sim import (
+    MODELED_WAVES,
+    WAVES,
+    ReferenceSimulator,
+    evaluate_configs,
+    flow_field_path,
+    place_towers,
+    validate_against_godot,
+)
+
+TOTAL_ENEMIES = sum(count for _, _, groups in WAVES for _, count in groups)
+NO_TOWERS = {"starting_gold": 50, "archer_cost": 80}  # Nothing affordable: every enemy leaks
+
+
+@pytest.fixture
+def config():
+    with open(PROJECT_PATH / "balance_config.json") as f:
+        return json.load(f)
+
+
+class StubRunner:
+    """run_config_batch stand-in returning canned Godot results."""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def run_config_batch(self, configs, count, strategy, seed):
+        self.calls.append((len(configs), count, strategy, seed))
+        return self.results
+
+
+def test_layout_matches_main_gd_placement_rules():
+    # b's first archer and d's first archer would cover the shrine tile (4, 4)
+    assert place_towers("b", 175, 80) == [(4, 2), (6, 3)]
+    assert place_towers("d", 175, 80) == [(6, 4)]
+    assert place_towers("a", 100, 80) == [(3, 2)]  # Second archer unaffordable
+
+    assert flow_field_path((2, 0), frozenset()) == [
+        (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (3, 4), (4, 4)
+    ]
+    assert flow_field_path((2, 0), frozenset({(2, 0)})) == []
+
+
+def test_undefended_shrine_takes_every_leak():
+    survived = evaluate_configs([dict(NO_TOWERS, shrine_hp=1000)], ["a"])[0]["strategies"]["a"]
+    assert survived["survived"]
+    assert survived["avg_leaked"] == TOTAL_ENEMIES
+    assert survived["avg_shrine_hp"] == 1000 - TOTAL_ENEMIES
+    assert survived["avg_gold"] == 50
+
+    lost = evaluate_configs([dict(NO_TOWERS, shrine_hp=3)], ["a"])[0]["strategies"]["a"]
+    assert not lost["survived"]
+    assert (lost["avg_final_wave"], lost["avg_leaked"], lost["avg_shrine_hp"]) == (1, 3, 0)
+
+
+def test_perfect_waves_pay_the_bonus():
+    overwhelming = {
+        "starting_gold": 200,
+        "archer_damage": 1000000,
+        "archer_attack_speed_ms": 100,
+        "archer_range": 20,
+    }
+    record = evaluate_configs([overwhelming], ["a"])[0]["strategies"]["a"]
+
+    gold = 200 - 2 * 80
+    for _, _, groups in WAVES:
+        wave_gold = sum(count * {"grunt": 5, "runner": 8}[enemy] for enemy, count in groups)
+        gold += wave_gold + wave_gold * 250 // 1000
+    assert record["avg_leaked"] == 0
+    assert record["avg_killed"] == TOTAL_ENEMIES
+    assert record["avg_gold"] == gold
+
+
+def test_batched_lanes_match_single_runs(config):
+    configs = [
+        dict(config, archer_damage=damage, grunt_speed=speed, shrine_hp=hp)
+        for damage, speed, hp in [(8000, 1200, 20), (24000, 900, 100), (15000, 2000, 40)]
+    ]
+    batched = ReferenceSimulator(configs).run()
+    for c, single_config in enumerate(configs):
+        single = ReferenceSimulator([single_config]).run()
+        for key, values in single.items():
+            np.testing.assert_array_equal(batched[key][c], values[0], err_msg=key)
+
+
+def test_validate_reports_only_disagreements(config):
+    weak = dict(config, shrine_hp=5)
+    reference = evaluate_configs([config, weak])
+    godot = json.loads(json.dumps(reference))
+    for result in godot:
+        for record in result["strategies"].values():
+            if record["survived"]:
+                record["avg_final_wave"] = 14.0  # Godot plays past the modeled waves
+    runner = StubRunner(godot)
+
+    assert validate_against_godot(runner, [config, weak], count=10, seed=7) == []
+    assert runner.calls == [(2, 10, "a,b,c,d", 7)]
+
+    lost = next(s for s, r in reference[1]["strategies"].items() if not r["survived"])
+    godot[1]["strategies"][lost]["avg_gold"] += 1
+    godot[0]["strategies"]["a"]["avg_final_wave"] = MODELED_WAVES - 2
+    mismatches = validate_against_godot(runner, [config, weak])
+    assert {(m["config"], m["strategy"], m["field"]) for m in mismatches} == {
+        (1, lost, "avg_gold"),
+        (0, "a", "avg_final_wave"),
+    }
+
+
+def test_unknown_strategy_is_rejected(config):
+    with pytest.raises(ValueError):
+        ReferenceSimulator([config], ["rush_aoe"])
@@ -0,0 +1,161 @@
+"""Tests for result_cache.py"""
+
+import os
+
+import pytest
+from result_cache import ResultCache, cache_key, source_fingerprint
+from simulation_runner import SimulationRunner
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Minimal project tree with simulation sources and a config."""
+    (tmp_path / "simulation").mkdir()
+    (tmp_path / "simulation" / "combat.gd").write_text("extends RefCounted\n")
+    (tmp_path / "resources").mkdir()
+    (tmp_path / "resources" / "archer.tres").write_text("[resource]\n")
+    (tmp_path / "balance_config.json").write_text('{"starting_gold": 120}')
+    return tmp_path
+
+
+def test_cache_key_is_canonical():
+    """Key ignores dict ordering but changes with any input."""
+    a = cache_key({"x": 1, "y": 2}, "a", 1, 10, "fp")
+    b = cache_key({"y": 2, "x": 1}, "a", 1, 10, "fp")
+
+    assert a == b
+    assert cache_key({"x": 1, "y": 3}, "a", 1, 10, "fp") != a
+    assert cache_key({"x": 1, "y": 2}, "b", 1, 10, "fp") != a
+    assert cache_key({"x": 1, "y": 2}, "a", 2, 10, "fp") != a
+    assert cache_key({"x": 1, "y": 2}, "a", 1, 11, "fp") != a
+    assert cache_key({"x": 1, "y": 2}, "a", 1, 10, "fp2") != a
+
+
+def test_source_fingerprint_tracks_sources(project):
+    """Editing a simulation source changes the fingerprint; other files do not."""
+    before = source_fingerprint(project)
+    (project / "notes.txt").write_text("unrelated")
+    assert source_fingerprint(project) == before
+
+    (project / "simulation" / "combat.gd").write_text("extends RefCounted\n# tweak\n")
+    assert source_fingerprint(project) != before
+
+
+def test_get_put_and_stats(tmp_path):
+    """Misses return None, hits return the stored value and credit saved time."""
+    cache = ResultCache(tmp_path)
+
+    assert cache.get("k") is None
+    cache.put("k", {"win_rate": 0.5}, sim_ms=250.0)
+    assert cache.get("k") == {"win_rate": 0.5}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["saved_ms"] == 250.0
+
+
+def test_lru_eviction(tmp_path):
+    """Entries over the size bound are evicted least recently used first."""
+    payload = {"data": "x" * 100}
+    cache = ResultCache(tmp_path, max_bytes=10_000)
+    for key in ("old", "used", "new"):
+        cache.put(key, payload)
+    entry_size = (tmp_path / "old.json").stat().st_size
+
+    # Age the entries, then touch "used" so "old" is the LRU entry
+    for age, key in enumerate(("new", "used", "old")):
+        os.utime(tmp_path / f"{key}.json", (1000 - age, 1000 - age))
+    cache.get("used")
+
+    cache.max_bytes = entry_size * 3
+    cache.put("newest", payload)
+
+    assert cache.get("old") is None
+    assert cache.get("used") == payload
+    assert cache.get("newest") == payload
+
+
+def test_runner_serves_repeat_sweeps_from_cache(fake_godot, project):
+    """A repeated sweep returns identical results without launching Godot."""
+    cache = ResultCache(project / "cache")
+    runner = SimulationRunner(godot_path=fake_godot, project_path=project, cache=cache)
+    first = runner.run_simulations(count=10, strategy="a,b", seed=3)
+
+    runner.godot_path = str(project / "missing-godot")
+    second = runner.run_simulations(count=10, strategy="a,b", seed=3)
+
+    assert second["strategies"] == first["strategies"]
+    assert second["best_strategy"] == first["best_strategy"]
+    assert second["parameter_bounds"] == first["parameter_bounds"]
+    assert second["cache"] == {"hits": 2, "misses": 0}
+    assert cache.stats()["hits"] == 2
+
+
+def test_runner_simulates_only_misses(fake_godot, project):
+    """Partially cached sweeps only run the uncached strategies, in order."""
+    cache = ResultCache(project / "cache")
+    runner = SimulationRunner(godot_path=fake_godot, project_path=project, cache=cache)
+    runner.run_simulations(count=10, strategy="b", seed=3)
+
+    result = runner.run_simulations(count=10, strategy="a,b,c", seed=3)
+    expected = SimulationRunner(godot_path=fake_godot, project_path=project).run_simulations(
+        count=10, strategy="a,b,c", seed=3
+    )
+
+    assert result["cache"] == {"hits": 1, "misses": 2}
+    assert list(result["strategies"]) == ["a", "b", "c"]
+    assert result["strategies"] == expected["strategies"]
+
+
+def test_runner_cache_invalidated_by_config(fake_godot, project):
+    """Changing the config file misses the cache."""
+    cache = ResultCache(project / "cache")
+    runner = SimulationRunner(godot_path=fake_godot, project_path=project, cache=cache)
+    runner.run_simulations(count=5, strategy="a", seed=1)
+
+    (project / "balance_config.json").write_text('{"starting_gold": 130}')
+    result = runner.run_simulations(count=5, strategy="a", seed=1)
+
+    assert result["cache"] == {"hits": 0, "misses": 1}
+
+
+def test_config_batch_uses_cache(fake_godot, project):
+    """Cached configs are skipped; only the new ones reach the engine."""
+    cache = ResultCache(project / "cache")
+    runner = SimulationRunner(godot_path=fake_godot, project_path=project, cache=cache)
+    first = runner.run_config_batch([{"starting_gold": 100}], count=5, strategy="a,b", seed=2)
+
+    batch = runner.run_config_batch(
+        [{"starting_gold": 100}, {"starting_gold": 110}], count=5, strategy="a,b", seed=2
+    )
+
+    assert first[0]["cache"] == {"hits": 0, "misses": 2}
+    assert batch[0]["strategies"] == first[0]["strategies"]
+    assert batch[0]["cache"] == {"hits": 2, "misses": 0}
+    assert batch[1]["cache"] == {"hits": 0, "misses": 2}
+    assert cache.has(cache_key({"starting_gold": 110}, "b", 2, 5, runner._fingerprint))
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 4
+
+
+def test_config_batch_simulates_only_missing_strategies(fake_godot, project, monkeypatch):
+    """A partially cached config reruns only its uncached strategies."""
+    boot_log = project / "boots.log"
+    monkeypatch.setenv("FAKE_GODOT_BOOT_LOG", str(boot_log))
+    cache = ResultCache(project / "cache")
+    runner = SimulationRunner(godot_path=fake_godot, project_path=project, cache=cache)
+    runner.run_config_batch([{"starting_gold": 100}], count=5, strategy="b", seed=2)
+
+    batch = runner.run_config_batch([{"starting_gold": 100}], count=5, strategy="a,b,c", seed=2)
+    expected = SimulationRunner(godot_path=fake_godot, project_path=project).run_config_batch(
+        [{"starting_gold": 100}], count=5, strategy="a,b,c", seed=2
+    )
+
+    assert batch[0]["cache"] == {"hits": 1, "misses": 2}
+    assert list(batch[0]["strategies"]) == ["a", "b", "c"]
+    assert batch[0]["strategies"] == expected[0]["strategies"]
+    boots = boot_log.read_text().splitlines()
+    assert "--strategy b " in boots[0] + " "
+    assert "--strategy a,c " in boots[1] + " "
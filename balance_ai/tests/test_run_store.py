@@ -0,0 +1,112 @@
+"""Tests for run_store.py and the Logger that writes to it"""
+
+import sqlite3
+
+import pytest
+from logger import Logger
+from run_store import RunStore
+
+TARGETS = {
+    "win_rate": (0.95, 1.0),
+    "shrine_hp": (85, 100),
+    "gold_remaining": (0, 20),
+    "enemies_leaked": (0, 5),
+}
+
+
+def results(win_rate, shrine_hp=90.0, gold=10.0, leaked=1.0, partial=False):
+    record = {
+        "win_rate": win_rate,
+        "avg_shrine_hp": shrine_hp,
+        "avg_gold": gold,
+        "avg_leaked": leaked,
+        "avg_killed": 100,
+        "avg_final_wave": 20,
+        "total_simulations": 50,
+    }
+    weak = dict(record, win_rate=win_rate / 2)
+    out = {"strategies": {"a": record, "b": weak}, "best_strategy": "a"}
+    if partial:
+        out["partial"] = True
+    return out
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3")
+    yield store
+    store.close()
+
+
+def test_writes_are_batched_until_flush(store):
+    store.start_run("r1", "goal", TARGETS)
+    store.add_evaluation("r1", 0, {"archer_damage": 15000}, results(0.5))
+
+    other = sqlite3.connect(store.path)
+    assert other.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0] == 0
+    store.flush()
+    assert other.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0] == 1
+    assert other.execute("SELECT COUNT(*) FROM strategy_metrics").fetchone()[0] == 2
+    other.close()
+
+
+def test_best_configs_rank_by_target_distance(store):
+    store.add_evaluation("r1", 0, {"archer_damage": 10000}, results(0.5))
+    store.add_evaluation("r1", 1, {"archer_damage": 20000}, results(0.97))
+    store.add_evaluation("r2", 0, {"archer_damage": 30000}, results(1.0, partial=True))
+    store.add_evaluation("r2", 1, {"archer_damage": 20000}, results(0.9, gold=50))
+    store.add_evaluation("r2", 2, {"archer_damage": 25000}, results(0.97, shrine_hp=70))
+
+    best = store.best_configs(TARGETS, limit=5)
+    assert [b["config"]["archer_damage"] for b in best] == [20000, 25000, 10000]
+    assert best[0]["distance"] == 0
+    assert best[0]["run_id"] == "r1" and best[0]["strategy"] == "a"
+    assert best[1]["distance"] == pytest.approx(1.0)  # (85 - 70) / 15
+
+
+def test_range_query_uses_parameter_values(store):
+    for damage in (10000, 15000, 20000, 25000):
+        store.add_evaluation("r1", 0, {"archer_damage": damage, "name": "x"}, results(0.5))
+
+    hits = store.evaluations_in_range("archer_damage", 12000, 20000)
+    assert [h["config"]["archer_damage"] for h in hits] == [15000, 20000]
+    assert hits[0]["win_rate"] == 0.5
+    assert store.evaluations_in_range("name", 0, 1) == []  # Non-numeric values are not indexed
+
+
+def test_evaluation_ids_continue_across_sessions(tmp_path):
+    path = tmp_path / "runs.sqlite3"
+    first = RunStore(path)
+    assert first.add_evaluation("r1", 0, {}, results(0.5)) == 1
+    first.close()
+    second = RunStore(path)
+    assert second.add_evaluation("r2", 0, {}, results(0.5)) == 2
+    second.close()
+
+
+def test_logger_records_run_in_store_and_buffers_log(tmp_path):
+    logger = Logger(results_dir=str(tmp_path))
+    logger.log_start("goal", TARGETS)
+    logger.log_iteration_start(0)
+    configs = [{"archer_damage": 15000}, {"archer_damage": 18000}]
+    logger.save_evaluations(
+        0, ["parent", "mutant_1"], configs, [results(0.5), results(0.8)], [2.0, float("inf")]
+    )
+    logger.save_iteration(0, configs[1], results(0.8), {"changes": {"grunt_hp": 50}})
+    logger.log_max_iterations()
+    logger.log_summary()
+    logger.close()
+
+    assert "MAX ITERATIONS REACHED" in logger.log_file.read_text()
+    assert not list(tmp_path.glob("iteration_*.json"))
+
+    store = RunStore(tmp_path / "runs.sqlite3")
+    [run] = store.runs()
+    assert run["run_id"] == logger.run_id
+    assert (run["status"], run["evaluations"]) == ("max_iterations", 2)
+    exported = store.export_run(logger.run_id)
+    assert exported["goal"] == "goal"
+    assert exported["iterations"][0]["config"] == {"archer_damage": 18000}
+    assert exported["iterations"][0]["results"]["a"]["win_rate"] == 0.8
+    assert exported["iterations"][0]["recommendations"]["changes"] == {"grunt_hp": 50}
+    store.close()
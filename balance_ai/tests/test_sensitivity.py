@@ -0,0 +1,104 @@
+"""Tests for sensitivity.py"""
+
+import math
+
+import numpy as np
+import pytest
+from sensitivity import (
+    analyze,
+    evaluate,
+    focus_bounds,
+    morris_design,
+    read_parameter_bounds,
+    top_parameters,
+)
+
+BOUNDS = {
+    "archer_damage": {"min": 0, "max": 1000, "step": 1},
+    "grunt_hp": {"min": 0, "max": 1000, "step": 1},
+    "wall_cost": {"min": 0, "max": 1000, "step": 1},
+}
+BASE = {"archer_damage": 500, "grunt_hp": 500, "wall_cost": 500}
+
+
+def linear_evaluator(configs):
+    """Shrine HP = 4 * damage - hp (scaled); wall cost has no effect."""
+    results = []
+    for config in configs:
+        hp = (4 * config["archer_damage"] - config["grunt_hp"]) / 1000
+        results.append(
+            {
+                "strategies": {
+                    "a": {
+                        "win_rate": 1.0,
+                        "avg_shrine_hp": hp,
+                        "avg_gold": 0.0,
+                        "avg_leaked": 0.0,
+                    }
+                }
+            }
+        )
+    return results
+
+
+def test_reads_bounds_from_balance_config():
+    bounds = read_parameter_bounds()
+    assert bounds["starting_gold"] == {"min": 50, "max": 300, "step": 10}
+    assert bounds["lightning_chain_range"]["step"] == 0.5
+    assert len(bounds) > 50
+
+
+def test_morris_design_moves_one_parameter_per_step():
+    design, steps = morris_design(5, 3, np.random.default_rng(1))
+    assert design.shape == (18, 5)
+    assert len(steps) == 15
+    for before, after, j in steps:
+        changed = np.flatnonzero(design[after] != design[before])
+        assert list(changed) == [j]
+        assert abs(design[after, j] - design[before, j]) == pytest.approx(2 / 3)
+
+
+def test_morris_ranks_influential_parameters():
+    report = analyze(BASE, BOUNDS, linear_evaluator, method="morris", trajectories=8)
+    effects = report["effects"]["shrine_hp"]
+    assert report["evaluations"] == 8 * 4
+    assert report["ranking"] == ["archer_damage", "grunt_hp", "wall_cost"]
+    assert effects["archer_damage"]["mu"] == pytest.approx(4.0, rel=0.01)
+    assert effects["grunt_hp"]["mu"] == pytest.approx(-1.0, rel=0.01)
+    assert effects["wall_cost"]["mu_star"] == 0
+    assert effects["archer_damage"]["sigma"] == pytest.approx(0, abs=0.01)  # Additive
+
+
+def test_sobol_indices_split_the_variance():
+    report = analyze(BASE, BOUNDS, linear_evaluator, method="sobol", samples=512, seed=3)
+    effects = report["effects"]["shrine_hp"]
+    assert report["evaluations"] == 512 * 5
+    assert effects["archer_damage"]["S1"] == pytest.approx(16 / 17, abs=0.1)
+    assert effects["archer_damage"]["ST"] == pytest.approx(16 / 17, abs=0.1)
+    assert effects["grunt_hp"]["ST"] == pytest.approx(1 / 17, abs=0.05)
+    assert effects["wall_cost"] == {"S1": 0.0, "ST": 0.0}
+    assert report["ranking"][0] == "archer_damage"
+
+
+def test_evaluate_batches_and_marks_partial_results():
+    calls = []
+
+    def evaluator(configs):
+        calls.append(len(configs))
+        results = linear_evaluator(configs)
+        results[0]["partial"] = True
+        return results
+
+    values = evaluate(evaluator, [BASE] * 5, batch_size=2)
+    assert calls == [2, 2, 1]
+    assert [math.isnan(v) for v in values["shrine_hp"]] == [True, False, True, False, True]
+
+
+def test_top_parameters_focus_the_bounds():
+    report = analyze(BASE, BOUNDS, linear_evaluator, trajectories=4)
+    focus = top_parameters(report, 2)
+    assert focus == ["archer_damage", "grunt_hp"]
+    assert set(focus_bounds(BOUNDS, focus)) == set(focus)
+    assert focus_bounds(BOUNDS, None) is BOUNDS
+    with pytest.raises(ValueError):
+        analyze(BASE, BOUNDS, linear_evaluator, method="fast99")
@@ -0,0 +1,434 @@
+"""Tests for simulation_runner.py"""
+
+import json
+import re
+import statistics
+
+import pytest
+from result_cache import ResultCache
+from simulation_runner import (
+    PROJECT_PATH,
+    SPREAD_METRICS,
+    SimulationRunner,
+    SimulationTimeout,
+    adaptive_options,
+    assemble_ndjson,
+    expand_strategy,
+    histogram_quantile,
+    merge_shard_results,
+    plan_shards,
+    pooled_std,
+)
+from tests import fake_godot
+
+
+def test_expand_strategy():
+    """expand_strategy resolves groups and comma lists."""
+    assert len(expand_strategy("all")) == 18
+    assert expand_strategy("upgrades")[0] == "archer_sniper"
+    assert expand_strategy("a, b,rush_aoe") == ["a", "b", "rush_aoe"]
+
+
+def test_plan_shards_groups_strategies():
+    """Fewer workers than strategies: every strategy appears exactly once."""
+    ids = expand_strategy("all")
+    shards = plan_shards(ids, 100, 1, 4)
+
+    assert len(shards) == 4
+    assigned = [s for shard in shards for s in shard["strategies"]]
+    assert sorted(assigned) == sorted(ids)
+    assert all(shard["count"] == 100 and shard["seed"] == 1 for shard in shards)
+
+
+def test_plan_shards_slices_seeds():
+    """More workers than strategies: seed ranges are split without gaps."""
+    shards = plan_shards(["a", "b"], 10, 100, 6)
+
+    a_shards = [s for s in shards if s["strategies"] == ["a"]]
+    assert len(a_shards) == 3
+    assert sum(s["count"] for s in a_shards) == 10
+    assert [s["seed"] for s in a_shards] == [100, 104, 107]
+
+
+def test_merge_shard_results_weights_by_runs():
+    """Merged averages are weighted by runs and best_strategy is recomputed."""
+    shard_a = {
+        "strategies": {
+            "a": {"runs": 1, "wins": 1, "win_rate": 1.0, "avg_shrine_hp": 90.0},
+            "b": {"runs": 2, "wins": 0, "win_rate": 0.0, "avg_shrine_hp": 0.0},
+        },
+        "best_strategy": "a",
+    }
+    shard_b = {
+        "strategies": {"a": {"runs": 3, "wins": 1, "win_rate": 1 / 3, "avg_shrine_hp": 50.0}},
+        "best_strategy": "a",
+    }
+
+    merged = merge_shard_results([shard_a, shard_b], ["a", "b"])
+
+    assert merged["strategies"]["a"]["runs"] == 4
+    assert merged["strategies"]["a"]["win_rate"] == 0.5
+    assert merged["strategies"]["a"]["avg_shrine_hp"] == 60.0
+    assert list(merged["strategies"]) == ["a", "b"]
+    assert merged["best_strategy"] == "a"
+
+
+def test_merge_sums_simulated_games():
+    """Each shard of a seed-invariant strategy simulates once; "simulated" adds them up."""
+    shards = [
+        {"strategies": {"a": {"runs": 50, "simulated": 1, "wins": 50, "win_rate": 1.0}}},
+        {"strategies": {"a": {"runs": 50, "simulated": 1, "wins": 50, "win_rate": 1.0}}},
+    ]
+
+    merged = merge_shard_results(shards, ["a"])["strategies"]["a"]
+
+    assert (merged["runs"], merged["simulated"]) == (100, 2)
+
+
+def test_histogram_quantile_is_nearest_rank():
+    histogram = {"100": 5, "0": 2, "40": 3}  # 0 0 40 40 40 100 100 100 100 100
+
+    assert histogram_quantile(histogram, 5) == 0
+    assert histogram_quantile(histogram, 20) == 0
+    assert histogram_quantile(histogram, 21) == 40
+    assert histogram_quantile(histogram, 50) == 40
+    assert histogram_quantile(histogram, 95) == 100
+    assert histogram_quantile({}, 50) == 0
+
+
+def test_pooled_std_matches_std_of_all_games():
+    """Shard std/avg/runs recombine into the sample std over every game."""
+    games = [[10, 20, 30], [40, 50], [60]]
+    records = [
+        {
+            "runs": len(shard),
+            "avg_gold": statistics.mean(shard),
+            "std_gold": statistics.stdev(shard) if len(shard) > 1 else 0.0,
+        }
+        for shard in games
+    ]
+    records.append({"runs": 0})
+
+    expected = statistics.stdev([gold for shard in games for gold in shard])
+    assert pooled_std(records, "gold") == pytest.approx(expected)
+    assert pooled_std(records[2:], "gold") == 0.0
+
+
+def test_spread_metrics_match_result_accumulator():
+    """SPREAD_METRICS and the fake engine's metrics follow ResultAccumulator.METRICS."""
+    source = (PROJECT_PATH / "simulation" / "runner" / "result_accumulator.gd").read_text()
+    body = re.search(r"const METRICS: Array\[String\] = \[(.*?)\]", source, re.S).group(1)
+    metrics = re.findall(r'"(\w+)"', body)
+
+    assert SPREAD_METRICS == metrics
+    assert fake_godot.METRICS == metrics
+
+
+def test_merge_seed_sliced_shards_pools_spread():
+    """Seed slices of one strategy merge to the stats of all their games together."""
+    games = [fake_godot.play_game("a", seed) for seed in range(1, 21)]
+    shards = [
+        {"strategies": {"a": fake_godot.run_strategy("a", n, seed)}}
+        for n, seed in ((7, 1), (13, 8))
+    ]
+
+    merged = merge_shard_results(shards, ["a"])["strategies"]["a"]
+
+    assert merged["runs"] == 20
+    for metric in SPREAD_METRICS:
+        values = [g[metric] for g in games]
+        assert merged[f"avg_{metric}"] == pytest.approx(statistics.mean(values))
+        assert merged[f"std_{metric}"] == pytest.approx(statistics.stdev(values))
+
+
+def test_merge_tolerates_spread_without_average():
+    """A std_* whose avg_* is missing is left as the first shard's, not a KeyError."""
+    shards = [
+        {"strategies": {"a": {"runs": 5, "wins": 5, "std_final_wave": 0.0}}},
+        {"strategies": {"a": {"runs": 5, "wins": 5, "std_final_wave": 0.0}}},
+    ]
+
+    assert merge_shard_results(shards, ["a"])["strategies"]["a"]["runs"] == 10
+
+
+@pytest.mark.parametrize("workers", [3, 40])
+def test_sharded_run_matches_single_process(fake_godot, workers):
+    """Pooled runs reproduce the single-process sweep."""
+    single = SimulationRunner(godot_path=fake_godot).run_simulations(count=20, seed=7)
+    pooled = SimulationRunner(godot_path=fake_godot, workers=workers).run_simulations(
+        count=20, seed=7
+    )
+
+    assert list(pooled["strategies"]) == list(single["strategies"])
+    assert pooled["best_strategy"] == single["best_strategy"]
+    for strat_id, expected in single["strategies"].items():
+        actual = pooled["strategies"][strat_id]
+        assert actual["runs"] == expected["runs"]
+        assert actual["wins"] == expected["wins"]
+        assert actual["avg_shrine_hp"] == pytest.approx(expected["avg_shrine_hp"])
+        for metric in SPREAD_METRICS:
+            assert actual[f"avg_{metric}"] == pytest.approx(expected[f"avg_{metric}"])
+            assert actual[f"std_{metric}"] == pytest.approx(expected[f"std_{metric}"])
+        assert actual["distributions"] == expected["distributions"]
+        for key in ("p5_shrine_hp", "p50_shrine_hp", "p95_gold", "p95_leaked"):
+            assert actual[key] == expected[key]
+        assert actual["upgrade_path_counts"] == expected["upgrade_path_counts"]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_persistent_run_matches_one_shot(fake_godot, workers):
+    """Warm --serve workers return the same results as one-shot processes."""
+    one_shot = SimulationRunner(godot_path=fake_godot, workers=workers).run_simulations(
+        count=20, seed=7
+    )
+    with SimulationRunner(godot_path=fake_godot, workers=workers, persistent=True) as runner:
+        first = runner.run_simulations(count=20, seed=7)
+        second = runner.run_simulations(count=20, seed=7)
+        servers = list(runner._all_servers)
+
+    # The pool is started once and reused across iterations
+    assert len(servers) == workers
+    assert not any(server.alive() for server in servers)
+    for result in (first, second):
+        assert result["strategies"] == one_shot["strategies"]
+        assert result["best_strategy"] == one_shot["best_strategy"]
+
+
+def test_persistent_replaces_dead_server(fake_godot):
+    """A crashed server is dropped from the pool when its replacement starts."""
+    with SimulationRunner(godot_path=fake_godot, workers=2, persistent=True) as runner:
+        runner.run_simulations(count=10, strategy="a,b", seed=7)
+        dead = runner._all_servers[0]
+        dead.kill()
+        result = runner.run_simulations(count=10, strategy="a,b", seed=7)
+        servers = list(runner._all_servers)
+
+    assert list(result["strategies"]) == ["a", "b"]
+    assert len(servers) == 2
+    assert dead not in servers
+
+
+def test_persistent_sends_config(fake_godot, tmp_path):
+    """The config file is read on the client and sent with each request."""
+    (tmp_path / "cfg.json").write_text('{"starting_gold": 222}')
+    with SimulationRunner(godot_path=fake_godot, project_path=tmp_path, persistent=True) as runner:
+        result = runner.run_simulations(count=5, strategy="a", config_path="cfg.json")
+
+    assert result["config"] == {"starting_gold": 222}
+    assert list(result["strategies"]) == ["a"]
+
+
+@pytest.mark.parametrize("workers,persistent", [(1, False), (2, False), (8, False), (2, True)])
+def test_config_batch_matches_individual_runs(fake_godot, tmp_path, workers, persistent):
+    """Batched configs return the same per-config results, in input order."""
+    configs = [{"starting_gold": gold} for gold in (100, 150, 200)]
+    with SimulationRunner(
+        godot_path=fake_godot, project_path=tmp_path, workers=workers, persistent=persistent
+    ) as runner:
+        batch = runner.run_config_batch(configs, count=10, strategy="a,b,c", seed=4)
+
+    assert len(batch) == 3
+    for i, (config, result) in enumerate(zip(configs, batch)):
+        (tmp_path / f"cfg{i}.json").write_text(json.dumps(config))
+        single = SimulationRunner(godot_path=fake_godot, project_path=tmp_path).run_simulations(
+            count=10, strategy="a,b,c", seed=4, config_path=f"cfg{i}.json"
+        )
+        assert "index" not in result
+        assert result["config"] == single["config"]
+        assert result["strategies"] == single["strategies"]
+    assert batch[0]["strategies"] != batch[1]["strategies"]
+
+
+def test_config_batch_boots_one_engine_per_worker(fake_godot, tmp_path, monkeypatch):
+    """Six configs on two workers start two engine processes, not six."""
+    boot_log = tmp_path / "boots.log"
+    monkeypatch.setenv("FAKE_GODOT_BOOT_LOG", str(boot_log))
+    configs = [{"starting_gold": 100 + i} for i in range(6)]
+
+    runner = SimulationRunner(godot_path=fake_godot, workers=2)
+    batch = runner.run_config_batch(configs, count=5, strategy="a", seed=1)
+
+    assert [r["config"] for r in batch] == configs
+    boots = boot_log.read_text().splitlines()
+    assert len(boots) == 2
+    assert all("--configs" in boot for boot in boots)
+
+
+def test_assemble_ndjson_without_summary_is_partial():
+    """A stream cut before "done" keeps finished strategies and is flagged partial."""
+    records = [
+        {"type": "game", "strategy": "a", "index": 0, "seed": 1, "result": {}},
+        {"type": "strategy", "id": "a", "record": {"runs": 1, "wins": 0, "win_rate": 0.0}},
+        {"type": "strategy", "id": "b", "record": {"runs": 1, "wins": 1, "win_rate": 1.0}},
+    ]
+
+    result = assemble_ndjson(records)
+
+    assert result["partial"] is True
+    assert list(result["strategies"]) == ["a", "b"]
+    assert result["best_strategy"] == "b"
+
+    done = {"type": "done", "config": {}, "best_strategy": "b", "ai_mode": ""}
+    assert "partial" not in assemble_ndjson(records + [done])
+
+
+def test_stream_simulations_yields_records_in_order(fake_godot):
+    """Game records precede their strategy record; the summary comes last."""
+    runner = SimulationRunner(godot_path=fake_godot)
+    records = list(runner.stream_simulations(count=3, strategy="a,b", seed=5, per_game=True))
+
+    types = [(r["type"], r.get("strategy") or r.get("id")) for r in records]
+    assert types == [
+        ("game", "a"),
+        ("game", "a"),
+        ("game", "a"),
+        ("strategy", "a"),
+        ("game", "b"),
+        ("game", "b"),
+        ("game", "b"),
+        ("strategy", "b"),
+        ("done", None),
+    ]
+    assert [r["seed"] for r in records if r["type"] == "game"][:3] == [5, 6, 7]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_ndjson_run_matches_json_run(fake_godot, workers):
+    """Streaming mode assembles the same result as the single JSON line."""
+    expected = SimulationRunner(godot_path=fake_godot).run_simulations(count=10, seed=2)
+    actual = SimulationRunner(
+        godot_path=fake_godot, workers=workers, ndjson=True
+    ).run_simulations(count=10, seed=2)
+
+    assert actual["strategies"] == expected["strategies"]
+    assert actual["best_strategy"] == expected["best_strategy"]
+    assert actual["parameter_bounds"] == expected["parameter_bounds"]
+    assert "partial" not in actual
+
+
+def test_ndjson_timeout_keeps_finished_strategies(fake_godot, monkeypatch):
+    """A timeout mid-sweep returns the strategies that already finished."""
+    monkeypatch.setenv("FAKE_GODOT_DELAY_S", "0.5")
+    runner = SimulationRunner(godot_path=fake_godot, timeout=1.25, ndjson=True)
+
+    result = runner.run_simulations(count=4, strategy="a,b,c,d", seed=1)
+
+    assert result["partial"] is True
+    assert list(result["strategies"]) == ["a", "b"]
+
+
+def test_ndjson_timeout_before_any_strategy_raises(fake_godot, monkeypatch):
+    """With nothing finished there is nothing to keep."""
+    monkeypatch.setenv("FAKE_GODOT_DELAY_S", "5")
+    runner = SimulationRunner(godot_path=fake_godot, timeout=0.5, ndjson=True)
+
+    with pytest.raises(SimulationTimeout):
+        runner.run_simulations(count=4, strategy="a", seed=1)
+
+
+def test_adaptive_options_from_targets():
+    """Every target becomes a stopping band; a target without an interval is refused."""
+    targets = {
+        "win_rate": (0.95, 1.0),
+        "shrine_hp": (85, 100),
+        "gold_remaining": (0, 20),
+        "enemies_leaked": (0, 5),
+    }
+
+    options = adaptive_options(targets, min_games=30)
+
+    assert options == {
+        "min_games": 30,
+        "targets": {
+            "win_rate": [0.95, 1.0],
+            "shrine_hp": [85.0, 100.0],
+            "gold_remaining": [0.0, 20.0],
+            "enemies_leaked": [0.0, 5.0],
+        },
+    }
+    with pytest.raises(ValueError, match="final_wave"):
+        adaptive_options(dict(targets, final_wave=(10, 30)))
+
+
+def test_adaptive_gold_and_leaked_bands_reach_engine(fake_godot):
+    """Gold and leaked bands get their own flags and decide the stop like the others."""
+    options = adaptive_options({"gold_remaining": (0, 20), "enemies_leaked": (0, 5)}, 10)
+    runner = SimulationRunner(godot_path=fake_godot, adaptive=options)
+    assert runner._build_command("a", 100, 1, "cfg.json")[-4:] == [
+        "--target-gold",
+        "0.0,20.0",
+        "--target-leaked",
+        "0.0,5.0",
+    ]
+
+    record = runner.run_simulations(count=100, strategy="a", seed=1)["strategies"]["a"]
+
+    assert record["adaptive_targets"] == options["targets"]
+    met = record["avg_gold"] <= 20 and record["avg_leaked"] <= 5
+    assert record["stop_reason"] == ("target_met" if met else "target_missed")
+
+
+def test_adaptive_flags_reach_engine(fake_godot):
+    """--adaptive and the target bands are passed on the command line."""
+    runner = SimulationRunner(
+        godot_path=fake_godot, adaptive=adaptive_options({"win_rate": (0.95, 1.0)}, 10)
+    )
+    assert runner._build_command("a", 100, 1, "cfg.json")[-6:] == [
+        "--json",
+        "--adaptive",
+        "--min-games",
+        "10",
+        "--target-win-rate",
+        "0.95,1.0",
+    ]
+
+    result = runner.run_simulations(count=100, strategy="a,b", seed=1)
+
+    for record in result["strategies"].values():
+        assert record["runs"] == 10
+        met = record["win_rate"] >= 0.95
+        assert record["stop_reason"] == ("target_met" if met else "target_missed")
+        assert record["adaptive_targets"] == {"win_rate": [0.95, 1.0]}
+
+
+def test_adaptive_persistent_request(fake_godot):
+    """Warm servers receive the same adaptive options in the request."""
+    options = adaptive_options({"shrine_hp": (85, 100)}, 5)
+    with SimulationRunner(godot_path=fake_godot, persistent=True, adaptive=options) as runner:
+        result = runner.run_simulations(count=100, strategy="a", seed=1)
+
+    assert result["strategies"]["a"]["runs"] == 5
+    assert result["strategies"]["a"]["adaptive_targets"] == {"shrine_hp": [85.0, 100.0]}
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_engine_mode_flags_reach_engine(fake_godot, persistent):
+    """fast_forward / reuse_prefix / every_seed add CLI flags (or serve keys); results as usual."""
+    with SimulationRunner(
+        godot_path=fake_godot,
+        fast_forward=True,
+        reuse_prefix=True,
+        every_seed=True,
+        persistent=persistent,
+    ) as runner:
+        assert runner._build_command("a", 10, 1, "cfg.json")[-3:] == [
+            "--fast-forward",
+            "--reuse-prefix",
+            "--every-seed",
+        ]
+        result = runner.run_simulations(count=10, strategy="a", seed=1)
+    assert result["strategies"]["a"]["runs"] == 10
+
+
+def test_max_waves_reaches_engine_and_is_cached_apart(fake_godot, tmp_path):
+    """A wave-limited run passes --max-waves and never answers a full run from the cache."""
+    cache = ResultCache(tmp_path / "cache")
+    runner = SimulationRunner(godot_path=fake_godot, cache=cache, max_waves=10)
+    assert runner._build_command("a", 10, 1, "cfg.json")[-2:] == ["--max-waves", "10"]
+
+    short = runner.run_simulations(count=10, strategy="a", seed=1)
+    runner.max_waves = 0
+    full = runner.run_simulations(count=10, strategy="a", seed=1)
+
+    assert full["cache"] == {"hits": 0, "misses": 1}
+    assert short["strategies"]["a"] != full["strategies"]["a"]
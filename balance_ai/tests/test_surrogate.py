@@ -0,0 +1,130 @@
+"""Tests for surrogate.py"""
+
+import json
+import random
+
+import pytest
+from population import score_results
+from surrogate import MIN_HISTORY, Surrogate, observed_metrics
+
+TARGETS = {
+    "win_rate": (0.95, 1.0),
+    "shrine_hp": (85, 100),
+    "gold_remaining": (0, 20),
+    "enemies_leaked": (0, 5),
+}
+
+BOUNDS = {
+    "starting_gold": {"min": 50, "max": 300, "step": 10},
+    "archer_damage": {"min": 5000, "max": 50000, "step": 1000},
+}
+
+
+def fake_results(config):
+    """Smooth synthetic response: more damage wins, more gold is left unspent."""
+    strength = (config["archer_damage"] - 5000) / 45000
+    return {
+        "strategies": {
+            "a": {
+                "win_rate": strength,
+                "avg_shrine_hp": 100 * strength,
+                "avg_gold": config["starting_gold"] / 10,
+                "avg_leaked": 20 * (1 - strength),
+                "avg_final_wave": 10,
+            }
+        }
+    }
+
+
+def grid_configs():
+    return [
+        {"starting_gold": gold, "archer_damage": damage}
+        for gold in (50, 150, 300)
+        for damage in (5000, 20000, 35000, 50000)
+    ]
+
+
+@pytest.fixture
+def surrogate():
+    model = Surrogate(history_path=None)
+    model.set_bounds(BOUNDS)
+    for config in grid_configs():
+        model.add(config, fake_results(config))
+    return model
+
+
+def test_observed_metrics_skips_partial_and_empty_results():
+    config = {"starting_gold": 100, "archer_damage": 50000}
+    assert observed_metrics(fake_results(config)) == {
+        "win_rate": 1.0,
+        "shrine_hp": 100.0,
+        "gold_remaining": 10.0,
+        "enemies_leaked": 0.0,
+    }
+    assert observed_metrics(dict(fake_results(config), partial=True)) is None
+    assert observed_metrics({"strategies": {}}) is None
+
+
+def test_not_ready_until_enough_history():
+    model = Surrogate(history_path=None)
+    model.set_bounds(BOUNDS)
+    configs = grid_configs()[: MIN_HISTORY - 1]
+    for config in configs:
+        model.add(config, fake_results(config))
+    assert not model.ready()
+    assert model.screen([("parent", configs[0]), ("m", configs[1])], TARGETS, 1) == [
+        ("parent", configs[0])
+    ]
+    with pytest.raises(RuntimeError):
+        model.predict(configs)
+
+
+def test_predictions_track_the_response_with_uncertainty(surrogate):
+    near = {"starting_gold": 160, "archer_damage": 27000}
+    prediction = surrogate.predict([near])[0]
+    expected = observed_metrics(fake_results(near))
+    for metric, (mean, std) in prediction.items():
+        assert mean == pytest.approx(expected[metric], abs=0.1 * max(expected[metric], 10))
+
+    # Uncertainty grows away from the observed configs
+    seen = surrogate.predict([grid_configs()[5]])[0]
+    far = surrogate.predict([{"starting_gold": 600, "archer_damage": 150000}])[0]
+    assert far["shrine_hp"][1] > seen["shrine_hp"][1]
+
+
+def test_screen_keeps_parent_and_rejects_hopeless_candidates(surrogate):
+    parent = {"starting_gold": 150, "archer_damage": 35000}
+    parent_score = score_results(fake_results(parent), TARGETS)
+    candidates = [
+        ("parent", parent),
+        ("weak", {"starting_gold": 300, "archer_damage": 5000}),
+        ("strong", {"starting_gold": 150, "archer_damage": 50000}),
+        ("stronger", {"starting_gold": 100, "archer_damage": 50000}),
+    ]
+
+    kept = surrogate.screen(candidates, TARGETS, keep=3, parent_score=parent_score)
+    assert kept[0] == candidates[0]
+    assert {label for label, _ in kept} == {"parent", "strong", "stronger"}
+    assert len(surrogate.screen(candidates, TARGETS, keep=2, parent_score=parent_score)) == 2
+
+
+def test_propose_stays_in_bounds_and_improves_on_parent(surrogate):
+    parent = {"starting_gold": 150, "archer_damage": 20000}
+    proposal = surrogate.propose(parent, TARGETS, random.Random(3), sigma=0.3)
+    assert proposal != parent
+    for key, bound in BOUNDS.items():
+        assert bound["min"] <= proposal[key] <= bound["max"]
+    [parent_lcb, proposal_lcb] = surrogate.optimistic_scores([parent, proposal], TARGETS)
+    assert proposal_lcb <= parent_lcb
+
+
+def test_history_persists_per_fingerprint(tmp_path):
+    path = tmp_path / "history.jsonl"
+    config = {"starting_gold": 100, "archer_damage": 20000}
+    Surrogate(history_path=path, fingerprint="old").add(config, fake_results(config))
+    Surrogate(history_path=path, fingerprint="new").add(config, fake_results(config))
+
+    assert len(path.read_text().splitlines()) == 2
+    assert json.loads(path.read_text().splitlines()[0])["fingerprint"] == "old"
+    reloaded = Surrogate(history_path=path, fingerprint="new")
+    assert reloaded.history == [(config, observed_metrics(fake_results(config)))]
@@ -0,0 +1,68 @@
+"""Tests for telemetry.py"""
+
+import numpy as np
+from simulation_runner import SimulationRunner
+from telemetry import load_table, load_telemetry, tower_totals, wave_means
+
+WAVES_HEADER = "strategy,game,seed,wave,success,ticks,spawned,killed,leaked,damage,gold_earned,"
+WAVES_CSV = WAVES_HEADER + """shrine_hp,gold
+a,0,7,1,1,120,10,10,0,50000,60,20,90
+a,0,7,2,0,80,12,6,6,30000,30,0,40
+a,1,8,1,1,110,10,8,2,40000,50,18,80
+b,0,7,1,1,100,10,10,0,55000,60,20,95
+"""
+TOWERS_CSV = """strategy,game,seed,tower,x,y,tier,branch,damage,kills,shots
+a,0,7,archer,3,2,2,marksman,80000,16,40
+a,1,8,archer,3,2,1,,40000,8,20
+b,0,7,cannon,6,3,1,,55000,10,11
+"""
+
+
+def write_telemetry(directory):
+    (directory / "waves.csv").write_text(WAVES_CSV)
+    (directory / "towers.csv").write_text(TOWERS_CSV)
+
+
+def test_load_telemetry_returns_typed_columns(tmp_path):
+    write_telemetry(tmp_path)
+    telemetry = load_telemetry(tmp_path)
+    waves, towers = telemetry["waves"], telemetry["towers"]
+
+    assert waves["killed"].dtype == np.int64
+    np.testing.assert_array_equal(waves["wave"], [1, 2, 1, 1])
+    np.testing.assert_array_equal(waves["strategy"], ["a", "a", "a", "b"])
+    np.testing.assert_array_equal(towers["branch"], ["marksman", "", ""])
+    assert towers["shots"].sum() == 71
+
+
+def test_header_only_table_has_empty_columns(tmp_path):
+    path = tmp_path / "towers.csv"
+    path.write_text(TOWERS_CSV.splitlines()[0] + "\n")
+
+    table = load_table(path)
+
+    assert table["damage"].shape == (0,)
+    assert table["tower"].shape == (0,)
+
+
+def test_wave_means_and_tower_totals(tmp_path):
+    write_telemetry(tmp_path)
+    telemetry = load_telemetry(tmp_path)
+
+    np.testing.assert_allclose(wave_means(telemetry["waves"], "killed"), [28 / 3, 6])
+    np.testing.assert_allclose(wave_means(telemetry["waves"], "leaked", "a"), [1, 6])
+    assert len(wave_means(telemetry["waves"], "leaked", "missing")) == 0
+    assert tower_totals(telemetry["towers"], "kills") == {"archer": 24, "cannon": 10}
+
+
+def test_run_with_telemetry_streams_every_game(fake_godot, tmp_path):
+    runner = SimulationRunner(godot_path=fake_godot)
+
+    results = runner.run_with_telemetry(tmp_path / "telemetry", count=6, strategy="a,b", seed=3)
+    waves = load_telemetry(tmp_path / "telemetry")["waves"]
+
+    assert len(waves["game"]) == 12
+    for strat_id, record in results["strategies"].items():
+        mask = waves["strategy"] == strat_id
+        assert waves["killed"][mask].mean() == record["avg_killed"]
+        assert waves["leaked"][mask].mean() == record["avg_leaked"]
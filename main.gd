@@ -237,6 +237,11 @@ func _ready() -> void:
 		get_tree().quit()
 		return
 
+	if "--serve" in args:
+		_serve()
+		get_tree().quit()
+		return
+
 	_run_simulation(args)
 	get_tree().quit()
 
@@ -253,12 +258,37 @@ Options:
   --help, -h           Show this help
   --count N            Simulations per strategy (default: 100)
   --seed N             Base random seed (default: 12345)
-  --strategy S         Strategy: a-d, upgrades, all, or a named path
+  --strategy S         Strategy: a-d, upgrades, all, a named path, or a
+                       comma-separated list (e.g. a,b,rush_aoe)
   --ai balanced        Run BalancedAI instead of static strategies
+  --adaptive           Treat --count as a cap; stop each strategy once its targets are
+                       decided (or, without targets, its confidence intervals are tight)
+  --min-games N        Adaptive: games before the first stopping check (default: 50)
+  --target-win-rate A,B     Adaptive: stop once the win-rate CI is inside/outside [A, B]
+  --target-shrine-hp A,B    Adaptive: same for average shrine HP
+  --target-gold A,B         Adaptive: same for average gold remaining
+  --target-leaked A,B       Adaptive: same for average enemies leaked
   --json               Output results as JSON (for AI optimizer)
+  --ndjson             Stream one JSON record per finished strategy, then a summary
+  --ndjson-games       Like --ndjson, plus one record per finished game
   --config FILE        Load balance config from JSON file
+  --configs FILE       Evaluate many configs (JSON array or NDJSON of config dicts) in one
+                       process; prints one --json result line per config with its "index"
   --save-config FILE   Save current config to JSON file
   --output FILE        Save results to file
+  --fast-forward       Skip idle ticks (no enemies alive, nothing due) in one step; results are
+                       identical to fixed 100ms stepping
+  --max-waves N        Play only waves 1-N (a game that clears them counts as won); a cheap
+                       low-fidelity screen for the optimizer
+  --every-seed         Simulate every seed even when the first game draws no randomness (by
+                       default such a seed-invariant batch plays once; see "simulated")
+  --reuse-prefix       With --configs/--serve, resume each game from the first wave a config
+                       change can affect (wave-start snapshots); results are identical
+  --profile            Add per-phase / per-wave / per-tower-special tick timings (us, calls)
+                       to each strategy record as "profile"
+  --telemetry DIR      Stream per-wave and per-tower stats of every game to DIR/waves.csv
+                       and DIR/towers.csv
+  --serve              Persistent worker: JSON requests on stdin, one result per line
 
 Strategies:
   a-d       T1 archer baselines (Dual/Triple/Flanking/Central)
@@ -266,10 +296,20 @@ Strategies:
   all       Baselines + upgrade matrix + special-round strategies
   Named     e.g. archer_sniper, rush_aoe, smash_maze, wall_fortress, ...
 
+Serve protocol (one JSON object per line):
+  request   {"id": 1, "config": {...}, "strategy": "all", "count": 100, "seed": 12345}
+            optional "adaptive": {"min_games": 50, "targets": {"win_rate": [0.95, 1.0]}}
+            optional "profile", "fast_forward", "reuse_prefix", "every_seed": true (as flags)
+            and "max_waves": N
+  response  same shape as --json output, plus the request "id"
+  quit      {"cmd": "quit"}, a blank line or EOF
+
 Examples:
   godot --headless -- --strategy upgrades --count 50 --json
   godot --headless -- --ai balanced --count 100 --json
   godot --headless -- --config balance.json --strategy all --json
+  godot --headless -- --strategy all --count 100 --ndjson
+  godot --headless -- --serve
 """
 	)
 
@@ -280,10 +320,21 @@ func _run_simulation(args: Array) -> void:
 	var base_seed := 12345
 	var strategy_arg := "all"
 	var json_output := false
+	var ndjson_output := false
+	var ndjson_games := false
 	var config_file := ""
 	var save_config_file := ""
 	var output_file := ""
+	var configs_file := ""
+	var telemetry_dir := ""
+	var profile := false
+	var fast_forward := false
+	var reuse_prefix := false
+	var every_seed := false
+	var max_waves := 0
 	var ai_mode := ""
+	var adaptive := false
+	var adaptive_opts := {}
 
 	for i in range(args.size()):
 		match args[i]:
@@ -301,6 +352,11 @@ func _run_simulation(args: Array) -> void:
 					ai_mode = args[i + 1].to_lower()
 			"--json":
 				json_output = true
+			"--ndjson":
+				ndjson_output = true
+			"--ndjson-games":
+				ndjson_output = true
+				ndjson_games = true
 			"--config":
 				if i + 1 < args.size():
 					config_file = args[i + 1]
@@ -310,6 +366,35 @@ func _run_simulation(args: Array) -> void:
 			"--output":
 				if i + 1 < args.size():
 					output_file = args[i + 1]
+			"--configs":
+				if i + 1 < args.size():
+					configs_file = args[i + 1]
+			"--telemetry":
+				if i + 1 < args.size():
+					telemetry_dir = args[i + 1]
+			"--profile":
+				profile = true
+			"--fast-forward":
+				fast_forward = true
+			"--reuse-prefix":
+				reuse_prefix = true
+			"--every-seed":
+				every_seed = true
+			"--max-waves":
+				if i + 1 < args.size():
+					max_waves = int(args[i + 1])
+			"--adaptive":
+				adaptive = true
+			"--min-games":
+				if i + 1 < args.size():
+					adaptive_opts["min_games"] = int(args[i + 1])
+			"--target-win-rate", "--target-shrine-hp", "--target-gold", "--target-leaked":
+				if i + 1 < args.size():
+					var metric: String = EarlyStopping.TARGET_FLAGS[args[i]]
+					adaptive_opts["targets"] = adaptive_opts.get("targets", {})
+					adaptive_opts["targets"][metric] = _parse_band(args[i + 1])
+
+	var quiet := json_output or ndjson_output
 
 	# Load or create balance config
 	var config := BalanceConfig.new()
@@ -323,7 +408,7 @@ func _run_simulation(args: Array) -> void:
 	if save_config_file != "":
 		var err := config.save_to_file(save_config_file)
 		if err == OK:
-			if not json_output:
+			if not quiet:
 				print("Config saved to: " + save_config_file)
 		else:
 			push_error("Failed to save config: " + save_config_file)
@@ -331,7 +416,145 @@ func _run_simulation(args: Array) -> void:
 			# Just saving config, no simulation
 			return
 
-	# Load base data (will be overridden by config)
+	var runner := _create_runner(config)
+	runner.fast_forward = fast_forward
+	runner.reuse_prefixes = reuse_prefix
+	runner.collapse_seed_invariant = not every_seed
+	runner.set_max_waves(max_waves)
+	if profile:
+		runner.profiler = TickProfiler.new()
+	var strategies_to_run := _resolve_strategy_ids(strategy_arg, ai_mode)
+
+	var early_stop: EarlyStopping = null
+	if adaptive:
+		early_stop = _create_early_stop(adaptive_opts)
+
+	if configs_file != "":
+		_run_config_batch(
+			runner, configs_file, strategies_to_run, ai_mode, count, base_seed, early_stop
+		)
+		return
+
+	var start_time := Time.get_ticks_msec()
+
+	if not quiet:
+		print("=================================")
+		print("BASTION'S LAST STAND")
+		print("Simulation Engine")
+		print("=================================")
+		print("")
+		print("Config:")
+		print("  Starting gold: %d" % config.starting_gold)
+		print("  Wall cost: %d" % config.wall_cost)
+		print(
+			(
+				"  Archer: %dg, %d dmg, %dms, %d range"
+				% [
+					config.archer_cost,
+					config.archer_damage / 1000,
+					config.archer_attack_speed_ms,
+					config.archer_range
+				]
+			)
+		)
+		print(
+			(
+				"  Grunt: %d HP, %d speed, %dg"
+				% [config.grunt_hp, config.grunt_speed, config.grunt_gold]
+			)
+		)
+		print(
+			(
+				"  Runner: %d HP, %d speed, %dg"
+				% [config.runner_hp, config.runner_speed, config.runner_gold]
+			)
+		)
+		print("  Shrine: %d HP" % config.shrine_hp)
+		if ai_mode != "":
+			print("  AI mode: %s" % ai_mode)
+		print("")
+		print("Running %d simulations per strategy..." % count)
+		print("")
+
+	var on_record := Callable()
+	var on_game := Callable()
+	if ndjson_output:
+		on_record = func(strat_id: String, record: Dictionary) -> void:
+			print(JSON.stringify({"type": "strategy", "id": strat_id, "record": record}))
+	if ndjson_games:
+		on_game = func(strat_id: String, index: int, result: TickProcessor.GameResult) -> void:
+			print(
+				(
+					JSON
+					. stringify(
+						{
+							"type": "game",
+							"strategy": strat_id,
+							"index": index,
+							"seed": base_seed + index,
+							"result": result.to_dict(),
+						}
+					)
+				)
+			)
+
+	var telemetry: TelemetryWriter = null
+	if telemetry_dir != "":
+		telemetry = TelemetryWriter.new()
+		if telemetry.open(telemetry_dir) != OK:
+			push_error("Failed to open telemetry dir: " + telemetry_dir)
+			return
+		on_game = _with_telemetry(on_game, telemetry, base_seed)
+
+	var all_results := _run_strategies(
+		runner, strategies_to_run, ai_mode, count, base_seed, quiet, on_record, on_game, early_stop
+	)
+	if telemetry:
+		telemetry.close()
+
+	var end_time := Time.get_ticks_msec()
+	var best_strategy := _find_best_strategy(all_results)
+
+	# Output results
+	if ndjson_output:
+		# Strategy records were already streamed; close with the summary
+		var summary := _build_output(config, {}, best_strategy, ai_mode, end_time - start_time)
+		summary.erase("strategies")
+		summary["type"] = "done"
+		print(JSON.stringify(summary))
+	elif json_output:
+		var output := _build_output(
+			config, all_results, best_strategy, ai_mode, end_time - start_time
+		)
+		print(JSON.stringify(output))
+	else:
+		var best_win_rate := -1.0
+		if all_results.has(best_strategy):
+			best_win_rate = all_results[best_strategy].win_rate
+		print("=================================")
+		print("Completed in %dms" % (end_time - start_time))
+		print(
+			"Best strategy: %s (%.1f%% win rate)" % [best_strategy.to_upper(), best_win_rate * 100]
+		)
+		print("=================================")
+
+	# Save to file if requested
+	if output_file != "":
+		var file := FileAccess.open(output_file, FileAccess.WRITE)
+		if file:
+			var output := {
+				"config": config.to_dict(),
+				"strategies": all_results,
+				"best_strategy": best_strategy,
+			}
+			file.store_string(JSON.stringify(output, "  "))
+			file.close()
+			if not quiet:
+				print("Results saved to: %s" % output_file)
+
+
+func _create_runner(config: BalanceConfig) -> SimulationRunner:
+	## Load map, waves and every tower/enemy resource once (config applied per batch)
 	var map := TestMap.create()
 	var waves := Waves1To10.create_full()
 
@@ -368,6 +591,7 @@ func _run_simulation(args: Array) -> void:
 
 	# Setup runner with config
 	var runner := SimulationRunner.new()
+	runner.keep_results = false  # Strategy records come from runner.summary
 	runner.setup(map, waves, config)
 
 	# Register all towers
@@ -401,176 +625,363 @@ func _run_simulation(args: Array) -> void:
 	runner.register_enemy(necromancer_data)
 	runner.register_enemy(iron_colossus_data)
 
-	var all_strategies := _get_all_strategies()
-	var strategies_to_run: Array[String] = []
-	if ai_mode == "":
-		if strategy_arg == "all":
-			strategies_to_run = ["a", "b", "c", "d"]
-			strategies_to_run.append_array(_get_upgrade_strategy_ids())
-		elif strategy_arg == "upgrades":
-			strategies_to_run = _get_upgrade_strategy_ids()
-		else:
-			strategies_to_run = [strategy_arg]
+	return runner
 
-	# Collect results
-	var all_results := {}
-	var start_time := Time.get_ticks_msec()
 
-	if not json_output:
-		print("=================================")
-		print("BASTION'S LAST STAND")
-		print("Simulation Engine")
-		print("=================================")
-		print("")
-		print("Config:")
-		print("  Starting gold: %d" % config.starting_gold)
-		print("  Wall cost: %d" % config.wall_cost)
-		print(
-			(
-				"  Archer: %dg, %d dmg, %dms, %d range"
-				% [
-					config.archer_cost,
-					config.archer_damage / 1000,
-					config.archer_attack_speed_ms,
-					config.archer_range
-				]
-			)
-		)
-		print(
-			(
-				"  Grunt: %d HP, %d speed, %dg"
-				% [config.grunt_hp, config.grunt_speed, config.grunt_gold]
-			)
-		)
-		print(
-			(
-				"  Runner: %d HP, %d speed, %dg"
-				% [config.runner_hp, config.runner_speed, config.runner_gold]
-			)
-		)
-		print("  Shrine: %d HP" % config.shrine_hp)
-		if ai_mode != "":
-			print("  AI mode: %s" % ai_mode)
-		print("")
-		print("Running %d simulations per strategy..." % count)
-		print("")
+func _resolve_strategy_ids(strategy_arg: String, ai_mode: String) -> Array[String]:
+	var strategies_to_run: Array[String] = []
+	if ai_mode != "":
+		return strategies_to_run
+
+	if strategy_arg == "all":
+		strategies_to_run = ["a", "b", "c", "d"]
+		strategies_to_run.append_array(_get_upgrade_strategy_ids())
+	elif strategy_arg == "upgrades":
+		strategies_to_run = _get_upgrade_strategy_ids()
+	else:
+		# Single id or comma-separated list (used by sharded balance_ai runs)
+		for strat_id in strategy_arg.split(",", false):
+			strategies_to_run.append(strat_id.strip_edges())
+	return strategies_to_run
+
+
+func _run_strategies(
+	runner: SimulationRunner,
+	strategies_to_run: Array[String],
+	ai_mode: String,
+	count: int,
+	base_seed: int,
+	quiet: bool,
+	on_record: Callable = Callable(),
+	on_game: Callable = Callable(),
+	early_stop: EarlyStopping = null
+) -> Dictionary:
+	## Run every requested strategy (or the AI) and return id -> result record
+	## on_record(strat_id, record) fires as each strategy finishes (--ndjson);
+	## on_game(strat_id, index, result) fires per finished game (--ndjson-games);
+	## early_stop makes count an upper bound per strategy (--adaptive)
+	var all_results := {}
 
 	if ai_mode == "balanced":
 		var BalancedAIClass = preload("res://simulation/ai/strategies/balanced_ai.gd")
-		var results := runner.run_batch_with_ai(
+		var ai_handler := _connect_game_stream(runner, "ai_balanced", on_game)
+		var ai_start_us := Time.get_ticks_usec()
+		runner.run_batch_with_ai(
 			count,
 			base_seed,
 			func(game: GameState, wave: int) -> void:
 				var ai = BalancedAIClass.new(game)
-				ai.make_decisions(wave)
+				ai.make_decisions(wave),
+			early_stop
 		)
-		var analysis := SimulationRunner.analyze_results(results)
-		all_results["ai_balanced"] = {
-			"name": "BalancedAI",
-			"description": "Coverage towers + upgrades + walls",
-			"runs": count,
-			"wins": analysis.wins,
-			"win_rate": analysis.win_rate,
-			"avg_shrine_hp": analysis.avg_shrine_hp,
-			"avg_gold": analysis.avg_gold,
-			"avg_killed": analysis.avg_killed,
-			"avg_leaked": analysis.avg_leaked,
-			"avg_duration_ms": analysis.avg_duration_ms,
-			"upgrade_path_counts": analysis.get("upgrade_path_counts", {}),
-		}
-		if not json_output:
+		_disconnect_game_stream(runner, ai_handler)
+		var analysis := runner.summary.to_dict()
+		analysis["elapsed_ms"] = (Time.get_ticks_usec() - ai_start_us) / 1000.0
+		analysis["simulated"] = runner.simulated_games
+		if runner.profiler:
+			analysis["profile"] = runner.profiler.take()
+		all_results["ai_balanced"] = _build_record(
+			"BalancedAI", "Coverage towers + upgrades + walls", analysis, early_stop
+		)
+		if on_record.is_valid():
+			on_record.call("ai_balanced", all_results["ai_balanced"])
+		if not quiet:
 			print("AI Balanced:")
 			print("  Win rate: %.1f%%" % [analysis.win_rate * 100])
 			print("  Avg shrine HP: %.1f" % analysis.avg_shrine_hp)
 			print("  Upgrade paths: %s" % str(analysis.get("upgrade_path_counts", {})))
 			print("")
-	else:
-		for strat_id in strategies_to_run:
-			if not all_strategies.has(strat_id):
-				push_error("Unknown strategy: " + strat_id)
-				continue
-			var strategy: Dictionary = all_strategies[strat_id]
+		return all_results
 
-			var towers: Array[Dictionary] = []
-			for t in strategy.towers:
-				towers.append(t)
+	var all_strategies := _get_all_strategies()
+	for strat_id in strategies_to_run:
+		if not all_strategies.has(strat_id):
+			push_error("Unknown strategy: " + strat_id)
+			continue
+		var strategy: Dictionary = all_strategies[strat_id]
+
+		var towers: Array[Dictionary] = []
+		for t in strategy.towers:
+			towers.append(t)
+
+		var walls: Array[Vector2i] = []
+		for w in strategy.walls:
+			walls.append(w)
+
+		var tower_upgrades: Array = strategy.get("tower_upgrades", [])
+		var wall_upgrades: Array = strategy.get("wall_upgrades", [])
+
+		var handler := _connect_game_stream(runner, strat_id, on_game)
+		var start_us := Time.get_ticks_usec()
+		runner.run_batch(count, base_seed, towers, walls, tower_upgrades, wall_upgrades, early_stop)
+		_disconnect_game_stream(runner, handler)
+		var analysis := runner.summary.to_dict()
+		analysis["elapsed_ms"] = (Time.get_ticks_usec() - start_us) / 1000.0
+		analysis["simulated"] = runner.simulated_games
+		if runner.profiler:
+			analysis["profile"] = runner.profiler.take()
+
+		all_results[strat_id] = _build_record(
+			strategy.name, strategy.description, analysis, early_stop
+		)
+		if on_record.is_valid():
+			on_record.call(strat_id, all_results[strat_id])
 
-			var walls: Array[Vector2i] = []
-			for w in strategy.walls:
-				walls.append(w)
+		if not quiet:
+			print("Strategy %s (%s):" % [strat_id, strategy.name])
+			print("  Win rate: %.1f%%" % [analysis.win_rate * 100])
+			print("  Avg shrine HP: %.1f" % analysis.avg_shrine_hp)
+			print("  Avg gold: %.1f" % analysis.avg_gold)
+			print("  Avg killed/leaked: %.0f / %.0f" % [analysis.avg_killed, analysis.avg_leaked])
+			print("")
 
-			var tower_upgrades: Array = strategy.get("tower_upgrades", [])
-			var wall_upgrades: Array = strategy.get("wall_upgrades", [])
+	return all_results
 
-			var results := runner.run_batch(
-				count, base_seed, towers, walls, tower_upgrades, wall_upgrades
-			)
-			var analysis := SimulationRunner.analyze_results(results)
-
-			all_results[strat_id] = {
-				"name": strategy.name,
-				"description": strategy.description,
-				"runs": count,
-				"wins": analysis.wins,
-				"win_rate": analysis.win_rate,
-				"avg_shrine_hp": analysis.avg_shrine_hp,
-				"avg_gold": analysis.avg_gold,
-				"avg_killed": analysis.avg_killed,
-				"avg_leaked": analysis.avg_leaked,
-				"avg_duration_ms": analysis.avg_duration_ms,
-				"upgrade_path_counts": analysis.get("upgrade_path_counts", {}),
-			}
 
-			if not json_output:
-				print("Strategy %s (%s):" % [strat_id, strategy.name])
-				print("  Win rate: %.1f%%" % [analysis.win_rate * 100])
-				print("  Avg shrine HP: %.1f" % analysis.avg_shrine_hp)
-				print("  Avg gold: %.1f" % analysis.avg_gold)
-				print(
-					"  Avg killed/leaked: %.0f / %.0f" % [analysis.avg_killed, analysis.avg_leaked]
-				)
-				print("")
+func _build_record(
+	strat_name: String, description: String, analysis: Dictionary, early_stop: EarlyStopping
+) -> Dictionary:
+	## One strategy's JSON record; runs is the games played, simulated those actually run
+	## (fewer when a seed-invariant batch collapsed to one game)
+	var record := {
+		"name": strat_name,
+		"description": description,
+		"runs": analysis.total_simulations,
+		"simulated": analysis.get("simulated", analysis.total_simulations),
+		"wins": analysis.wins,
+		"win_rate": analysis.win_rate,
+		"avg_final_wave": analysis.get("avg_final_wave", 0.0),
+		"avg_shrine_hp": analysis.avg_shrine_hp,
+		"avg_gold": analysis.avg_gold,
+		"avg_killed": analysis.avg_killed,
+		"avg_leaked": analysis.avg_leaked,
+		"avg_duration_ms": analysis.avg_duration_ms,
+		"avg_ticks": analysis.get("avg_ticks", 0.0),
+		"elapsed_ms": analysis.get("elapsed_ms", 0.0),
+		"upgrade_path_counts": analysis.get("upgrade_path_counts", {}),
+		"distributions": analysis.get("distributions", {}),
+	}
+	for key in ResultAccumulator.spread_keys():
+		record[key] = analysis.get(key, 0.0)
+	if analysis.has("profile"):
+		record["profile"] = analysis.profile
+	if early_stop:
+		var win_ci := early_stop.win_rate_interval()
+		var hp_ci := early_stop.shrine_hp_interval()
+		record["stop_reason"] = early_stop.stop_reason
+		record["win_rate_ci"] = [win_ci.x, win_ci.y]
+		record["shrine_hp_ci"] = [hp_ci.x, hp_ci.y]
+	return record
+
+
+func _create_early_stop(options: Dictionary) -> EarlyStopping:
+	## Build the --adaptive stopping rule from CLI flags or a serve request
+	var early_stop := EarlyStopping.new()
+	early_stop.chunk_size = int(options.get("chunk_size", early_stop.chunk_size))
+	early_stop.min_games = int(options.get("min_games", early_stop.min_games))
+	early_stop.max_win_rate_half_width = float(
+		options.get("win_rate_half_width", early_stop.max_win_rate_half_width)
+	)
+	early_stop.max_shrine_hp_half_width = float(
+		options.get("shrine_hp_half_width", early_stop.max_shrine_hp_half_width)
+	)
+	var targets = options.get("targets", {})
+	if typeof(targets) == TYPE_DICTIONARY:
+		for metric in targets:
+			var band = targets[metric]
+			if typeof(band) == TYPE_ARRAY and band.size() == 2:
+				early_stop.target_bands[metric] = [float(band[0]), float(band[1])]
+	return early_stop
 
-	var end_time := Time.get_ticks_msec()
 
-	# Find best strategy
+func _parse_band(arg: String) -> Array:
+	var parts := arg.split(",", false)
+	if parts.size() != 2:
+		push_error("Expected MIN,MAX: " + arg)
+		return []
+	return [float(parts[0]), float(parts[1])]
+
+
+func _connect_game_stream(
+	runner: SimulationRunner, strat_id: String, on_game: Callable
+) -> Callable:
+	## Forward simulation_completed to on_game tagged with the strategy id
+	if not on_game.is_valid():
+		return Callable()
+	var handler := func(index: int, result: TickProcessor.GameResult) -> void:
+		on_game.call(strat_id, index, result)
+	runner.simulation_completed.connect(handler)
+	return handler
+
+
+func _with_telemetry(on_game: Callable, telemetry: TelemetryWriter, base_seed: int) -> Callable:
+	## Record each finished game in the --telemetry CSVs, then pass it on to on_game
+	return func(strat_id: String, index: int, result: TickProcessor.GameResult) -> void:
+		telemetry.write_game(strat_id, index, base_seed + index, result)
+		if on_game.is_valid():
+			on_game.call(strat_id, index, result)
+
+
+func _disconnect_game_stream(runner: SimulationRunner, handler: Callable) -> void:
+	if handler.is_valid():
+		runner.simulation_completed.disconnect(handler)
+
+
+func _find_best_strategy(all_results: Dictionary) -> String:
 	var best_strategy := ""
 	var best_win_rate := -1.0
 	for strat_id in all_results:
 		if all_results[strat_id].win_rate > best_win_rate:
 			best_win_rate = all_results[strat_id].win_rate
 			best_strategy = strat_id
+	return best_strategy
 
-	# Output results
-	if json_output:
-		var output := {
-			"config": config.to_dict(),
-			"strategies": all_results,
-			"best_strategy": best_strategy,
-			"ai_mode": ai_mode,
-			"total_duration_ms": end_time - start_time,
-			"timestamp": Time.get_datetime_string_from_system(),
-			"parameter_bounds": BalanceConfig.get_parameter_bounds(),
-		}
-		print(JSON.stringify(output))
-	else:
-		print("=================================")
-		print("Completed in %dms" % (end_time - start_time))
-		print(
-			"Best strategy: %s (%.1f%% win rate)" % [best_strategy.to_upper(), best_win_rate * 100]
+
+func _build_output(
+	config: BalanceConfig,
+	all_results: Dictionary,
+	best_strategy: String,
+	ai_mode: String,
+	duration_ms: int
+) -> Dictionary:
+	return {
+		"config": config.to_dict(),
+		"strategies": all_results,
+		"best_strategy": best_strategy,
+		"ai_mode": ai_mode,
+		"total_duration_ms": duration_ms,
+		"timestamp": Time.get_datetime_string_from_system(),
+		"parameter_bounds": BalanceConfig.get_parameter_bounds(),
+	}
+
+
+## Multi-config batch (--configs)
+
+
+func _run_config_batch(
+	runner: SimulationRunner,
+	configs_file: String,
+	strategies_to_run: Array[String],
+	ai_mode: String,
+	count: int,
+	base_seed: int,
+	early_stop: EarlyStopping
+) -> void:
+	## Evaluate every config in the file against the already-loaded runner
+	var config_dicts := _load_config_list(configs_file)
+	for i in range(config_dicts.size()):
+		var start_time := Time.get_ticks_msec()
+		var config := BalanceConfig.new()
+		config.from_dict(config_dicts[i])
+		runner.set_balance_config(config)
+
+		var all_results := _run_strategies(
+			runner,
+			strategies_to_run,
+			ai_mode,
+			count,
+			base_seed,
+			true,
+			Callable(),
+			Callable(),
+			early_stop
 		)
-		print("=================================")
+		var output := _build_output(
+			config,
+			all_results,
+			_find_best_strategy(all_results),
+			ai_mode,
+			Time.get_ticks_msec() - start_time
+		)
+		output["index"] = i
+		print(JSON.stringify(output))
 
-	# Save to file if requested
-	if output_file != "":
-		var file := FileAccess.open(output_file, FileAccess.WRITE)
-		if file:
-			var output := {
-				"config": config.to_dict(),
-				"strategies": all_results,
-				"best_strategy": best_strategy,
-			}
-			file.store_string(JSON.stringify(output, "  "))
-			file.close()
-			if not json_output:
-				print("Results saved to: %s" % output_file)
+
+func _load_config_list(path: String) -> Array[Dictionary]:
+	## Read a JSON array of config dicts, or one config dict per line (NDJSON)
+	var configs: Array[Dictionary] = []
+	var file := FileAccess.open(path, FileAccess.READ)
+	if not file:
+		push_error("Failed to open configs: " + path)
+		return configs
+	var text := file.get_as_text()
+	file.close()
+
+	var parsed = JSON.parse_string(text)
+	if typeof(parsed) == TYPE_ARRAY:
+		for entry in parsed:
+			if typeof(entry) == TYPE_DICTIONARY:
+				configs.append(entry)
+		return configs
+
+	for line in text.split("\n", false):
+		if line.strip_edges().is_empty():
+			continue
+		var entry = JSON.parse_string(line)
+		if typeof(entry) == TYPE_DICTIONARY:
+			configs.append(entry)
+		else:
+			push_error("Invalid config line: " + line)
+	return configs
+
+
+## Persistent worker (--serve)
+
+
+func _serve() -> void:
+	## Keep resources loaded and answer one JSON request per stdin line
+	var runner := _create_runner(BalanceConfig.new())
+
+	while true:
+		var line := OS.read_string_from_stdin().strip_edges()
+		if line.is_empty():
+			break  # EOF or blank line ends the session
+
+		var request = JSON.parse_string(line)
+		if typeof(request) != TYPE_DICTIONARY:
+			print(JSON.stringify({"error": "Invalid request: " + line}))
+			continue
+		if request.get("cmd", "") == "quit":
+			break
+
+		print(JSON.stringify(_handle_request(runner, request)))
+
+
+func _handle_request(runner: SimulationRunner, request: Dictionary) -> Dictionary:
+	## Run one serve request against the warm runner
+	var config := BalanceConfig.new()
+	var config_dict = request.get("config", {})
+	if typeof(config_dict) == TYPE_DICTIONARY:
+		config.from_dict(config_dict)
+	runner.set_balance_config(config)
+	runner.profiler = TickProfiler.new() if request.get("profile", false) else null
+	runner.fast_forward = bool(request.get("fast_forward", false))
+	runner.reuse_prefixes = bool(request.get("reuse_prefix", false))
+	runner.collapse_seed_invariant = not bool(request.get("every_seed", false))
+	runner.set_max_waves(int(request.get("max_waves", 0)))
+
+	var ai_mode := str(request.get("ai", "")).to_lower()
+	var strategy_ids := _resolve_strategy_ids(
+		str(request.get("strategy", "all")).to_lower(), ai_mode
+	)
+	var count := int(request.get("count", 100))
+	var base_seed := int(request.get("seed", 12345))
+
+	var start_time := Time.get_ticks_msec()
+	var early_stop: EarlyStopping = null
+	var adaptive = request.get("adaptive")
+	if typeof(adaptive) == TYPE_DICTIONARY:
+		early_stop = _create_early_stop(adaptive)
+
+	var all_results := _run_strategies(
+		runner, strategy_ids, ai_mode, count, base_seed, true, Callable(), Callable(), early_stop
+	)
+	var output := _build_output(
+		config,
+		all_results,
+		_find_best_strategy(all_results),
+		ai_mode,
+		Time.get_ticks_msec() - start_time
+	)
+	output["id"] = request.get("id")
+	return output
@@ -25,7 +25,10 @@ var wall_data: WallData  # Shared wall config / upgrade tree
 
 ## Core systems
 var pathfinding: SimPathfinding
-var rng: RandomManager
+var rng: RandomManager  # AI decisions; simulation systems draw from rng_stream() children
+var profiler: TickProfiler = null  # Set for --profile runs; see TickProcessor.process_tick
+var enemy_grid := EnemyGrid.new()  # Spatial index over enemies; see refresh_enemy_grid
+var _rng_streams: Dictionary = {}  # stream id -> RandomManager, created on first use
 
 ## Game state
 var current_wave: int = 0
@@ -45,6 +48,7 @@ var total_gold_spent: int = 0
 var total_damage_dealt: int = 0  # x1000
 var enemies_killed: int = 0
 var enemies_leaked: int = 0
+var enemies_spawned: int = 0  # Includes splits, summons and resurrections
 
 ## Wave state
 var wave_in_progress: bool = false
@@ -58,6 +62,22 @@ var wave_seconds_early: float = 0.0  # Build time remaining when wave started
 const STARTING_GOLD := 120
 const SHRINE_HP := 100
 const TICK_MS := 100  # 0.1 seconds per tick
+## Scalars carried by snapshot(); wave-local state is rebuilt by start_wave
+const SNAPSHOT_VARS: Array[String] = [
+	"current_wave",
+	"gold",
+	"total_gold_earned",
+	"total_gold_spent",
+	"total_damage_dealt",
+	"enemies_killed",
+	"enemies_leaked",
+	"enemies_spawned",
+]
+## rng_stream() ids: splitter offsets, and one stream per tower (crits, procs, scatter)
+## offset by its cell. Streams depend on the seed alone, so two configs played on the same
+## seed share each stream's sequence however differently the other streams are consumed.
+const SPLIT_STREAM := 1
+const TOWER_STREAM_BASE := 1 << 20
 
 
 func _init() -> void:
@@ -79,6 +99,7 @@ func initialize_with_config(
 	wave_data = p_wave_data
 	balance_config = config if config else BalanceConfig.new()
 	rng = RandomManager.new(seed)
+	_rng_streams.clear()
 
 	# Initialize pathfinding
 	pathfinding = SimPathfinding.new(map_data.width, map_data.height)
@@ -109,6 +130,7 @@ func initialize_with_config(
 	total_damage_dealt = 0
 	enemies_killed = 0
 	enemies_leaked = 0
+	enemies_spawned = 0
 	wave_in_progress = false
 	wave_gold_earned = 0
 	wave_shrine_damaged = false
@@ -247,7 +269,7 @@ func place_wall(pos: Vector2i) -> SimWall:
 
 
 func repath_ground_enemies() -> void:
-	## Recalculate A* paths for ground enemies after the block map changes
+	## Re-read flow-field paths for ground enemies after the block map changes
 	for enemy in enemies:
 		if enemy.is_flying or enemy.is_wall_breaker:
 			continue
@@ -435,26 +457,20 @@ func _spawn_enemy(enemy_id: String, spawn_point: Vector2i) -> void:
 	var enemy := SimEnemy.new()
 	enemy.initialize(data, spawn_point, pathfinding)
 	enemies.append(enemy)
+	enemies_spawned += 1
 	enemy_spawned.emit(enemy)
 
 
 ## Get enemies for targeting
-func get_enemies_in_range(pos: Vector2i, range_tiles: int) -> Array[SimEnemy]:
-	var result: Array[SimEnemy] = []
-	var range_sq := range_tiles * range_tiles
-
-	for enemy in enemies:
-		var dist_sq := _distance_squared(pos, enemy.grid_pos)
-		if dist_sq <= range_sq:
-			result.append(enemy)
+func refresh_enemy_grid() -> EnemyGrid:
+	## Re-index enemies; call at the start of any phase that runs range queries
+	## (positions, spawns and removals may all have changed since the last one)
+	enemy_grid.rebuild(enemies)
+	return enemy_grid
 
-	return result
 
-
-func _distance_squared(a: Vector2i, b: Vector2) -> float:
-	var dx := float(a.x) - b.x
-	var dy := float(a.y) - b.y
-	return dx * dx + dy * dy
+func get_enemies_in_range(pos: Vector2i, range_tiles: int) -> Array[SimEnemy]:
+	return refresh_enemy_grid().get_enemies_in_radius(Vector2(pos), float(range_tiles))
 
 
 ## Remove dead enemies
@@ -541,6 +557,7 @@ func spawn_enemy_at_position(enemy_id: String, pos: Vector2) -> SimEnemy:
 	enemy.grid_pos = pos  # Override to exact position
 
 	enemies.append(enemy)
+	enemies_spawned += 1
 	enemy_spawned.emit(enemy)
 	return enemy
 
@@ -556,3 +573,93 @@ func track_dead_enemy(enemy: SimEnemy) -> void:
 	# Limit tracked enemies
 	while dead_enemies.size() > MAX_DEAD_ENEMIES:
 		dead_enemies.pop_front()
+
+
+## Random streams (common random numbers across configs)
+func rng_stream(stream_id: int) -> RandomManager:
+	var stream: RandomManager = _rng_streams.get(stream_id)
+	if stream == null:
+		stream = rng.create_child(stream_id)
+		_rng_streams[stream_id] = stream
+	return stream
+
+
+func tower_rng(tower: SimTower) -> RandomManager:
+	## The tower's own stream, keyed by cell so placing other towers does not shift it
+	return rng_stream(TOWER_STREAM_BASE + (tower.position.y << 10) + tower.position.x)
+
+
+func rng_calls() -> int:
+	## Draws from rng and every stream; 0 means the seed never mattered
+	var calls := rng.get_call_count()
+	for stream in _rng_streams.values():
+		calls += stream.get_call_count()
+	return calls
+
+
+## Wave-boundary snapshots (SimulationRunner.reuse_prefixes)
+
+
+func snapshot() -> Dictionary:
+	## Everything later waves read, taken between waves (no enemies alive or queued)
+	## Entities are copied, so the game can keep running and the snapshot stays as taken.
+	if wave_in_progress or not enemies.is_empty():
+		push_error("GameState.snapshot() called mid-wave")
+		return {}
+	var data := {}
+	for name in SNAPSHOT_VARS:
+		data[name] = get(name)
+	data["shrine"] = _copy_entity(shrine)
+	data["towers"] = towers.map(_copy_entity)
+	data["walls"] = walls.map(_copy_entity)
+	data["ground_effects"] = ground_effects.map(_copy_entity)
+	data["delayed_damage_queue"] = delayed_damage_queue.duplicate(true)
+	data["dead_enemies"] = dead_enemies.duplicate(true)
+	data["rng"] = rng.get_state()
+	var streams := {}
+	for stream_id in _rng_streams:
+		streams[stream_id] = _rng_streams[stream_id].get_state()
+	data["rng_streams"] = streams
+	data["pathfinding"] = pathfinding.copy()
+	return data
+
+
+func restore(data: Dictionary) -> void:
+	## Resume an initialized game from snapshot() (same map, waves and seed; a config that
+	## only differs in later waves). Copies again, so one snapshot can be restored many times.
+	for name in SNAPSHOT_VARS:
+		set(name, data[name])
+	shrine = _copy_entity(data.shrine)
+	towers.assign(data.towers.map(_copy_entity))
+	walls.assign(data.walls.map(_copy_entity))
+	ground_effects = data.ground_effects.map(_copy_entity)
+	delayed_damage_queue.assign(data.delayed_damage_queue.duplicate(true))
+	dead_enemies.assign(data.dead_enemies.duplicate(true))
+	rng.set_state(data.rng)
+	_rng_streams.clear()
+	for stream_id in data.rng_streams:
+		var stream := RandomManager.new()
+		stream.set_state(data.rng_streams[stream_id])
+		_rng_streams[stream_id] = stream
+	pathfinding = data.pathfinding.copy()
+	enemies.clear()
+	spawn_queue.clear()
+	wave_in_progress = false
+
+	# Upgrades read the config-applied data of this game, not the snapshot's
+	for tower in towers:
+		var tower_data := get_tower_data(tower.id)
+		if tower_data:
+			tower.data = tower_data
+
+
+static func _copy_entity(entity: Object) -> Object:
+	## Field-by-field copy of a shrine, tower, wall or ground effect (data resources are shared)
+	var copy: Object = entity.get_script().new()
+	for property in entity.get_property_list():
+		if property.usage & PROPERTY_USAGE_SCRIPT_VARIABLE:
+			var value = entity.get(property.name)
+			if value is Array or value is Dictionary:
+				value = value.duplicate(true)
+			copy.set(property.name, value)
+	return copy
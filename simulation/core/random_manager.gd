@@ -28,6 +28,18 @@ func get_call_count() -> int:
 	return _call_count
 
 
+func get_state() -> Dictionary:
+	## Generator position (seed, stream state, call count) for GameState.snapshot
+	return {"seed": _seed, "state": _rng.state, "calls": _call_count}
+
+
+func set_state(state: Dictionary) -> void:
+	## Resume exactly where get_state() was taken
+	set_seed(state.seed)
+	_rng.state = state.state
+	_call_count = state.calls
+
+
 ## Returns random int in range [0, max_value) - exclusive upper bound
 func randi_range_exclusive(max_value: int) -> int:
 	_call_count += 1
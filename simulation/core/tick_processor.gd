@@ -7,6 +7,11 @@ extends RefCounted
 const TICK_MS := 100  # 0.1 seconds per tick
 
 var game_state: GameState
+## Skip idle stretches (no enemies alive, nothing due) in one step; results are identical
+var fast_forward := false
+## Take a GameState.snapshot() before each wave of run_all_waves (SimulationRunner.reuse_prefixes)
+var record_snapshots := false
+var snapshots: Array[Dictionary] = []  # Wave-start snapshots, oldest first
 
 
 func _init(p_game_state: GameState) -> void:
@@ -28,48 +33,86 @@ func process_tick() -> TickResult:
 	if not game_state.wave_in_progress:
 		return TickResult.WAITING
 
+	return _advance(TICK_MS)
+
+
+func _advance(delta_ms: int) -> TickResult:
+	## Run every phase once over delta_ms: one tick, or an idle stretch from idle_ticks()
+
+	var profiler := game_state.profiler
+	if profiler:
+		profiler.begin_tick(game_state.current_wave)
+
 	# 1. Process enemy spawns
-	game_state.process_spawns(TICK_MS)
+	game_state.process_spawns(delta_ms)
+	if profiler:
+		profiler.lap("spawns")
 
 	# 2. Move enemies
 	for enemy in game_state.enemies:
-		enemy.move(TICK_MS)
+		enemy.move(delta_ms)
+	if profiler:
+		profiler.lap("move")
 
 	# 2.5. Process wall breaker attacks
-	Combat.process_wall_breaker_attacks(game_state, TICK_MS)
+	Combat.process_wall_breaker_attacks(game_state, delta_ms)
+	if profiler:
+		profiler.lap("wall_breakers")
 
 	# 2.6. Process siege attacks (no-path enemies attack blockers)
-	Combat.process_siege_attacks(game_state, TICK_MS)
+	Combat.process_siege_attacks(game_state, delta_ms)
+	if profiler:
+		profiler.lap("siege")
 
 	# 2.7. Wall repair / tar auras (after damage so combat_idle resets apply)
-	Combat.process_wall_effects(game_state, TICK_MS)
+	Combat.process_wall_effects(game_state, delta_ms)
+	if profiler:
+		profiler.lap("wall_effects")
 
 	# 3. Process status effects (DOTs, slow decay, etc.)
-	Combat.process_status_effects(game_state, TICK_MS)
+	Combat.process_status_effects(game_state, delta_ms)
+	if profiler:
+		profiler.lap("status_effects")
 
 	# 3.3 Process healer effects
-	Combat.process_healer_effects(game_state, TICK_MS)
+	Combat.process_healer_effects(game_state, delta_ms)
+	if profiler:
+		profiler.lap("healers")
 
 	# 3.4 Process boss abilities
-	Combat.process_boss_abilities(game_state, TICK_MS)
+	Combat.process_boss_abilities(game_state, delta_ms)
+	if profiler:
+		profiler.lap("boss_abilities")
 
 	# 3.5 Process ground effects
-	_process_ground_effects(TICK_MS)
+	_process_ground_effects(delta_ms)
+	if profiler:
+		profiler.lap("ground_effects")
 
 	# 3.6 Process delayed damage
-	_process_delayed_damage(TICK_MS)
+	_process_delayed_damage(delta_ms)
+	if profiler:
+		profiler.lap("delayed_damage")
 
 	# 3.7 Support tower auras (before attacks so buffs apply this tick)
-	Combat.process_support_auras(game_state, TICK_MS)
+	Combat.process_support_auras(game_state, delta_ms)
+	if profiler:
+		profiler.lap("support_auras")
 
 	# 4. Tower attacks
-	Combat.process_tower_attacks(game_state, TICK_MS)
+	Combat.process_tower_attacks(game_state, delta_ms)
+	if profiler:
+		profiler.lap("tower_attacks")
 
 	# 5. Remove dead enemies
 	Combat.process_enemy_deaths(game_state)
+	if profiler:
+		profiler.lap("deaths")
 
 	# 6. Handle enemies reaching shrine
 	Combat.process_enemy_leaks(game_state)
+	if profiler:
+		profiler.lap("leaks")
 
 	# 7. Check win/loss conditions
 	if game_state.is_game_over():
@@ -83,41 +126,111 @@ func process_tick() -> TickResult:
 
 
 func run_wave(wave_number: int) -> WaveResult:
-	## Runs a complete wave, returns result
+	## Runs a complete wave, returns result (with this wave's telemetry counters)
 
 	if not game_state.start_wave(wave_number):
 		return WaveResult.new(false, 0, 0, 0)
 
+	var before := _wave_counters()
 	var ticks := 0
 	var max_ticks := 10000  # Safety limit (1000 seconds)
 
 	while ticks < max_ticks:
+		if fast_forward:
+			var idle := mini(idle_ticks(), max_ticks - ticks)
+			if idle > 1:
+				_advance(idle * TICK_MS)  # Nothing can happen, so this is always ONGOING
+				ticks += idle
+				continue
+
 		var result := process_tick()
 		ticks += 1
 
 		match result:
 			TickResult.WAVE_COMPLETE:
-				return WaveResult.new(true, ticks, game_state.shrine.hp, game_state.gold)
+				return _wave_result(true, ticks, before)
 			TickResult.GAME_OVER_LOSS:
-				return WaveResult.new(false, ticks, game_state.shrine.hp, game_state.gold)
+				return _wave_result(false, ticks, before)
 			TickResult.GAME_OVER_WIN:
-				return WaveResult.new(true, ticks, game_state.shrine.hp, game_state.gold)
+				return _wave_result(true, ticks, before)
 
 	# Timeout - treat as loss
 	push_warning("Wave %d timed out after %d ticks" % [wave_number, max_ticks])
-	return WaveResult.new(false, ticks, game_state.shrine.hp, game_state.gold)
+	return _wave_result(false, ticks, before)
+
+
+func idle_ticks() -> int:
+	## Ticks that can be advanced in one step with results identical to fixed stepping
+	## Needs no enemies alive (so no targeting, damage or RNG) and every structure at full
+	## HP (no regen or repair accumulators); the stretch ends one tick before the next
+	## spawn, ground-effect pulse or expiry, or delayed hit.
+	if not game_state.enemies.is_empty() or game_state.spawn_queue.is_empty():
+		return 0
+	for tower in game_state.towers:
+		if tower.hp < tower.max_hp:
+			return 0
+	for wall in game_state.walls:
+		if wall.hp < wall.max_hp and wall.special.get("self_repair", 0) > 0:
+			return 0
+
+	var idle := _ticks_before(game_state.spawn_queue[0].delay_remaining)
+	for entry in game_state.spawn_queue:
+		idle = mini(idle, _ticks_before(entry.delay_remaining))
+	for effect in game_state.ground_effects:
+		idle = mini(idle, _ticks_before(mini(effect.remaining_ms, effect.next_tick_ms)))
+	for entry in game_state.delayed_damage_queue:
+		idle = mini(idle, _ticks_before(entry.time_ms))
+	return idle
+
+
+static func _ticks_before(due_ms: int) -> int:
+	## Whole ticks that can pass with due_ms still positive (the timer does not fire)
+	return maxi(due_ms - 1, 0) / TICK_MS
+
+
+func _wave_counters() -> PackedInt64Array:
+	## Cumulative game counters, diffed across a wave for per-wave telemetry
+	return PackedInt64Array(
+		[
+			game_state.enemies_spawned,
+			game_state.enemies_killed,
+			game_state.enemies_leaked,
+			game_state.total_damage_dealt,
+			game_state.total_gold_earned,
+		]
+	)
+
+
+func _wave_result(success: bool, ticks: int, before: PackedInt64Array) -> WaveResult:
+	var result := WaveResult.new(success, ticks, game_state.shrine.hp, game_state.gold)
+	var after := _wave_counters()
+	result.spawned = after[0] - before[0]
+	result.killed = after[1] - before[1]
+	result.leaked = after[2] - before[2]
+	result.damage = after[3] - before[3]
+	result.gold_earned = after[4] - before[4]
+	return result
 
 
-func run_all_waves() -> GameResult:
+func run_all_waves(first_wave: int = 1, earlier_waves: Array[WaveResult] = []) -> GameResult:
 	## Runs all waves until win or loss
+	## A game restored from a wave-start snapshot resumes at first_wave; earlier_waves are
+	## the results of the waves before it.
 	var result := GameResult.new()
 	result.start_time = Time.get_ticks_msec()
+	result.wave_results.assign(earlier_waves)
+	for wave_result in earlier_waves:
+		result.total_ticks += wave_result.ticks
+	result.final_wave = first_wave - 1
 
 	var total_waves := game_state.wave_data.get_total_waves()
 
-	for wave_num in range(1, total_waves + 1):
+	for wave_num in range(first_wave, total_waves + 1):
+		if record_snapshots:
+			snapshots.append(game_state.snapshot())
 		var wave_result := run_wave(wave_num)
 		result.wave_results.append(wave_result)
+		result.total_ticks += wave_result.ticks
 
 		if not wave_result.success:
 			result.won = false
@@ -137,6 +250,7 @@ func run_all_waves() -> GameResult:
 	result.enemies_killed = game_state.enemies_killed
 	result.enemies_leaked = game_state.enemies_leaked
 	result.total_damage_dealt = game_state.total_damage_dealt
+	result.rng_calls = game_state.rng_calls()
 
 	# Collect tower / upgrade stats
 	_fill_result_loadout(result, game_state)
@@ -160,6 +274,12 @@ class WaveResult:
 	var ticks: int
 	var shrine_hp: int
 	var gold: int
+	## Per-wave telemetry (deltas of the GameState counters over this wave)
+	var spawned: int = 0
+	var killed: int = 0
+	var leaked: int = 0
+	var damage: int = 0  # x1000
+	var gold_earned: int = 0
 
 	func _init(p_success: bool, p_ticks: int, p_shrine_hp: int, p_gold: int) -> void:
 		success = p_success
@@ -180,6 +300,8 @@ class GameResult:
 	var enemies_killed: int = 0
 	var enemies_leaked: int = 0
 	var total_damage_dealt: int = 0  # x1000
+	var total_ticks: int = 0  # Simulated ticks over all waves (benchmark throughput)
+	var rng_calls: int = 0  # RandomManager draws; 0 means every seed plays this exact game
 	var wave_results: Array[WaveResult] = []
 	var tower_stats: Dictionary = {}  # tower_id -> {damage, kills, shots, tier, branch}
 	## Final loadout for upgrade balance reporting
@@ -200,6 +322,7 @@ class GameResult:
 			"enemies_killed": enemies_killed,
 			"enemies_leaked": enemies_leaked,
 			"total_damage_dealt": total_damage_dealt,
+			"ticks": total_ticks,
 			"tower_stats": tower_stats,
 			"upgrade_loadout": upgrade_loadout,
 		}
@@ -265,6 +388,7 @@ func _process_ground_effects(delta_ms: int) -> void:
 func _process_delayed_damage(delta_ms: int) -> void:
 	## Process delayed damage queue (barrage, etc)
 	var triggered: Array[int] = []
+	var grid: EnemyGrid = null
 
 	for i in range(game_state.delayed_damage_queue.size()):
 		var entry: Dictionary = game_state.delayed_damage_queue[i]
@@ -272,13 +396,15 @@ func _process_delayed_damage(delta_ms: int) -> void:
 
 		if entry.time_ms <= 0:
 			triggered.push_front(i)
-			_apply_delayed_damage(entry)
+			if not grid:
+				grid = game_state.refresh_enemy_grid()
+			_apply_delayed_damage(entry, grid)
 
 	for idx in triggered:
 		game_state.delayed_damage_queue.remove_at(idx)
 
 
-func _apply_delayed_damage(entry: Dictionary) -> void:
+func _apply_delayed_damage(entry: Dictionary, grid: EnemyGrid) -> void:
 	## Apply AOE damage at position
 	var pos: Vector2 = entry.position
 	var damage: int = entry.damage
@@ -287,13 +413,6 @@ func _apply_delayed_damage(entry: Dictionary) -> void:
 	if radius <= 0:
 		return
 
-	var radius_sq := radius * radius
-
-	for enemy in game_state.enemies:
-		var dx := enemy.grid_pos.x - pos.x
-		var dy := enemy.grid_pos.y - pos.y
-		var dist_sq := dx * dx + dy * dy
-
-		if dist_sq <= radius_sq:
-			enemy.take_damage(damage)
-			game_state.total_damage_dealt += damage
+	for enemy in grid.get_enemies_in_radius(pos, radius):
+		enemy.take_damage(damage)
+		game_state.total_damage_dealt += damage
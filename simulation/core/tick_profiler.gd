@@ -0,0 +1,84 @@
+class_name TickProfiler
+extends RefCounted
+
+## Opt-in per-phase timing for TickProcessor.process_tick (--profile)
+## Accumulates microseconds and call counts per tick phase (overall and per wave)
+## and per tower special. One profiler is shared by every game of a batch.
+
+## phase -> [usec, calls]
+var phases: Dictionary = {}
+## wave number -> phase -> [usec, calls]
+var waves: Dictionary = {}
+## special (beam, capacitor, barrage, cluster) -> [usec, calls]
+var specials: Dictionary = {}
+
+var _wave_phases: Dictionary = {}
+var _lap_us: int = 0
+var _special_us: int = 0
+
+
+func begin_tick(wave: int) -> void:
+	## Start timing a tick of the given wave; each lap() closes the next phase
+	if not waves.has(wave):
+		waves[wave] = {}
+	_wave_phases = waves[wave]
+	_lap_us = Time.get_ticks_usec()
+
+
+func lap(phase: String) -> void:
+	## Credit the time since the previous lap (or begin_tick) to phase
+	var now := Time.get_ticks_usec()
+	var elapsed := now - _lap_us
+	_lap_us = now
+	_add(phases, phase, elapsed)
+	_add(_wave_phases, phase, elapsed)
+
+
+func begin_special() -> void:
+	_special_us = Time.get_ticks_usec()
+
+
+func end_special(special: String) -> void:
+	_add(specials, special, Time.get_ticks_usec() - _special_us)
+
+
+func reset() -> void:
+	phases.clear()
+	waves.clear()
+	specials.clear()
+	_wave_phases = {}
+
+
+func to_dict() -> Dictionary:
+	## {phases: {name: {us, calls}}, specials: {...}, waves: {"1": {name: {us, calls}}}}
+	var wave_dicts := {}
+	for wave in waves:
+		wave_dicts[str(wave)] = _timings_to_dict(waves[wave])
+	return {
+		"phases": _timings_to_dict(phases),
+		"specials": _timings_to_dict(specials),
+		"waves": wave_dicts,
+	}
+
+
+func take() -> Dictionary:
+	## to_dict(), then reset for the next batch
+	var data := to_dict()
+	reset()
+	return data
+
+
+static func _add(timings: Dictionary, key: String, usec: int) -> void:
+	var entry: Array = timings.get(key, [])
+	if entry.is_empty():
+		entry = [0, 0]
+		timings[key] = entry
+	entry[0] += usec
+	entry[1] += 1
+
+
+static func _timings_to_dict(timings: Dictionary) -> Dictionary:
+	var result := {}
+	for key in timings:
+		result[key] = {"us": timings[key][0], "calls": timings[key][1]}
+	return result
@@ -92,9 +92,12 @@ func process_cooldown(delta_ms: int) -> void:
 			frozen_ms = 0
 
 
-func attack(target: SimEnemy, all_enemies: Array[SimEnemy]) -> Array[SimEnemy]:
+func attack(
+	target: SimEnemy, all_enemies: Array[SimEnemy], grid: EnemyGrid = null
+) -> Array[SimEnemy]:
 	## Performs attack, returns list of enemies hit
 	## Caller is responsible for applying damage
+	## With grid (indexed all_enemies), AOE and chain lookups skip distant enemies
 
 	if not can_attack():
 		return []
@@ -107,10 +110,13 @@ func attack(target: SimEnemy, all_enemies: Array[SimEnemy]) -> Array[SimEnemy]:
 	if aoe_radius > 0:
 		# AOE attack centered on target
 		var radius := float(aoe_radius) / 1000.0
-		hit_enemies = Targeting.get_enemies_in_aoe(target.grid_pos, all_enemies, radius)
+		if grid:
+			hit_enemies = grid.get_enemies_in_radius(target.grid_pos, radius)
+		else:
+			hit_enemies = Targeting.get_enemies_in_aoe(target.grid_pos, all_enemies, radius)
 	elif special.has("chain"):
 		# Chain attack - hits primary target then chains to nearby
-		hit_enemies = _get_chain_targets(target, all_enemies)
+		hit_enemies = _get_chain_targets(target, all_enemies, grid)
 	elif special.has("pierce"):
 		# Pierce attack - hits multiple enemies in a line
 		hit_enemies = get_pierce_targets(target, all_enemies)
@@ -121,7 +127,9 @@ func attack(target: SimEnemy, all_enemies: Array[SimEnemy]) -> Array[SimEnemy]:
 	return hit_enemies
 
 
-func _get_chain_targets(target: SimEnemy, all_enemies: Array[SimEnemy]) -> Array[SimEnemy]:
+func _get_chain_targets(
+	target: SimEnemy, all_enemies: Array[SimEnemy], grid: EnemyGrid = null
+) -> Array[SimEnemy]:
 	## Returns list of chain targets starting from primary target
 	var chain_count: int = special.get("chain", 1)
 	var chain_range: float = special.get("chain_range", 2.0)
@@ -130,7 +138,11 @@ func _get_chain_targets(target: SimEnemy, all_enemies: Array[SimEnemy]) -> Array
 	var current := target
 
 	for i in range(chain_count - 1):
-		var next := _find_nearest_unchained(current, all_enemies, hit, chain_range)
+		var next: SimEnemy
+		if grid:
+			next = grid.find_nearest_unchained(current, hit, chain_range)
+		else:
+			next = _find_nearest_unchained(current, all_enemies, hit, chain_range)
 		if not next:
 			break
 		hit.append(next)
@@ -0,0 +1,159 @@
+class_name EarlyStopping
+extends RefCounted
+
+## Sequential stopping rule for SimulationRunner.run_batch
+## Games run in chunks; after each chunk the batch stops once the win-rate
+## (Wilson) and shrine-HP (normal) confidence intervals are tight enough.
+## With target bands it instead stops only once every interval lies inside
+## its band, or once one lies entirely outside. Gold and leaked enemies get
+## normal intervals too, so every balance_ai TARGETS metric can be banded.
+
+const REASON_NONE := ""
+const REASON_CONVERGED := "converged"
+const REASON_TARGET_MET := "target_met"
+const REASON_TARGET_MISSED := "target_missed"
+const REASON_MAX_GAMES := "max_games"
+## Banded metrics judged on a per-game mean (win_rate uses the Wilson interval)
+const MEAN_METRICS := ["shrine_hp", "gold_remaining", "enemies_leaked"]
+## main.gd --target-* flag -> target band metric
+const TARGET_FLAGS := {
+	"--target-win-rate": "win_rate",
+	"--target-shrine-hp": "shrine_hp",
+	"--target-gold": "gold_remaining",
+	"--target-leaked": "enemies_leaked",
+}
+
+var chunk_size: int = 25
+var min_games: int = 50
+var z: float = 1.96  # 95% two-sided
+var max_win_rate_half_width: float = 0.05
+var max_shrine_hp_half_width: float = 2.0
+## Metric -> [min, max] (same names as balance_ai TARGETS: win_rate or a MEAN_METRICS entry)
+var target_bands: Dictionary = {}
+
+var stop_reason: String = REASON_NONE
+
+var _games: int = 0
+var _wins: int = 0
+var _sums: Dictionary = {}  # MEAN_METRICS metric -> sum of per-game values
+var _sq_sums: Dictionary = {}
+
+
+func reset() -> void:
+	stop_reason = REASON_NONE
+	_games = 0
+	_wins = 0
+	_sums.clear()
+	_sq_sums.clear()
+
+
+func add_result(result: TickProcessor.GameResult) -> void:
+	_games += 1
+	if result.won:
+		_wins += 1
+	_add_value("shrine_hp", result.final_shrine_hp)
+	_add_value("gold_remaining", result.final_gold)
+	_add_value("enemies_leaked", result.enemies_leaked)
+
+
+func should_check(games_played: int) -> bool:
+	## Only evaluate the rule at chunk boundaries past the minimum sample
+	return games_played >= min_games and games_played % maxi(1, chunk_size) == 0
+
+
+func should_stop() -> bool:
+	## Evaluate the rule on the results added so far; sets stop_reason
+	## With target bands only a decided target stops the batch: an interval
+	## that straddles a band edge keeps running up to the count, so early
+	## stopping never flips the optimizer's fixed-batch target check.
+	if _games < 2:
+		return false
+
+	if not target_bands.is_empty():
+		var decisions := {}
+		for metric in target_bands:
+			decisions[metric] = _band_decision(metric, _interval(metric))
+		# A missed target only stops once the win rate (which ranks the best
+		# strategy) is itself decided against its band
+		var win_decided: bool = decisions.get("win_rate", REASON_TARGET_MET) != REASON_NONE
+		var met := 0
+		for metric in decisions:
+			if decisions[metric] == REASON_TARGET_MISSED and win_decided:
+				stop_reason = REASON_TARGET_MISSED
+				return true
+			if decisions[metric] == REASON_TARGET_MET:
+				met += 1
+		if met == decisions.size():
+			stop_reason = REASON_TARGET_MET
+			return true
+		return false
+
+	var win_ci := win_rate_interval()
+	var hp_ci := shrine_hp_interval()
+	var win_half := (win_ci.y - win_ci.x) / 2.0
+	var hp_half := (hp_ci.y - hp_ci.x) / 2.0
+	if win_half <= max_win_rate_half_width and hp_half <= max_shrine_hp_half_width:
+		stop_reason = REASON_CONVERGED
+		return true
+	return false
+
+
+func win_rate_interval() -> Vector2:
+	## Wilson score interval; well behaved at 0% and 100% win rates
+	if _games == 0:
+		return Vector2(0.0, 1.0)
+	var n := float(_games)
+	var p := _wins / n
+	var z2 := z * z
+	var denom := 1.0 + z2 / n
+	var center := (p + z2 / (2.0 * n)) / denom
+	var half := z * sqrt(p * (1.0 - p) / n + z2 / (4.0 * n * n)) / denom
+	return Vector2(maxf(0.0, center - half), minf(1.0, center + half))
+
+
+func shrine_hp_interval() -> Vector2:
+	return mean_interval("shrine_hp")
+
+
+func mean_interval(metric: String) -> Vector2:
+	## Normal interval for the per-game mean of a MEAN_METRICS metric
+	if _games == 0:
+		return Vector2(0.0, 0.0)
+	var n := float(_games)
+	var mean: float = _sums.get(metric, 0) / n
+	if _games < 2:
+		return Vector2(mean, mean)
+	var variance := maxf(0.0, (_sq_sums.get(metric, 0) - n * mean * mean) / (n - 1.0))
+	var half := z * sqrt(variance / n)
+	return Vector2(mean - half, mean + half)
+
+
+func games_played() -> int:
+	return _games
+
+
+func _interval(metric: String) -> Vector2:
+	if metric == "win_rate":
+		return win_rate_interval()
+	if metric in MEAN_METRICS:
+		return mean_interval(metric)
+	# No interval for this metric: its band is never decided
+	return Vector2(-INF, INF)
+
+
+func _band_decision(metric: String, interval: Vector2) -> String:
+	if not target_bands.has(metric):
+		return REASON_NONE
+	var band: Array = target_bands[metric]
+	var lo := float(band[0])
+	var hi := float(band[1])
+	if interval.x >= lo and interval.y <= hi:
+		return REASON_TARGET_MET
+	if interval.y < lo or interval.x > hi:
+		return REASON_TARGET_MISSED
+	return REASON_NONE
+
+
+func _add_value(metric: String, value: int) -> void:
+	_sums[metric] = _sums.get(metric, 0) + value
+	_sq_sums[metric] = _sq_sums.get(metric, 0) + value * value
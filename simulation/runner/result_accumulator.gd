@@ -0,0 +1,137 @@
+class_name ResultAccumulator
+extends RefCounted
+
+## Streaming summary of finished games (SimulationRunner.summary, analyze_results)
+## State stays constant-size however many games are added: integer sums for exact means,
+## Welford M2 for variances, and a value -> count histogram per quantile metric. Game
+## metrics are small integers, so a histogram is an exact quantile sketch whose size is
+## bounded by the metric's range (e.g. 0-100 shrine HP), not by the game count.
+
+## Metric name (as in avg_<name> / std_<name>), in _values() order
+const METRICS: Array[String] = [
+	"final_wave", "shrine_hp", "gold", "killed", "leaked", "ticks", "duration_ms"
+]
+## Metrics with p5/p50/p95 (and a "distributions" histogram for merging shards)
+const QUANTILE_METRICS: Array[String] = ["shrine_hp", "gold", "leaked"]
+const QUANTILES: Array[int] = [5, 50, 95]
+
+var games: int = 0
+var wins: int = 0
+var tower_damage: Dictionary = {}  # tower id -> x1000
+var tower_kills: Dictionary = {}  # tower id -> kills
+var upgrade_path_counts: Dictionary = {}  # "id:T<tier><branch>" -> final loadouts
+
+var _sums := PackedInt64Array()
+var _means := PackedFloat64Array()
+var _m2 := PackedFloat64Array()
+var _histograms: Dictionary = {}  # quantile metric -> {value: count}
+
+
+func _init() -> void:
+	_sums.resize(METRICS.size())
+	_means.resize(METRICS.size())
+	_m2.resize(METRICS.size())
+	for metric in QUANTILE_METRICS:
+		_histograms[metric] = {}
+
+
+func add(result: TickProcessor.GameResult) -> void:
+	games += 1
+	if result.won:
+		wins += 1
+
+	var values := _values(result)
+	for i in range(values.size()):
+		var value := values[i]
+		_sums[i] += value
+		var delta := value - _means[i]
+		_means[i] += delta / games
+		_m2[i] += delta * (value - _means[i])
+	for metric in QUANTILE_METRICS:
+		var value := values[METRICS.find(metric)]
+		var histogram: Dictionary = _histograms[metric]
+		histogram[value] = histogram.get(value, 0) + 1
+
+	for tower_key in result.tower_stats:
+		var stats: Dictionary = result.tower_stats[tower_key]
+		var tower_id := str(stats.get("id", tower_key))
+		tower_damage[tower_id] = tower_damage.get(tower_id, 0) + stats.damage
+		tower_kills[tower_id] = tower_kills.get(tower_id, 0) + stats.kills
+	for entry in result.upgrade_loadout:
+		var path_key := "%s:T%d%s" % [entry.id, entry.tier, entry.branch]
+		upgrade_path_counts[path_key] = upgrade_path_counts.get(path_key, 0) + 1
+
+
+func mean(metric: String) -> float:
+	return float(_sums[METRICS.find(metric)]) / games if games > 0 else 0.0
+
+
+func std(metric: String) -> float:
+	## Sample standard deviation (0 below two games)
+	return sqrt(_m2[METRICS.find(metric)] / (games - 1)) if games > 1 else 0.0
+
+
+func quantile(metric: String, percent: int) -> int:
+	## Nearest-rank percentile: the smallest value with at least percent% of games at or below
+	var histogram: Dictionary = _histograms[metric]
+	var values := histogram.keys()
+	values.sort()
+	var rank := maxi(ceili(games * percent / 100.0), 1)
+	var seen := 0
+	for value in values:
+		seen += histogram[value]
+		if seen >= rank:
+			return value
+	return 0
+
+
+func to_dict() -> Dictionary:
+	## analyze_results() shape: totals, avg_*, std_*, p<q>_* and per-tower / path counts
+	if games == 0:
+		return {}
+
+	var analysis := {
+		"total_simulations": games,
+		"wins": wins,
+		"losses": games - wins,
+		"win_rate": float(wins) / games,
+	}
+	for metric in METRICS:
+		analysis["avg_" + metric] = mean(metric)
+	for metric in METRICS:
+		analysis["std_" + metric] = std(metric)
+	var distributions := {}
+	for metric in QUANTILE_METRICS:
+		for percent in QUANTILES:
+			analysis["p%d_%s" % [percent, metric]] = quantile(metric, percent)
+		distributions[metric] = _histograms[metric].duplicate()
+	analysis["distributions"] = distributions
+	analysis["tower_total_damage"] = tower_damage.duplicate()
+	analysis["tower_total_kills"] = tower_kills.duplicate()
+	analysis["upgrade_path_counts"] = upgrade_path_counts.duplicate()
+	return analysis
+
+
+static func spread_keys() -> Array[String]:
+	## The std_* and p<q>_* keys of to_dict(), for result records
+	var keys: Array[String] = []
+	for metric in METRICS:
+		keys.append("std_" + metric)
+	for metric in QUANTILE_METRICS:
+		for percent in QUANTILES:
+			keys.append("p%d_%s" % [percent, metric])
+	return keys
+
+
+static func _values(result: TickProcessor.GameResult) -> PackedInt64Array:
+	return PackedInt64Array(
+		[
+			result.final_wave,
+			result.final_shrine_hp,
+			result.final_gold,
+			result.enemies_killed,
+			result.enemies_leaked,
+			result.total_ticks,
+			result.get_duration_ms(),
+		]
+	)
@@ -7,36 +7,138 @@ signal simulation_started(index: int, total: int)
 signal simulation_completed(index: int, result: TickProcessor.GameResult)
 signal batch_completed(results: Array)
 
+const MAX_PREFIX_GAMES := 4096  # Games kept for reuse_prefixes; later ones run in full unstored
+
 var _map_data: MapData
-var _wave_data: WaveData
+var _wave_data: WaveData  # The games' roster: _full_wave_data or its first waves
+var _full_wave_data: WaveData
 var _tower_registry: Dictionary = {}
 var _enemy_registry: Dictionary = {}
 var _wall_data: WallData
 var _balance_config: BalanceConfig
 
+## Shared by every game while set (--profile); read with profiler.take() after a batch
+var profiler: TickProfiler = null
+## Skip idle ticks in one step (--fast-forward); results are identical to fixed stepping
+var fast_forward := false
+## Keep wave-start snapshots of run_single games (--reuse-prefix); when the config changes,
+## a stored game resumes from the first wave the change can affect (first_affected_wave)
+var reuse_prefixes := false
+## Stop simulating a batch once its first game draws no randomness: the seed then cannot
+## matter, so that game is every game's result (--every-seed turns this off)
+var collapse_seed_invariant := true
+## Games actually simulated by the last batch (1 when it collapsed)
+var simulated_games := 0
+## Streaming summary of the last batch, updated as each game finishes
+var summary := ResultAccumulator.new()
+## Also return every GameResult from run_batch*; off, memory stays flat in the game count
+var keep_results := true
+
+## Config-applied copies shared read-only by every game until the config or registries change
+var _prepared_towers: Array[TowerData] = []
+var _prepared_enemies: Array[EnemyData] = []
+var _prepared := false
+
+## Game key (seed + loadout) -> {snapshots: Array[Dictionary], waves: Array[WaveResult]}
+var _prefixes: Dictionary = {}
+var _prefix_config: Dictionary = {}  # BalanceConfig.to_dict() the stored games were run with
+
 
 func setup(map: MapData, waves: WaveData, config: BalanceConfig = null) -> void:
 	_map_data = map
 	_wave_data = waves
+	_full_wave_data = waves
 	_balance_config = config if config else BalanceConfig.new()
+	_prepared = false
+	_prefixes.clear()
 
 
 func register_tower(data: TowerData) -> void:
 	_tower_registry[data.id] = data
+	_prepared = false
+	_prefixes.clear()
 
 
 func register_enemy(data: EnemyData) -> void:
 	_enemy_registry[data.id] = data
+	_prepared = false
+	_prefixes.clear()
 
 
 func register_wall(data: WallData) -> void:
 	_wall_data = data
+	_prefixes.clear()
+
+
+func set_max_waves(max_waves: int) -> void:
+	## Play only the first max_waves waves of the setup() roster (--max-waves; 0 = all)
+	## A game that clears them counts as won, so this is a cheap low-fidelity screen.
+	var waves := _full_wave_data
+	if max_waves > 0 and max_waves < waves.get_total_waves():
+		waves = WaveData.new()
+		waves.waves.assign(_full_wave_data.waves.slice(0, max_waves))
+	if waves.get_total_waves() != _wave_data.get_total_waves():
+		_wave_data = waves
+		_prefixes.clear()
 
 
 func get_balance_config() -> BalanceConfig:
 	return _balance_config
 
 
+func set_balance_config(config: BalanceConfig) -> void:
+	## Swap the config without reloading registries (used by the --serve worker)
+	_balance_config = config if config else BalanceConfig.new()
+	_prepared = false
+
+
+func prepare_game_data() -> void:
+	## Apply the balance config to one copy of each tower/enemy type
+	## Games only read this data (entities copy their stats and specials), so
+	## the copies are shared; upgrade trees are shared with the registry too.
+	## run_batch calls this once per batch so in-place config edits are picked up.
+	_prepared_towers.clear()
+	for id in _tower_registry:
+		_prepared_towers.append(_apply_config_to_tower(_tower_registry[id].duplicate()))
+	_prepared_enemies.clear()
+	for id in _enemy_registry:
+		_prepared_enemies.append(_apply_config_to_enemy(_enemy_registry[id].duplicate()))
+	_prepared = true
+	_sync_prefixes()
+
+
+func get_prepared_tower_data(id: String) -> TowerData:
+	for data in _prepared_towers:
+		if data.id == id:
+			return data
+	return null
+
+
+func get_prepared_enemy_data(id: String) -> EnemyData:
+	for data in _prepared_enemies:
+		if data.id == id:
+			return data
+	return null
+
+
+func _create_game(seed: int) -> GameState:
+	## New game wired to the shared config-applied data
+	if not _prepared:
+		prepare_game_data()
+
+	var game := GameState.new()
+	for data in _prepared_towers:
+		game.register_tower_data(data)
+	for data in _prepared_enemies:
+		game.register_enemy_data(data)
+	if _wall_data:
+		game.register_wall_data(_wall_data)
+
+	game.initialize_with_config(_map_data, _wave_data, _balance_config, seed)
+	game.profiler = profiler
+	return game
+
+
 func _apply_config_to_tower(data: TowerData) -> TowerData:
 	## Apply balance config overrides to tower data (base + upgrade costs)
 	match data.id:
@@ -88,22 +190,15 @@ func run_single(
 	## tower_upgrades: [{pos: Vector2i, upgrade_id: String}, ...] applied in order
 	## wall_upgrades: [{pos: Vector2i, upgrade_id: String}, ...]
 
-	var game := GameState.new()
+	var key := ""
+	if _reusing_prefixes():
+		if not _prepared:
+			prepare_game_data()  # Trims stored games after a config swap
+		key = var_to_str([seed, tower_placements, wall_placements, tower_upgrades, wall_upgrades])
+		if _prefixes.has(key) and _prefixes[key].snapshots.size() > 1:
+			return _resume_game(key, seed)
 
-	# Register data with config overrides
-	for id in _tower_registry:
-		var data: TowerData = _tower_registry[id].duplicate(true)
-		data = _apply_config_to_tower(data)
-		game.register_tower_data(data)
-	for id in _enemy_registry:
-		var data: EnemyData = _enemy_registry[id].duplicate()
-		data = _apply_config_to_enemy(data)
-		game.register_enemy_data(data)
-	if _wall_data:
-		game.register_wall_data(_wall_data.duplicate(true))
-
-	# Initialize with config
-	game.initialize_with_config(_map_data, _wave_data, _balance_config, seed)
+	var game := _create_game(seed)
 
 	# Place walls first (affects pathfinding)
 	for pos in wall_placements:
@@ -118,7 +213,14 @@ func run_single(
 
 	# Run simulation
 	var processor := TickProcessor.new(game)
-	return processor.run_all_waves()
+	processor.fast_forward = fast_forward
+	processor.record_snapshots = key != ""
+	var result := processor.run_all_waves()
+	if key != "" and _prefixes.size() < MAX_PREFIX_GAMES:
+		_prefixes[key] = {
+			"snapshots": processor.snapshots, "waves": result.wave_results.duplicate()
+		}
+	return result
 
 
 func _apply_scheduled_upgrades(
@@ -171,71 +273,219 @@ func _find_wall_at(game: GameState, pos: Vector2i) -> SimWall:
 	return null
 
 
+## Prefix reuse
+
+
+func first_affected_wave(old_config: Dictionary, new_config: Dictionary) -> int:
+	## Earliest wave that can play out differently under new_config (BalanceConfig.to_dict()
+	## form); total waves + 1 when none can. wave_N_* keys reach wave N, the rush interval the
+	## first rush wave and <enemy id>_* stats the first wave that enemy can appear in (spawned,
+	## split or summoned). Anything else (economy, towers, shrine) can change wave 1.
+	var first := _wave_data.get_total_waves() + 1
+	for key in new_config:
+		if old_config.get(key) != new_config[key]:
+			first = mini(first, _parameter_first_wave(key))
+	return first
+
+
+func _parameter_first_wave(key: String) -> int:
+	var total := _wave_data.get_total_waves()
+	if key == "wave_spawn_interval_rush_ms":
+		for wave_num in range(1, total + 1):
+			if _wave_data.get_wave(wave_num).is_rush:
+				return wave_num
+		return total + 1
+
+	var parts := key.split("_")
+	if parts.size() > 2 and parts[0] == "wave" and parts[1].is_valid_int():
+		return parts[1].to_int()
+
+	var enemy_id := ""
+	for id in _enemy_registry:
+		if key.begins_with(id + "_") and id.length() > enemy_id.length():
+			enemy_id = id
+	if enemy_id != "":
+		for wave_num in range(1, total + 1):
+			if _wave_enemy_ids(_wave_data.get_wave(wave_num)).has(enemy_id):
+				return wave_num
+		return total + 1
+	return 1
+
+
+func _wave_enemy_ids(wave: SingleWaveData) -> Dictionary:
+	## Enemy ids a wave can field: its spawn groups plus what they split into or summon
+	## (resurrected enemies died in this or an earlier wave, so they are covered too)
+	var ids := {}
+	var pending: Array[String] = []
+	for group in wave.spawns:
+		pending.append(group.enemy_id)
+	while not pending.is_empty():
+		var id: String = pending.pop_back()
+		if ids.has(id):
+			continue
+		ids[id] = true
+		var data: EnemyData = _enemy_registry.get(id)
+		if data:
+			for link in ["splits_into", "spawns_enemy"]:
+				var next: String = data.special.get(link, "")
+				if next != "":
+					pending.append(next)
+	return ids
+
+
+func _reusing_prefixes() -> bool:
+	# A profile times every wave of every game, so profiled batches always run in full
+	return reuse_prefixes and profiler == null
+
+
+func _sync_prefixes() -> void:
+	## Trim stored games to the waves the current config still plays identically
+	var config := _balance_config.to_dict()
+	if config == _prefix_config:
+		return
+	var keep := 1 if _prefix_config.is_empty() else first_affected_wave(_prefix_config, config)
+	_prefix_config = config
+	if keep <= 1:
+		_prefixes.clear()
+		return
+	for key in _prefixes:
+		var prefix: Dictionary = _prefixes[key]
+		# The snapshot before wave keep is still valid; so are the results of waves 1..keep-1
+		prefix.snapshots = prefix.snapshots.slice(0, keep)
+		prefix.waves = prefix.waves.slice(0, keep - 1)
+
+
+func _resume_game(key: String, seed: int) -> TickProcessor.GameResult:
+	## Replay a stored game from its latest valid wave-start snapshot
+	var prefix: Dictionary = _prefixes[key]
+	var first_wave: int = prefix.snapshots.size()
+	var game := _create_game(seed)
+	game.restore(prefix.snapshots[first_wave - 1])
+
+	var earlier_waves: Array[TickProcessor.WaveResult] = []
+	earlier_waves.assign(prefix.waves.slice(0, first_wave - 1))
+	var processor := TickProcessor.new(game)
+	processor.fast_forward = fast_forward
+	processor.record_snapshots = true
+	var result := processor.run_all_waves(first_wave, earlier_waves)
+
+	prefix.snapshots = prefix.snapshots.slice(0, first_wave - 1) + processor.snapshots
+	prefix.waves = result.wave_results.duplicate()
+	return result
+
+
 func run_batch(
 	count: int,
 	base_seed: int,
 	tower_placements: Array[Dictionary],
 	wall_placements: Array[Vector2i] = [],
 	tower_upgrades: Array = [],
-	wall_upgrades: Array = []
+	wall_upgrades: Array = [],
+	early_stop: EarlyStopping = null
 ) -> Array[TickProcessor.GameResult]:
 	## Run multiple simulations
+	## With early_stop, count is an upper bound and the batch ends as soon as
+	## the stopping rule is satisfied (see early_stop.stop_reason)
+	## summary covers the batch either way; without keep_results the returned array is empty
 
 	var results: Array[TickProcessor.GameResult] = []
+	prepare_game_data()
+	if early_stop:
+		early_stop.reset()
+	simulated_games = 0
+	summary = ResultAccumulator.new()
+	var invariant: TickProcessor.GameResult = null
 
 	for i in range(count):
 		simulation_started.emit(i, count)
 
 		var seed := base_seed + i
-		var result := run_single(
-			seed, tower_placements, wall_placements, tower_upgrades, wall_upgrades
-		)
-		results.append(result)
+		var result := invariant
+		if not result:
+			result = run_single(
+				seed, tower_placements, wall_placements, tower_upgrades, wall_upgrades
+			)
+			simulated_games += 1
+			invariant = _seed_invariant(result)
+		summary.add(result)
+		if keep_results:
+			results.append(result)
 
 		simulation_completed.emit(i, result)
 
+		if _should_stop_early(early_stop, result):
+			break
+
+	_finish_early_stop(early_stop)
 	batch_completed.emit(results)
 	return results
 
 
 func run_batch_with_ai(
-	count: int, base_seed: int, ai_strategy: Callable  # func(game: GameState, wave: int) -> void
+	count: int, base_seed: int, ai_strategy: Callable, early_stop: EarlyStopping = null
 ) -> Array[TickProcessor.GameResult]:
 	## Run simulations where AI places towers between waves
+	## ai_strategy: func(game: GameState, wave: int) -> void
+	## Its decisions may only draw randomness from game.rng (see collapse_seed_invariant)
 
 	var results: Array[TickProcessor.GameResult] = []
+	prepare_game_data()
+	if early_stop:
+		early_stop.reset()
+	simulated_games = 0
+	summary = ResultAccumulator.new()
+	var invariant: TickProcessor.GameResult = null
 
 	for i in range(count):
 		simulation_started.emit(i, count)
 
 		var seed := base_seed + i
-		var result := _run_with_ai(seed, ai_strategy)
-		results.append(result)
+		var result := invariant
+		if not result:
+			result = _run_with_ai(seed, ai_strategy)
+			simulated_games += 1
+			invariant = _seed_invariant(result)
+		summary.add(result)
+		if keep_results:
+			results.append(result)
 
 		simulation_completed.emit(i, result)
 
+		if _should_stop_early(early_stop, result):
+			break
+
+	_finish_early_stop(early_stop)
 	batch_completed.emit(results)
 	return results
 
 
-func _run_with_ai(seed: int, ai_strategy: Callable) -> TickProcessor.GameResult:
-	var game := GameState.new()
+func _seed_invariant(result: TickProcessor.GameResult) -> TickProcessor.GameResult:
+	## result when it stands for every seed of the batch, else null
+	## The seed only feeds GameState.rng and its streams, so a game that never drew from
+	## them plays out the same under any seed. Profiled batches keep simulating, since
+	## they time each game.
+	if collapse_seed_invariant and profiler == null and result.rng_calls == 0:
+		return result
+	return null
 
-	# Register data with same config overrides as run_single
-	for id in _tower_registry:
-		var data: TowerData = _tower_registry[id].duplicate(true)
-		data = _apply_config_to_tower(data)
-		game.register_tower_data(data)
-	for id in _enemy_registry:
-		var data: EnemyData = _enemy_registry[id].duplicate()
-		data = _apply_config_to_enemy(data)
-		game.register_enemy_data(data)
-	if _wall_data:
-		game.register_wall_data(_wall_data.duplicate(true))
 
-	game.initialize_with_config(_map_data, _wave_data, _balance_config, seed)
+func _should_stop_early(early_stop: EarlyStopping, result: TickProcessor.GameResult) -> bool:
+	if not early_stop:
+		return false
+	early_stop.add_result(result)
+	return early_stop.should_check(early_stop.games_played()) and early_stop.should_stop()
+
+
+func _finish_early_stop(early_stop: EarlyStopping) -> void:
+	if early_stop and early_stop.stop_reason == EarlyStopping.REASON_NONE:
+		early_stop.stop_reason = EarlyStopping.REASON_MAX_GAMES
+
+
+func _run_with_ai(seed: int, ai_strategy: Callable) -> TickProcessor.GameResult:
+	var game := _create_game(seed)
 
 	var processor := TickProcessor.new(game)
+	processor.fast_forward = fast_forward
 	var result := TickProcessor.GameResult.new()
 	result.start_time = Time.get_ticks_msec()
 
@@ -248,6 +498,7 @@ func _run_with_ai(seed: int, ai_strategy: Callable) -> TickProcessor.GameResult:
 		# Run wave
 		var wave_result := processor.run_wave(wave_num)
 		result.wave_results.append(wave_result)
+		result.total_ticks += wave_result.ticks
 
 		if not wave_result.success:
 			result.won = false
@@ -267,6 +518,7 @@ func _run_with_ai(seed: int, ai_strategy: Callable) -> TickProcessor.GameResult:
 	result.enemies_killed = game.enemies_killed
 	result.enemies_leaked = game.enemies_leaked
 	result.total_damage_dealt = game.total_damage_dealt
+	result.rng_calls = game.rng_calls()
 
 	TickProcessor._fill_result_loadout(result, game)
 
@@ -277,57 +529,11 @@ func _run_with_ai(seed: int, ai_strategy: Callable) -> TickProcessor.GameResult:
 
 
 static func analyze_results(results: Array[TickProcessor.GameResult]) -> Dictionary:
-	if results.is_empty():
-		return {}
-
-	var wins := 0
-	var total_waves := 0
-	var total_shrine_hp := 0
-	var total_gold := 0
-	var total_duration := 0
-	var total_killed := 0
-	var total_leaked := 0
-	var tower_damage: Dictionary = {}
-	var tower_kills: Dictionary = {}
-	var upgrade_path_counts: Dictionary = {}
-
+	## Summary of finished games (same shape as summary.to_dict() after a batch)
+	var accumulator := ResultAccumulator.new()
 	for result in results:
-		if result.won:
-			wins += 1
-		total_waves += result.final_wave
-		total_shrine_hp += result.final_shrine_hp
-		total_gold += result.final_gold
-		total_duration += result.get_duration_ms()
-		total_killed += result.enemies_killed
-		total_leaked += result.enemies_leaked
-
-		for tower_key in result.tower_stats:
-			var stats: Dictionary = result.tower_stats[tower_key]
-			var tower_id: String = str(stats.get("id", tower_key))
-			tower_damage[tower_id] = tower_damage.get(tower_id, 0) + stats.damage
-			tower_kills[tower_id] = tower_kills.get(tower_id, 0) + stats.kills
-
-		for entry in result.upgrade_loadout:
-			var path_key := "%s:T%d%s" % [entry.id, entry.tier, entry.branch]
-			upgrade_path_counts[path_key] = upgrade_path_counts.get(path_key, 0) + 1
-
-	var count := results.size()
-
-	return {
-		"total_simulations": count,
-		"wins": wins,
-		"losses": count - wins,
-		"win_rate": float(wins) / count,
-		"avg_final_wave": float(total_waves) / count,
-		"avg_shrine_hp": float(total_shrine_hp) / count,
-		"avg_gold": float(total_gold) / count,
-		"avg_duration_ms": float(total_duration) / count,
-		"avg_killed": float(total_killed) / count,
-		"avg_leaked": float(total_leaked) / count,
-		"tower_total_damage": tower_damage,
-		"tower_total_kills": tower_kills,
-		"upgrade_path_counts": upgrade_path_counts,
-	}
+		accumulator.add(result)
+	return accumulator.to_dict()
 
 
 static func print_analysis(analysis: Dictionary) -> void:
@@ -0,0 +1,115 @@
+class_name TelemetryWriter
+extends RefCounted
+
+## Streams per-wave and per-tower telemetry for every finished game as CSV
+## One row per wave (waves.csv) and per placed tower (towers.csv); rows are written as
+## each game finishes, so memory stays flat however many games a run plays.
+
+const WAVES_FILE := "waves.csv"
+const TOWERS_FILE := "towers.csv"
+const WAVE_COLUMNS: Array[String] = [
+	"strategy",
+	"game",
+	"seed",
+	"wave",
+	"success",
+	"ticks",
+	"spawned",
+	"killed",
+	"leaked",
+	"damage",
+	"gold_earned",
+	"shrine_hp",
+	"gold",
+]
+const TOWER_COLUMNS: Array[String] = [
+	"strategy", "game", "seed", "tower", "x", "y", "tier", "branch", "damage", "kills", "shots"
+]
+
+var _waves: FileAccess
+var _towers: FileAccess
+
+
+func open(directory: String) -> Error:
+	## Create (truncate) waves.csv and towers.csv in directory and write their headers
+	var err := DirAccess.make_dir_recursive_absolute(directory)
+	if err != OK:
+		return err
+	_waves = FileAccess.open(directory.path_join(WAVES_FILE), FileAccess.WRITE)
+	if not _waves:
+		return FileAccess.get_open_error()
+	_towers = FileAccess.open(directory.path_join(TOWERS_FILE), FileAccess.WRITE)
+	if not _towers:
+		_waves.close()
+		_waves = null
+		return FileAccess.get_open_error()
+	_waves.store_line(",".join(WAVE_COLUMNS))
+	_towers.store_line(",".join(TOWER_COLUMNS))
+	return OK
+
+
+func is_open() -> bool:
+	return _waves != null
+
+
+func write_game(strat_id: String, index: int, seed: int, result: TickProcessor.GameResult) -> void:
+	## Append one finished game's wave and tower rows
+	if not is_open():
+		return
+	for i in range(result.wave_results.size()):
+		var wave := result.wave_results[i]
+		(
+			_waves
+			. store_line(
+				(
+					"%s,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d,%d"
+					% [
+						strat_id,
+						index,
+						seed,
+						i + 1,
+						1 if wave.success else 0,
+						wave.ticks,
+						wave.spawned,
+						wave.killed,
+						wave.leaked,
+						wave.damage,
+						wave.gold_earned,
+						wave.shrine_hp,
+						wave.gold,
+					]
+				)
+			)
+		)
+	for key in result.tower_stats:
+		var stats: Dictionary = result.tower_stats[key]
+		(
+			_towers
+			. store_line(
+				(
+					"%s,%d,%d,%s,%d,%d,%d,%s,%d,%d,%d"
+					% [
+						strat_id,
+						index,
+						seed,
+						stats.id,
+						stats.pos.x,
+						stats.pos.y,
+						stats.tier,
+						stats.branch,
+						stats.damage,
+						stats.kills,
+						stats.shots,
+					]
+				)
+			)
+		)
+
+
+func close() -> void:
+	if _waves:
+		_waves.close()
+		_waves = null
+	if _towers:
+		_towers.close()
+		_towers = null
@@ -14,15 +14,18 @@ static func process_support_auras(game_state: GameState, delta_ms: int) -> void:
 	for enemy in game_state.enemies:
 		enemy.clear_mark_state()
 
+	var grid := game_state.refresh_enemy_grid()
 	for support in game_state.towers:
 		if not support.is_support_tower():
 			continue
-		_apply_support_aura(support, game_state, delta_ms)
+		_apply_support_aura(support, game_state, grid, delta_ms)
 
 	_apply_tower_regen(game_state, delta_ms)
 
 
-static func _apply_support_aura(support: SimTower, game_state: GameState, delta_ms: int) -> void:
+static func _apply_support_aura(
+	support: SimTower, game_state: GameState, grid: EnemyGrid, delta_ms: int
+) -> void:
 	var special := support.special
 	var support_center := support.get_center()
 	var range_sq := float(support.range_tiles * support.range_tiles)
@@ -51,11 +54,9 @@ static func _apply_support_aura(support: SimTower, game_state: GameState, delta_
 			tower.aura_regen_per_sec = regen
 
 	# Enemy mark / EMP / reveal
-	for enemy in game_state.enemies:
+	for enemy in grid.get_enemies_in_radius(support_center, float(support.range_tiles)):
 		if enemy.is_dead():
 			continue
-		if not _is_in_aura_range(support_center, enemy.grid_pos, range_sq):
-			continue
 
 		if special.get("mark_enemies", false):
 			enemy.is_marked = true
@@ -102,6 +103,9 @@ static func _is_in_aura_range(center: Vector2, target: Vector2, range_sq: float)
 
 static func process_tower_attacks(game_state: GameState, delta_ms: int) -> void:
 	## Process all tower attacks for this tick
+	## Enemies neither move nor leave during this phase, so one index serves every tower
+	var grid := game_state.refresh_enemy_grid()
+	var profiler := game_state.profiler
 
 	for tower in game_state.towers:
 		# Support towers are aura-only
@@ -114,35 +118,44 @@ static func process_tower_attacks(game_state: GameState, delta_ms: int) -> void:
 
 		# Capacitor before beam — Arc Pylon→Capacitor may still have beam:true
 		if tower.special.get("capacitor", false):
-			_process_capacitor_tower(tower, game_state, delta_ms)
+			if profiler:
+				profiler.begin_special()
+			_process_capacitor_tower(tower, game_state, grid, delta_ms)
+			if profiler:
+				profiler.end_special("capacitor")
 			continue
 
 		# Handle beam mode towers
 		if tower.special.has("beam"):
-			_process_beam_tower(tower, game_state, delta_ms)
+			if profiler:
+				profiler.begin_special()
+			_process_beam_tower(tower, game_state, grid, delta_ms)
+			if profiler:
+				profiler.end_special("beam")
 			continue
 
 		if not tower.can_attack():
 			continue
 
 		# Find target
-		var target := Targeting.find_target(
-			tower.position, game_state.enemies, tower.get_effective_range(), tower.target_priority
+		var target := grid.find_target(
+			tower.position, tower.get_effective_range(), tower.target_priority
 		)
 
 		if not target:
 			continue
 
 		# Perform attack
-		var hit_enemies := tower.attack(target, game_state.enemies)
+		var hit_enemies := tower.attack(target, game_state.enemies, grid)
 
 		# Handle pierce_line special (railgun)
 		if tower.special.has("pierce_line") and tower.special.pierce_line:
 			hit_enemies = _get_line_targets(tower, target, game_state.enemies)
 
 		# Apply damage to each hit enemy
+		var rng := game_state.tower_rng(tower)
 		for enemy in hit_enemies:
-			var damage := _calculate_damage(tower, enemy, game_state.rng)
+			var damage := _calculate_damage(tower, enemy, rng)
 			enemy.take_damage(damage)
 			tower.record_damage(damage)
 			game_state.total_damage_dealt += damage
@@ -156,15 +169,23 @@ static func process_tower_attacks(game_state: GameState, delta_ms: int) -> void:
 			# Check for kill (handle shatter)
 			if enemy.is_dead():
 				tower.record_kill()
-				_handle_kill_effects(tower, enemy, game_state)
+				_handle_kill_effects(tower, enemy, game_state, grid)
 
 		# Handle barrage (schedule delayed damage)
 		if tower.special.has("barrage") and tower.special.barrage:
+			if profiler:
+				profiler.begin_special()
 			_schedule_barrage(tower, target.grid_pos, game_state)
+			if profiler:
+				profiler.end_special("barrage")
 
 		# Handle cluster (spawn sub-explosions)
 		if tower.special.has("cluster"):
-			_spawn_cluster(tower, target.grid_pos, game_state)
+			if profiler:
+				profiler.begin_special()
+			_spawn_cluster(tower, target.grid_pos, game_state, grid)
+			if profiler:
+				profiler.end_special("cluster")
 
 		# Handle ground_burn (hellfire)
 		if tower.special.has("ground_burn") and tower.special.ground_burn:
@@ -174,7 +195,7 @@ static func process_tower_attacks(game_state: GameState, delta_ms: int) -> void:
 static func _apply_tower_effects(tower: SimTower, enemy: SimEnemy, game_state: GameState) -> void:
 	## Apply special effects from tower to enemy
 	var special := tower.special
-	var rng := game_state.rng
+	var rng := game_state.tower_rng(tower)
 
 	# Slow effect
 	if special.has("slow"):
@@ -259,11 +280,13 @@ static func _calculate_damage(tower: SimTower, enemy: SimEnemy, rng: RandomManag
 	return damage
 
 
-static func _process_beam_tower(tower: SimTower, game_state: GameState, delta_ms: int) -> void:
+static func _process_beam_tower(
+	tower: SimTower, game_state: GameState, grid: EnemyGrid, delta_ms: int
+) -> void:
 	## Handle continuous beam damage
 	# Beam towers attack every tick (no cooldown)
-	var target := Targeting.find_target(
-		tower.position, game_state.enemies, tower.get_effective_range(), tower.target_priority
+	var target := grid.find_target(
+		tower.position, tower.get_effective_range(), tower.target_priority
 	)
 
 	if not target:
@@ -284,16 +307,14 @@ static func _process_beam_tower(tower: SimTower, game_state: GameState, delta_ms
 		tower.record_kill()
 
 
-static func _process_capacitor_tower(tower: SimTower, game_state: GameState, delta_ms: int) -> void:
+static func _process_capacitor_tower(
+	tower: SimTower, game_state: GameState, grid: EnemyGrid, delta_ms: int
+) -> void:
 	## Charge while enemies are in range, then discharge AOE from tower center
 	if tower.frozen_ms > 0:
 		return
 
-	var in_range := Targeting.get_enemies_in_range(
-		tower.position, game_state.enemies, tower.range_tiles
-	)
-	in_range = in_range.filter(func(e): return e.is_targetable())
-	if in_range.is_empty():
+	if not grid.has_targetable_in_range(tower.position, tower.range_tiles):
 		return
 
 	tower.capacitor_charge_ms += delta_ms
@@ -310,12 +331,13 @@ static func _process_capacitor_tower(tower: SimTower, game_state: GameState, del
 	var radius := float(tower.aoe_radius) / 1000.0
 	if radius <= 0.0:
 		radius = float(tower.range_tiles)
-	var hit_enemies := Targeting.get_enemies_in_aoe(tower.get_center(), game_state.enemies, radius)
+	var hit_enemies := grid.get_enemies_in_radius(tower.get_center(), radius)
+	var rng := game_state.tower_rng(tower)
 
 	for enemy in hit_enemies:
 		if not enemy.is_targetable():
 			continue
-		var damage := _calculate_damage(tower, enemy, game_state.rng)
+		var damage := _calculate_damage(tower, enemy, rng)
 		enemy.take_damage(damage)
 		tower.record_damage(damage)
 		game_state.total_damage_dealt += damage
@@ -323,7 +345,7 @@ static func _process_capacitor_tower(tower: SimTower, game_state: GameState, del
 		game_state.tower_attacked.emit(tower, enemy, damage)
 		if enemy.is_dead():
 			tower.record_kill()
-			_handle_kill_effects(tower, enemy, game_state)
+			_handle_kill_effects(tower, enemy, game_state, grid)
 
 
 static func _get_line_targets(
@@ -373,18 +395,19 @@ static func _schedule_barrage(tower: SimTower, target_pos: Vector2, game_state:
 	## Schedule delayed damage for howitzer barrage
 	var damage: int = tower.damage
 	var aoe_radius: float = float(tower.aoe_radius) / 1000.0
+	var rng := game_state.tower_rng(tower)
 
 	# Schedule 4 hits over 3 seconds
 	for i in range(4):
 		var delay_ms := (i + 1) * 750  # 750, 1500, 2250, 3000ms
 		# Add some randomness to position
-		var offset := Vector2(
-			game_state.rng.randf_range(-0.5, 0.5), game_state.rng.randf_range(-0.5, 0.5)
-		)
+		var offset := Vector2(rng.randf_range(-0.5, 0.5), rng.randf_range(-0.5, 0.5))
 		game_state.add_delayed_damage(delay_ms, target_pos + offset, damage, aoe_radius)
 
 
-static func _spawn_cluster(tower: SimTower, target_pos: Vector2, game_state: GameState) -> void:
+static func _spawn_cluster(
+	tower: SimTower, target_pos: Vector2, game_state: GameState, grid: EnemyGrid
+) -> void:
 	## Spawn cluster sub-explosions
 	var cluster_count: int = tower.special.cluster
 	var damage: int = tower.damage
@@ -397,14 +420,9 @@ static func _spawn_cluster(tower: SimTower, target_pos: Vector2, game_state: Gam
 		var sub_pos := target_pos + offset
 
 		# Apply damage immediately to enemies in sub-explosion
-		var radius_sq := sub_radius * sub_radius
-		for enemy in game_state.enemies:
-			var dx := enemy.grid_pos.x - sub_pos.x
-			var dy := enemy.grid_pos.y - sub_pos.y
-			var dist_sq := dx * dx + dy * dy
-			if dist_sq <= radius_sq:
-				enemy.take_damage(damage)
-				game_state.total_damage_dealt += damage
+		for enemy in grid.get_enemies_in_radius(sub_pos, sub_radius):
+			enemy.take_damage(damage)
+			game_state.total_damage_dealt += damage
 
 
 static func _spawn_ground_burn(tower: SimTower, target_pos: Vector2, game_state: GameState) -> void:
@@ -418,7 +436,9 @@ static func _spawn_ground_burn(tower: SimTower, target_pos: Vector2, game_state:
 	game_state.add_ground_effect(effect)
 
 
-static func _handle_kill_effects(tower: SimTower, enemy: SimEnemy, game_state: GameState) -> void:
+static func _handle_kill_effects(
+	tower: SimTower, enemy: SimEnemy, game_state: GameState, grid: EnemyGrid
+) -> void:
 	## Handle on-kill effects like shatter
 	var special := tower.special
 
@@ -426,17 +446,12 @@ static func _handle_kill_effects(tower: SimTower, enemy: SimEnemy, game_state: G
 	if special.has("shatter_damage"):
 		var shatter_damage: int = special.shatter_damage
 		var shatter_radius := 1.5  # Tiles
-		var radius_sq := shatter_radius * shatter_radius
 
-		for other_enemy in game_state.enemies:
+		for other_enemy in grid.get_enemies_in_radius(enemy.grid_pos, shatter_radius):
 			if other_enemy == enemy:
 				continue
-			var dx := other_enemy.grid_pos.x - enemy.grid_pos.x
-			var dy := other_enemy.grid_pos.y - enemy.grid_pos.y
-			var dist_sq := dx * dx + dy * dy
-			if dist_sq <= radius_sq:
-				other_enemy.take_damage(shatter_damage)
-				game_state.total_damage_dealt += shatter_damage
+			other_enemy.take_damage(shatter_damage)
+			game_state.total_damage_dealt += shatter_damage
 
 
 static func process_enemy_deaths(game_state: GameState) -> void:
@@ -450,10 +465,9 @@ static func process_enemy_deaths(game_state: GameState) -> void:
 	for enemy in to_remove:
 		# Handle splitter spawning before removal
 		if enemy.splits_into != "" and enemy.split_count > 0:
+			var rng := game_state.rng_stream(GameState.SPLIT_STREAM)
 			for i in range(enemy.split_count):
-				var offset := Vector2(
-					game_state.rng.randf_range(-0.3, 0.3), game_state.rng.randf_range(-0.3, 0.3)
-				)
+				var offset := Vector2(rng.randf_range(-0.3, 0.3), rng.randf_range(-0.3, 0.3))
 				game_state.spawn_enemy_at_position(enemy.splits_into, enemy.grid_pos + offset)
 
 		# Track for necromancer resurrection
@@ -494,6 +508,7 @@ static func process_status_effects(game_state: GameState, delta_ms: int) -> void
 
 static func process_healer_effects(game_state: GameState, delta_ms: int) -> void:
 	## Healers heal nearby allies each tick
+	var grid: EnemyGrid = null
 	for enemy in game_state.enemies:
 		if enemy.healer_range <= 0 or enemy.heal_per_sec <= 0:
 			continue
@@ -501,20 +516,15 @@ static func process_healer_effects(game_state: GameState, delta_ms: int) -> void
 			continue
 
 		var heal_amount := enemy.heal_per_sec * delta_ms / 1000 / 1000  # x1000 to actual HP
-		var range_sq := enemy.healer_range * enemy.healer_range
+		if not grid:
+			grid = game_state.refresh_enemy_grid()
 
-		for ally in game_state.enemies:
+		for ally in grid.get_enemies_in_radius(enemy.grid_pos, float(enemy.healer_range)):
 			if ally == enemy:
 				continue
 			if ally.hp >= ally.max_hp:
 				continue
-
-			var dx := ally.grid_pos.x - enemy.grid_pos.x
-			var dy := ally.grid_pos.y - enemy.grid_pos.y
-			var dist_sq := dx * dx + dy * dy
-
-			if dist_sq <= range_sq:
-				ally.hp = mini(ally.hp + heal_amount, ally.max_hp)
+			ally.hp = mini(ally.hp + heal_amount, ally.max_hp)
 
 
 static func process_boss_abilities(game_state: GameState, delta_ms: int) -> void:
@@ -616,10 +626,14 @@ static func _resurrect_nearby_dead(enemy: SimEnemy, game_state: GameState) -> vo
 
 static func process_wall_effects(game_state: GameState, delta_ms: int) -> void:
 	## Tick wall timers, self-repair, and tar auras
+	var grid: EnemyGrid = null
 	for wall in game_state.walls:
 		wall.process_timers(delta_ms)
 		_apply_wall_repair(wall, delta_ms)
-		_apply_tar_aura(wall, game_state, delta_ms)
+		if wall.special.has("tar_slow"):
+			if not grid:
+				grid = game_state.refresh_enemy_grid()
+			_apply_tar_aura(wall, grid, delta_ms)
 
 
 static func _apply_wall_repair(wall: SimWall, delta_ms: int) -> void:
@@ -640,20 +654,13 @@ static func _apply_wall_repair(wall: SimWall, delta_ms: int) -> void:
 	wall.hp = mini(wall.hp + heal, wall.max_hp)
 
 
-static func _apply_tar_aura(wall: SimWall, game_state: GameState, delta_ms: int) -> void:
-	if not wall.special.has("tar_slow"):
-		return
+static func _apply_tar_aura(wall: SimWall, grid: EnemyGrid, delta_ms: int) -> void:
 	var slow_amount: int = wall.special.tar_slow
 	var radius: float = float(wall.special.get("tar_radius", 2))
-	var radius_sq := radius * radius
-	var wall_pos := Vector2(wall.position)
-	for enemy in game_state.enemies:
+	for enemy in grid.get_enemies_in_radius(Vector2(wall.position), radius):
 		if enemy.is_dead() or enemy.is_flying:
 			continue
-		var dx := enemy.grid_pos.x - wall_pos.x
-		var dy := enemy.grid_pos.y - wall_pos.y
-		if dx * dx + dy * dy <= radius_sq:
-			enemy.apply_slow(slow_amount, maxi(delta_ms * 2, 200))
+		enemy.apply_slow(slow_amount, maxi(delta_ms * 2, 200))
 
 
 static func _damage_wall(
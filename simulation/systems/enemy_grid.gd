@@ -0,0 +1,202 @@
+class_name EnemyGrid
+extends RefCounted
+
+## Bucketed tile grid over GameState.enemies for range queries
+## rebuild() is a counting sort into reused packed arrays (no per-enemy
+## allocation). Each bucket keeps enemies in array order and ties are broken
+## by that order, so every query returns exactly what a full scan would.
+
+const CELL_TILES := 2.0
+const MAX_CELLS_PER_AXIS := 64
+const EDGE_EPSILON := 0.001  # Widen query boxes so float rounding never drops an edge hit
+
+var _enemies: Array[SimEnemy] = []
+var _origin := Vector2.ZERO
+var _cell_size := CELL_TILES
+var _cols := 0
+var _rows := 0
+var _cell_start := PackedInt32Array()  # Offsets into _cell_items, cols * rows + 1
+var _cell_items := PackedInt32Array()  # Enemy indices grouped by cell, ascending per cell
+var _cell_of := PackedInt32Array()  # Scratch: cell of each enemy
+var _cursor := PackedInt32Array()  # Scratch: fill position per cell
+var _hits := PackedInt32Array()  # Scratch: indices matched by list queries
+
+# Query box (cell coordinates), set by _set_box
+var _x0 := 0
+var _x1 := -1
+var _y0 := 0
+var _y1 := -1
+
+
+func rebuild(enemies: Array[SimEnemy]) -> void:
+	## Index the current enemy positions; call again after enemies move, spawn or leave
+	_enemies = enemies
+	var n := enemies.size()
+	if n == 0:
+		_cols = 0
+		_rows = 0
+		return
+
+	var min_x := enemies[0].grid_pos.x
+	var min_y := enemies[0].grid_pos.y
+	var max_x := min_x
+	var max_y := min_y
+	for enemy in enemies:
+		min_x = minf(min_x, enemy.grid_pos.x)
+		min_y = minf(min_y, enemy.grid_pos.y)
+		max_x = maxf(max_x, enemy.grid_pos.x)
+		max_y = maxf(max_y, enemy.grid_pos.y)
+
+	_origin = Vector2(min_x, min_y)
+	_cell_size = maxf(CELL_TILES, maxf(max_x - min_x, max_y - min_y) / MAX_CELLS_PER_AXIS)
+	_cols = int((max_x - min_x) / _cell_size) + 1
+	_rows = int((max_y - min_y) / _cell_size) + 1
+
+	var cells := _cols * _rows
+	_cell_start.resize(cells + 1)
+	_cell_start.fill(0)
+	_cell_of.resize(n)
+	for i in range(n):
+		var cell := _cell_index(enemies[i].grid_pos)
+		_cell_of[i] = cell
+		_cell_start[cell + 1] += 1
+	for c in range(cells):
+		_cell_start[c + 1] += _cell_start[c]
+
+	_cursor.resize(cells)
+	for c in range(cells):
+		_cursor[c] = _cell_start[c]
+	_cell_items.resize(n)
+	for i in range(n):
+		var cell := _cell_of[i]
+		_cell_items[_cursor[cell]] = i
+		_cursor[cell] += 1
+
+
+func find_target(tower_pos: Vector2i, range_tiles: int, priority: int) -> SimEnemy:
+	## Same result as Targeting.find_target over the indexed enemies, without allocating
+	var center := Vector2(tower_pos)
+	var range_sq := float(range_tiles * range_tiles)
+	var best: SimEnemy = null
+	var best_index := -1
+	var best_score := 0.0
+
+	if not _set_box(center, float(range_tiles)):
+		return null
+	for cy in range(_y0, _y1 + 1):
+		for cx in range(_x0, _x1 + 1):
+			var cell := cy * _cols + cx
+			for k in range(_cell_start[cell], _cell_start[cell + 1]):
+				var index := _cell_items[k]
+				var enemy := _enemies[index]
+				var dx := center.x - enemy.grid_pos.x
+				var dy := center.y - enemy.grid_pos.y
+				if dx * dx + dy * dy > range_sq or not enemy.is_targetable():
+					continue
+				var score := Targeting.priority_score(priority, tower_pos, enemy)
+				if (
+					best == null
+					or score > best_score
+					or (score == best_score and index < best_index)
+				):
+					best = enemy
+					best_index = index
+					best_score = score
+
+	return best
+
+
+func has_targetable_in_range(pos: Vector2i, range_tiles: int) -> bool:
+	var center := Vector2(pos)
+	var range_sq := float(range_tiles * range_tiles)
+
+	if not _set_box(center, float(range_tiles)):
+		return false
+	for cy in range(_y0, _y1 + 1):
+		for cx in range(_x0, _x1 + 1):
+			var cell := cy * _cols + cx
+			for k in range(_cell_start[cell], _cell_start[cell + 1]):
+				var enemy := _enemies[_cell_items[k]]
+				var dx := center.x - enemy.grid_pos.x
+				var dy := center.y - enemy.grid_pos.y
+				if dx * dx + dy * dy <= range_sq and enemy.is_targetable():
+					return true
+
+	return false
+
+
+func get_enemies_in_radius(center: Vector2, radius: float) -> Array[SimEnemy]:
+	## Enemies within radius of center, in GameState.enemies order
+	## (matches Targeting.get_enemies_in_aoe / get_enemies_in_range)
+	var result: Array[SimEnemy] = []
+	var radius_sq := radius * radius
+
+	_hits.resize(0)
+	if not _set_box(center, radius):
+		return result
+	for cy in range(_y0, _y1 + 1):
+		for cx in range(_x0, _x1 + 1):
+			var cell := cy * _cols + cx
+			for k in range(_cell_start[cell], _cell_start[cell + 1]):
+				var index := _cell_items[k]
+				var enemy := _enemies[index]
+				var dx := center.x - enemy.grid_pos.x
+				var dy := center.y - enemy.grid_pos.y
+				if dx * dx + dy * dy <= radius_sq:
+					_hits.append(index)
+
+	_hits.sort()
+	for index in _hits:
+		result.append(_enemies[index])
+	return result
+
+
+func find_nearest_unchained(from: SimEnemy, exclude: Array[SimEnemy], max_range: float) -> SimEnemy:
+	## Nearest targetable enemy strictly within max_range of from (chain lightning hops)
+	var best: SimEnemy = null
+	var best_index := -1
+	var best_dist := max_range * max_range
+
+	if not _set_box(from.grid_pos, max_range):
+		return null
+	for cy in range(_y0, _y1 + 1):
+		for cx in range(_x0, _x1 + 1):
+			var cell := cy * _cols + cx
+			for k in range(_cell_start[cell], _cell_start[cell + 1]):
+				var index := _cell_items[k]
+				var enemy := _enemies[index]
+				if enemy in exclude or not enemy.is_targetable():
+					continue
+				var dx := from.grid_pos.x - enemy.grid_pos.x
+				var dy := from.grid_pos.y - enemy.grid_pos.y
+				var dist_sq := dx * dx + dy * dy
+				if dist_sq < best_dist or (dist_sq == best_dist and best and index < best_index):
+					best = enemy
+					best_index = index
+					best_dist = dist_sq
+
+	return best
+
+
+func _cell_index(pos: Vector2) -> int:
+	var cx := clampi(floori((pos.x - _origin.x) / _cell_size), 0, _cols - 1)
+	var cy := clampi(floori((pos.y - _origin.y) / _cell_size), 0, _rows - 1)
+	return cy * _cols + cx
+
+
+func _set_box(center: Vector2, radius: float) -> bool:
+	## Clamp the cells covering [center - radius, center + radius]; false if none
+	if _cols == 0:
+		return false
+	var reach := radius + EDGE_EPSILON
+	var x0 := floori((center.x - reach - _origin.x) / _cell_size)
+	var x1 := floori((center.x + reach - _origin.x) / _cell_size)
+	var y0 := floori((center.y - reach - _origin.y) / _cell_size)
+	var y1 := floori((center.y + reach - _origin.y) / _cell_size)
+	if x1 < 0 or y1 < 0 or x0 >= _cols or y0 >= _rows:
+		return false
+	_x0 = maxi(x0, 0)
+	_x1 = mini(x1, _cols - 1)
+	_y0 = maxi(y0, 0)
+	_y1 = mini(y1, _rows - 1)
+	return true
@@ -1,8 +1,10 @@
 class_name SimPathfinding
 extends RefCounted
 
-## A* pathfinding for the simulation grid
-## Caches paths per spawn point, invalidates on wall changes
+## Flow-field pathfinding for the simulation grid
+## Keeps one reverse BFS distance field from the shrine. Blocking or unblocking
+## a tile repairs only the affected region; paths are read off the field in
+## O(path length) and cached per start tile until the field changes.
 
 const DIRECTIONS := [
 	Vector2i(0, -1),  # Up
@@ -10,34 +12,60 @@ const DIRECTIONS := [
 	Vector2i(-1, 0),  # Left
 	Vector2i(1, 0),  # Right
 ]
+const UNREACHABLE := -1
 
 var _width: int
 var _height: int
 var _blocked: Dictionary = {}  # Vector2i -> bool
-var _path_cache: Dictionary = {}  # spawn_point (Vector2i) -> path (Array[Vector2i])
+var _path_cache: Dictionary = {}  # start (Vector2i) -> path (Array[Vector2i])
 var _shrine_pos: Vector2i
+var _dist := PackedInt32Array()  # Steps to the shrine per tile (y * width + x), -1 if none
+var _field_dirty := true  # Full rebuild pending (shrine moved)
 
 
 func _init(width: int, height: int) -> void:
 	_width = width
 	_height = height
+	_dist.resize(width * height)
+	_dist.fill(UNREACHABLE)
 
 
 func set_shrine_position(pos: Vector2i) -> void:
 	_shrine_pos = pos
+	_field_dirty = true
 	_path_cache.clear()
 
 
+func copy() -> SimPathfinding:
+	## Independent copy of the block map, distance field and path cache (wave snapshots)
+	var other := SimPathfinding.new(_width, _height)
+	other._blocked = _blocked.duplicate()
+	other._path_cache = _path_cache.duplicate(true)
+	other._shrine_pos = _shrine_pos
+	other._dist = _dist.duplicate()
+	other._field_dirty = _field_dirty
+	return other
+
+
 func get_shrine_position() -> Vector2i:
 	return _shrine_pos
 
 
 func set_blocked(pos: Vector2i, blocked: bool) -> void:
+	if blocked == _blocked.has(pos):
+		return
 	if blocked:
 		_blocked[pos] = true
 	else:
 		_blocked.erase(pos)
-	_path_cache.clear()  # Invalidate all cached paths
+	_path_cache.clear()
+
+	if _field_dirty or not _in_bounds(pos):
+		return
+	if blocked:
+		_repair_after_block(pos)
+	else:
+		_repair_after_unblock(pos)
 
 
 func is_blocked(pos: Vector2i) -> bool:
@@ -53,90 +81,175 @@ func is_walkable(pos: Vector2i) -> bool:
 
 
 func get_path(from: Vector2i) -> Array[Vector2i]:
-	## Returns cached path or computes new one
+	## Returns cached path or reads a new one off the distance field
 	if _path_cache.has(from):
 		return _path_cache[from]
 
-	var path := _compute_path(from, _shrine_pos)
+	var path := _trace_path(from)
 	_path_cache[from] = path
 	return path
 
 
+func get_distance(from: Vector2i) -> int:
+	## Steps from tile to shrine along the shortest path, -1 if unreachable
+	if not _in_bounds(from):
+		return UNREACHABLE
+	_ensure_field()
+	return _dist[_index(from)]
+
+
 func has_valid_path(from: Vector2i) -> bool:
-	var path := get_path(from)
-	return not path.is_empty()
+	return get_distance(from) != UNREACHABLE
 
 
 func invalidate_cache() -> void:
 	_path_cache.clear()
 
 
-func _compute_path(start: Vector2i, goal: Vector2i) -> Array[Vector2i]:
-	## Standard A* implementation
-	if not is_walkable(start):
+func _trace_path(start: Vector2i) -> Array[Vector2i]:
+	## Walk downhill from start; prefer keeping the current heading, then DIRECTIONS order
+	var remaining := get_distance(start)
+	if remaining == UNREACHABLE:
 		return []
-	if start == goal:
-		return [goal]
-
-	var open_set: Array[Vector2i] = [start]
-	var came_from: Dictionary = {}
-	var g_score: Dictionary = {start: 0}
-	var f_score: Dictionary = {start: _heuristic(start, goal)}
-
-	while not open_set.is_empty():
-		var current := _get_lowest_f(open_set, f_score)
-
-		if current == goal:
-			return _reconstruct_path(came_from, current)
-
-		open_set.erase(current)
 
-		for direction in DIRECTIONS:
-			var neighbor: Vector2i = current + direction
+	var path: Array[Vector2i] = [start]
+	var current := start
+	var heading := Vector2i.ZERO
+	while remaining > 0:
+		var next := current + heading
+		if heading == Vector2i.ZERO or not _is_step(next, remaining - 1):
+			for direction in DIRECTIONS:
+				next = current + direction
+				if _is_step(next, remaining - 1):
+					heading = direction
+					break
+		current = next
+		remaining -= 1
+		path.append(current)
 
-			if not is_walkable(neighbor):
-				continue
+	return path
 
-			var tentative_g: int = g_score[current] + 1
 
-			if tentative_g < g_score.get(neighbor, 999999):
-				came_from[neighbor] = current
-				g_score[neighbor] = tentative_g
-				f_score[neighbor] = tentative_g + _heuristic(neighbor, goal)
+func _is_step(pos: Vector2i, dist: int) -> bool:
+	return _in_bounds(pos) and _dist[_index(pos)] == dist
 
-				if neighbor not in open_set:
-					open_set.append(neighbor)
 
-	# No path found
-	return []
+func _ensure_field() -> void:
+	if not _field_dirty:
+		return
+	_field_dirty = false
+	_dist.fill(UNREACHABLE)
+	if not is_walkable(_shrine_pos):
+		return
 
+	var origin := _index(_shrine_pos)
+	_dist[origin] = 0
+	_relax_from(PackedInt32Array([origin]))
 
-func _heuristic(a: Vector2i, b: Vector2i) -> int:
-	## Manhattan distance
-	return absi(a.x - b.x) + absi(a.y - b.y)
 
+func _repair_after_block(pos: Vector2i) -> void:
+	## Drop every tile whose distance depended on pos, then refill from the intact border
+	var cell := _index(pos)
+	if _dist[cell] == UNREACHABLE:
+		return
 
-func _get_lowest_f(open_set: Array[Vector2i], f_score: Dictionary) -> Vector2i:
-	var lowest: Vector2i = open_set[0]
-	var lowest_f: int = f_score.get(lowest, 999999)
+	# Level by level, invalidate tiles left without a neighbor one step closer
+	var lost := PackedInt32Array([cell])
+	var levels := PackedInt32Array([_dist[cell]])
+	_dist[cell] = UNREACHABLE
+	var head := 0
+	while head < lost.size():
+		var tile := _tile(lost[head])
+		var child_dist := levels[head] + 1
+		head += 1
+		for direction in DIRECTIONS:
+			var neighbor: Vector2i = tile + direction
+			if not _in_bounds(neighbor):
+				continue
+			var n := _index(neighbor)
+			if _dist[n] != child_dist or _has_parent(neighbor, child_dist):
+				continue
+			_dist[n] = UNREACHABLE
+			lost.append(n)
+			levels.append(child_dist)
+
+	# Seed lost tiles that border intact ones, nearest first
+	var seeds: Array[int] = []
+	var seed_dist := PackedInt32Array()
+	for i in range(1, lost.size()):
+		var best := _best_neighbor_dist(_tile(lost[i]))
+		if best != UNREACHABLE:
+			seeds.append(lost[i])
+			seed_dist.append(best + 1)
+	for i in range(seeds.size()):
+		_dist[seeds[i]] = seed_dist[i]
+	seeds.sort_custom(func(a: int, b: int) -> bool: return _dist[a] < _dist[b])
+	_relax_from(PackedInt32Array(seeds))
+
+
+func _best_neighbor_dist(tile: Vector2i) -> int:
+	## Smallest distance among in-bounds neighbors, -1 if none is reachable
+	var best := UNREACHABLE
+	for direction in DIRECTIONS:
+		var neighbor: Vector2i = tile + direction
+		if not _in_bounds(neighbor):
+			continue
+		var d := _dist[_index(neighbor)]
+		if d != UNREACHABLE and (best == UNREACHABLE or d < best):
+			best = d
+	return best
+
+
+func _has_parent(tile: Vector2i, dist: int) -> bool:
+	## True if an open neighbor still sits exactly one step closer to the shrine
+	for direction in DIRECTIONS:
+		var neighbor: Vector2i = tile + direction
+		if _in_bounds(neighbor) and _dist[_index(neighbor)] == dist - 1:
+			return true
+	return false
+
+
+func _repair_after_unblock(pos: Vector2i) -> void:
+	## Give pos a distance from its neighbors and push improvements outward
+	var cell := _index(pos)
+	if pos == _shrine_pos:
+		_dist[cell] = 0
+	else:
+		var best := _best_neighbor_dist(pos)
+		if best == UNREACHABLE:
+			return
+		_dist[cell] = best + 1
+	_relax_from(PackedInt32Array([cell]))
+
+
+func _relax_from(queue: PackedInt32Array) -> void:
+	## BFS relaxation: lower neighbor distances until nothing improves
+	var head := 0
+	while head < queue.size():
+		var index := queue[head]
+		head += 1
+		var tile := _tile(index)
+		var next_dist := _dist[index] + 1
+		for direction in DIRECTIONS:
+			var neighbor: Vector2i = tile + direction
+			if not is_walkable(neighbor):
+				continue
+			var n := _index(neighbor)
+			if _dist[n] == UNREACHABLE or next_dist < _dist[n]:
+				_dist[n] = next_dist
+				queue.append(n)
 
-	for pos in open_set:
-		var f: int = f_score.get(pos, 999999)
-		if f < lowest_f:
-			lowest_f = f
-			lowest = pos
 
-	return lowest
+func _in_bounds(pos: Vector2i) -> bool:
+	return pos.x >= 0 and pos.x < _width and pos.y >= 0 and pos.y < _height
 
 
-func _reconstruct_path(came_from: Dictionary, current: Vector2i) -> Array[Vector2i]:
-	var path: Array[Vector2i] = [current]
+func _index(pos: Vector2i) -> int:
+	return pos.y * _width + pos.x
 
-	while came_from.has(current):
-		current = came_from[current]
-		path.push_front(current)
 
-	return path
+func _tile(index: int) -> Vector2i:
+	return Vector2i(index % _width, index / _width)
 
 
 ## Debug: Get all blocked positions
@@ -149,7 +262,7 @@ func get_all_blocked() -> Array[Vector2i]:
 
 ## Get path length (for AI evaluation)
 func get_path_length(from: Vector2i) -> int:
-	var path := get_path(from)
-	if path.is_empty():
+	var dist := get_distance(from)
+	if dist == UNREACHABLE:
 		return -1  # No valid path
-	return path.size()
+	return dist + 1
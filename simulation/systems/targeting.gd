@@ -18,28 +18,37 @@ static func find_target(
 	range_tiles: int,
 	priority: Priority = Priority.FIRST
 ) -> SimEnemy:
-	## Find best target from enemies in range
-	var in_range := get_enemies_in_range(tower_pos, enemies, range_tiles)
+	## Find best target from enemies in range (single pass, no intermediate arrays)
+	## Ties go to the enemy earliest in the array
+	var best: SimEnemy = null
+	var best_score := 0.0
+	var range_sq := range_tiles * range_tiles
 
-	# Filter to targetable only
-	in_range = in_range.filter(func(e): return e.is_targetable())
+	for enemy in enemies:
+		if _distance_sq(tower_pos, enemy.grid_pos) > range_sq or not enemy.is_targetable():
+			continue
+		var score := priority_score(priority, tower_pos, enemy)
+		if best == null or score > best_score:
+			best = enemy
+			best_score = score
+
+	return best
 
-	if in_range.is_empty():
-		return null
 
+static func priority_score(priority: int, tower_pos: Vector2i, enemy: SimEnemy) -> float:
+	## Higher is a better target for the given priority
 	match priority:
 		Priority.FIRST:
-			return _get_first(in_range)
+			return enemy.path_progress  # Furthest along path
 		Priority.LAST:
-			return _get_last(in_range)
+			return -enemy.path_progress  # Closest to spawn
 		Priority.STRONGEST:
-			return _get_strongest(in_range)
+			return float(enemy.hp)
 		Priority.WEAKEST:
-			return _get_weakest(in_range)
+			return -float(enemy.hp)
 		Priority.CLOSEST:
-			return _get_closest(tower_pos, in_range)
-
-	return in_range[0]
+			return -_distance_sq(tower_pos, enemy.grid_pos)
+	return 0.0
 
 
 static func get_enemies_in_range(
@@ -75,53 +84,6 @@ static func get_enemies_in_aoe(
 	return result
 
 
-static func _get_first(enemies: Array[SimEnemy]) -> SimEnemy:
-	## Furthest along path
-	var best: SimEnemy = enemies[0]
-	for enemy in enemies:
-		if enemy.path_progress > best.path_progress:
-			best = enemy
-	return best
-
-
-static func _get_last(enemies: Array[SimEnemy]) -> SimEnemy:
-	## Closest to spawn
-	var best: SimEnemy = enemies[0]
-	for enemy in enemies:
-		if enemy.path_progress < best.path_progress:
-			best = enemy
-	return best
-
-
-static func _get_strongest(enemies: Array[SimEnemy]) -> SimEnemy:
-	var best: SimEnemy = enemies[0]
-	for enemy in enemies:
-		if enemy.hp > best.hp:
-			best = enemy
-	return best
-
-
-static func _get_weakest(enemies: Array[SimEnemy]) -> SimEnemy:
-	var best: SimEnemy = enemies[0]
-	for enemy in enemies:
-		if enemy.hp < best.hp:
-			best = enemy
-	return best
-
-
-static func _get_closest(tower_pos: Vector2i, enemies: Array[SimEnemy]) -> SimEnemy:
-	var best: SimEnemy = enemies[0]
-	var best_dist := _distance_sq(tower_pos, best.grid_pos)
-
-	for enemy in enemies:
-		var dist := _distance_sq(tower_pos, enemy.grid_pos)
-		if dist < best_dist:
-			best_dist = dist
-			best = enemy
-
-	return best
-
-
 static func _distance_sq(a: Vector2i, b: Vector2) -> float:
 	var dx := float(a.x) - b.x
 	var dy := float(a.y) - b.y
@@ -0,0 +1,79 @@
+extends SceneTree
+
+## Benchmark: fixed 100ms stepping vs TickProcessor fast-forward
+## Runs the same seeds both ways, checks the results are identical and reports the time
+## per game. Run: godot --headless -s res://tests/benchmarks/bench_fast_forward.gd -- [games]
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+
+const DEFAULT_GAMES := 50
+
+
+func _init() -> void:
+	var games := DEFAULT_GAMES
+	var user_args := OS.get_cmdline_user_args()
+	if not user_args.is_empty():
+		games = maxi(1, user_args[0].to_int())
+
+	var runner := _make_runner()
+	var towers: Array[Dictionary] = [
+		{pos = Vector2i(3, 2), id = "archer"}, {pos = Vector2i(6, 2), id = "archer"}
+	]
+
+	runner.fast_forward = false
+	var fixed := _measure(runner, games, towers)
+	runner.fast_forward = true
+	var skipped := _measure(runner, games, towers)
+
+	var mismatches := 0
+	for i in range(games):
+		if (
+			JSON.stringify(_comparable(fixed.results[i]))
+			!= JSON.stringify(_comparable(skipped.results[i]))
+		):
+			mismatches += 1
+
+	print("Fast-forward, %d games (strategy A):" % games)
+	print("  fixed stepping  %10.1f us/game" % fixed.usec_per_game)
+	print("  fast-forward    %10.1f us/game" % skipped.usec_per_game)
+	print("  speedup         %10.2fx" % (fixed.usec_per_game / maxf(skipped.usec_per_game, 1.0)))
+	print("  mismatched games: %d" % mismatches)
+	quit(1 if mismatches > 0 else 0)
+
+
+func _measure(runner: SimulationRunner, games: int, towers: Array[Dictionary]) -> Dictionary:
+	var start := Time.get_ticks_usec()
+	var results := runner.run_batch(games, 1, towers)
+	return {
+		"results": results,
+		"usec_per_game": float(Time.get_ticks_usec() - start) / games,
+	}
+
+
+func _comparable(result: TickProcessor.GameResult) -> Dictionary:
+	var data := result.to_dict()
+	data.erase("duration_ms")
+	return data
+
+
+func _make_runner() -> SimulationRunner:
+	var runner := SimulationRunnerClass.new()
+	runner.collapse_seed_invariant = false  # Time every game, not one per batch
+	runner.setup(TestMap.create(), Waves1To10.create_full(), BalanceConfig.new())
+	for path in _resource_paths("res://resources/towers/"):
+		runner.register_tower(load(path))
+	for path in _resource_paths("res://resources/enemies/"):
+		runner.register_enemy(load(path))
+	runner.register_wall(load("res://resources/walls/basic_wall.tres"))
+	return runner
+
+
+func _resource_paths(dir_path: String) -> Array[String]:
+	var paths: Array[String] = []
+	for file in DirAccess.get_files_at(dir_path):
+		if file.ends_with(".tres"):
+			paths.append(dir_path + file)
+	paths.sort()
+	return paths
@@ -0,0 +1,115 @@
+extends SceneTree
+
+## Benchmark: per-game tower/enemy data setup in SimulationRunner
+## Compares the old per-game deep duplication against the shared, config-applied
+## data prepared once per batch. Reports objects allocated and time per game.
+## Run: godot --headless -s res://tests/benchmarks/bench_game_data.gd -- [games]
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+
+const DEFAULT_GAMES := 1000
+const FULL_GAMES := 20
+
+
+func _init() -> void:
+	var games := DEFAULT_GAMES
+	var user_args := OS.get_cmdline_user_args()
+	if not user_args.is_empty():
+		games = maxi(1, user_args[0].to_int())
+
+	var runner := _make_runner()
+	var map := TestMap.create()
+	var waves := Waves1To10.create_full()
+
+	var duplicated := _measure(games, func(): return _setup_duplicated(runner, map, waves))
+	runner.prepare_game_data()
+	var shared := _measure(games, func(): return _setup_shared(runner, map, waves))
+
+	print("Game data setup, %d games:" % games)
+	_print_row("per-game duplicate(true)", duplicated)
+	_print_row("prepared once per batch", shared)
+	print(
+		(
+			"  saved per game: %.1f objects, %.1f us"
+			% [
+				duplicated.objects_per_game - shared.objects_per_game,
+				duplicated.usec_per_game - shared.usec_per_game
+			]
+		)
+	)
+
+	var towers: Array[Dictionary] = [
+		{pos = Vector2i(3, 2), id = "archer"}, {pos = Vector2i(6, 2), id = "archer"}
+	]
+	var start := Time.get_ticks_usec()
+	runner.run_batch(FULL_GAMES, 1, towers)
+	var full_usec := float(Time.get_ticks_usec() - start) / FULL_GAMES
+	print("  full game (strategy A, for scale): %.1f us" % full_usec)
+	quit()
+
+
+func _measure(games: int, setup: Callable) -> Dictionary:
+	## Keep every game alive so the object count reflects allocations, not churn
+	var keep: Array[GameState] = []
+	var objects_before := Performance.get_monitor(Performance.OBJECT_COUNT)
+	var start := Time.get_ticks_usec()
+	for i in range(games):
+		keep.append(setup.call())
+	var usec := Time.get_ticks_usec() - start
+	var objects := Performance.get_monitor(Performance.OBJECT_COUNT) - objects_before
+	return {
+		"objects_per_game": objects / games,
+		"usec_per_game": float(usec) / games,
+	}
+
+
+func _print_row(label: String, row: Dictionary) -> void:
+	print("  %-26s %8.1f objects %10.1f us" % [label, row.objects_per_game, row.usec_per_game])
+
+
+func _setup_duplicated(runner: SimulationRunner, map: MapData, waves: WaveData) -> GameState:
+	## The pre-batch behaviour: deep-copy and re-apply the config for every game
+	var game := GameState.new()
+	for id in runner._tower_registry:
+		var data: TowerData = runner._tower_registry[id].duplicate(true)
+		game.register_tower_data(runner._apply_config_to_tower(data))
+	for id in runner._enemy_registry:
+		var data: EnemyData = runner._enemy_registry[id].duplicate()
+		game.register_enemy_data(runner._apply_config_to_enemy(data))
+	game.register_wall_data(runner._wall_data.duplicate(true))
+	game.initialize_with_config(map, waves, runner.get_balance_config(), 1)
+	return game
+
+
+func _setup_shared(runner: SimulationRunner, map: MapData, waves: WaveData) -> GameState:
+	var game := GameState.new()
+	for id in runner._tower_registry:
+		game.register_tower_data(runner.get_prepared_tower_data(id))
+	for id in runner._enemy_registry:
+		game.register_enemy_data(runner.get_prepared_enemy_data(id))
+	game.register_wall_data(runner._wall_data)
+	game.initialize_with_config(map, waves, runner.get_balance_config(), 1)
+	return game
+
+
+func _make_runner() -> SimulationRunner:
+	var runner := SimulationRunnerClass.new()
+	runner.collapse_seed_invariant = false  # Time every game, not one per batch
+	runner.setup(TestMap.create(), Waves1To10.create_full(), BalanceConfig.new())
+	for path in _resource_paths("res://resources/towers/"):
+		runner.register_tower(load(path))
+	for path in _resource_paths("res://resources/enemies/"):
+		runner.register_enemy(load(path))
+	runner.register_wall(load("res://resources/walls/basic_wall.tres"))
+	return runner
+
+
+func _resource_paths(dir_path: String) -> Array[String]:
+	var paths: Array[String] = []
+	for file in DirAccess.get_files_at(dir_path):
+		if file.ends_with(".tres"):
+			paths.append(dir_path + file)
+	paths.sort()
+	return paths
@@ -0,0 +1,146 @@
+extends GutTest
+
+## Integration tests for TickProcessor fast-forward (idle tick skipping)
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+
+var _game_state: GameState
+var _tick_processor: TickProcessor
+
+
+func before_each() -> void:
+	_game_state = TestHelpers.create_test_game_state()
+	_tick_processor = TickProcessor.new(_game_state)
+	_game_state.register_enemy_data(TestHelpers.create_basic_enemy_data())
+	_game_state.register_tower_data(TestHelpers.create_basic_tower_data())
+
+
+# ============================================
+# idle_ticks() tests
+# ============================================
+
+
+func test_idle_ticks_stop_before_next_spawn() -> void:
+	_game_state.start_wave(1)
+	_queue_spawns([1000, 2000])
+
+	assert_eq(_tick_processor.idle_ticks(), 9)
+
+	_game_state.spawn_queue[0].delay_remaining = 1050
+	assert_eq(_tick_processor.idle_ticks(), 10)
+
+
+func test_idle_ticks_zero_with_enemies_or_damage() -> void:
+	_game_state.start_wave(1)
+	_queue_spawns([5000])
+	_game_state.gold = 1000
+	var tower := _game_state.place_tower(Vector2i(10, 8), "archer")
+	tower.hp = tower.max_hp - 1
+
+	assert_eq(_tick_processor.idle_ticks(), 0)
+
+	tower.hp = tower.max_hp
+	_game_state.spawn_enemy_at_position("grunt", Vector2(0, 0))
+	assert_eq(_tick_processor.idle_ticks(), 0)
+
+
+func test_idle_ticks_respect_delayed_damage() -> void:
+	_game_state.start_wave(1)
+	_queue_spawns([5000])
+	_game_state.add_delayed_damage(750, Vector2(5, 5), 1000, 1.0)
+
+	assert_eq(_tick_processor.idle_ticks(), 7)
+
+
+# ============================================
+# Bit-identical results
+# ============================================
+
+
+func test_fast_forward_matches_fixed_stepping() -> void:
+	var layouts: Array = [
+		[{pos = Vector2i(3, 2), id = "archer"}, {pos = Vector2i(6, 2), id = "archer"}],
+		[{pos = Vector2i(3, 2), id = "frost"}, {pos = Vector2i(6, 3), id = "cannon"}],
+		[{pos = Vector2i(3, 2), id = "lightning"}, {pos = Vector2i(6, 3), id = "support"}],
+	]
+	var runner := _make_runner()
+	for layout in layouts:
+		var towers: Array[Dictionary] = []
+		towers.assign(layout)
+		for seed in [1, 2, 3]:
+			_assert_same_both_ways(runner, seed, towers, [])
+
+
+func test_fast_forward_matches_with_tower_specials() -> void:
+	## Barrage (delayed damage), capacitor, ground burn and beam paths
+	var paths := [
+		["cannon", "cannon_artillery", "cannon_howitzer"],
+		["lightning", "lightning_arc_pylon", "lightning_capacitor"],
+		["flame", "flame_inferno", "flame_hellfire"],
+		["flame", "flame_focused", "flame_plasma"],
+	]
+	var pos := Vector2i(3, 2)
+	var runner := _make_runner()
+	for path in paths:
+		var towers: Array[Dictionary] = [{pos = pos, id = path[0]}]
+		var upgrades := [{pos = pos, upgrade_id = path[1]}, {pos = pos, upgrade_id = path[2]}]
+		for seed in [4, 5]:
+			_assert_same_both_ways(runner, seed, towers, upgrades)
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _assert_same_both_ways(
+	runner: SimulationRunner, seed: int, towers: Array[Dictionary], upgrades: Array
+) -> void:
+	var walls: Array[Vector2i] = []
+	runner.fast_forward = false
+	var fixed := runner.run_single(seed, towers, walls, upgrades, [])
+	runner.fast_forward = true
+	var skipped := runner.run_single(seed, towers, walls, upgrades, [])
+	_assert_same_result(skipped, fixed)
+
+
+func _assert_same_result(
+	actual: TickProcessor.GameResult, expected: TickProcessor.GameResult
+) -> void:
+	var a := actual.to_dict()
+	var e := expected.to_dict()
+	a.erase("duration_ms")
+	e.erase("duration_ms")
+	assert_eq_deep(a, e)
+	assert_eq(actual.total_ticks, expected.total_ticks)
+	assert_eq(actual.wave_results.size(), expected.wave_results.size())
+	for i in range(expected.wave_results.size()):
+		var aw := actual.wave_results[i]
+		var ew := expected.wave_results[i]
+		assert_eq(
+			[aw.success, aw.ticks, aw.shrine_hp, aw.gold, aw.killed, aw.leaked, aw.damage],
+			[ew.success, ew.ticks, ew.shrine_hp, ew.gold, ew.killed, ew.leaked, ew.damage]
+		)
+
+
+func _queue_spawns(delays: Array) -> void:
+	_game_state.spawn_queue.clear()
+	for delay in delays:
+		_game_state.spawn_queue.append(
+			{"enemy_id": "grunt", "spawn_point": Vector2i(0, 0), "delay_remaining": delay}
+		)
+
+
+func _make_runner() -> SimulationRunner:
+	var runner := SimulationRunnerClass.new()
+	runner.setup(TestMap.create(), Waves1To10.create_full(), BalanceConfig.new())
+	for file in DirAccess.get_files_at("res://resources/towers/"):
+		if file.ends_with(".tres"):
+			runner.register_tower(load("res://resources/towers/" + file))
+	for file in DirAccess.get_files_at("res://resources/enemies/"):
+		if file.ends_with(".tres"):
+			runner.register_enemy(load("res://resources/enemies/" + file))
+	runner.register_wall(load("res://resources/walls/basic_wall.tres"))
+	return runner
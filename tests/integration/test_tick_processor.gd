@@ -233,6 +233,18 @@ func test_run_wave_tracks_shrine_hp() -> void:
 	assert_lte(result.shrine_hp, initial_hp)
 
 
+func test_run_wave_counts_wave_telemetry() -> void:
+	# No towers - every spawned enemy leaks
+	var first := _tick_processor.run_wave(1)
+	var second := _tick_processor.run_wave(2)
+
+	assert_gt(first.spawned, 0)
+	assert_eq(first.leaked, first.spawned - first.killed)
+	assert_eq(first.leaked + second.leaked, _game_state.enemies_leaked)
+	assert_eq(first.spawned + second.spawned, _game_state.enemies_spawned)
+	assert_eq(first.damage + second.damage, _game_state.total_damage_dealt)
+
+
 func test_run_wave_invalid_wave() -> void:
 	var result := _tick_processor.run_wave(999)
 
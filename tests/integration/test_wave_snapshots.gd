@@ -0,0 +1,195 @@
+extends GutTest
+
+## Integration tests for wave-boundary snapshots and SimulationRunner prefix reuse
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+
+const TOWERS: Array[Dictionary] = [
+	{pos = Vector2i(3, 2), id = "archer"},
+	{pos = Vector2i(6, 2), id = "archer"},
+	{pos = Vector2i(3, 6), id = "frost"},
+]
+
+# ============================================
+# Snapshot / restore
+# ============================================
+
+
+func test_restored_game_finishes_like_the_original() -> void:
+	var runner := _make_runner()
+	var game := runner._create_game(7)
+	for placement in TOWERS:
+		game.place_tower(placement.pos, placement.id)
+	var processor := TickProcessor.new(game)
+	for wave_num in range(1, 4):
+		processor.run_wave(wave_num)
+	var snapshot := game.snapshot()
+	var original := processor.run_all_waves(4)
+
+	var copy := runner._create_game(7)
+	copy.restore(snapshot)
+	var resumed := TickProcessor.new(copy).run_all_waves(4)
+
+	_assert_same_result(resumed, original)
+
+
+func test_restore_does_not_share_entities_with_snapshot() -> void:
+	var runner := _make_runner()
+	var game := runner._create_game(1)
+	game.place_tower(Vector2i(3, 2), "archer")
+	game.place_wall(Vector2i(8, 8))
+	var snapshot := game.snapshot()
+
+	var copy := runner._create_game(1)
+	copy.restore(snapshot)
+	copy.towers[0].kills = 5
+	copy.walls[0].hp = 1
+	copy.pathfinding.set_blocked(Vector2i(9, 9), true)
+
+	assert_eq(snapshot.towers[0].kills, 0)
+	assert_eq(snapshot.walls[0].hp, snapshot.walls[0].max_hp)
+	assert_false(snapshot.pathfinding.is_blocked(Vector2i(9, 9)))
+	assert_true(copy.pathfinding.is_blocked(Vector2i(8, 8)))
+
+
+func test_snapshot_restores_rng_position() -> void:
+	var runner := _make_runner()
+	var game := runner._create_game(42)
+	game.rng.randf()
+	game.rng.randf()
+	var snapshot := game.snapshot()
+	var expected := game.rng.randf()
+
+	var copy := runner._create_game(42)
+	copy.restore(snapshot)
+	assert_eq(copy.rng.randf(), expected)
+	assert_eq(copy.rng.get_call_count(), 3)
+
+
+# ============================================
+# first_affected_wave()
+# ============================================
+
+
+func test_first_affected_wave_by_parameter() -> void:
+	var runner := _make_runner()
+	var base := BalanceConfig.new().to_dict()
+
+	assert_eq(runner.first_affected_wave(base, base), 31)
+	assert_eq(_first_wave(runner, base, "wave_9_grunts", 20), 9)
+	assert_eq(_first_wave(runner, base, "runner_hp", 99), 6)
+	assert_eq(_first_wave(runner, base, "wave_spawn_interval_rush_ms", 250), 8)
+	assert_eq(_first_wave(runner, base, "grunt_hp", 70), 1)
+	assert_eq(_first_wave(runner, base, "archer_damage", 1), 1)
+	assert_eq(_first_wave(runner, base, "starting_gold", 999), 1)
+
+
+func test_first_affected_wave_follows_splits_and_summons() -> void:
+	var runner := _make_runner()
+	var spawns_mini := 31
+	var waves := Waves1To10.create_full()
+	for wave_num in range(30, 0, -1):
+		if runner._wave_enemy_ids(waves.get_wave(wave_num)).has("mini"):
+			spawns_mini = wave_num
+
+	assert_lt(spawns_mini, 31, "some wave fields minis through splitters or summons")
+	var config := BalanceConfig.new().to_dict()
+	var changed := config.duplicate()
+	changed["mini_hp"] = 1
+	assert_eq(runner.first_affected_wave(config, changed), spawns_mini)
+
+
+# ============================================
+# Prefix reuse
+# ============================================
+
+
+func test_prefix_reuse_matches_full_runs() -> void:
+	var configs := [{}, {"runner_gold": 20}, {"wave_9_grunts": 30}, {"grunt_hp": 75}]
+	var reused := _make_runner()
+	reused.reuse_prefixes = true
+	var fresh := _make_runner()
+	var walls: Array[Vector2i] = []
+
+	for overrides in configs:
+		var config := BalanceConfig.new()
+		config.from_dict(overrides)
+		reused.set_balance_config(config)
+		fresh.set_balance_config(config)
+		for seed in [1, 2, 3]:
+			_assert_same_result(
+				reused.run_single(seed, TOWERS, walls), fresh.run_single(seed, TOWERS, walls)
+			)
+
+
+func test_prefix_reuse_skips_unaffected_waves() -> void:
+	var runner := _make_runner()
+	runner.reuse_prefixes = true
+	var walls: Array[Vector2i] = []
+	runner.run_single(1, TOWERS, walls)
+	var key: String = runner._prefixes.keys()[0]
+	var played: int = runner._prefixes[key].snapshots.size()
+
+	var config := BalanceConfig.new()
+	config.runner_gold = 20
+	runner.set_balance_config(config)
+	runner.prepare_game_data()
+	assert_eq(runner._prefixes[key].snapshots.size(), mini(played, 6), "waves 1-5 stay valid")
+
+	runner.run_single(1, TOWERS, walls)
+	assert_eq(runner._prefixes[key].snapshots.size(), played, "re-recorded from wave 6")
+
+
+func test_profiled_runs_do_not_reuse_prefixes() -> void:
+	var runner := _make_runner()
+	runner.reuse_prefixes = true
+	runner.profiler = TickProfiler.new()
+	var walls: Array[Vector2i] = []
+	runner.run_single(1, TOWERS, walls)
+
+	assert_true(runner._prefixes.is_empty())
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _first_wave(runner: SimulationRunner, base: Dictionary, key: String, value) -> int:
+	var changed := base.duplicate()
+	changed[key] = value
+	return runner.first_affected_wave(base, changed)
+
+
+func _assert_same_result(
+	actual: TickProcessor.GameResult, expected: TickProcessor.GameResult
+) -> void:
+	var a := actual.to_dict()
+	var e := expected.to_dict()
+	a.erase("duration_ms")
+	e.erase("duration_ms")
+	assert_eq_deep(a, e)
+	assert_eq(actual.final_wave, expected.final_wave)
+	assert_eq(actual.wave_results.size(), expected.wave_results.size())
+	for i in range(mini(actual.wave_results.size(), expected.wave_results.size())):
+		var aw := actual.wave_results[i]
+		var ew := expected.wave_results[i]
+		assert_eq(
+			[aw.success, aw.ticks, aw.shrine_hp, aw.gold, aw.killed, aw.leaked, aw.damage],
+			[ew.success, ew.ticks, ew.shrine_hp, ew.gold, ew.killed, ew.leaked, ew.damage]
+		)
+
+
+func _make_runner() -> SimulationRunner:
+	var runner := SimulationRunnerClass.new()
+	runner.setup(TestMap.create(), Waves1To10.create_full(), BalanceConfig.new())
+	for file in DirAccess.get_files_at("res://resources/towers/"):
+		if file.ends_with(".tres"):
+			runner.register_tower(load("res://resources/towers/" + file))
+	for file in DirAccess.get_files_at("res://resources/enemies/"):
+		if file.ends_with(".tres"):
+			runner.register_enemy(load("res://resources/enemies/" + file))
+	runner.register_wall(load("res://resources/walls/basic_wall.tres"))
+	return runner
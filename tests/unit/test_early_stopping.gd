@@ -0,0 +1,209 @@
+extends GutTest
+
+## Unit tests for EarlyStopping and adaptive SimulationRunner batches
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+
+# ============================================
+# Interval tests
+# ============================================
+
+
+func test_wilson_interval_all_wins_stays_in_unit_range() -> void:
+	var rule := EarlyStopping.new()
+	_add_results(rule, 50, true, 100)
+
+	var ci := rule.win_rate_interval()
+
+	assert_almost_eq(ci.y, 1.0, 0.0001)
+	assert_gt(ci.x, 0.9)
+	assert_lt(ci.x, 0.95)
+
+
+func test_shrine_hp_interval_is_point_for_constant_hp() -> void:
+	var rule := EarlyStopping.new()
+	_add_results(rule, 10, true, 90)
+
+	var ci := rule.shrine_hp_interval()
+
+	assert_almost_eq(ci.x, 90.0, 0.0001)
+	assert_almost_eq(ci.y, 90.0, 0.0001)
+
+
+# ============================================
+# Stopping rule tests
+# ============================================
+
+
+func test_stops_when_intervals_converge() -> void:
+	var rule := EarlyStopping.new()
+	_add_results(rule, 50, true, 100)
+
+	assert_true(rule.should_stop())
+	assert_eq(rule.stop_reason, EarlyStopping.REASON_CONVERGED)
+
+
+func test_stops_when_target_is_missed() -> void:
+	var rule := EarlyStopping.new()
+	rule.max_win_rate_half_width = 0.0
+	rule.target_bands = {"win_rate": [0.95, 1.0]}
+	_add_results(rule, 20, false, 0)
+
+	assert_true(rule.should_stop())
+	assert_eq(rule.stop_reason, EarlyStopping.REASON_TARGET_MISSED)
+
+
+func test_stops_when_all_targets_are_met() -> void:
+	var rule := EarlyStopping.new()
+	rule.max_win_rate_half_width = 0.0
+	rule.target_bands = {"win_rate": [0.95, 1.0], "shrine_hp": [85, 100]}
+	_add_results(rule, 50, true, 100)
+	assert_false(rule.should_stop())
+
+	_add_results(rule, 25, true, 100)
+	assert_true(rule.should_stop())
+	assert_eq(rule.stop_reason, EarlyStopping.REASON_TARGET_MET)
+
+
+func test_interval_straddling_a_band_edge_keeps_running() -> void:
+	## 97/100 wins: tight enough to converge, but the CI still straddles 0.95
+	var rule := EarlyStopping.new()
+	rule.target_bands = {"win_rate": [0.95, 1.0], "shrine_hp": [85, 100]}
+	_add_results(rule, 97, true, 100)
+	_add_results(rule, 3, false, 100)
+
+	var ci := rule.win_rate_interval()
+	assert_lt(ci.x, 0.95)
+	assert_lt((ci.y - ci.x) / 2.0, rule.max_win_rate_half_width)
+	assert_false(rule.should_stop())
+	assert_eq(rule.stop_reason, EarlyStopping.REASON_NONE)
+
+
+func test_missed_target_waits_for_a_decided_win_rate() -> void:
+	var rule := EarlyStopping.new()
+	rule.target_bands = {"win_rate": [0.95, 1.0], "shrine_hp": [85, 100]}
+	_add_results(rule, 97, true, 0)
+	_add_results(rule, 3, false, 0)
+	assert_false(rule.should_stop(), "shrine HP missed, win rate still undecided")
+
+	var losing := EarlyStopping.new()
+	losing.target_bands = rule.target_bands
+	_add_results(losing, 100, false, 0)
+	assert_true(losing.should_stop())
+	assert_eq(losing.stop_reason, EarlyStopping.REASON_TARGET_MISSED)
+
+
+func test_gold_and_leaked_bands_decide_target_met() -> void:
+	var rule := EarlyStopping.new()
+	rule.target_bands = {
+		"win_rate": [0.95, 1.0],
+		"shrine_hp": [85, 100],
+		"gold_remaining": [0, 20],
+		"enemies_leaked": [0, 5],
+	}
+	_add_results(rule, 100, true, 100, 60)
+	assert_true(rule.should_stop())
+	assert_eq(rule.stop_reason, EarlyStopping.REASON_TARGET_MISSED, "60 gold is outside 0-20")
+
+	rule.reset()
+	_add_results(rule, 100, true, 100, 10, 2)
+	assert_true(rule.should_stop())
+	assert_eq(rule.stop_reason, EarlyStopping.REASON_TARGET_MET)
+	assert_almost_eq(rule.mean_interval("enemies_leaked").x, 2.0, 0.0001)
+
+
+func test_band_without_interval_blocks_target_met() -> void:
+	var rule := EarlyStopping.new()
+	rule.target_bands = {"win_rate": [0.95, 1.0], "final_wave": [10, 30]}
+	_add_results(rule, 100, true, 100)
+
+	assert_false(rule.should_stop())
+
+
+func test_noisy_results_keep_running() -> void:
+	var rule := EarlyStopping.new()
+	for i in range(100):
+		_add_results(rule, 1, i % 2 == 0, 50 if i % 2 == 0 else 0)
+
+	assert_false(rule.should_stop())
+
+
+func test_should_check_only_at_chunk_boundaries() -> void:
+	var rule := EarlyStopping.new()
+	rule.min_games = 50
+	rule.chunk_size = 25
+
+	assert_false(rule.should_check(25))
+	assert_true(rule.should_check(50))
+	assert_false(rule.should_check(60))
+	assert_true(rule.should_check(75))
+
+
+# ============================================
+# run_batch integration
+# ============================================
+
+
+func test_run_batch_stops_early_on_deterministic_results() -> void:
+	var runner := _make_runner()
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+	var rule := EarlyStopping.new()
+	rule.min_games = 4
+	rule.chunk_size = 2
+	rule.max_win_rate_half_width = 1.0
+	rule.max_shrine_hp_half_width = 1000.0
+
+	var results := runner.run_batch(20, 1, towers, [], [], [], rule)
+
+	assert_eq(results.size(), 4)
+	assert_eq(rule.stop_reason, EarlyStopping.REASON_CONVERGED)
+
+
+func test_run_batch_without_rule_runs_full_count() -> void:
+	var runner := _make_runner()
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+
+	var results := runner.run_batch(3, 1, towers)
+
+	assert_eq(results.size(), 3)
+
+
+func test_run_batch_reports_max_games_when_undecided() -> void:
+	var runner := _make_runner()
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+	var rule := EarlyStopping.new()
+	rule.min_games = 100
+
+	var results := runner.run_batch(3, 1, towers, [], [], [], rule)
+
+	assert_eq(results.size(), 3)
+	assert_eq(rule.stop_reason, EarlyStopping.REASON_MAX_GAMES)
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _add_results(
+	rule: EarlyStopping, n: int, won: bool, shrine_hp: int, gold: int = 0, leaked: int = 0
+) -> void:
+	for i in range(n):
+		var result := TickProcessor.GameResult.new()
+		result.won = won
+		result.final_shrine_hp = shrine_hp
+		result.final_gold = gold
+		result.enemies_leaked = leaked
+		rule.add_result(result)
+
+
+func _make_runner() -> SimulationRunner:
+	var runner := SimulationRunnerClass.new()
+	runner.setup(TestMap.create(), Waves1To10.create(), BalanceConfig.new())
+	runner.register_tower(load("res://resources/towers/archer_tower.tres"))
+	runner.register_wall(load("res://resources/walls/basic_wall.tres"))
+	runner.register_enemy(load("res://resources/enemies/grunt.tres"))
+	runner.register_enemy(load("res://resources/enemies/runner.tres"))
+	return runner
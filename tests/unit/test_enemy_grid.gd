@@ -0,0 +1,112 @@
+extends GutTest
+
+## Unit tests for EnemyGrid spatial queries (must match full scans exactly)
+
+var _pathfinding: SimPathfinding
+var _rng: RandomNumberGenerator
+
+
+func before_each() -> void:
+	_pathfinding = TestHelpers.create_test_pathfinding()
+	_rng = RandomNumberGenerator.new()
+	_rng.seed = 1234
+
+
+# ============================================
+# Equivalence with full scans
+# ============================================
+
+
+func test_find_target_matches_full_scan_for_every_priority() -> void:
+	var enemies := _scatter(60)
+	var grid := EnemyGrid.new()
+	grid.rebuild(enemies)
+
+	for priority in Targeting.Priority.values():
+		for x in range(0, 20, 3):
+			for y in range(0, 20, 3):
+				var pos := Vector2i(x, y)
+				for range_tiles in [1, 3, 6]:
+					assert_eq(
+						grid.find_target(pos, range_tiles, priority),
+						Targeting.find_target(pos, enemies, range_tiles, priority),
+						"priority %d at %s range %d" % [priority, str(pos), range_tiles]
+					)
+
+
+func test_radius_query_matches_aoe_scan_in_array_order() -> void:
+	var enemies := _scatter(60)
+	var grid := EnemyGrid.new()
+	grid.rebuild(enemies)
+
+	for center in [Vector2(0, 0), Vector2(7.3, 4.9), Vector2(19.5, 19.5), Vector2(-5, 30)]:
+		for radius in [0.5, 1.5, 4.0, 50.0]:
+			assert_eq(
+				grid.get_enemies_in_radius(center, radius),
+				Targeting.get_enemies_in_aoe(center, enemies, radius)
+			)
+
+
+func test_ties_go_to_earliest_enemy() -> void:
+	# Same progress and HP; the later enemy sits in a different bucket
+	var enemies: Array[SimEnemy] = [
+		TestHelpers.create_enemy_at_position(Vector2(9, 9), null, _pathfinding),
+		TestHelpers.create_enemy_at_position(Vector2(0, 0), null, _pathfinding),
+		TestHelpers.create_enemy_at_position(Vector2(4, 4), null, _pathfinding),
+	]
+	var grid := EnemyGrid.new()
+	grid.rebuild(enemies)
+
+	assert_eq(grid.find_target(Vector2i(4, 4), 10, Targeting.Priority.FIRST), enemies[0])
+	assert_eq(grid.find_target(Vector2i(4, 4), 10, Targeting.Priority.STRONGEST), enemies[0])
+
+
+func test_rebuild_tracks_moves_and_removals() -> void:
+	var enemies := _scatter(10)
+	var grid := EnemyGrid.new()
+	grid.rebuild(enemies)
+
+	enemies[0].grid_pos = Vector2(100, 100)
+	enemies.remove_at(1)
+	grid.rebuild(enemies)
+
+	assert_eq(grid.get_enemies_in_radius(Vector2(100, 100), 0.5), [enemies[0]])
+	assert_eq(
+		grid.get_enemies_in_radius(Vector2(10, 10), 15.0),
+		Targeting.get_enemies_in_aoe(Vector2(10, 10), enemies, 15.0)
+	)
+
+
+func test_stealth_and_empty_grid() -> void:
+	var grid := EnemyGrid.new()
+	var none: Array[SimEnemy] = []
+	grid.rebuild(none)
+	assert_null(grid.find_target(Vector2i(0, 0), 10, Targeting.Priority.FIRST))
+	assert_false(grid.has_targetable_in_range(Vector2i(0, 0), 10))
+
+	var hidden := TestHelpers.create_enemy_at_position(
+		Vector2(1, 1), TestHelpers.create_stealth_enemy_data(), _pathfinding
+	)
+	var enemies: Array[SimEnemy] = [hidden]
+	grid.rebuild(enemies)
+
+	assert_null(grid.find_target(Vector2i(0, 0), 5, Targeting.Priority.FIRST))
+	assert_false(grid.has_targetable_in_range(Vector2i(0, 0), 5))
+	assert_eq(grid.get_enemies_in_radius(Vector2(0, 0), 5.0).size(), 1)
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _scatter(count: int) -> Array[SimEnemy]:
+	## Random positions with repeated progress/HP values so ties are common
+	var enemies: Array[SimEnemy] = []
+	for i in range(count):
+		var pos := Vector2(_rng.randf_range(0, 20), _rng.randf_range(0, 20))
+		var enemy := TestHelpers.create_enemy_at_position(pos, null, _pathfinding)
+		enemy.path_progress = float(_rng.randi_range(0, 4)) / 4.0
+		enemy.hp = _rng.randi_range(1, 3) * 10
+		enemies.append(enemy)
+	return enemies
@@ -274,3 +274,58 @@ func test_path_multiple_equal_options() -> void:
 	assert_false(path.is_empty())
 	assert_eq(path[0], Vector2i(0, 10))
 	assert_eq(path[-1], Vector2i(19, 10))
+
+
+# ============================================
+# Distance field tests
+# ============================================
+
+
+func test_get_distance_matches_path_length() -> void:
+	assert_eq(_pathfinding.get_distance(Vector2i(19, 10)), 0)
+	assert_eq(_pathfinding.get_distance(Vector2i(0, 10)), 19)
+	assert_eq(_pathfinding.get_distance(Vector2i(-1, 10)), -1)
+
+	_pathfinding.set_blocked(Vector2i(10, 10), true)
+	var path := _pathfinding.get_path(Vector2i(0, 10))
+	assert_eq(path.size(), _pathfinding.get_distance(Vector2i(0, 10)) + 1)
+	assert_eq(path.size(), 22)  # One detour around the block
+
+
+func test_path_steps_are_adjacent_and_open() -> void:
+	for y in range(3, 18):
+		_pathfinding.set_blocked(Vector2i(8, y), true)
+	var path := _pathfinding.get_path(Vector2i(0, 10))
+
+	for i in range(1, path.size()):
+		var step: Vector2i = path[i] - path[i - 1]
+		assert_eq(absi(step.x) + absi(step.y), 1)
+		assert_true(_pathfinding.is_walkable(path[i]))
+
+
+func test_incremental_updates_match_fresh_field() -> void:
+	var rng := RandomNumberGenerator.new()
+	rng.seed = 42
+	for i in range(200):
+		var pos := Vector2i(rng.randi_range(-1, 20), rng.randi_range(-1, 20))
+		_pathfinding.set_blocked(pos, rng.randf() < 0.6)
+		if i % 10 != 0:
+			continue
+
+		var fresh := SimPathfinding.new(20, 20)
+		fresh.set_shrine_position(Vector2i(19, 10))
+		for blocked_pos in _pathfinding.get_all_blocked():
+			fresh.set_blocked(blocked_pos, true)
+		for x in range(20):
+			for y in range(20):
+				var tile := Vector2i(x, y)
+				assert_eq(_pathfinding.get_distance(tile), fresh.get_distance(tile), str(tile))
+
+
+func test_blocking_shrine_cuts_every_path() -> void:
+	_pathfinding.get_path(Vector2i(0, 10))
+	_pathfinding.set_blocked(Vector2i(19, 10), true)
+	assert_false(_pathfinding.has_valid_path(Vector2i(18, 10)))
+
+	_pathfinding.set_blocked(Vector2i(19, 10), false)
+	assert_eq(_pathfinding.get_path_length(Vector2i(0, 0)), 30)
@@ -0,0 +1,100 @@
+extends GutTest
+
+## Unit tests for ResultAccumulator (streaming batch summary)
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+
+# ============================================
+# Statistics tests
+# ============================================
+
+
+func test_mean_and_sample_std() -> void:
+	var accumulator := ResultAccumulator.new()
+	for hp in [2, 4, 4, 4, 5, 5, 7, 9]:
+		accumulator.add(_result(hp, 0))
+
+	assert_eq(accumulator.games, 8)
+	assert_almost_eq(accumulator.mean("shrine_hp"), 5.0, 0.0001)
+	assert_almost_eq(accumulator.std("shrine_hp"), sqrt(32.0 / 7.0), 0.0001)
+	assert_eq(accumulator.std("gold"), 0.0)
+
+
+func test_single_game_has_zero_std() -> void:
+	var accumulator := ResultAccumulator.new()
+	accumulator.add(_result(50, 10))
+
+	assert_eq(accumulator.std("shrine_hp"), 0.0)
+	assert_eq(accumulator.quantile("shrine_hp", 5), 50)
+	assert_eq(accumulator.quantile("shrine_hp", 95), 50)
+
+
+func test_quantiles_are_nearest_rank() -> void:
+	var accumulator := ResultAccumulator.new()
+	for hp in [100, 0, 40, 100, 40, 100, 0, 100, 40, 100]:
+		accumulator.add(_result(hp, 0))
+
+	assert_eq(accumulator.quantile("shrine_hp", 5), 0)
+	assert_eq(accumulator.quantile("shrine_hp", 20), 0)
+	assert_eq(accumulator.quantile("shrine_hp", 21), 40)
+	assert_eq(accumulator.quantile("shrine_hp", 50), 40)
+	assert_eq(accumulator.quantile("shrine_hp", 95), 100)
+
+
+func test_to_dict_reports_spread_and_distributions() -> void:
+	var accumulator := ResultAccumulator.new()
+	accumulator.add(_result(100, 30))
+	accumulator.add(_result(0, 10))
+	accumulator.add(_result(100, 20))
+
+	var analysis := accumulator.to_dict()
+	assert_eq(analysis.total_simulations, 3)
+	assert_eq(analysis.wins, 2)
+	assert_almost_eq(analysis.avg_gold, 20.0, 0.0001)
+	assert_almost_eq(analysis.std_gold, 10.0, 0.0001)
+	assert_eq(analysis.p50_shrine_hp, 100)
+	assert_eq_deep(analysis.distributions.shrine_hp, {100: 2, 0: 1})
+	for key in ResultAccumulator.spread_keys():
+		assert_true(analysis.has(key), key)
+	assert_eq_deep(ResultAccumulator.new().to_dict(), {})
+
+
+# ============================================
+# SimulationRunner.summary
+# ============================================
+
+
+func test_summary_without_kept_results() -> void:
+	var runner := SimulationRunnerClass.new()
+	runner.setup(TestMap.create(), Waves1To10.create(), BalanceConfig.new())
+	runner.register_tower(load("res://resources/towers/archer_tower.tres"))
+	runner.register_enemy(load("res://resources/enemies/grunt.tres"))
+	runner.register_enemy(load("res://resources/enemies/runner.tres"))
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+
+	var kept := runner.run_batch(3, 1, towers)
+	var expected := SimulationRunner.analyze_results(kept)
+	runner.keep_results = false
+	var dropped := runner.run_batch(3, 1, towers)
+
+	assert_true(dropped.is_empty())
+	var analysis := runner.summary.to_dict()
+	assert_eq(analysis.total_simulations, 3)
+	assert_eq(analysis.avg_shrine_hp, expected.avg_shrine_hp)
+	assert_eq(analysis.std_killed, expected.std_killed)
+	assert_eq(analysis.p95_leaked, expected.p95_leaked)
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _result(shrine_hp: int, gold: int) -> TickProcessor.GameResult:
+	var result := TickProcessor.GameResult.new()
+	result.won = shrine_hp > 0
+	result.final_shrine_hp = shrine_hp
+	result.final_gold = gold
+	return result
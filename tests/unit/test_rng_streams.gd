@@ -0,0 +1,84 @@
+extends GutTest
+
+## Unit tests for GameState's per-subsystem RNG streams (common random numbers)
+
+var _game_state: GameState
+
+
+func before_each() -> void:
+	_game_state = TestHelpers.create_test_game_state()
+
+
+# ============================================
+# Stream independence
+# ============================================
+
+
+func test_tower_stream_ignores_other_draws() -> void:
+	var other := TestHelpers.create_test_game_state()
+	var tower := TestHelpers.create_tower_at_position(Vector2i(4, 4))
+	var neighbour := TestHelpers.create_tower_at_position(Vector2i(8, 4))
+
+	for i in range(25):
+		other.rng.randf()
+		other.tower_rng(neighbour).randf()
+		other.rng_stream(GameState.SPLIT_STREAM).randf()
+
+	assert_eq(_sequence(other.tower_rng(tower)), _sequence(_game_state.tower_rng(tower)))
+
+
+func test_towers_on_different_cells_get_different_streams() -> void:
+	var a := TestHelpers.create_tower_at_position(Vector2i(4, 4))
+	var b := TestHelpers.create_tower_at_position(Vector2i(4, 5))
+
+	assert_ne(_sequence(_game_state.tower_rng(a)), _sequence(_game_state.tower_rng(b)))
+	assert_eq(_game_state.tower_rng(a), _game_state.tower_rng(a), "one stream per cell")
+
+
+func test_streams_follow_the_seed() -> void:
+	var tower := TestHelpers.create_tower_at_position(Vector2i(4, 4))
+	var reseeded := TestHelpers.create_test_game_state()
+	reseeded.initialize(reseeded.map_data, reseeded.wave_data, 999)
+
+	assert_ne(_sequence(reseeded.tower_rng(tower)), _sequence(_game_state.tower_rng(tower)))
+
+
+# ============================================
+# Draw counting and snapshots
+# ============================================
+
+
+func test_rng_calls_counts_every_stream() -> void:
+	var tower := TestHelpers.create_tower_at_position(Vector2i(4, 4))
+	assert_eq(_game_state.rng_calls(), 0)
+
+	_game_state.rng.randf()
+	_game_state.tower_rng(tower).randf()
+	_game_state.rng_stream(GameState.SPLIT_STREAM).randf()
+	_game_state.rng_stream(GameState.SPLIT_STREAM).randf()
+
+	assert_eq(_game_state.rng_calls(), 4)
+
+
+func test_restore_resumes_stream_positions() -> void:
+	var tower := TestHelpers.create_tower_at_position(Vector2i(4, 4))
+	_game_state.tower_rng(tower).randf()
+	var snapshot := _game_state.snapshot()
+	var expected := _sequence(_game_state.tower_rng(tower))
+
+	var copy := TestHelpers.create_test_game_state()
+	copy.restore(snapshot)
+	assert_eq(_sequence(copy.tower_rng(tower)), expected)
+	assert_eq(copy.rng_calls(), 1 + expected.size())
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _sequence(rng: RandomManager) -> Array:
+	var values := []
+	for i in range(5):
+		values.append(rng.randi_range(0, 999))
+	return values
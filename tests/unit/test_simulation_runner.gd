@@ -0,0 +1,174 @@
+extends GutTest
+
+## Unit tests for SimulationRunner's shared, config-applied game data
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+const ARCHER_PATH := "res://resources/towers/archer_tower.tres"
+
+# ============================================
+# Prepared data tests
+# ============================================
+
+
+func test_prepare_applies_config_without_touching_registry() -> void:
+	var config := BalanceConfig.new()
+	config.archer_cost = 77
+	config.grunt_hp = 1234
+	var runner := _make_runner(config)
+	var archer: TowerData = load(ARCHER_PATH)
+	var original_cost := archer.base_cost
+
+	runner.prepare_game_data()
+
+	assert_eq(runner.get_prepared_tower_data("archer").base_cost, 77)
+	assert_eq(runner.get_prepared_enemy_data("grunt").hp, 1234)
+	assert_eq(archer.base_cost, original_cost)
+	assert_ne(runner.get_prepared_tower_data("archer"), archer)
+
+
+func test_prepared_data_is_shared_between_games() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+
+	runner.run_single(1, towers)
+	var archer := runner.get_prepared_tower_data("archer")
+	runner.run_single(2, towers)
+
+	assert_same(runner.get_prepared_tower_data("archer"), archer)
+
+
+func test_set_balance_config_rebuilds_prepared_data() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	runner.prepare_game_data()
+
+	var config := BalanceConfig.new()
+	config.archer_damage = 99000
+	runner.set_balance_config(config)
+	var towers: Array[Dictionary] = []
+	runner.run_single(1, towers)
+
+	assert_eq(runner.get_prepared_tower_data("archer").damage, 99000)
+
+
+func test_shared_data_keeps_games_deterministic() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+	var walls: Array[Vector2i] = []
+	var upgrades := [
+		{pos = Vector2i(3, 2), upgrade_id = "archer_marksman"},
+		{pos = Vector2i(3, 2), upgrade_id = "archer_sniper"},
+	]
+
+	var first := runner.run_single(5, towers, walls, upgrades, [])
+	runner.run_single(6, towers)
+	var again := runner.run_single(5, towers, walls, upgrades, [])
+
+	assert_eq(again.won, first.won)
+	assert_eq(again.final_shrine_hp, first.final_shrine_hp)
+	assert_eq(again.enemies_killed, first.enemies_killed)
+	assert_eq(again.total_damage_dealt, first.total_damage_dealt)
+
+
+func test_results_count_simulated_ticks() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+
+	var result := runner.run_single(3, towers)
+	var wave_ticks := 0
+	for wave in result.wave_results:
+		wave_ticks += wave.ticks
+	var results: Array[TickProcessor.GameResult] = [result, result]
+
+	assert_gt(result.total_ticks, 0)
+	assert_eq(result.total_ticks, wave_ticks)
+	assert_eq(SimulationRunner.analyze_results(results).avg_ticks, float(wave_ticks))
+
+
+# ============================================
+# Seed-invariant batches
+# ============================================
+
+
+func test_batch_without_randomness_simulates_once() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+	var started := []
+	runner.simulation_started.connect(func(index: int, _total: int) -> void: started.append(index))
+
+	var results := runner.run_batch(5, 1, towers)
+
+	assert_eq(results[0].rng_calls, 0, "plain archers vs grunts draw no randomness")
+	assert_eq(results.size(), 5)
+	assert_eq(runner.simulated_games, 1)
+	assert_eq(started, [0, 1, 2, 3, 4])
+	assert_eq(SimulationRunner.analyze_results(results).total_simulations, 5)
+
+
+func test_every_seed_mode_simulates_full_count() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	runner.collapse_seed_invariant = false
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+
+	var results := runner.run_batch(3, 1, towers)
+
+	assert_eq(runner.simulated_games, 3)
+	assert_eq(results[1].to_dict().won, results[0].to_dict().won)
+
+
+func test_games_that_draw_randomness_are_not_collapsed() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	var result := TickProcessor.GameResult.new()
+	result.rng_calls = 12
+	assert_null(runner._seed_invariant(result))
+
+	result.rng_calls = 0
+	assert_eq(runner._seed_invariant(result), result)
+	runner.profiler = TickProfiler.new()
+	assert_null(runner._seed_invariant(result), "profiled batches time every game")
+
+
+# ============================================
+# Wave limit (--max-waves)
+# ============================================
+
+
+func test_max_waves_plays_a_prefix_of_the_roster() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+	var full := runner.run_single(1, towers)
+
+	runner.set_max_waves(3)
+	var short := runner.run_single(1, towers)
+
+	assert_lte(short.final_wave, 3)
+	assert_eq(short.won, full.wave_results.size() > 3 or full.won)
+	for i in range(short.wave_results.size()):
+		assert_eq(short.wave_results[i].ticks, full.wave_results[i].ticks)
+
+
+func test_max_waves_zero_or_past_the_end_restores_the_roster() -> void:
+	var runner := _make_runner(BalanceConfig.new())
+	runner.set_max_waves(3)
+	assert_eq(runner.first_affected_wave({}, {}), 4)
+
+	runner.set_max_waves(0)
+	assert_eq(runner.first_affected_wave({}, {}), 11)
+	runner.set_max_waves(50)
+	assert_eq(runner.first_affected_wave({}, {}), 11)
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _make_runner(config: BalanceConfig) -> SimulationRunner:
+	var runner := SimulationRunnerClass.new()
+	runner.setup(TestMap.create(), Waves1To10.create(), config)
+	runner.register_tower(load(ARCHER_PATH))
+	runner.register_wall(load("res://resources/walls/basic_wall.tres"))
+	runner.register_enemy(load("res://resources/enemies/grunt.tres"))
+	runner.register_enemy(load("res://resources/enemies/runner.tres"))
+	return runner
@@ -0,0 +1,93 @@
+extends GutTest
+
+## Unit tests for TelemetryWriter's per-wave / per-tower CSV export
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+
+var _dir: String
+
+
+func before_each() -> void:
+	_dir = "user://telemetry_test_%d" % Time.get_ticks_usec()
+
+
+func after_each() -> void:
+	for file_name in [TelemetryWriter.WAVES_FILE, TelemetryWriter.TOWERS_FILE]:
+		DirAccess.remove_absolute(_dir.path_join(file_name))
+	DirAccess.remove_absolute(_dir)
+
+
+# ============================================
+# CSV export tests
+# ============================================
+
+
+func test_writes_one_row_per_wave_and_tower() -> void:
+	var result := _play_game(7)
+	var writer := TelemetryWriter.new()
+	assert_eq(writer.open(_dir), OK)
+
+	writer.write_game("a", 0, 7, result)
+	writer.write_game("a", 1, 8, result)
+	writer.close()
+
+	var waves := _read_lines(TelemetryWriter.WAVES_FILE)
+	var towers := _read_lines(TelemetryWriter.TOWERS_FILE)
+	assert_eq(waves[0], ",".join(TelemetryWriter.WAVE_COLUMNS))
+	assert_eq(towers[0], ",".join(TelemetryWriter.TOWER_COLUMNS))
+	assert_eq(waves.size(), 1 + 2 * result.wave_results.size())
+	assert_eq(towers.size(), 1 + 2 * result.tower_stats.size())
+	assert_true(towers[1].begins_with("a,0,7,archer,3,2,"))
+
+
+func test_wave_rows_sum_to_game_totals() -> void:
+	var result := _play_game(3)
+	var writer := TelemetryWriter.new()
+	writer.open(_dir)
+	writer.write_game("a", 0, 3, result)
+	writer.close()
+
+	var killed_col := TelemetryWriter.WAVE_COLUMNS.find("killed")
+	var leaked_col := TelemetryWriter.WAVE_COLUMNS.find("leaked")
+	var killed := 0
+	var leaked := 0
+	var waves := _read_lines(TelemetryWriter.WAVES_FILE)
+	for line in waves.slice(1):
+		var fields := line.split(",")
+		killed += int(fields[killed_col])
+		leaked += int(fields[leaked_col])
+
+	assert_eq(killed, result.enemies_killed)
+	assert_eq(leaked, result.enemies_leaked)
+
+
+func test_unopened_writer_ignores_games() -> void:
+	var writer := TelemetryWriter.new()
+
+	writer.write_game("a", 0, 1, _play_game(1))
+
+	assert_false(writer.is_open())
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _play_game(seed: int) -> TickProcessor.GameResult:
+	var runner := SimulationRunnerClass.new()
+	runner.setup(TestMap.create(), Waves1To10.create(), BalanceConfig.new())
+	runner.register_tower(load("res://resources/towers/archer_tower.tres"))
+	runner.register_enemy(load("res://resources/enemies/grunt.tres"))
+	runner.register_enemy(load("res://resources/enemies/runner.tres"))
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+	return runner.run_single(seed, towers)
+
+
+func _read_lines(file_name: String) -> PackedStringArray:
+	var file := FileAccess.open(_dir.path_join(file_name), FileAccess.READ)
+	var text := file.get_as_text()
+	file.close()
+	return text.split("\n", false)
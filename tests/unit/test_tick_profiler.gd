@@ -0,0 +1,88 @@
+extends GutTest
+
+## Unit tests for TickProfiler (--profile per-phase tick timings)
+
+const SimulationRunnerClass = preload("res://simulation/runner/simulation_runner.gd")
+const TestMap = preload("res://maps/test_map.gd")
+const Waves1To10 = preload("res://resources/waves/waves_1_10.gd")
+
+# ============================================
+# Accumulation tests
+# ============================================
+
+
+func test_laps_accumulate_per_phase_and_wave() -> void:
+	var profiler := TickProfiler.new()
+
+	profiler.begin_tick(1)
+	profiler.lap("spawns")
+	profiler.lap("move")
+	profiler.begin_tick(2)
+	profiler.lap("spawns")
+
+	var data := profiler.to_dict()
+	assert_eq(data.phases.spawns.calls, 2)
+	assert_eq(data.phases.move.calls, 1)
+	assert_eq(data.waves["1"].spawns.calls, 1)
+	assert_eq(data.waves["2"].spawns.calls, 1)
+	assert_false(data.waves["2"].has("move"))
+	assert_gte(data.phases.spawns.us, 0)
+
+
+func test_specials_and_take_resets() -> void:
+	var profiler := TickProfiler.new()
+	profiler.begin_special()
+	profiler.end_special("beam")
+	profiler.begin_special()
+	profiler.end_special("beam")
+
+	var data := profiler.take()
+
+	assert_eq(data.specials.beam.calls, 2)
+	assert_true(profiler.to_dict().specials.is_empty())
+	assert_true(profiler.to_dict().phases.is_empty())
+
+
+# ============================================
+# Runner integration tests
+# ============================================
+
+
+func test_runner_profiles_every_tick() -> void:
+	var runner := _make_runner()
+	runner.profiler = TickProfiler.new()
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+
+	var result := runner.run_single(4, towers)
+	var data := runner.profiler.take()
+
+	assert_eq(data.phases.spawns.calls, result.total_ticks)
+	assert_eq(data.phases.tower_attacks.calls, result.total_ticks)
+	assert_eq(data.waves.size(), result.wave_results.size())
+
+
+func test_profiling_does_not_change_results() -> void:
+	var runner := _make_runner()
+	var towers: Array[Dictionary] = [{pos = Vector2i(3, 2), id = "archer"}]
+	var plain := runner.run_single(9, towers)
+
+	runner.profiler = TickProfiler.new()
+	var profiled := runner.run_single(9, towers)
+
+	assert_eq(profiled.final_wave, plain.final_wave)
+	assert_eq(profiled.final_shrine_hp, plain.final_shrine_hp)
+	assert_eq(profiled.total_damage_dealt, plain.total_damage_dealt)
+
+
+# ============================================
+# Helpers
+# ============================================
+
+
+func _make_runner() -> SimulationRunner:
+	var runner := SimulationRunnerClass.new()
+	runner.setup(TestMap.create(), Waves1To10.create(), BalanceConfig.new())
+	runner.register_tower(load("res://resources/towers/archer_tower.tres"))
+	runner.register_enemy(load("res://resources/enemies/grunt.tres"))
+	runner.register_enemy(load("res://resources/enemies/runner.tres"))
+	return runner